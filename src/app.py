@@ -1,16 +1,29 @@
 """
 Streamlit Web Application for Lung Cancer Risk Prediction
 Clean version - No FastAPI, No uvicorn
+
+Streamlit her slider hareketinde script'i baştan çalıştırır. Bu yüzden:
+- Tahmin, grafik ve PDF girdi tuple'ı (RAW_FEATURES sırası) ile st.cache_data'da tutulur
+- Son tahmin session_state'te saklanır, sonraki rerun'larda cache'ten çizilir
+- PDF yalnızca "Prepare PDF Report" tıklanınca üretilir (reports.py, içerik hash'i ile disk cache)
+- Statik bölümler (CSS, açıklama, footer) modül sabitleridir
+- Bulk Upload sekmesi: CSV dosyaları parça parça doğrulanır ve skorlanır (bulk_scoring.py)
+- Key Risk Factors: önceden hesaplanmış partial-dependence tablolarından okunur (interpretation.py)
 """
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from inference import LungCancerPredictor
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from io import BytesIO
-
-st.markdown("""
+from features import RAW_FEATURES
+from reports import generate_report
+from bulk_scoring import score_csv, OUTPUT_FORMATS
+from interpretation import InterpretationTables
+from config import INTERPRETATION_CONFIG
+
+# =============================================================================
+# STATIC SECTIONS (her rerun'da yeniden üretilmez)
+# =============================================================================
+APP_CSS = """
 <style>
 .risk-card {
     background-color: #ffffff;
@@ -40,51 +53,54 @@ st.markdown("""
     animation: grow 1.5s ease-out forwards;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-def generate_pdf_report(result, input_data):
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
+ABOUT_MARKDOWN = """
+### How It Works
 
-    # Başlık
-    c.setFont("Helvetica-Bold", 20)
-    c.drawString(50, 750, "Lung Cancer Risk Report")
+This system uses machine learning (XGBoost) to analyze multiple factors:
+- **Environmental:** Air pollution, occupational hazards
+- **Lifestyle:** Smoking, alcohol use, diet, obesity
+- **Health:** Genetic risk, chronic conditions, symptoms
 
-    # Risk seviyesi
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, 720, f"Risk Level: {result['risk_level']}")
+The model was trained on patient data and validated to ensure reliable predictions.
 
-    # Confidence
-    c.setFont("Helvetica", 12)
-    c.drawString(50, 700, f"Confidence: {result['confidence']*100:.2f}%")
+### Important Note
+⚠️ This tool is for informational purposes only and should not replace professional medical advice.
+Always consult with healthcare providers for proper diagnosis and treatment.
+"""
 
-    # Probability dağılımları
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, 670, "Probability Distribution:")
-    
-    y = 650
-    for k, v in result["probability"].items():
-        c.setFont("Helvetica", 12)
-        c.drawString(60, y, f"{k}: {v*100:.2f}%")
-        y -= 20
-
-    # Hasta girdileri
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y - 20, "Patient Inputs:")
-    y -= 40
-
-    for k, v in input_data.items():
-        c.setFont("Helvetica", 10)
-        c.drawString(60, y, f"{k}: {v}")
-        y -= 15
-        if y < 50:  # Sayfa dolarsa yenisini aç
-            c.showPage()
-            y = 750
-
-    c.save()
-    buffer.seek(0)
-    return buffer
+FOOTER_HTML = """
+<div style='text-align: center'>
+    <p>🫁 Lung Cancer Risk Prediction System | Zero2End ML Bootcamp 2024</p>
+    <p>Built with Streamlit, XGBoost, and scikit-learn</p>
+</div>
+"""
+
+BULK_HELP_MARKDOWN = """
+Upload a CSV in the raw training schema (one row per patient). Required columns:
+""" + ", ".join(f"`{name}`" for name in RAW_FEATURES) + """.
+
+An optional `Patient Id` column is carried through to the results. Rows with values outside
+the allowed ranges are skipped and listed below.
+"""
+
+HIGH_RISK_RECOMMENDATIONS = """
+        **⚠️ High Risk Detected:**
+        - Consult with a healthcare professional immediately
+        - Consider comprehensive screening tests
+        - Reduce exposure to risk factors (smoking, pollution)
+        - Improve lifestyle habits (diet, exercise)
+        - Regular health monitoring recommended
+        """
 
+LOW_RISK_RECOMMENDATIONS = """
+        **✅ Low Risk Detected:**
+        - Maintain current healthy lifestyle
+        - Continue regular health check-ups
+        - Be mindful of environmental exposures
+        - Early detection is key - monitor any symptoms
+        """
 
 # Page config
 st.set_page_config(
@@ -92,12 +108,64 @@ st.set_page_config(
     page_icon="🫁",
     layout="wide"
 )
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Initialize predictor
 @st.cache_resource
 def load_predictor():
     return LungCancerPredictor()
 
+
+# =============================================================================
+# MEMOIZED PREDICTION & ARTEFACTS (anahtar: RAW_FEATURES sırasındaki girdi tuple'ı)
+# =============================================================================
+@st.cache_data(max_entries=512, show_spinner=False)
+def predict_cached(input_key):
+    """Prediction for one input tuple (computed once per distinct input)"""
+    return load_predictor().predict_with_details(dict(zip(RAW_FEATURES, input_key)))
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def probability_figure(prob_items):
+    """Plotly bar chart for ((risk level, probability), ...)"""
+    levels = [level for level, _ in prob_items]
+    probs = [p for _, p in prob_items]
+    fig = go.Figure(data=[
+        go.Bar(
+            x=levels,
+            y=probs,
+            marker_color=['#00cc96' if p < 0.5 else '#ef553b' for p in probs],
+            text=[f"{p:.1%}" for p in probs],
+            textposition='auto',
+        )
+    ])
+    fig.update_layout(
+        title="<b>Risk Probability Distribution</b>",
+        title_x=0.3
+    )
+    return fig
+
+
+@st.cache_resource
+def load_interpretation():
+    """Permutation importance / partial-dependence tables (None if not built)"""
+    return InterpretationTables.load()
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def risk_factor_effects(input_key):
+    """Shift in High-risk probability caused by each input value (PDP lookup)"""
+    tables = load_interpretation()
+    if tables is None:
+        return None
+    return tables.effects(dict(zip(RAW_FEATURES, input_key)), 'High')
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def pdf_report_bytes(input_key):
+    """PDF report for one input tuple (only built when requested)"""
+    return generate_report(predict_cached(input_key), dict(zip(RAW_FEATURES, input_key)))
+
 try:
     predictor = load_predictor()
 except Exception as e:
@@ -159,220 +227,246 @@ with st.sidebar.expander("🤒 Symptoms", expanded=False):
 predict_button = st.sidebar.button("🔮 Predict Risk", type="primary")
 
 
-# Main area
-if predict_button:
-    # Prepare input data
-    input_data = {
-        'Age': age,
-        'Gender': 1 if gender == "Male" else 2,
-        'Air Pollution': air_pollution,
-        'Alcohol use': alcohol_use,
-        'Dust Allergy': dust_allergy,
-        'OccuPational Hazards': occupational_hazards,
-        'Genetic Risk': genetic_risk,
-        'chronic Lung Disease': chronic_lung_disease,
-        'Balanced Diet': balanced_diet,
-        'Obesity': obesity,
-        'Smoking': smoking,
-        'Passive Smoker': passive_smoker,
-        'Chest Pain': chest_pain,
-        'Coughing of Blood': coughing_blood,
-        'Fatigue': fatigue,
-        'Weight Loss': weight_loss,
-        'Shortness of Breath': shortness_breath,
-        'Wheezing': wheezing,
-        'Swallowing Difficulty': swallowing_difficulty,
-        'Clubbing of Finger Nails': clubbing_nails,
-        'Frequent Cold': frequent_cold,
-        'Dry Cough': dry_cough,
-        'Snoring': snoring
-    }
+# Prepare input data
+input_data = {
+    'Age': age,
+    'Gender': gender,
+    'Air Pollution': air_pollution,
+    'Alcohol use': alcohol_use,
+    'Dust Allergy': dust_allergy,
+    'OccuPational Hazards': occupational_hazards,
+    'Genetic Risk': genetic_risk,
+    'chronic Lung Disease': chronic_lung_disease,
+    'Balanced Diet': balanced_diet,
+    'Obesity': obesity,
+    'Smoking': smoking,
+    'Passive Smoker': passive_smoker,
+    'Chest Pain': chest_pain,
+    'Coughing of Blood': coughing_blood,
+    'Fatigue': fatigue,
+    'Weight Loss': weight_loss,
+    'Shortness of Breath': shortness_breath,
+    'Wheezing': wheezing,
+    'Swallowing Difficulty': swallowing_difficulty,
+    'Clubbing of Finger Nails': clubbing_nails,
+    'Frequent Cold': frequent_cold,
+    'Dry Cough': dry_cough,
+    'Snoring': snoring
+}
+input_key = tuple(input_data[name] for name in RAW_FEATURES)
 
-    
-    # Make prediction
-    with st.spinner("Analyzing patient data..."):
-        try:
-            result = predictor.predict_with_details(input_data)
-        except Exception as e:
-            st.error(f"Prediction failed: {e}")
-            st.info("Please check that all required files are present and try again.")
-            st.stop()
-    
-    # Display results
-    st.header("📊 Prediction Results")
-
-    # --- Animated Risk Card ---
-
-    # Probabilities
-    prob_high = result['probability'].get('High', result['probability'].get('high', 0))
-    prob_low = result['probability'].get('Low', result['probability'].get('low', 0))
-
-    # Bar rengi
-    if result['risk_level'] == 'High':
-        bar_color = "#e63946"   # Kırmızı
-        percent = int(prob_high * 100)
-    elif result['risk_level'] == 'Medium':
-        bar_color = "#f1c40f"   # Sarı
-        percent = 60            # Medium için stabil
-    else:
-        bar_color = "#2ecc71"   # Yeşil
-        percent = int(prob_low * 100)
-
-    # CSS içindeki placeholder'ı değiştir
-    risk_css = f"""
-    <style>
-    @keyframes grow {{
-        from {{ width: 0%; }}
-        to {{ width: {percent}%; }}
-    }}
-    .progress-bar {{
-        background-color: {bar_color};
-    }}
-    </style>
-    """
-    st.markdown(risk_css, unsafe_allow_html=True)
-
-    # HTML Kart
-    card_html = f"""
-    <div class="risk-card">
-        <h3 style="text-align:center;">Risk Level: {result['risk_level']}</h3>
-        <div class="progress-container">
-            <div class="progress-bar"></div>
+if predict_button:
+    st.session_state['predicted_key'] = input_key
+
+predicted_key = st.session_state.get('predicted_key')
+
+
+tab_single, tab_bulk = st.tabs(["🧍 Single Patient", "📁 Bulk Upload"])
+
+with tab_single:
+    # Main area
+    if predicted_key is not None:
+        # Sonuçlar son tahmin edilen girdiye aittir (slider'lar sonradan değişmiş olabilir)
+        patient = dict(zip(RAW_FEATURES, predicted_key))
+        if predicted_key != input_key:
+            st.caption("✏️ Inputs changed since the last prediction - click **Predict Risk** to update.")
+
+        # Make prediction (cached per input tuple)
+        with st.spinner("Analyzing patient data..."):
+            try:
+                result = predict_cached(predicted_key)
+            except Exception as e:
+                st.error(f"Prediction failed: {e}")
+                st.info("Please check that all required files are present and try again.")
+                st.stop()
+
+        # Display results
+        st.header("📊 Prediction Results")
+
+        # --- Animated Risk Card ---
+
+        # Probabilities
+        prob_high = result['probability'].get('High', result['probability'].get('high', 0))
+        prob_low = result['probability'].get('Low', result['probability'].get('low', 0))
+
+        # Bar rengi
+        if result['risk_level'] == 'High':
+            bar_color = "#e63946"   # Kırmızı
+            percent = int(prob_high * 100)
+        elif result['risk_level'] == 'Medium':
+            bar_color = "#f1c40f"   # Sarı
+            percent = 60            # Medium için stabil
+        else:
+            bar_color = "#2ecc71"   # Yeşil
+            percent = int(prob_low * 100)
+
+        # CSS içindeki placeholder'ı değiştir
+        risk_css = f"""
+        <style>
+        @keyframes grow {{
+            from {{ width: 0%; }}
+            to {{ width: {percent}%; }}
+        }}
+        .progress-bar {{
+            background-color: {bar_color};
+        }}
+        </style>
+        """
+        st.markdown(risk_css, unsafe_allow_html=True)
+
+        # HTML Kart
+        card_html = f"""
+        <div class="risk-card">
+            <h3 style="text-align:center;">Risk Level: {result['risk_level']}</h3>
+            <div class="progress-container">
+                <div class="progress-bar"></div>
+            </div>
+            <p style="text-align:center; margin-top:10px; font-size:16px;">
+                Probability Score: {percent}%
+            </p>
         </div>
-        <p style="text-align:center; margin-top:10px; font-size:16px;">
-            Probability Score: {percent}%
-        </p>
-    </div>
-    """
+        """
 
-    st.markdown(card_html, unsafe_allow_html=True)
+        st.markdown(card_html, unsafe_allow_html=True)
 
-        
-    # PDF EXPORT BUTTON
-    st.subheader("📄 Download Risk Report (PDF)")
 
-    pdf_buffer = generate_pdf_report(result, input_data)
+        # PDF EXPORT BUTTON (PDF yalnızca istendiğinde üretilir)
+        st.subheader("📄 Download Risk Report (PDF)")
 
-    st.download_button(
-        label="📥 Download PDF Report",
-        data=pdf_buffer,
-        file_name="lung_cancer_risk_report.pdf",
-        mime="application/pdf"
-    )
+        if st.button("📄 Prepare PDF Report"):
+            st.session_state['pdf_key'] = predicted_key
 
+        if st.session_state.get('pdf_key') == predicted_key:
+            st.download_button(
+                label="📥 Download PDF Report",
+                data=pdf_report_bytes(predicted_key),
+                file_name="lung_cancer_risk_report.pdf",
+                mime="application/pdf"
+            )
 
-    # Risk level with color coding
-    col1, col2, col3 = st.columns(3)
 
-    with col1:
-        st.markdown("<div class='result-card'>", unsafe_allow_html=True)
-        risk_level = result['risk_level']
-        if risk_level == 'High':
-            st.error(f"### ⚠️ {risk_level} Risk")
-        else:
-            st.success(f"### ✅ {risk_level} Risk")
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-        confidence = result['confidence']
-        st.metric("Confidence", f"{confidence:.1%}")
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    with col3:
-        st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-        prob_high = result['probability'].get('High', 0)
-        st.metric("High Risk Probability", f"{prob_high:.1%}")
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    # Probability visualization
-    st.subheader("Risk Probability Distribution")
-    
-    prob_df = pd.DataFrame({
-        'Risk Level': list(result['probability'].keys()),
-        'Probability': list(result['probability'].values())
-    })
-    
-    fig = go.Figure(data=[
-        go.Bar(
-            x=prob_df['Risk Level'],
-            y=prob_df['Probability'],
-            marker_color=['#00cc96' if p < 0.5 else '#ef553b' for p in prob_df['Probability']],
-            text=[f"{p:.1%}" for p in prob_df['Probability']],
-            textposition='auto',
-        )
-    ])
-    
-    fig.update_layout(
-    title="<b>Risk Probability Distribution</b>",
-    title_x=0.3
-    )
+        # Risk level with color coding
+        col1, col2, col3 = st.columns(3)
 
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # Risk factors summary
-    st.subheader("Key Risk Factors")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("**High Risk Factors:**")
-        high_factors = []
-        if smoking >= 7:
-            high_factors.append(f"• Smoking: {smoking}/10")
-        if air_pollution >= 7:
-            high_factors.append(f"• Air Pollution: {air_pollution}/10")
-        if genetic_risk >= 7:
-            high_factors.append(f"• Genetic Risk: {genetic_risk}/10")
-        if alcohol_use >= 7:
-            high_factors.append(f"• Alcohol Use: {alcohol_use}/10")
-        
-        if high_factors:
-            for factor in high_factors:
-                st.markdown(factor)
+        with col1:
+            st.markdown("<div class='result-card'>", unsafe_allow_html=True)
+            risk_level = result['risk_level']
+            if risk_level == 'High':
+                st.error(f"### ⚠️ {risk_level} Risk")
+            else:
+                st.success(f"### ✅ {risk_level} Risk")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        with col2:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            confidence = result['confidence']
+            st.metric("Confidence", f"{confidence:.1%}")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        with col3:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            prob_high = result['probability'].get('High', 0)
+            st.metric("High Risk Probability", f"{prob_high:.1%}")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # Probability visualization
+        st.subheader("Risk Probability Distribution")
+
+        fig = probability_figure(tuple(result['probability'].items()))
+
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Risk factors summary
+        st.subheader("Key Risk Factors")
+
+        effects = risk_factor_effects(predicted_key)
+        threshold = INTERPRETATION_CONFIG['effect_threshold']
+
+        if effects is None:
+            st.info("Risk factor tables not found. Run `python interpretation.py` "
+                    "(or the pipeline with --interpret) to build them.")
         else:
-            st.markdown("No major high-risk factors identified")
-    
-    with col2:
-        st.markdown("**Protective Factors:**")
-        protective = []
-        if balanced_diet >= 7:
-            protective.append(f"• Good Balanced Diet: {balanced_diet}/10")
-        if smoking <= 3:
-            protective.append(f"• Low Smoking: {smoking}/10")
-        if obesity <= 3:
-            protective.append(f"• Normal Weight: {obesity}/10")
-        
-        if protective:
-            for factor in protective:
-                st.markdown(factor)
+            ranked = sorted(effects.items(), key=lambda item: item[1], reverse=True)
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.markdown("**High Risk Factors:**")
+                high_factors = [(name, effect) for name, effect in ranked if effect >= threshold][:4]
+                for name, effect in high_factors:
+                    st.markdown(f"• {name}: {patient[name]} ({effect:+.1%} high-risk probability)")
+                if not high_factors:
+                    st.markdown("No major high-risk factors identified")
+
+            with col2:
+                st.markdown("**Protective Factors:**")
+                protective = [(name, effect) for name, effect in reversed(ranked) if effect <= -threshold][:4]
+                for name, effect in protective:
+                    st.markdown(f"• {name}: {patient[name]} ({effect:+.1%} high-risk probability)")
+                if not protective:
+                    st.markdown("Limited protective factors")
+
+        # Recommendations
+        st.subheader("💡 Recommendations")
+
+        if risk_level == 'High':
+            st.warning(HIGH_RISK_RECOMMENDATIONS)
         else:
-            st.markdown("Limited protective factors")
-    
-    # Recommendations
-    st.subheader("💡 Recommendations")
-    
-    if risk_level == 'High':
-        st.warning("""
-        **⚠️ High Risk Detected:**
-        - Consult with a healthcare professional immediately
-        - Consider comprehensive screening tests
-        - Reduce exposure to risk factors (smoking, pollution)
-        - Improve lifestyle habits (diet, exercise)
-        - Regular health monitoring recommended
-        """)
+            st.info(LOW_RISK_RECOMMENDATIONS)
     else:
-        st.info("""
-        **✅ Low Risk Detected:**
-        - Maintain current healthy lifestyle
-        - Continue regular health check-ups
-        - Be mindful of environmental exposures
-        - Early detection is key - monitor any symptoms
-        """)
-else:
-    # Welcome message when no prediction made
-    st.info("👈 Enter patient information in the sidebar and click **Predict Risk** to begin analysis.")
-        
+        # Welcome message when no prediction made
+        st.info("👈 Enter patient information in the sidebar and click **Predict Risk** to begin analysis.")
+
+
+# =============================================================================
+# BULK UPLOAD (parça parça doğrulama + skorlama, sonuç diske yazılır)
+# =============================================================================
+with tab_bulk:
+    st.header("📁 Bulk CSV Scoring")
+    st.markdown(BULK_HELP_MARKDOWN)
+
+    uploaded = st.file_uploader("Upload patient CSV (raw schema)", type=["csv"])
+    output_format = st.radio("Output format", list(OUTPUT_FORMATS), horizontal=True)
+
+    if uploaded is not None and st.button("🚀 Score File", type="primary"):
+        progress = st.progress(0.0, text="Scoring...")
+
+        def show_progress(done, total):
+            progress.progress(min(done / max(total, 1), 1.0), text=f"Scored {done:,} / {total:,} rows")
+
+        try:
+            st.session_state['bulk_summary'] = dict(
+                score_csv(uploaded, load_predictor(), output_format=output_format, on_progress=show_progress),
+                file_name=uploaded.name,
+                output_format=output_format
+            )
+        except ValueError as e:
+            st.session_state.pop('bulk_summary', None)
+            st.error(f"Invalid file: {e}")
+
+    summary = st.session_state.get('bulk_summary')
+    if summary:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows", f"{summary['n_rows']:,}")
+        col2.metric("Scored", f"{summary['n_scored']:,}")
+        col3.metric("Invalid", f"{summary['n_invalid']:,}")
+
+        if summary['prediction_counts']:
+            st.bar_chart(pd.Series(summary['prediction_counts'], name="Patients"))
+
+        if summary['n_invalid']:
+            st.warning(f"{summary['n_invalid']:,} row(s) failed validation and were not scored.")
+            st.dataframe(summary['errors'], use_container_width=True)
+
+        if summary['n_scored']:
+            stem = summary['file_name'].rsplit('.', 1)[0]
+            with open(summary['output_path'], 'rb') as f:
+                st.download_button(
+                    label=f"📥 Download Results ({summary['output_format'].upper()})",
+                    data=f,
+                    file_name=f"{stem}_scored.{summary['output_format']}",
+                    mime="text/csv" if summary['output_format'] == 'csv' else "application/octet-stream"
+                )
+
 
 # Show sample statistics
 st.subheader("📈 About This System")
@@ -388,26 +482,8 @@ with col2:
 with col3:
     st.metric("Risk Categories", "2")
 
-st.markdown("""
-### How It Works
-
-This system uses machine learning (XGBoost) to analyze multiple factors:
-- **Environmental:** Air pollution, occupational hazards
-- **Lifestyle:** Smoking, alcohol use, diet, obesity
-- **Health:** Genetic risk, chronic conditions, symptoms
-
-The model was trained on patient data and validated to ensure reliable predictions.
-
-### Important Note
-⚠️ This tool is for informational purposes only and should not replace professional medical advice.
-Always consult with healthcare providers for proper diagnosis and treatment.
-""")
+st.markdown(ABOUT_MARKDOWN)
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div style='text-align: center'>
-    <p>🫁 Lung Cancer Risk Prediction System | Zero2End ML Bootcamp 2024</p>
-    <p>Built with Streamlit, XGBoost, and scikit-learn</p>
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
@@ -4,20 +4,44 @@ FastAPI Application - Cancer Risk Prediction
 REST API for cancer risk prediction service
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
-from typing import Dict, List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, ValidationError, create_model
+from typing import Dict, List, Literal, Optional
 import uvicorn
+import pandas as pd
 from datetime import datetime
+import asyncio
+import io
 import logging
+import multiprocessing
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 
-# Import inference module
+from config import FEATURE_RANGES, API_RESPONSE_CONFIG
+from serialization import FastJSONResponse, to_columnar
+from binary_batch import BINARY_MEDIA_TYPES, decode_batch, encode_batch
+from validation import validate_records
+from response_cache import build_response_cache, payload_key
+from feedback import attach_label, new_prediction_entry, append_predictions
+
+# Ham şema tahmincisi: /predict (predict_with_risk_factors), PDF raporları (predict_with_details)
+# ve binary batch'ler (predict_batch)
 try:
-    from inference import CancerRiskPredictor
-except:
-    print("⚠️ Warning: inference.py not found. Using mock predictor.")
-    CancerRiskPredictor = None
+    from inference import LungCancerPredictor, risk_factor_scores
+    from reports import render_pdf, report_key, get_report_cache
+    from explain import ExplanationService
+    from interpretation import InterpretationTables
+    from config import REPORT_MAX_WORKERS, EXPLAIN_CONFIG, SHADOW_CONFIG
+    from shadow import ShadowEvaluator
+    from routing import load_router
+except ImportError:
+    print("⚠️ Warning: inference dependencies not found. Predictions and /report disabled.")
+    LungCancerPredictor = None
 
 # =============================================================================
 # CONFIGURATION
@@ -31,31 +55,12 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 # DATA MODELS
 # =============================================================================
-class PatientData(BaseModel):
+# Pydantic alanları FEATURE_RANGES'tan üretilir (API adı: boşluk -> alt çizgi);
+# aralık kontrolü alan alan değil, validation motoruyla batch halinde yapılır
+API_FIELD_NAMES = {name: name.replace(' ', '_') for name in FEATURE_RANGES}
+
+class PatientBase(BaseModel):
     """Patient input data model"""
-    Age: int = Field(..., ge=14, le=100, description="Patient age (14-100)")
-    Gender: int = Field(..., ge=1, le=2, description="Gender (1=Male, 2=Female)")
-    Air_Pollution: int = Field(..., ge=1, le=8, description="Air Pollution level (1-8)")
-    Alcohol_use: int = Field(..., ge=1, le=8, description="Alcohol use level (1-8)")
-    Dust_Allergy: int = Field(..., ge=1, le=8, description="Dust Allergy level (1-8)")
-    OccuPational_Hazards: int = Field(..., ge=1, le=8, description="Occupational Hazards (1-8)")
-    Genetic_Risk: int = Field(..., ge=1, le=7, description="Genetic Risk (1-7)")
-    chronic_Lung_Disease: int = Field(..., ge=1, le=7, description="Chronic Lung Disease (1-7)")
-    Balanced_Diet: int = Field(..., ge=1, le=7, description="Balanced Diet (1-7)")
-    Obesity: int = Field(..., ge=1, le=7, description="Obesity level (1-7)")
-    Smoking: int = Field(..., ge=1, le=8, description="Smoking level (1-8)")
-    Passive_Smoker: int = Field(..., ge=1, le=8, description="Passive Smoker (1-8)")
-    Chest_Pain: int = Field(..., ge=1, le=9, description="Chest Pain (1-9)")
-    Coughing_of_Blood: int = Field(..., ge=1, le=9, description="Coughing of Blood (1-9)")
-    Fatigue: int = Field(..., ge=1, le=9, description="Fatigue (1-9)")
-    Weight_Loss: int = Field(..., ge=1, le=8, description="Weight Loss (1-8)")
-    Shortness_of_Breath: int = Field(..., ge=1, le=9, description="Shortness of Breath (1-9)")
-    Wheezing: int = Field(..., ge=1, le=8, description="Wheezing (1-8)")
-    Swallowing_Difficulty: int = Field(..., ge=1, le=8, description="Swallowing Difficulty (1-8)")
-    Clubbing_of_Finger_Nails: int = Field(..., ge=1, le=9, description="Clubbing of Finger Nails (1-9)")
-    Frequent_Cold: int = Field(..., ge=1, le=7, description="Frequent Cold (1-7)")
-    Dry_Cough: int = Field(..., ge=1, le=7, description="Dry Cough (1-7)")
-    Snoring: int = Field(..., ge=1, le=7, description="Snoring (1-7)")
     
     class Config:
         schema_extra = {
@@ -88,31 +93,38 @@ class PatientData(BaseModel):
     
     def to_dict(self):
         """Convert to dictionary with proper column names"""
-        return {
-            'Age': self.Age,
-            'Gender': self.Gender,
-            'Air Pollution': self.Air_Pollution,
-            'Alcohol use': self.Alcohol_use,
-            'Dust Allergy': self.Dust_Allergy,
-            'OccuPational Hazards': self.OccuPational_Hazards,
-            'Genetic Risk': self.Genetic_Risk,
-            'chronic Lung Disease': self.chronic_Lung_Disease,
-            'Balanced Diet': self.Balanced_Diet,
-            'Obesity': self.Obesity,
-            'Smoking': self.Smoking,
-            'Passive Smoker': self.Passive_Smoker,
-            'Chest Pain': self.Chest_Pain,
-            'Coughing of Blood': self.Coughing_of_Blood,
-            'Fatigue': self.Fatigue,
-            'Weight Loss': self.Weight_Loss,
-            'Shortness of Breath': self.Shortness_of_Breath,
-            'Wheezing': self.Wheezing,
-            'Swallowing Difficulty': self.Swallowing_Difficulty,
-            'Clubbing of Finger Nails': self.Clubbing_of_Finger_Nails,
-            'Frequent Cold': self.Frequent_Cold,
-            'Dry Cough': self.Dry_Cough,
-            'Snoring': self.Snoring
-        }
+        return {name: getattr(self, field) for name, field in API_FIELD_NAMES.items()}
+
+PatientData = create_model(
+    'PatientData',
+    __base__=PatientBase,
+    **{
+        field: (int, Field(..., description=f"{name} ({FEATURE_RANGES[name][0]}-{FEATURE_RANGES[name][1]})"))
+        for name, field in API_FIELD_NAMES.items()
+    }
+)
+
+def validate_patients(patients: List[PatientBase]) -> List[Dict]:
+    """
+    Range-check all patients in one pass
+    
+    Args:
+        patients: Parsed patient models
+        
+    Returns:
+        Raw-schema records
+        
+    Raises:
+        HTTPException: 422 with one {row, column, value, reason, allowed} entry per invalid field
+    """
+    records = [patient.to_dict() for patient in patients]
+    result = validate_records(records)
+    if not result.ok:
+        errors = result.to_records()
+        for error in errors:
+            error['field'] = API_FIELD_NAMES[error['column']]
+        raise HTTPException(status_code=422, detail=errors)
+    return records
 
 class PredictionResponse(BaseModel):
     """Prediction response model"""
@@ -123,6 +135,9 @@ class PredictionResponse(BaseModel):
     overall_risk_score: float
     timestamp: str
     recommendations: List[str]
+    prediction_id: str
+    variant: Optional[str] = None
+    model_version: Optional[str] = None
 
 class HealthResponse(BaseModel):
     """Health check response"""
@@ -131,8 +146,24 @@ class HealthResponse(BaseModel):
     model_loaded: bool
 
 class BatchPredictionRequest(BaseModel):
-    """Batch prediction request"""
+    """Batch prediction request (patient_ids: A/B routing, one id per patient)"""
+    patients: List[PatientData]
+    patient_ids: Optional[List[str]] = None
+
+class RoutedBatchRequest(BaseModel):
+    """Batch request for the A/B router (optional ids keep each patient on one variant)"""
     patients: List[PatientData]
+    patient_ids: Optional[List[str]] = None
+
+class OutcomeRequest(BaseModel):
+    """Confirmed diagnosis for a patient scored through the router"""
+    patient_id: str
+    label: Literal["Low", "Medium", "High"]
+
+class FeedbackRequest(BaseModel):
+    """Confirmed diagnosis for a prediction in the prediction log"""
+    prediction_id: str
+    label: Literal["Low", "Medium", "High"]
 
 # =============================================================================
 # INITIALIZE APP
@@ -142,7 +173,15 @@ app = FastAPI(
     description="Predict cancer risk level based on patient data",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
+)
+
+# Yanıt sıkıştırma: yalnızca Accept-Encoding: gzip gönderen istemcilere
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=API_RESPONSE_CONFIG['gzip_minimum_size'],
+    compresslevel=API_RESPONSE_CONFIG['gzip_level'],
 )
 
 # CORS middleware
@@ -154,21 +193,82 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize predictor
-predictor = None
+# Raw-schema predictor (predictions, reports, binary batches) + process pool (PDF çizimi event loop'u bloklamaz)
+raw_predictor = None
+report_pool = None
+
+# TreeSHAP açıklayıcı: ağaç yapısı startup'ta bir kez derlenir
+explanation_service = None
+
+# Önceden hesaplanmış importance / partial-dependence tabloları (interpretation.py)
+interpretation_tables = None
+
+# Shadow (aday) model: canlı isteklerin örneğini arka planda skorlar (SHADOW_MODEL_PATH ile açılır)
+shadow_evaluator = None
+
+# Çoklu model / A-B yönlendirici (ROUTING_CONFIG varyantları)
+model_router = None
+
+# /predict yanıt cache'i (girdi hash'i + model sürümü, LRU + TTL)
+response_cache = None
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize predictor on startup"""
-    global predictor
+    global raw_predictor, explanation_service, interpretation_tables, shadow_evaluator, model_router
+    global response_cache
     try:
-        if CancerRiskPredictor:
-            predictor = CancerRiskPredictor()
-            logger.info("✅ Predictor initialized successfully")
-        else:
-            logger.warning("⚠️ CancerRiskPredictor not available")
+        if LungCancerPredictor:
+            raw_predictor = LungCancerPredictor()
+            logger.info(f"✅ Predictor {raw_predictor.version} initialized successfully")
+            explanation_service = ExplanationService(raw_predictor)
+            logger.info(f"✅ Explainer compiled ({len(raw_predictor.model.estimators_)} trees)")
+            interpretation_tables = InterpretationTables.load()
+            if interpretation_tables is None:
+                logger.warning("⚠️ Interpretation tables not found (run interpretation.py)")
     except Exception as e:
-        logger.error(f"❌ Failed to initialize predictor: {e}")
+        logger.error(f"❌ Failed to initialize raw-schema predictor: {e}")
+    
+    try:
+        if LungCancerPredictor and SHADOW_CONFIG['model_path']:
+            shadow_evaluator = ShadowEvaluator(
+                LungCancerPredictor(SHADOW_CONFIG['model_path']),
+                primary_version=getattr(raw_predictor, 'version', None)
+            )
+            logger.info(f"✅ Shadow model {shadow_evaluator.candidate_version} scoring "
+                        f"{shadow_evaluator.sample_rate:.0%} of requests")
+    except Exception as e:
+        logger.error(f"❌ Failed to initialize shadow model: {e}")
+    
+    response_cache = build_response_cache()
+    
+    try:
+        if LungCancerPredictor:
+            model_router = load_router()
+            logger.info(f"✅ Model router: {model_router.weights} ({model_router.strategy})")
+    except Exception as e:
+        logger.error(f"❌ Failed to initialize model router: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the report worker pool and the shadow model, persist router metrics"""
+    global report_pool, shadow_evaluator
+    if report_pool is not None:
+        report_pool.shutdown(wait=False, cancel_futures=True)
+        report_pool = None
+    if shadow_evaluator is not None:
+        shadow_evaluator.close()
+        shadow_evaluator = None
+    if model_router is not None:
+        model_router.flush()
+
+def get_report_pool():
+    """Lazily started process pool for PDF rendering (spawn: the API process runs threads)"""
+    global report_pool
+    if report_pool is None:
+        report_pool = ProcessPoolExecutor(max_workers=REPORT_MAX_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+    return report_pool
 
 # =============================================================================
 # API ENDPOINTS
@@ -180,43 +280,119 @@ async def root():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "model_loaded": predictor is not None
+        "model_loaded": raw_predictor is not None
     }
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
     return {
-        "status": "healthy" if predictor else "model not loaded",
+        "status": "healthy" if raw_predictor else "model not loaded",
         "timestamp": datetime.now().isoformat(),
-        "model_loaded": predictor is not None
+        "model_loaded": raw_predictor is not None
     }
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(patient: PatientData):
+def served_model_version() -> str:
+    """Version of the model behind /predict (bundle id; object id if unversioned)"""
+    return getattr(raw_predictor, 'version', None) or f"object-{id(raw_predictor)}"
+
+def log_served(background_tasks: BackgroundTasks, records: List[Dict], results: List[Dict]) -> List[str]:
+    """
+    Queue served predictions for the prediction log (written after the response is sent)
+    
+    Returns:
+        prediction_id per record (used by /feedback)
+    """
+    now = datetime.now()
+    entries = [new_prediction_entry(record, result['prediction'], result['probabilities'], now)
+            for record, result in zip(records, results)]
+    if entries:
+        background_tasks.add_task(append_predictions, entries)
+    return [entry['id'] for entry in entries]
+
+def routing_active() -> bool:
+    """True when ROUTING_CONFIG has several variants (then /predict and /predict/batch are A/B routed)"""
+    return model_router is not None and len(model_router.names) > 1
+
+def routed_results(records: List[Dict], patient_ids: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Score records through the A/B router
+    
+    Args:
+        records: Raw-schema records
+        patient_ids: One stable id per record (hash routing; default: random assignment)
+        
+    Returns:
+        predict_with_risk_factors-style results plus variant and model_version
+    """
+    if not records:
+        return []
+    scored = model_router.predict_batch(pd.DataFrame(records), patient_ids)
+    return [
+        {
+            "prediction": row["prediction"],
+            "probabilities": {c: float(row[f"prob_{c}"]) for c in model_router.classes},
+            "confidence": float(row["confidence"]),
+            **risk_factor_scores(record),
+            "variant": row["variant"],
+            "model_version": row["model_version"],
+        }
+        for record, row in zip(records, scored.to_dict(orient="records"))
+    ]
+
+@app.post("/predict", response_model=PredictionResponse, response_model_exclude_none=True)
+async def predict(patient: PatientData, response: Response, background_tasks: BackgroundTasks,
+                patient_id: Optional[str] = None):
     """
     Predict cancer risk level for a patient
     
+    Identical payloads for the same model version are answered from the
+    response cache (X-Cache: HIT / MISS header). Every served prediction,
+    cached or not, is logged with a new prediction_id. With several
+    ROUTING_CONFIG variants the request is scored by the variant the router
+    picks (variant and model_version in the body) and not cached.
+    
     Args:
         patient: Patient data
+        response: Used to set the X-Cache header
+        background_tasks: Prediction log write (after the response)
+        patient_id: Stable id for A/B routing (the same patient always sees the same variant)
         
     Returns:
-        Prediction with probabilities and risk factors
+        Prediction with probabilities, risk factors and prediction_id
     """
-    if not predictor:
+    patient_dict = validate_patients([patient])[0]
+    if not raw_predictor:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
+    # A/B trafiği cache'lenmez: her istek varyant metriklerine yazılmalı
+    routed = routing_active()
+    cache_key = None
+    if response_cache is not None and not routed:
+        # Model değiştiyse (hot-swap) bellek katmanı boşaltılır; anahtar sürümü içerir
+        version = served_model_version()
+        response_cache.ensure_version(version)
+        cache_key = payload_key(patient_dict, version)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            response.headers["X-Cache"] = "HIT"
+            prediction_id, = log_served(background_tasks, [patient_dict], [cached])
+            return dict(cached, timestamp=datetime.now().isoformat(), prediction_id=prediction_id)
+    
     try:
-        # Convert to dictionary
-        patient_dict = patient.to_dict()
         
         # Get prediction with details
-        result = predictor.predict_with_details(patient_dict)
+        if routed:
+            result, = routed_results([patient_dict], None if patient_id is None else [patient_id])
+        else:
+            started = time.perf_counter()
+            result = raw_predictor.predict_with_risk_factors(patient_dict)
+            submit_shadow(patient_dict, result, time.perf_counter() - started)
         
         # Generate recommendations based on risk factors
         recommendations = generate_recommendations(result['risk_factors'], result['prediction'])
         
-        return {
+        body = {
             "prediction": result['prediction'],
             "confidence": result['confidence'],
             "probabilities": result['probabilities'],
@@ -225,56 +401,412 @@ async def predict(patient: PatientData):
             "timestamp": datetime.now().isoformat(),
             "recommendations": recommendations
         }
+        if routed:
+            body.update(variant=result["variant"], model_version=result["model_version"])
+        if cache_key is not None:
+            response_cache.put(cache_key, body)
+            response.headers["X-Cache"] = "MISS"
+        # Kimlik cache'e yazılmaz: her sunulan tahmin ayrı kaydedilir
+        prediction_id, = log_served(background_tasks, [patient_dict], [body])
+        return dict(body, prediction_id=prediction_id)
         
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
-@app.post("/predict/batch")
-async def batch_predict(request: BatchPredictionRequest):
+BINARY_BODY_SCHEMA = {"type": "string", "format": "binary"}
+
+@app.post("/predict/batch", openapi_extra={
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"$ref": "#/components/schemas/BatchPredictionRequest"}},
+            **{media_type: {"schema": BINARY_BODY_SCHEMA} for media_type in BINARY_MEDIA_TYPES},
+        },
+    }
+})
+async def batch_predict(
+    http_request: Request,
+    background_tasks: BackgroundTasks,
+    format: Literal["records", "columnar"] = "records",
+    recommendations: Literal["text", "codes"] = "text",
+):
     """
     Batch prediction for multiple patients
     
+    JSON bodies are BatchPredictionRequest. Arrow IPC streams and packed uint8
+    matrices (FEATURE_RANGES column order) are scored in one vectorized pass
+    and answered in the same binary format. JSON predictions are logged and
+    carry a prediction_id; binary batches are not logged. With several
+    ROUTING_CONFIG variants JSON batches are A/B routed (patient_ids keep
+    each patient on one variant).
+    
     Args:
-        request: List of patient data
+        http_request: JSON or binary body (see Content-Type)
+        background_tasks: Prediction log write (after the response)
+        format: "records" (one object per patient) or "columnar" (one list per field)
+        recommendations: "text" (full strings) or "codes" (keys into recommendation_catalog)
         
     Returns:
         List of predictions
     """
-    if not predictor:
+    body = await http_request.body()
+    media_type = http_request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type in BINARY_MEDIA_TYPES:
+        return binary_batch_predict(body, media_type)
+    
+    try:
+        request = BatchPredictionRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    
+    records = validate_patients(request.patients)
+    if not raw_predictor:
         raise HTTPException(status_code=503, detail="Model not loaded")
+    if request.patient_ids is not None and len(request.patient_ids) != len(records):
+        raise HTTPException(status_code=422, detail="patient_ids must have one id per patient")
     
     try:
         results = []
         
-        for patient in request.patients:
-            patient_dict = patient.to_dict()
-            result = predictor.predict_with_details(patient_dict)
-            recommendations = generate_recommendations(result['risk_factors'], result['prediction'])
-            
-            results.append({
-                "prediction": result['prediction'],
-                "confidence": result['confidence'],
-                "probabilities": result['probabilities'],
-                "risk_factors": result['risk_factors'],
-                "overall_risk_score": result['overall_risk_score'],
-                "recommendations": recommendations
-            })
+        if routing_active():
+            for result in routed_results(records, request.patient_ids):
+                item = format_batch_item(result, codes=recommendations == "codes")
+                results.append(dict(item, variant=result["variant"], model_version=result["model_version"]))
+        else:
+            for patient_dict in records:
+                started = time.perf_counter()
+                result = raw_predictor.predict_with_risk_factors(patient_dict)
+                submit_shadow(patient_dict, result, time.perf_counter() - started)
+                results.append(format_batch_item(result, codes=recommendations == "codes"))
         
-        return {
-            "predictions": results,
-            "count": len(results),
-            "timestamp": datetime.now().isoformat()
-        }
+        for item, prediction_id in zip(results, log_served(background_tasks, records, results)):
+            item["prediction_id"] = prediction_id
+        return batch_response(results, format, recommendations)
         
     except Exception as e:
         logger.error(f"Batch prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
 
+def binary_batch_predict(body: bytes, media_type: str) -> Response:
+    """
+    Score a binary columnar batch (Arrow IPC or packed uint8 matrix)
+    
+    Args:
+        body: Request bytes
+        media_type: One of BINARY_MEDIA_TYPES
+        
+    Returns:
+        Probabilities in the request's format; class order in the X-Classes header
+    """
+    try:
+        features = decode_batch(body, media_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    result = validate_records(features)
+    if not result.ok:
+        raise HTTPException(status_code=422, detail=result.to_records())
+    if not raw_predictor:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    try:
+        scored = raw_predictor.predict_batch(features)
+    except Exception as e:
+        logger.error(f"Binary batch prediction error: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+    
+    return Response(
+        content=encode_batch(scored, media_type),
+        media_type=media_type,
+        headers={"X-Classes": ",".join(map(str, raw_predictor.model.classes_))}
+    )
+
+def format_batch_item(result: Dict, codes: bool = False) -> Dict:
+    """One /predict/batch entry from a predict_with_risk_factors result"""
+    recommendation_codes = generate_recommendation_codes(result['risk_factors'], result['prediction'])
+    return {
+        "prediction": result['prediction'],
+        "confidence": result['confidence'],
+        "probabilities": result['probabilities'],
+        "risk_factors": result['risk_factors'],
+        "overall_risk_score": result['overall_risk_score'],
+        "recommendations": recommendation_codes if codes else [RECOMMENDATIONS[c] for c in recommendation_codes]
+    }
+
+def batch_response(results: List[Dict], format: str = "records", recommendations: str = "text") -> Dict:
+    """
+    /predict/batch body in the requested layout
+    
+    Args:
+        results: format_batch_item outputs
+        format: "records" or "columnar"
+        recommendations: "text" or "codes" (adds recommendation_catalog)
+        
+    Returns:
+        Response body
+    """
+    body = {
+        "predictions": to_columnar(results, nested=("probabilities", "risk_factors")) if format == "columnar" else results,
+        "count": len(results),
+        "timestamp": datetime.now().isoformat()
+    }
+    if recommendations == "codes":
+        body["recommendation_catalog"] = RECOMMENDATIONS
+    return body
+
+async def render_report_async(patient_dict: Dict) -> bytes:
+    """
+    Predict and render one PDF report in the worker pool (content-hash cached)
+    
+    Args:
+        patient_dict: Raw patient inputs
+        
+    Returns:
+        PDF bytes
+    """
+    result = raw_predictor.predict_with_details(patient_dict)
+    cache = get_report_cache()
+    key = report_key(result, patient_dict)
+    pdf = cache.get('report', key)
+    if pdf is None:
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(get_report_pool(), render_pdf, result, patient_dict)
+        cache.put('report', key, pdf)
+    return pdf
+
+@app.post("/report")
+async def report(patient: PatientData):
+    """
+    PDF risk report for a patient
+    
+    Args:
+        patient: Patient data
+        
+    Returns:
+        application/pdf
+    """
+    patient_dict = validate_patients([patient])[0]
+    if not raw_predictor:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    try:
+        pdf = await render_report_async(patient_dict)
+    except Exception as e:
+        logger.error(f"Report error: {e}")
+        raise HTTPException(status_code=500, detail=f"Report failed: {str(e)}")
+    
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": "attachment; filename=lung_cancer_risk_report.pdf"}
+    )
+
+@app.post("/report/batch")
+async def batch_report(request: BatchPredictionRequest):
+    """
+    PDF reports for a cohort, rendered concurrently across worker processes
+    
+    Args:
+        request: List of patient data
+        
+    Returns:
+        application/zip with one PDF per patient (report_0001.pdf, ...)
+    """
+    records = validate_patients(request.patients)
+    if not raw_predictor:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    try:
+        pdfs = await asyncio.gather(*(render_report_async(record) for record in records))
+    except Exception as e:
+        logger.error(f"Batch report error: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch report failed: {str(e)}")
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for i, pdf in enumerate(pdfs, start=1):
+            archive.writestr(f"report_{i:04d}.pdf", pdf)
+    
+    return Response(
+        content=buffer.getvalue(),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=risk_reports.zip"}
+    )
+
+@app.post("/explain")
+async def explain(patient: PatientData):
+    """
+    Exact TreeSHAP explanation for a patient
+    
+    Args:
+        patient: Patient data
+        
+    Returns:
+        Prediction, per-class feature contributions (sum + expected_value = probability),
+        top features for the predicted class, cache flag and latency
+    """
+    patient_dict = validate_patients([patient])[0]
+    if not explanation_service:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    hits = explanation_service.hits
+    start = time.perf_counter()
+    result = explanation_service.explain(patient_dict)
+    latency_ms = (time.perf_counter() - start) * 1000
+    cached = explanation_service.hits > hits
+    
+    if not cached and latency_ms > EXPLAIN_CONFIG['latency_target_ms']:
+        logger.warning(f"⚠️ /explain took {latency_ms:.1f} ms (target {EXPLAIN_CONFIG['latency_target_ms']} ms)")
+    
+    return dict(result, cached=cached, latency_ms=latency_ms)
+
+@app.post("/explain/batch")
+async def batch_explain(request: BatchPredictionRequest):
+    """
+    TreeSHAP explanations for many patients (cache misses computed in one vectorized pass)
+    
+    Args:
+        request: List of patient data
+        
+    Returns:
+        Explanations in input order and total latency
+    """
+    records = validate_patients(request.patients)
+    if not explanation_service:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    start = time.perf_counter()
+    explanations = explanation_service.explain_batch(pd.DataFrame(records)) if records else []
+    latency_ms = (time.perf_counter() - start) * 1000
+    
+    if records and latency_ms / len(records) > EXPLAIN_CONFIG['latency_target_ms']:
+        logger.warning(f"⚠️ /explain/batch took {latency_ms / len(records):.1f} ms per patient")
+    
+    return {
+        "explanations": explanations,
+        "count": len(explanations),
+        "latency_ms": latency_ms
+    }
+
+@app.get("/model/importance")
+async def model_importance():
+    """Permutation importance of the raw features (accuracy drop when shuffled)"""
+    if not interpretation_tables:
+        raise HTTPException(status_code=503, detail="Interpretation tables not built")
+    
+    return {
+        "importance": interpretation_tables.importance.to_dict(orient="records"),
+        "classes": interpretation_tables.classes
+    }
+
+@app.post("/risk/effects")
+async def risk_effects(patient: PatientData, label: str = "High"):
+    """
+    Per-feature shift in P(label) for a patient, read from partial-dependence tables
+    
+    Args:
+        patient: Patient data
+        label: Risk level whose probability is read
+        
+    Returns:
+        Effects sorted from most risk-raising to most protective
+    """
+    patient_dict = validate_patients([patient])[0]
+    if not interpretation_tables:
+        raise HTTPException(status_code=503, detail="Interpretation tables not built")
+    if label not in interpretation_tables.classes:
+        raise HTTPException(status_code=422, detail=f"Unknown label: {label}")
+    
+    effects = interpretation_tables.effects(patient_dict, label)
+    return {
+        "label": label,
+        "effects": [
+            {"feature": name, "value": patient_dict[name], "effect": effect}
+            for name, effect in sorted(effects.items(), key=lambda item: item[1], reverse=True)
+        ]
+    }
+
+@app.get("/shadow/metrics")
+async def shadow_metrics():
+    """Primary vs. shadow model comparison (agreement, probability deltas, latency)"""
+    if not shadow_evaluator:
+        raise HTTPException(status_code=404, detail="Shadow model not enabled (set SHADOW_MODEL_PATH)")
+    return shadow_evaluator.metrics()
+
+@app.post("/ab/predict")
+async def routed_predict(patient: PatientData, patient_id: Optional[str] = None, variant: Optional[str] = None):
+    """
+    Score one patient with the variant chosen by the router
+    
+    Args:
+        patient: Patient data
+        patient_id: Stable id (hash routing: the same patient always sees the same variant)
+        variant: Force a variant (e.g. for comparisons)
+        
+    Returns:
+        variant, model_version, prediction, confidence, probabilities
+    """
+    patient_dict = validate_patients([patient])[0]
+    if not model_router:
+        raise HTTPException(status_code=503, detail="Model router not loaded")
+    if variant is not None and variant not in model_router.variants:
+        raise HTTPException(status_code=422, detail=f"Unknown variant: {variant}")
+    result = model_router.predict(patient_dict, patient_id, variant)
+    result["timestamp"] = datetime.now().isoformat()
+    return result
+
+@app.post("/ab/predict/batch")
+async def routed_batch_predict(request: RoutedBatchRequest, format: Literal["records", "columnar"] = "records"):
+    """Score many patients through the router (features computed once for all variants)"""
+    records = validate_patients(request.patients)
+    if not model_router:
+        raise HTTPException(status_code=503, detail="Model router not loaded")
+    if request.patient_ids is not None and len(request.patient_ids) != len(records):
+        raise HTTPException(status_code=422, detail="patient_ids must have one id per patient")
+    
+    results = []
+    if records:
+        scored = model_router.predict_batch(pd.DataFrame(records), request.patient_ids)
+        results = scored.to_dict(orient="records")
+    return to_columnar(results) if format == "columnar" else results
+
+@app.post("/ab/outcome")
+async def routed_outcome(outcome: OutcomeRequest):
+    """Attach a confirmed diagnosis to the patient's last routed prediction"""
+    if not model_router:
+        raise HTTPException(status_code=503, detail="Model router not loaded")
+    variant = model_router.record_outcome(outcome.patient_id, outcome.label)
+    if variant is None:
+        raise HTTPException(status_code=404, detail=f"No recent routed prediction for {outcome.patient_id}")
+    return {"patient_id": outcome.patient_id, "variant": variant}
+
+@app.get("/ab/metrics")
+async def routed_metrics():
+    """Per-variant traffic, latency, confidence and accuracy"""
+    if not model_router:
+        raise HTTPException(status_code=503, detail="Model router not loaded")
+    return model_router.metrics()
+
+@app.post("/feedback")
+async def prediction_feedback(feedback: FeedbackRequest):
+    """Attach a confirmed diagnosis to a logged prediction (used by incremental retraining)"""
+    try:
+        return attach_label(feedback.prediction_id, feedback.label)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No logged prediction with id {feedback.prediction_id}")
+
+@app.get("/cache/metrics")
+async def cache_metrics():
+    """Response cache hit ratio, evictions, expirations and invalidations"""
+    if response_cache is None:
+        raise HTTPException(status_code=404, detail="Response cache disabled")
+    return response_cache.metrics()
+
 @app.get("/model/info")
 async def model_info():
     """Get model information"""
-    if not predictor:
+    if not raw_predictor:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
     return {
@@ -323,49 +855,82 @@ async def risk_factors_info():
 # UTILITY FUNCTIONS
 # =============================================================================
 
-def generate_recommendations(risk_factors: Dict[str, float], prediction: str) -> List[str]:
+def submit_shadow(patient_dict: Dict, result: Dict, latency: float):
+    """Offer a served prediction to the shadow model (non-blocking, sampled)"""
+    if shadow_evaluator is not None:
+        shadow_evaluator.submit(patient_dict, result['prediction'], result['probabilities'], latency)
+
+# Öneri metinleri sabit kodlarla tutulur; toplu yanıtlarda metin yerine kod gönderilebilir
+RECOMMENDATIONS = {
+    "high_risk": "🚨 Seek immediate medical consultation for comprehensive cancer screening",
+    "medium_risk": "⚠️ Schedule a medical check-up within the next month",
+    "low_risk": "✅ Maintain regular health check-ups and healthy lifestyle",
+    "smoking_cessation": "🚭 Consider smoking cessation programs and reduce alcohol consumption",
+    "exercise_diet": "🏃 Adopt regular exercise routine and balanced diet",
+    "pollutant_exposure": "🏭 Minimize exposure to pollutants and use protective equipment at work",
+    "air_purifier": "🏠 Consider air purifiers for indoor air quality",
+    "document_symptoms": "🩺 Document all symptoms and discuss with healthcare provider",
+    "critical_symptoms": "🚑 Critical symptoms detected - seek immediate medical attention",
+    "follow_treatment": "💊 Follow prescribed medications and treatment plans",
+    "monitor_symptoms": "📊 Monitor symptoms regularly and keep health records",
+}
+
+def generate_recommendation_codes(risk_factors: Dict[str, float], prediction: str) -> List[str]:
     """
-    Generate personalized recommendations based on risk factors
+    Recommendation codes (keys of RECOMMENDATIONS) based on risk factors
     
     Args:
         risk_factors: Dictionary of risk factor scores
         prediction: Predicted risk level
         
     Returns:
-        List of recommendations
+        List of recommendation codes
     """
-    recommendations = []
+    codes = []
     
     # General recommendation based on risk level
     if prediction == "High":
-        recommendations.append("🚨 Seek immediate medical consultation for comprehensive cancer screening")
+        codes.append("high_risk")
     elif prediction == "Medium":
-        recommendations.append("⚠️ Schedule a medical check-up within the next month")
+        codes.append("medium_risk")
     else:
-        recommendations.append("✅ Maintain regular health check-ups and healthy lifestyle")
+        codes.append("low_risk")
     
     # Lifestyle recommendations
     if risk_factors['Lifestyle Risk'] > 6:
-        recommendations.append("🚭 Consider smoking cessation programs and reduce alcohol consumption")
-        recommendations.append("🏃 Adopt regular exercise routine and balanced diet")
+        codes.append("smoking_cessation")
+        codes.append("exercise_diet")
     
     # Environmental recommendations
     if risk_factors['Environmental Risk'] > 6:
-        recommendations.append("🏭 Minimize exposure to pollutants and use protective equipment at work")
-        recommendations.append("🏠 Consider air purifiers for indoor air quality")
+        codes.append("pollutant_exposure")
+        codes.append("air_purifier")
     
     # Symptom-based recommendations
     if risk_factors['Symptom Severity'] > 6:
-        recommendations.append("🩺 Document all symptoms and discuss with healthcare provider")
+        codes.append("document_symptoms")
     
     if risk_factors['Critical Symptoms'] >= 2:
-        recommendations.append("🚑 Critical symptoms detected - seek immediate medical attention")
+        codes.append("critical_symptoms")
     
     # General health recommendations
-    recommendations.append("💊 Follow prescribed medications and treatment plans")
-    recommendations.append("📊 Monitor symptoms regularly and keep health records")
+    codes.append("follow_treatment")
+    codes.append("monitor_symptoms")
     
-    return recommendations
+    return codes
+
+def generate_recommendations(risk_factors: Dict[str, float], prediction: str) -> List[str]:
+    """
+    Generate personalized recommendations based on risk factors
+    
+    Args:
+        risk_factors: Dictionary of risk factor scores
+        prediction: Predicted risk level
+        
+    Returns:
+        List of recommendations
+    """
+    return [RECOMMENDATIONS[code] for code in generate_recommendation_codes(risk_factors, prediction)]
 
 # =============================================================================
 # RUN SERVER
@@ -0,0 +1,373 @@
+"""
+Artifact Bundle - Versioned Model Bundle with Checksums
+=======================================================
+models/ dizini tek bir paket (bundle) olarak ele alınır; manifest.json şunları tutar:
+
+- Her dosyanın SHA-256 checksum'ı ve boyutu; paket sürümü (version) bu checksum'ların hash'i
+- Feature sırası (final_features.txt) ve sınıf sırası (model.classes_)
+- Eğitim metadata'sı: veri hash'i, satır sayıları, parametreler, metrikler, kütüphane sürümleri
+
+load_bundle():
+- Skorlama için gereken dosyaları (model, scaler, feature listesi) checksum ile doğrular,
+  model/scaler/feature uyumsuzluğunda ValueError verir (yanlış scaler ile skorlama yapılmaz)
+- Doğrulanmış paketi (dosya boyutu, mtime) parmak izi ile bellekte tutar; dosyalar
+  değişmedikçe tekrar yükleme hash ve unpickle maliyeti ödemez
+
+Eski (manifest'siz) model dizinleri için: python artifacts.py --write
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import sklearn
+
+from config import BUNDLE_MANIFEST_PATH, MODEL_DIR
+from stage_cache import file_digest
+
+BUNDLE_FORMAT = 'lung-cancer-risk-bundle'
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = Path(BUNDLE_MANIFEST_PATH).name
+
+# Pipeline'ın yazabileceği yan ürünler (varsa manifest'e eklenir, skorlama için zorunlu değil)
+OPTIONAL_FILES = [
+    'model_results.json', 'feature_importance.csv', 'compact_model.pkl', 'compaction_report.csv',
+    'interpretation.pkl', 'permutation_importance.csv', 'partial_dependence.csv',
+    'partial_dependence_2d.csv', 'quantized_model.npz',
+]
+
+# (dizin, model dosyası) -> (parmak izi, ArtifactBundle)
+_bundle_cache = {}
+
+
+# =============================================================================
+# CONSISTENCY
+# =============================================================================
+
+def check_consistency(model, scaler, feature_names, classes=None):
+    """
+    Raise ValueError if model, scaler and feature list do not belong together
+
+    Args:
+        model: Fitted classifier
+        scaler: Fitted scaler
+        feature_names: Model input order
+        classes: Expected class order (default: not checked)
+    """
+    feature_names = list(feature_names)
+    scaler_names = getattr(scaler, 'feature_names_in_', None)
+    if scaler_names is not None and list(scaler_names) != feature_names:
+        raise ValueError("Scaler was fitted on a different feature list/order than final_features.txt")
+    for name, obj in (('Scaler', scaler), ('Model', model)):
+        n_features = getattr(obj, 'n_features_in_', len(feature_names))
+        if n_features != len(feature_names):
+            raise ValueError(f"{name} expects {n_features} features, feature list has {len(feature_names)}")
+    if classes is not None and [str(c) for c in model.classes_] != [str(c) for c in classes]:
+        raise ValueError(f"Model classes {list(model.classes_)} differ from manifest classes {list(classes)}")
+
+
+def _jsonable(value):
+    """Plain JSON value (numpy scalars -> Python, others -> str)"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    return str(value)
+
+
+def training_metadata(model, **extra):
+    """
+    Reproducibility metadata for a trained model
+
+    Args:
+        model: Fitted estimator
+        **extra: Additional fields (data hash, row counts, metrics, ...)
+
+    Returns:
+        dict: Model class/params, library versions and extra fields
+    """
+    metadata = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'model_class': type(model).__name__,
+        'model_params': _jsonable(model.get_params()) if hasattr(model, 'get_params') else {},
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+    }
+    metadata.update(_jsonable(extra))
+    return metadata
+
+
+# =============================================================================
+# MANIFEST
+# =============================================================================
+
+def _bundle_version(files):
+    """Short content id of the bundle (hash of the file checksums)"""
+    h = hashlib.sha256()
+    for name in sorted(files):
+        h.update(f"{name}:{files[name]['sha256']}\n".encode())
+    return h.hexdigest()[:12]
+
+
+def _file_entry(path):
+    return {'sha256': file_digest(path), 'bytes': Path(path).stat().st_size}
+
+
+def _write_json_atomic(data, path):
+    """Write JSON next to path, then replace it"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_name, path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+
+
+def read_manifest(directory=MODEL_DIR):
+    """Manifest of a bundle directory (None if there is none)"""
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != BUNDLE_FORMAT or manifest.get('format_version', 0) > BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle manifest: {manifest.get('format')} "
+                        f"v{manifest.get('format_version')} (expected {BUNDLE_FORMAT} <= v{BUNDLE_FORMAT_VERSION})")
+    return manifest
+
+
+def write_manifest(directory, model, scaler, feature_names, files=None, training=None,
+                model_file='final_model.pkl', scaler_file='final_scaler.pkl',
+                features_file='final_features.txt'):
+    """
+    Checksum the saved artifacts and write manifest.json
+
+    Args:
+        directory: Bundle directory (files already written)
+        model, scaler, feature_names: The objects that were saved (consistency check)
+        files: Extra file names to include (default: OPTIONAL_FILES that exist)
+        training: Training metadata (see training_metadata)
+        model_file, scaler_file, features_file: Core file names
+
+    Returns:
+        dict: The manifest
+    """
+    directory = Path(directory)
+    check_consistency(model, scaler, feature_names)
+    if files is None:
+        files = [name for name in OPTIONAL_FILES if (directory / name).exists()]
+    names = [model_file, scaler_file, features_file] + [name for name in files if name not in
+                                                        (model_file, scaler_file, features_file)]
+    entries = {name: _file_entry(directory / name) for name in names}
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'version': _bundle_version(entries),
+        'model': model_file,
+        'scaler': scaler_file,
+        'features': features_file,
+        'feature_names': list(feature_names),
+        'classes': [str(c) for c in model.classes_],
+        'files': entries,
+        'training': training or training_metadata(model),
+    }
+    _write_json_atomic(manifest, directory / MANIFEST_NAME)
+    return manifest
+
+
+def refresh_manifest(directory, names, **updates):
+    """
+    Re-checksum files that were replaced in place (e.g. incremental retraining)
+
+    Args:
+        directory: Bundle directory
+        names: File names that changed (must already be in the manifest)
+        **updates: Fields merged into manifest['training']
+
+    Returns:
+        dict: Updated manifest (None if the directory has no manifest)
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    for name in names:
+        if name not in manifest['files']:
+            raise ValueError(f"{name} is not part of the bundle in {directory}")
+        manifest['files'][name] = _file_entry(directory / name)
+    manifest['version'] = _bundle_version(manifest['files'])
+    manifest['training'].update(_jsonable(updates))
+    _write_json_atomic(manifest, directory / MANIFEST_NAME)
+    return manifest
+
+
+def verify_bundle(directory=MODEL_DIR):
+    """
+    Checksum status of every file in the manifest
+
+    Returns:
+        dict: {file name: 'ok' | 'modified' | 'missing'} (None if there is no manifest)
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    status = {}
+    for name, entry in manifest['files'].items():
+        path = directory / name
+        if not path.exists():
+            status[name] = 'missing'
+        else:
+            status[name] = 'ok' if file_digest(path) == entry['sha256'] else 'modified'
+    return status
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+class ArtifactBundle:
+    """Validated model, scaler and feature list of one bundle"""
+
+    def __init__(self, directory, manifest, model, scaler, feature_names, model_file):
+        self.directory = Path(directory)
+        self.manifest = manifest
+        self.model = model
+        self.scaler = scaler
+        self.feature_names = feature_names
+        self.model_file = model_file
+
+    @property
+    def version(self):
+        """Bundle content id (plus the model file if it is not the primary model)"""
+        if self.model_file == self.manifest['model']:
+            return self.manifest['version']
+        return f"{self.manifest['version']}:{self.model_file}"
+
+    @property
+    def classes(self):
+        return list(self.manifest['classes'])
+
+
+def _fingerprint(directory, names):
+    """(name, size, mtime) of the manifest and the given files (None if one is missing)"""
+    fingerprint = []
+    for name in [MANIFEST_NAME] + list(names):
+        try:
+            stat = (directory / name).stat()
+        except FileNotFoundError:
+            return None
+        fingerprint.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+def load_bundle(directory=MODEL_DIR, model_file=None):
+    """
+    Load and validate a bundle (cached while its files are unchanged)
+
+    Args:
+        directory: Bundle directory
+        model_file: Model file inside the bundle (default: manifest['model'];
+            e.g. 'compact_model.pkl')
+
+    Returns:
+        ArtifactBundle: None if the directory has no manifest
+
+    Raises:
+        ValueError: Missing/modified files or mismatched model, scaler and features
+    """
+    directory = Path(directory).resolve()
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    model_file = model_file or manifest['model']
+    required = [model_file, manifest['scaler'], manifest['features']]
+
+    cache_key = (str(directory), model_file)
+    fingerprint = _fingerprint(directory, required)
+    cached = _bundle_cache.get(cache_key)
+    if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    for name in required:
+        entry = manifest['files'].get(name)
+        if entry is None:
+            raise ValueError(f"{name} is not part of the bundle in {directory}")
+        path = directory / name
+        if not path.exists():
+            raise ValueError(f"Bundle file missing: {path}")
+        if file_digest(path) != entry['sha256']:
+            raise ValueError(f"Checksum mismatch for {path} (modified after the manifest was written)")
+
+    model = joblib.load(directory / model_file)
+    scaler = joblib.load(directory / manifest['scaler'])
+    with open(directory / manifest['features']) as f:
+        feature_names = [line.strip() for line in f if line.strip()]
+    if feature_names != manifest['feature_names']:
+        raise ValueError("final_features.txt differs from the manifest feature order")
+    check_consistency(model, scaler, feature_names, manifest['classes'])
+
+    bundle = ArtifactBundle(directory, manifest, model, scaler, feature_names, model_file)
+    _bundle_cache[cache_key] = (fingerprint, bundle)
+    return bundle
+
+
+def clear_cache():
+    """Forget every loaded bundle"""
+    _bundle_cache.clear()
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    """Verify a bundle, or write a manifest for existing loose artifacts"""
+    parser = argparse.ArgumentParser(description="Model artifact bundle")
+    parser.add_argument('--dir', type=Path, default=MODEL_DIR, help="Bundle directory")
+    parser.add_argument('--write', action='store_true',
+                        help="Checksum the existing artifacts and (re)write manifest.json")
+    args = parser.parse_args()
+    directory = args.dir
+
+    if args.write:
+        model = joblib.load(directory / 'final_model.pkl')
+        scaler = joblib.load(directory / 'final_scaler.pkl')
+        with open(directory / 'final_features.txt') as f:
+            feature_names = [line.strip() for line in f if line.strip()]
+        previous = read_manifest(directory)
+        training = previous['training'] if previous else training_metadata(
+            model, source='migrated from loose artifacts (original training data not recorded)')
+        manifest = write_manifest(directory, model, scaler, feature_names, training=training)
+        print(f"✅ Manifest written: {directory / MANIFEST_NAME} (version {manifest['version']}, "
+            f"{len(manifest['files'])} files)")
+
+    status = verify_bundle(directory)
+    if status is None:
+        print(f"❌ No manifest in {directory} (run with --write)")
+        return
+    for name, state in status.items():
+        print(f"   {'✅' if state == 'ok' else '❌'} {name}: {state}")
+    bundle = load_bundle(directory)
+    print(f"\n✅ Bundle {bundle.version} valid: {type(bundle.model).__name__}, "
+        f"{len(bundle.feature_names)} features, classes {bundle.classes}")
+
+
+if __name__ == '__main__':
+    main()
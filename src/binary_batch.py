@@ -0,0 +1,109 @@
+"""
+Binary Batch Codec - Columnar Request/Response Bodies
+=====================================================
+Yüksek hacimli istemciler (EHR) için /predict/batch'in JSON dışı gövde formatları.
+
+- Arrow IPC stream (application/vnd.apache.arrow.stream): RAW_FEATURES kolonları;
+  yanıt prediction, confidence ve prob_<sınıf> kolonlarıyla yine Arrow
+- Paketlenmiş uint8 matris (application/x-uint8-matrix): satır başına
+  len(FEATURE_RANGES) byte, FEATURE_RANGES kolon sırasıyla; gövde kopyalanmadan
+  (np.frombuffer) skor matrisine dönüşür. Yanıt: float32 (little-endian)
+  olasılık matrisi, sınıf sırası X-Classes başlığında
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import FEATURE_RANGES
+
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+MATRIX_MEDIA_TYPE = 'application/x-uint8-matrix'
+BINARY_MEDIA_TYPES = (ARROW_MEDIA_TYPE, MATRIX_MEDIA_TYPE)
+
+MATRIX_COLUMNS = list(FEATURE_RANGES)  # Tüm aralıklar uint8'e sığar (Age <= 100)
+
+
+# =============================================================================
+# DECODING
+# =============================================================================
+
+def decode_matrix(body):
+    """
+    Packed uint8 rows -> DataFrame view over the request bytes
+
+    Args:
+        body: bytes, len(FEATURE_RANGES) bytes per patient
+
+    Returns:
+        pd.DataFrame: MATRIX_COLUMNS, uint8 (shares memory with body)
+
+    Raises:
+        ValueError: If the body length is not a whole number of rows
+    """
+    width = len(MATRIX_COLUMNS)
+    if len(body) % width:
+        raise ValueError(f"Body length {len(body)} is not a multiple of {width} (one byte per feature)")
+    matrix = np.frombuffer(body, dtype=np.uint8).reshape(-1, width)
+    return pd.DataFrame(matrix, columns=MATRIX_COLUMNS, copy=False)
+
+
+def decode_arrow(body):
+    """
+    Arrow IPC stream -> DataFrame
+
+    Raises:
+        ValueError: If the stream is unreadable or feature columns are missing
+    """
+    import pyarrow as pa
+
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except pa.ArrowInvalid as e:
+        raise ValueError(f"Invalid Arrow IPC stream: {e}")
+    missing = [name for name in MATRIX_COLUMNS if name not in table.column_names]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return table.select(MATRIX_COLUMNS).to_pandas()
+
+
+def decode_batch(body, media_type):
+    """Decode a binary /predict/batch body into raw features"""
+    if media_type == ARROW_MEDIA_TYPE:
+        return decode_arrow(body)
+    if media_type == MATRIX_MEDIA_TYPE:
+        return decode_matrix(body)
+    raise ValueError(f"Unsupported media type: {media_type}")
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+
+def probability_columns(result):
+    """prob_<class> columns of a predict_batch result, in model class order"""
+    return [column for column in result.columns if column.startswith('prob_')]
+
+
+def encode_matrix(result):
+    """predict_batch result -> float32 probability matrix bytes (row-major)"""
+    return np.ascontiguousarray(result[probability_columns(result)].to_numpy(), dtype='<f4').tobytes()
+
+
+def encode_arrow(result):
+    """predict_batch result -> Arrow IPC stream bytes"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(result, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_batch(result, media_type):
+    """Encode a predict_batch result in the request's format"""
+    if media_type == ARROW_MEDIA_TYPE:
+        return encode_arrow(result)
+    if media_type == MATRIX_MEDIA_TYPE:
+        return encode_matrix(result)
+    raise ValueError(f"Unsupported media type: {media_type}")
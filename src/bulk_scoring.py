@@ -0,0 +1,155 @@
+"""
+Bulk Scoring - Chunked CSV Scoring
+==================================
+Ham şemadaki (RAW_FEATURES) büyük CSV dosyalarını parça parça (chunk) doğrular ve skorlar.
+
+- Bellek sınırlı: dosya `chunksize` satırlık parçalarla okunur, sonuçlar her
+  parçadan sonra diske (CSV veya Parquet) yazılır
+- Doğrulama vektörel: her parça validation.FEATURE_VALIDATOR ile tek seferde kontrol edilir
+- Geçersiz satırlar skorlanmaz, (satır, kolon, değer, sebep) olarak raporlanır
+"""
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from config import BULK_SCORING_CONFIG
+from data_loader import ID_COLUMN
+from feature_store import count_rows
+from features import RAW_FEATURES
+from validation import FEATURE_VALIDATOR, ERROR_COLUMNS
+
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+
+def validate_chunk(chunk, row_offset=0):
+    """
+    Check one chunk against FEATURE_RANGES
+
+    Args:
+        chunk: DataFrame with RAW_FEATURES columns (any dtype)
+        row_offset: Row number of the chunk's first row in the file
+
+    Returns:
+        tuple: (valid row mask, errors DataFrame with row/column/value/reason)
+    """
+    result = FEATURE_VALIDATOR.validate(chunk, row_offset)
+    return result.valid, result.errors
+
+
+def check_columns(path_or_buffer):
+    """
+    Missing RAW_FEATURES columns in a CSV header
+
+    Returns:
+        list: Missing column names (empty if the schema matches)
+    """
+    header = pd.read_csv(path_or_buffer, nrows=0).columns
+    if hasattr(path_or_buffer, 'seek'):
+        path_or_buffer.seek(0)
+    return [name for name in RAW_FEATURES if name not in header]
+
+
+class _ResultWriter:
+    """Append scored chunks to a CSV or Parquet file"""
+
+    def __init__(self, path, output_format):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format} (expected one of {OUTPUT_FORMATS})")
+        self.path = path
+        self.output_format = output_format
+        self._parquet = None
+        self._first = True
+
+    def write(self, df):
+        if self.output_format == 'csv':
+            df.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_csv(path_or_buffer, predictor, output_path=None, output_format='csv',
+            chunksize=None, on_progress=None, max_error_rows=None):
+    """
+    Validate and score a raw-schema CSV chunk by chunk
+
+    Args:
+        path_or_buffer: CSV path or binary file object (e.g. a Streamlit upload)
+        predictor: Object with predict_batch(df) (LungCancerPredictor)
+        output_path: Result file (default: temporary file)
+        output_format: 'csv' or 'parquet'
+        chunksize: Rows per chunk (default: BULK_SCORING_CONFIG['chunksize'])
+        on_progress: Callable(rows_done, total_rows) called after each chunk
+        max_error_rows: Keep at most this many error rows (default: from config)
+
+    Returns:
+        dict: output_path, n_rows, n_scored, n_invalid, prediction_counts, errors (DataFrame)
+
+    Raises:
+        ValueError: If required columns are missing
+    """
+    chunksize = chunksize or BULK_SCORING_CONFIG['chunksize']
+    max_error_rows = max_error_rows or BULK_SCORING_CONFIG['max_error_rows']
+
+    missing = check_columns(path_or_buffer)
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    total = count_rows(path_or_buffer)
+    if output_path is None:
+        output_path = tempfile.NamedTemporaryFile(suffix=f".{output_format}", delete=False).name
+    writer = _ResultWriter(output_path, output_format)
+
+    errors = []
+    n_errors_kept = 0
+    n_rows = n_scored = n_invalid = 0
+    counts = {}
+
+    usecols = lambda column: column in RAW_FEATURES or column == ID_COLUMN
+    try:
+        for chunk in pd.read_csv(path_or_buffer, chunksize=chunksize, usecols=usecols, dtype=str):
+            valid, chunk_errors = validate_chunk(chunk, row_offset=n_rows)
+            if n_errors_kept < max_error_rows and len(chunk_errors):
+                chunk_errors = chunk_errors.head(max_error_rows - n_errors_kept)
+                errors.append(chunk_errors)
+                n_errors_kept += len(chunk_errors)
+
+            scored = chunk[valid]
+            if len(scored):
+                # Metin olarak okunur: '33.0' gibi tam sayı değerli float'lar geçerlidir, önce sayıya çevrilir
+                features = scored[RAW_FEATURES].apply(pd.to_numeric).astype(np.int64)
+                result = predictor.predict_batch(features)
+                result.insert(0, 'row', np.flatnonzero(valid) + n_rows)
+                if ID_COLUMN in chunk.columns:
+                    result.insert(1, ID_COLUMN, scored[ID_COLUMN].to_numpy())
+                writer.write(result)
+                for label, count in result['prediction'].value_counts().items():
+                    counts[label] = counts.get(label, 0) + int(count)
+
+            n_rows += len(chunk)
+            n_scored += int(valid.sum())
+            n_invalid += int((~valid).sum())
+            if on_progress:
+                on_progress(n_rows, total)
+    finally:
+        writer.close()
+
+    return {
+        'output_path': output_path,
+        'n_rows': n_rows,
+        'n_scored': n_scored,
+        'n_invalid': n_invalid,
+        'prediction_counts': counts,
+        'errors': pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=ERROR_COLUMNS),
+    }
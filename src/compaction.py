@@ -0,0 +1,286 @@
+"""
+Model Compaction - Forest Pruning & Distillation
+================================================
+Servis (inference) için doğruluğu koruyan en küçük modeli arar.
+
+Adaylar:
+- subset:    referans ormanın en iyi k ağacı (her ağaç kendi OOB örnekleriyle sıralanır;
+             kabul kümesi sıralamada kullanılmaz -> seçim yanlılığı yok). OOB satırları
+             bilinmiyorsa (bootstrap yok / sklearn özel API'si yok) doğrulama kümesiyle
+             sıralanır; raporda ranking='validation' (kabul doğruluğu iyimser)
+- depth:     daha sığ (max_depth) ve daha az ağaçlı yeniden eğitilmiş orman
+- distilled: öğretmen (teacher) ormanın etiketleriyle eğitilmiş tek karar ağacı
+
+Doğrulama doğruluğu referansın en fazla `tolerance` altında kalan ve en az `min_trees`
+ağaçlı (kullanılabilir olasılıklar; tek ağaç yalnızca 0/1 verir) adaylar arasından en
+küçük (byte) olan seçilir; her aday için gecikme, bellek ve doğruluk raporlanır.
+"""
+
+import copy
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.tree import DecisionTreeClassifier
+
+from features import RAW_FEATURES, FEATURE_RANGES, build_feature_matrix
+
+try:
+    from config import COMPACTION_CONFIG, RANDOM_STATE
+except ImportError:
+    COMPACTION_CONFIG = {
+        'tolerance': 0.005,
+        'tree_counts': [1, 3, 5, 10, 25, 50, 100],
+        'min_trees': 10,
+        'depths': [3, 5, 8],
+        'depth_n_estimators': 25,
+        'distill_depths': [4, 6, 8, None],
+        'n_synthetic': 5000,
+        'validation_size': 0.2,
+        'latency_repeats': 50,
+    }
+    RANDOM_STATE = 42
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def model_footprint(model):
+    """
+    Serialized size and node count of a tree model
+
+    Returns:
+        dict: size_bytes, n_nodes, n_trees
+    """
+    trees = getattr(model, 'estimators_', [model])
+    return {
+        'size_bytes': len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+        'n_nodes': int(sum(tree.tree_.node_count for tree in trees)),
+        'n_trees': len(trees),
+    }
+
+
+def measure_latency(model, X, n_repeats=50):
+    """
+    Single-row and batch prediction latency
+
+    Args:
+        model: Fitted classifier
+        X: Rows to predict (the first row is used for single-row timing)
+        n_repeats: Single-row timing repeats (median is reported)
+
+    Returns:
+        dict: latency_ms (one row, median), batch_ms (all rows), rows_per_sec
+    """
+    X = np.asarray(X)
+    row = X[:1]
+    model.predict_proba(row)  # Isınma (warm-up)
+
+    timings = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    model.predict_proba(X)
+    batch = time.perf_counter() - start
+
+    return {
+        'latency_ms': float(np.median(timings) * 1000),
+        'batch_ms': float(batch * 1000),
+        'rows_per_sec': float(len(X) / batch) if batch > 0 else float('inf'),
+    }
+
+
+# =============================================================================
+# CANDIDATES
+# =============================================================================
+
+def oob_indices(forest):
+    """
+    Out-of-bag row indices of each tree (rows of the forest's training set)
+
+    Returns:
+        list of np.ndarray, or None if the forest was fit without bootstrap or the
+        sklearn version lacks the private sampling API
+    """
+    if not getattr(forest, 'bootstrap', False):
+        return None
+    # _n_samples / _get_estimators_indices özel sklearn API'si: sürümle değişebilir
+    try:
+        n_samples = forest._n_samples
+        return [np.flatnonzero(np.bincount(sampled, minlength=n_samples) == 0)
+                for sampled in forest._get_estimators_indices()]
+    except (AttributeError, TypeError):
+        return None
+
+
+def rank_trees(forest, X, y, oob=False):
+    """
+    Order forest trees by individual accuracy
+
+    Eşit skorlarda küçük (az düğümlü) ağaç önce gelir.
+
+    Args:
+        forest: Fitted forest
+        X, y: Rows to score the trees on
+        oob: X, y are the forest's training rows; score each tree only on its
+            out-of-bag rows
+
+    Returns:
+        np.ndarray: Tree indices, best first
+    """
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    rows = oob_indices(forest) if oob else None
+    if oob and rows is None:
+        raise ValueError("OOB ranking needs a forest fit with bootstrap=True "
+                        "(and sklearn's private _get_estimators_indices)")
+
+    tree_acc = []
+    for i, tree in enumerate(forest.estimators_):
+        idx = slice(None) if rows is None else rows[i]
+        hits = forest.classes_[tree.predict(X[idx]).astype(int)] == y[idx]
+        tree_acc.append(np.mean(hits) if len(hits) else 0.0)
+    node_counts = np.array([tree.tree_.node_count for tree in forest.estimators_])
+    return np.lexsort((node_counts, -np.array(tree_acc)))
+
+
+def subset_forest(forest, indices):
+    """
+    Copy of a fitted forest that keeps only the given trees
+
+    Returns:
+        RandomForestClassifier: Fitted forest with len(indices) estimators
+    """
+    compact = copy.copy(forest)
+    compact.estimators_ = [forest.estimators_[i] for i in indices]
+    compact.n_estimators = len(compact.estimators_)
+    return compact
+
+
+def synthetic_patients(n_rows, feature_names, random_state=RANDOM_STATE):
+    """
+    Random patients drawn uniformly from FEATURE_RANGES, engineered like training rows
+
+    Damıtmada öğrencinin, öğretmenin karar sınırlarını eğitim verisi dışında da
+    öğrenmesi için kullanılır (etiketleri öğretmen üretir).
+
+    Returns:
+        pd.DataFrame: Engineered features in feature_names order
+    """
+    rng = np.random.default_rng(random_state)
+    raw = pd.DataFrame({
+        name: rng.integers(*FEATURE_RANGES[name], size=n_rows, endpoint=True)
+        for name in RAW_FEATURES
+    })
+    return pd.DataFrame(build_feature_matrix(raw, feature_names), columns=feature_names)
+
+
+def distill(teacher, X_transfer, max_depth=None, random_state=RANDOM_STATE):
+    """
+    Train a single decision tree on the teacher's predictions
+
+    Args:
+        teacher: Fitted classifier
+        X_transfer: Transfer set (training rows + synthetic rows)
+        max_depth: Student depth
+        random_state: Seed
+
+    Returns:
+        DecisionTreeClassifier: Student model
+    """
+    student = DecisionTreeClassifier(max_depth=max_depth, random_state=random_state)
+    student.fit(X_transfer, teacher.predict(X_transfer))
+    return student
+
+
+def compact_model(reference, X_fit, y_fit, X_val, y_val, X_transfer=None,
+                config=None, random_state=RANDOM_STATE):
+    """
+    Search for the smallest model within tolerance of the reference
+
+    Args:
+        reference: Unfitted or fitted forest (fitted on X_fit if unfitted)
+        X_fit, y_fit: Training rows
+        X_val, y_val: Validation rows (acceptance; also tree ranking when OOB rows are unavailable)
+        X_transfer: Extra unlabeled rows for distillation (default: X_fit only)
+        config: Overrides for COMPACTION_CONFIG
+        random_state: Seed
+
+    Returns:
+        dict: best (name), model, report (DataFrame), reference_accuracy,
+            ranking ('oob' or 'validation')
+    """
+    config = dict(COMPACTION_CONFIG, **(config or {}))
+    min_trees = config.get('min_trees', 1)
+    X_fit = np.asarray(X_fit)
+    X_val = np.asarray(X_val)
+    y_val = np.asarray(y_val)
+
+    if not hasattr(reference, 'estimators_'):
+        reference = clone(reference).fit(X_fit, y_fit)
+
+    candidates = {'reference': ('reference', reference)}
+
+    # 1) Ağaç alt kümeleri (yeniden eğitim yok). Sıralama OOB örnekleriyle (orman X_fit
+    #    üzerinde eğitildiyse); OOB bilinmiyorsa doğrulama satırlarıyla
+    oob = getattr(reference, '_n_samples', None) == len(X_fit) and oob_indices(reference) is not None
+    ranking = 'oob' if oob else 'validation'
+    if oob:
+        order = rank_trees(reference, X_fit, y_fit, oob=True)
+    else:
+        order = rank_trees(reference, X_val, y_val)
+    for k in config['tree_counts']:
+        if min_trees <= k < len(order):
+            candidates[f"subset-{k}"] = ('subset', subset_forest(reference, order[:k]))
+
+    # 2) Sığ ormanlar (yeniden eğitim)
+    for depth in config['depths']:
+        model = clone(reference).set_params(
+            n_estimators=config['depth_n_estimators'], max_depth=depth, random_state=random_state
+        )
+        candidates[f"depth-{depth}"] = ('depth', model.fit(X_fit, y_fit))
+
+    # 3) Damıtma (distillation): tek ağaç, öğretmen etiketleri
+    transfer = X_fit if X_transfer is None else np.vstack([X_fit, np.asarray(X_transfer)])
+    for depth in config['distill_depths']:
+        candidates[f"distilled-{depth or 'full'}"] = (
+            'distilled', distill(reference, transfer, depth, random_state)
+        )
+
+    reference_acc = accuracy_score(y_val, reference.predict(X_val))
+    rows = []
+    for name, (kind, model) in candidates.items():
+        val_acc = accuracy_score(y_val, model.predict(X_val))
+        row = {
+            'candidate': name,
+            'kind': kind,
+            'max_depth': int(max(est.get_depth() for est in getattr(model, 'estimators_', [model]))),
+            'val_accuracy': float(val_acc),
+            'accuracy_drop': float(reference_acc - val_acc),
+            'within_tolerance': bool(reference_acc - val_acc <= config['tolerance']),
+        }
+        row.update(model_footprint(model))
+        row['eligible'] = row['within_tolerance'] and (row['n_trees'] >= min_trees or name == 'reference')
+        row.update(measure_latency(model, X_val, config['latency_repeats']))
+        rows.append(row)
+
+    report = pd.DataFrame(rows)
+    report['size_kb'] = report['size_bytes'] / 1024
+    report = report.sort_values(['eligible', 'size_bytes', 'latency_ms'],
+                                ascending=[False, True, True]).reset_index(drop=True)
+
+    best = report.iloc[0]['candidate']
+    return {
+        'best': best,
+        'model': candidates[best][1],
+        'report': report,
+        'reference_accuracy': float(reference_acc),
+        'ranking': ranking,
+    }
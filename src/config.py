@@ -23,7 +23,8 @@ for directory in [DATA_DIR, MODEL_DIR, NOTEBOOK_DIR, SRC_DIR, DOCS_DIR]:
     directory.mkdir(exist_ok=True, parents=True)
 
 # Veri yolları
-RAW_DATA_PATH = DATA_DIR / 'cancer patient data sets.csv'
+# Ham eğitim verisi repo kökündeki data/raw altında (BASE_DIR = src)
+RAW_DATA_PATH = BASE_DIR.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
 PROCESSED_DATA_PATH = DATA_DIR / 'cancer_data_feature_engineered.csv'
 
 # Model yolları
@@ -31,6 +32,28 @@ FINAL_MODEL_PATH = MODEL_DIR / 'final_model.pkl'
 FINAL_SCALER_PATH = MODEL_DIR / 'final_scaler.pkl'
 FEATURE_LIST_PATH = MODEL_DIR / 'final_features.txt'
 
+# Artifact bundle manifest: SHA-256 checksum'lar, feature/sınıf sırası, eğitim metadata'sı (artifacts.py)
+BUNDLE_MANIFEST_PATH = MODEL_DIR / 'manifest.json'
+
+# Pipeline aşama cache'i (content-addressed stage cache)
+PIPELINE_CACHE_DIR = BASE_DIR / '.cache' / 'pipeline'
+PIPELINE_CACHE_MAX_BYTES = 2 * 1024**3  # 2 GB, aşılırsa LRU tahliye
+
+# PDF rapor cache'i (içerik hash'i -> PDF) ve rapor işçi havuzu
+REPORT_CACHE_DIR = BASE_DIR / '.cache' / 'reports'
+REPORT_CACHE_MAX_BYTES = 256 * 1024**2  # 256 MB
+REPORT_MAX_WORKERS = None  # None = tüm çekirdekler (process pool)
+
+# API yanıt cache'i: kanonik girdi hash'i + model sürümü -> /predict yanıtı (response_cache.py)
+RESPONSE_CACHE_CONFIG = {
+    'enabled': True,
+    'max_entries': 10000,            # Bellek katmanı (LRU)
+    'ttl_seconds': 300,              # Bu süreden eski yanıtlar tekrar hesaplanır
+    'disk': False,                   # True: RESPONSE_CACHE_DIR'daki disk katmanını tüm worker'lar paylaşır
+    'disk_max_bytes': 64 * 1024**2   # Disk katmanı sınırı (LRU tahliye)
+}
+RESPONSE_CACHE_DIR = BASE_DIR / '.cache' / 'responses'
+
 # =============================================================================
 # MODEL PARAMETERS(MODEL PARAMETRELERİ)
 # ==============================================================================
@@ -48,6 +71,61 @@ MODEL_PARAMS = {
     'n_jobs': -1
 }
 
+# Hiperparametre arama uzayı (successive halving / Hyperband, pipeline 'tune' aşaması)
+TUNING_SEARCH_SPACE = {
+    'n_estimators': [50, 100, 200, 300, 500],
+    'max_depth': [5, 8, 10, 15, 20, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 'log2', None]
+}
+
+TUNING_CONFIG = {
+    'method': 'halving',        # 'halving' veya 'hyperband'
+    'n_candidates': 27,         # İlk turdaki aday sayısı
+    'eta': 3,                   # Her turda adayların 1/eta'sı kalır
+    'min_fraction': 1 / 9,      # İlk turdaki veri/ağaç bütçesi oranı
+    'min_trees': 10,            # Düşük bütçeli fit için minimum ağaç sayısı
+    'validation_size': 0.2      # Train içinden ayrılan doğrulama oranı
+}
+
+TUNING_CHECKPOINT_PATH = BASE_DIR / '.cache' / 'tuning' / 'trials.jsonl'
+TUNED_PARAMS_PATH = MODEL_DIR / 'tuned_params.json'
+
+# Model küçültme (compaction): budama + damıtma, pipeline 'compact' aşaması
+COMPACTION_CONFIG = {
+    'tolerance': 0.005,                          # Referanstan izin verilen doğruluk kaybı
+    'tree_counts': [1, 3, 5, 10, 25, 50, 100],   # Denenecek ağaç alt küme boyutları
+    'min_trees': 10,                             # Seçilebilir modelde en az ağaç (0/1 olmayan olasılıklar)
+    'depths': [3, 5, 8],                         # Sığ orman derinlikleri
+    'depth_n_estimators': 25,                    # Sığ ormanlardaki ağaç sayısı
+    'distill_depths': [4, 6, 8, None],           # Damıtılmış tek ağaç derinlikleri
+    'n_synthetic': 5000,                         # Damıtma için sentetik hasta sayısı
+    'validation_size': 0.2,                      # Train içinden ayrılan doğrulama oranı
+    'latency_repeats': 50                        # Tek satır gecikme ölçüm tekrarı
+}
+
+COMPACT_MODEL_PATH = MODEL_DIR / 'compact_model.pkl'
+
+# Kuantize model: tamsayı eşikler + sabit noktalı yaprak olasılıkları (quantization.py)
+QUANTIZATION_CONFIG = {
+    'probability_dtype': 'uint16',   # 'uint8' (en küçük) veya 'uint16' (olasılık hatası < 1e-5)
+    'chunk_size': 2048               # Seviye seviye gezinmede satır parçası (önbellek sınırı)
+}
+
+QUANTIZED_MODEL_PATH = MODEL_DIR / 'quantized_model.npz'
+
+# Global yorumlama tabloları: permutation importance + partial dependence (pipeline 'interpret' aşaması)
+INTERPRETATION_CONFIG = {
+    'n_repeats': 5,            # Özellik başına permütasyon tekrarı
+    'n_background': 200,       # PDP ortalaması için arka plan hasta sayısı
+    'grid_resolution': 20,     # Bir özellik aralığındaki en fazla grid noktası
+    'n_pair_features': 4,      # İki yönlü PDP: en önemli k özelliğin tüm çiftleri
+    'effect_threshold': 0.02   # Uygulama paneli: |etki| bunun altındaysa gösterilmez
+}
+
+INTERPRETATION_PATH = MODEL_DIR / 'interpretation.pkl'
+
 # =============================================================================
 # FEATURE ENGINEERING PARAMETERS(ÖZELLİK MÜHENDİSLİĞİ PARAMETRELERİ)
 # =============================================================================
@@ -143,6 +221,39 @@ This API predicts cancer risk level (Low, Medium, High) based on patient data.
 # API rate limiting(API oran sınırlaması)
 API_RATE_LIMIT = "100/hour"
 
+# Toplu CSV skorlama (Streamlit upload sekmesi)
+BULK_SCORING_CONFIG = {
+    'chunksize': 5000,       # Parça başına satır (bellek sınırı)
+    'max_error_rows': 1000   # Raporlanan en fazla hata satırı
+}
+
+# Çok çekirdekli toplu skorlama (sharded_scoring.py, süreç havuzu)
+SHARDED_SCORING_CONFIG = {
+    'n_workers': None,         # None: os.cpu_count()
+    'shard_size': 50000,       # Görev (shard) başına en fazla satır
+    'start_method': 'spawn'    # Thread'li süreçlerde (API) fork güvenli değil
+}
+
+# Ağaç değerlendirme çekirdeği (tree_kernel.py, thread havuzu)
+TREE_KERNEL_CONFIG = {
+    'n_threads': None,         # None: os.cpu_count()
+    'crossover_rows': 512      # Bu satır sayısının altı seri (bkz. tests/benchmark_tree_kernel.py)
+}
+
+# API yanıt sıkıştırma (Accept-Encoding: gzip olan istemciler için)
+API_RESPONSE_CONFIG = {
+    'gzip_minimum_size': 1000,  # Bu boyutun altındaki yanıtlar sıkıştırılmaz (byte)
+    'gzip_level': 6
+}
+
+# Tahmin açıklamaları (TreeSHAP, /explain)
+EXPLAIN_CONFIG = {
+    'cache_size': 4096,        # LRU: girdi tuple'ı -> açıklama
+    'chunk_size': 64,          # Batch hesaplamada satır parçası (bellek sınırı)
+    'top_k': 5,                # Yanıttaki en etkili özellik sayısı
+    'latency_target_ms': 50    # Tek satır (cache dışı) hedefi; aşılırsa uyarı loglanır
+}
+
 # =============================================================================
 # MONITORING & LOGGING(İZLEME VE KAYIT)
 # =============================================================================
@@ -168,6 +279,29 @@ LOG_LEVEL = 'INFO'
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 LOG_FILE = BASE_DIR / 'logs' / 'app.log'
 
+# Shadow (gölge) model: aday model canlı isteklerin bir örneğini yanıt yolunun dışında skorlar (shadow.py)
+SHADOW_CONFIG = {
+    'model_path': os.getenv('SHADOW_MODEL_PATH'),  # Aday model (kendi bundle dizininde); None = kapalı
+    'sample_rate': 0.1,         # Shadow'a gönderilen istek oranı
+    'max_cpu_fraction': 0.25,   # Shadow thread'inin kullanabileceği en fazla CPU (tek çekirdeğin oranı)
+    'queue_size': 256,          # Kuyruk doluysa örnek atılır (primary hiç beklemez)
+    'flush_every': 100          # Her N skorlamada metrikler diske yazılır
+}
+SHADOW_METRICS_PATH = BASE_DIR.parent / 'logs' / 'shadow_metrics.json'
+
+# Çoklu model yönlendirme / A-B testi (routing.py, /ab/* uç noktaları)
+ROUTING_CONFIG = {
+    'variants': {                 # ad -> model dosyası (kendi bundle dizininde) ve trafik ağırlığı
+        'control': {'model_path': FINAL_MODEL_PATH, 'weight': 1.0},
+        # 'compact': {'model_path': COMPACT_MODEL_PATH, 'weight': 0.1},
+    },
+    'strategy': 'hash',           # 'hash': patient_id hash'i (aynı hasta hep aynı varyant), 'weight': rastgele
+    'salt': 'ab-1',               # Deney değişince değiştir (hash kovaları yeniden karılır)
+    'outcome_memory': 10000,      # Sonuç (etiket) eşleştirmesi için hatırlanan son atamalar
+    'flush_every': 100            # Her N istekte metrikler diske yazılır
+}
+ROUTING_METRICS_PATH = BASE_DIR.parent / 'logs' / 'routing_metrics.json'
+
 # =============================================================================
 # MODEL RETRAINING TRIGGERS(MODEL YENİDEN EĞİTİM TETİKLEYİCİLERİ)
 # =============================================================================
@@ -178,6 +312,32 @@ RETRAINING_TRIGGERS = {
     'sample_count': 1000  # Retrain after 1000 new samples
 }
 
+# Tahmin kayıtları (monitoring.py '../logs/predictions.json' ile aynı dosya)
+# Etiketli kayıt = doğrulanmış tanısı (Low/Medium/High) LABEL_LOG_PATH'te veya 'label' alanında olan kayıt
+PREDICTION_LOG_PATH = BASE_DIR.parent / 'logs' / 'predictions.json'
+# Sonradan gelen tanılar: tahmin kimliğiyle eşleşen, yalnızca sona eklenen JSONL (feedback.py)
+LABEL_LOG_PATH = BASE_DIR.parent / 'logs' / 'labels.jsonl'
+RETRAIN_STATE_PATH = MODEL_DIR / 'retrain_state.json'
+
+# Artımlı (warm-start) yeniden eğitim
+INCREMENTAL_RETRAIN_CONFIG = {
+    'trees_per_update': 50,   # Her güncellemede yeni verilerle eklenen ağaç sayısı
+    'max_trees': 600,         # Aşılırsa en eski ağaçlar atılır
+    'replay_size': 500,       # Yeni ağaçlara karıştırılan eski eğitim verisi satırı
+    'min_new_samples': 30     # Bundan az yeni etiketli kayıtla güncelleme yapılmaz
+}
+
+# Tetikleyici değerlendirme zamanlayıcısı (scheduler.py)
+SCHEDULER_CONFIG = {
+    'interval_seconds': 3600,          # Değerlendirme aralığı
+    'min_labelled_for_performance': 50,  # Performans düşüşü için minimum etiketli kayıt
+    'min_samples_for_drift': 100       # Veri kayması için minimum kayıt
+}
+SCHEDULER_STATE_PATH = BASE_DIR / '.cache' / 'scheduler' / 'state.json'
+SCHEDULER_AUDIT_PATH = BASE_DIR.parent / 'logs' / 'scheduler_audit.jsonl'
+RETRAIN_QUEUE_DIR = BASE_DIR / '.cache' / 'scheduler' / 'queue'
+MODEL_RESULTS_PATH = MODEL_DIR / 'model_results.json'
+
 # =============================================================================
 # DEPLOYMENT CONFIGURATION( DAĞITIM YAPILANDIRMASI)
 # =============================================================================
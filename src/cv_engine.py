@@ -0,0 +1,156 @@
+"""
+Cross-Validation Engine - Cancer Risk Prediction
+================================================
+Katlar (folds) ve ağaçlar (trees) için ortak, sınırlı bir işçi havuzu.
+
+cross_val_score katları seri çalıştırır, her katın ormanı ise n_jobs=-1 ile tüm
+çekirdekleri kullanır. Burada toplam çekirdek sayısı katlar arasında bölünür:
+  fold_workers * tree_jobs <= max_workers
+Böylece aşırı abonelik (oversubscription) olmaz. Her katın tahminleri saklanır,
+tüm metrikler bu tahminlerden hesaplanır (model tekrar çalıştırılmaz).
+"""
+
+import os
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+from sklearn.model_selection import StratifiedKFold
+
+try:
+    from config import CV_FOLDS
+except ImportError:
+    CV_FOLDS = 5
+
+
+def plan_workers(n_folds, max_workers=None):
+    """
+    Split a bounded worker budget between folds and trees
+
+    Args:
+        n_folds: Number of CV folds
+        max_workers: Total worker budget (default: all cores)
+
+    Returns:
+        tuple: (fold_workers, tree_jobs_per_fold)
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    fold_workers = max(1, min(n_folds, max_workers))
+    tree_jobs = max(1, max_workers // fold_workers)
+    return fold_workers, tree_jobs
+
+
+def _run_fold(estimator, X, y, fold, train_idx, test_idx, tree_jobs):
+    """Fit and predict one fold (runs inside the worker pool)"""
+    model = clone(estimator)
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=tree_jobs)
+
+    start = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = model.predict(X[test_idx])
+    predict_time = time.perf_counter() - start
+
+    return {
+        'fold': fold,
+        'test_idx': test_idx,
+        'y_pred': y_pred,
+        'fit_time': fit_time,
+        'predict_time': predict_time,
+        'n_train': len(train_idx),
+        'n_test': len(test_idx),
+    }
+
+
+def cross_validate_parallel(estimator, X, y, n_folds=CV_FOLDS, max_workers=None):
+    """
+    Stratified K-fold CV with folds and trees scheduled on one worker budget
+
+    Katlar cross_val_score ile aynıdır (StratifiedKFold, shuffle yok).
+    Thread tabanlı havuz: ağaç eğitimi GIL'i bırakır, veri kopyalanmaz.
+
+    Args:
+        estimator: Unfitted sklearn estimator
+        X: Feature matrix (array-like)
+        y: Labels
+        n_folds: Number of folds
+        max_workers: Total worker budget (default: all cores)
+
+    Returns:
+        dict: scores, out-of-fold predictions, per-fold timings and metrics
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    fold_workers, tree_jobs = plan_workers(n_folds, max_workers)
+    splits = list(StratifiedKFold(n_splits=n_folds).split(X, y))
+
+    start = time.perf_counter()
+    folds = Parallel(n_jobs=fold_workers, prefer='threads')(
+        delayed(_run_fold)(estimator, X, y, i, train_idx, test_idx, tree_jobs)
+        for i, (train_idx, test_idx) in enumerate(splits)
+    )
+    wall_time = time.perf_counter() - start
+
+    # Out-of-fold tahminler: tüm metrikler tek tahmin setinden
+    oof_pred = np.empty(len(y), dtype=y.dtype)
+    for fold in folds:
+        oof_pred[fold['test_idx']] = fold['y_pred']
+        fold['accuracy'] = float(accuracy_score(y[fold['test_idx']], fold['y_pred']))
+
+    scores = np.array([fold['accuracy'] for fold in folds])
+    precision, recall, f1, _ = precision_recall_fscore_support(y, oof_pred, average='macro', zero_division=0)
+
+    return {
+        'scores': scores,
+        'oof_pred': oof_pred,
+        'oof_accuracy': float(accuracy_score(y, oof_pred)),
+        'oof_macro_precision': float(precision),
+        'oof_macro_recall': float(recall),
+        'oof_macro_f1': float(f1),
+        'folds': [
+            {k: fold[k] for k in ('fold', 'n_train', 'n_test', 'fit_time', 'predict_time', 'accuracy')}
+            for fold in folds
+        ],
+        'fold_workers': fold_workers,
+        'tree_jobs': tree_jobs,
+        'wall_time': wall_time,
+    }
+
+
+def format_classification_report(report, digits=2):
+    """
+    Render a classification_report(output_dict=True) dict as text
+
+    classification_report'u ikinci kez çağırmadan metin çıktısı üretir.
+
+    Args:
+        report: Dict from classification_report(..., output_dict=True)
+        digits: Decimal digits
+
+    Returns:
+        str: Text report in sklearn's layout
+    """
+    labels = [k for k in report if k not in ('accuracy', 'macro avg', 'weighted avg', 'micro avg')]
+    width = max([len(label) for label in labels] + [len('weighted avg')])
+    header = f"{'':>{width}s} {'precision':>9s} {'recall':>9s} {'f1-score':>9s} {'support':>9s}"
+    lines = [header, '']
+
+    def row(name, values):
+        return (f"{name:>{width}s} {values['precision']:>9.{digits}f} {values['recall']:>9.{digits}f} "
+                f"{values['f1-score']:>9.{digits}f} {int(values['support']):>9d}")
+
+    for label in labels:
+        lines.append(row(label, report[label]))
+    lines.append('')
+    if 'accuracy' in report:
+        support = int(report['macro avg']['support'])
+        lines.append(f"{'accuracy':>{width}s} {'':>9s} {'':>9s} {report['accuracy']:>9.{digits}f} {support:>9d}")
+    for avg in ('macro avg', 'weighted avg'):
+        if avg in report:
+            lines.append(row(avg, report[avg]))
+    return '\n'.join(lines)
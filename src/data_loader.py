@@ -0,0 +1,185 @@
+"""
+Data Loader - Cancer Risk Prediction
+====================================
+Şema tabanlı (schema-driven) CSV okuma.
+
+Ham skor kolonları FEATURE_RANGES'e göre en küçük tamsayı tipine (uint8) okunur,
+'Level' kategorik olarak, 'Patient Id' ise isteğe bağlı olarak yüklenir.
+Varsayılan pd.read_csv (int64 + Python string) ile karşılaştırıldığında bellek
+kullanımı ~8 kat azalır.
+
+Desteklenen motorlar:
+- 'c'       : pandas C parser, parça parça (chunked) okuma
+- 'pyarrow' : çok çekirdekli PyArrow parser (tek seferde)
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from config import FEATURE_RANGES
+
+# =============================================================================
+# RAW SCHEMA (HAM VERİ ŞEMASI)
+# =============================================================================
+TARGET_COLUMN = 'Level'
+ID_COLUMN = 'Patient Id'
+LEVEL_CATEGORIES = ['Low', 'Medium', 'High']
+LEVEL_DTYPE = pd.CategoricalDtype(LEVEL_CATEGORIES)
+
+# Okuma sırasında kullanılan geniş tip: taşma (300 -> 44 gibi sessiz wrap-around)
+# kontrol edildikten sonra hedef tipe düşürülür
+PARSE_DTYPE = np.int16
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def storage_dtype(min_val, max_val):
+    """
+    Smallest integer dtype that holds [min_val, max_val]
+
+    Args:
+        min_val: Lower bound of the feature range
+        max_val: Upper bound of the feature range
+
+    Returns:
+        np.dtype (e.g. uint8 for (1, 100))
+    """
+    return np.promote_types(np.min_scalar_type(min_val), np.min_scalar_type(max_val))
+
+
+RAW_SCHEMA = {col: storage_dtype(lo, hi) for col, (lo, hi) in FEATURE_RANGES.items()}
+
+
+def _read_kwargs(include_patient_id):
+    """pd.read_csv arguments shared by all engines"""
+    usecols = list(RAW_SCHEMA) + [TARGET_COLUMN]
+    dtype = {col: PARSE_DTYPE for col in RAW_SCHEMA}
+    dtype[TARGET_COLUMN] = LEVEL_DTYPE
+    if include_patient_id:
+        usecols.append(ID_COLUMN)
+        dtype[ID_COLUMN] = 'string'
+    return {'usecols': usecols, 'dtype': dtype}
+
+
+def _downcast(df):
+    """
+    Downcast parsed int16 columns to their storage dtype
+
+    Raises:
+        ValueError: If a value does not fit the storage dtype or Level is unknown
+    """
+    for col, dtype in RAW_SCHEMA.items():
+        info = np.iinfo(dtype)
+        values = df[col].to_numpy()
+        if values.size and (values.min() < info.min or values.max() > info.max):
+            raise ValueError(
+                f"Column '{col}' has values outside {dtype} range "
+                f"[{info.min}, {info.max}]"
+            )
+        df[col] = values.astype(dtype)
+
+    if df[TARGET_COLUMN].isna().any():
+        raise ValueError(f"Column '{TARGET_COLUMN}' must be one of {LEVEL_CATEGORIES}")
+
+    # Kolon sırası: şema sırası (Patient Id varsa en başta)
+    ordered = list(RAW_SCHEMA) + [TARGET_COLUMN]
+    if ID_COLUMN in df.columns:
+        ordered = [ID_COLUMN] + ordered
+    return df[ordered]
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+def iter_raw_chunks(path, chunksize=DEFAULT_CHUNKSIZE, include_patient_id=False):
+    """
+    Read raw CSV in compact chunks (C engine)
+
+    Args:
+        path: Path to raw CSV
+        chunksize: Rows per chunk
+        include_patient_id: Also load 'Patient Id' column
+
+    Yields:
+        DataFrame chunks with schema dtypes
+    """
+    reader = pd.read_csv(path, chunksize=chunksize, engine='c', **_read_kwargs(include_patient_id))
+    with reader:
+        for chunk in reader:
+            yield _downcast(chunk)
+
+
+def load_raw_data(path, engine='c', chunksize=DEFAULT_CHUNKSIZE, include_patient_id=False):
+    """
+    Load raw CSV with schema dtypes
+
+    Args:
+        path: Path to raw CSV
+        engine: 'c' (chunked) or 'pyarrow'
+        chunksize: Rows per chunk for the C engine
+        include_patient_id: Also load 'Patient Id' column
+
+    Returns:
+        DataFrame with uint8 feature columns and categorical Level
+    """
+    if engine == 'pyarrow':
+        df = pd.read_csv(path, engine='pyarrow', **_read_kwargs(include_patient_id))
+        return _downcast(df)
+    if engine != 'c':
+        raise ValueError(f"Unknown engine: {engine} (expected 'c' or 'pyarrow')")
+
+    chunks = list(iter_raw_chunks(path, chunksize, include_patient_id))
+    if len(chunks) == 1:
+        return chunks[0]
+    df = pd.concat(chunks, ignore_index=True)
+    # concat kategorik tipi korur (tüm parçalar aynı LEVEL_DTYPE)
+    return df
+
+
+# =============================================================================
+# MEMORY REPORT (BELLEK RAPORU)
+# =============================================================================
+def memory_footprint(df):
+    """
+    Compare memory of schema dtypes against default pd.read_csv dtypes
+
+    Varsayılan değer tahminidir: sayısal kolonlar int64, metin kolonları
+    Python string nesneleri (pointer + nesne boyutu).
+
+    Args:
+        df: DataFrame loaded with load_raw_data
+
+    Returns:
+        dict: default_bytes (estimated), optimized_bytes, ratio
+    """
+    n_rows = len(df)
+    optimized = int(df.memory_usage(index=False, deep=True).sum())
+
+    default = 0
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            counts = series.value_counts()
+            default += 8 * n_rows + sum(int(n) * sys.getsizeof(str(cat)) for cat, n in counts.items())
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            default += 8 * n_rows
+        else:
+            default += 8 * n_rows + sum(sys.getsizeof(str(v)) for v in series.dropna())
+
+    return {
+        'default_bytes': default,
+        'optimized_bytes': optimized,
+        'ratio': default / optimized if optimized else float('nan')
+    }
+
+
+def print_memory_report(df):
+    """Print memory footprint before/after schema dtypes"""
+    report = memory_footprint(df)
+    print(f"\n💾 Memory Footprint:")
+    print(f"   Default dtypes (est.): {report['default_bytes'] / 1024**2:.3f} MB")
+    print(f"   Schema dtypes:         {report['optimized_bytes'] / 1024**2:.3f} MB")
+    print(f"   Reduction:             {report['ratio']:.1f}x")
+    return report
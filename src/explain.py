@@ -0,0 +1,246 @@
+"""
+Explainability - Exact TreeSHAP for the Serving Forest
+======================================================
+Her tahmin için özellik katkıları (SHAP değerleri), `shap` paketi olmadan.
+
+- Ağaç yapısı model yüklenirken bir kez derlenir: her yaprak için yol üzerindeki
+  (tekilleştirilmiş) özellikler, (alt, üst] aralıkları, kapsama (cover) oranları
+  ve yaprak değeri; yapraklar yol uzunluğuna göre gruplanıp NumPy dizilerine konur
+- Path-dependent TreeSHAP: yaprak başına E[f | S] = v * Π(j∈S ? o_j : z_j)
+  çarpım oyunudur; Shapley ağırlıkları ∫ t^s (1-t)^(d-1-s) dt olduğundan
+  φ_i = v (o_i - z_i) ∫ Π_{j≠i} (t o_j + (1-t) z_j) dt, Gauss-Legendre ile
+  tam (exact) hesaplanır; satırlar ve yapraklar üzerinde vektörel
+- Açıklamalar ham girdi tuple'ı ile LRU cache'te tutulur (ExplanationService)
+"""
+
+from collections import OrderedDict
+from math import ceil
+
+import numpy as np
+import pandas as pd
+
+from config import EXPLAIN_CONFIG
+from features import RAW_FEATURES, build_feature_matrix
+
+
+# =============================================================================
+# TREE COMPILATION
+# =============================================================================
+
+def _tree_leaves(tree, weight):
+    """
+    Yield (path, value) for every leaf of a fitted decision tree
+
+    path: {feature index: (lower, upper, zero fraction)} — x reaches the leaf along
+    this feature iff lower < x <= upper; zero fraction is the product of cover
+    ratios of the feature's splits on the path.
+    """
+    t = tree.tree_
+    value = t.value[:, 0, :]
+    value = value / value.sum(axis=1, keepdims=True) * weight
+    cover = t.weighted_n_node_samples
+
+    stack = [(0, {})]
+    while stack:
+        node, path = stack.pop()
+        left, right = t.children_left[node], t.children_right[node]
+        if left == -1:
+            yield path, value[node]
+            continue
+        feature, threshold = int(t.feature[node]), float(t.threshold[node])
+        lower, upper, zero = path.get(feature, (-np.inf, np.inf, 1.0))
+        stack.append((left, {**path, feature: (lower, min(upper, threshold), zero * cover[left] / cover[node])}))
+        stack.append((right, {**path, feature: (max(lower, threshold), upper, zero * cover[right] / cover[node])}))
+
+
+class _LeafGroup:
+    """Leaves whose paths use the same number of distinct features"""
+
+    def __init__(self, paths, values, n_features):
+        n_leaves, depth = len(paths), len(paths[0])
+        self.feature = np.empty((n_leaves, depth), dtype=np.intp)
+        self.lower = np.empty((n_leaves, depth))
+        self.upper = np.empty((n_leaves, depth))
+        self.zero = np.empty((n_leaves, depth))
+        for i, path in enumerate(paths):
+            for j, (feature, (lower, upper, zero)) in enumerate(sorted(path.items())):
+                self.feature[i, j] = feature
+                self.lower[i, j], self.upper[i, j], self.zero[i, j] = lower, upper, zero
+        self.value = np.asarray(values)
+
+        # (yaprak, yol) -> özellik eşlemesi: katkılar tek matris çarpımıyla toplanır
+        self.onehot = np.zeros((n_leaves * depth, n_features))
+        self.onehot[np.arange(n_leaves * depth), self.feature.ravel()] = 1.0
+
+        # İntegrand d-1 dereceli polinom: ceil(d/2) Gauss-Legendre noktası tam sonuç verir
+        nodes, weights = np.polynomial.legendre.leggauss(max(1, ceil(depth / 2)))
+        self.t = (nodes + 1) / 2
+        self.w = weights / 2
+
+    def expected_value(self):
+        return (self.value * self.zero.prod(axis=1, keepdims=True)).sum(axis=0)
+
+    def contributions(self, X):
+        """SHAP values of this group's leaves for rows X, shape (n, n_features, n_classes)"""
+        x = X[:, self.feature]                                          # (n, L, d)
+        one = ((x > self.lower) & (x <= self.upper)).astype(np.float64)
+        terms = one[..., None] * self.t + (1 - self.t) * self.zero[..., None]  # (n, L, d, K)
+        others = terms.prod(axis=2, keepdims=True) / terms              # Π_{j≠i}
+        coef = (one - self.zero) * (others @ self.w)                    # (n, L, d)
+
+        n = len(X)
+        out = np.empty((n, self.onehot.shape[1], self.value.shape[1]))
+        for c in range(self.value.shape[1]):
+            out[:, :, c] = (coef * self.value[None, :, c, None]).reshape(n, -1) @ self.onehot
+        return out
+
+
+class TreeExplainer:
+    """
+    Exact path-dependent TreeSHAP for a fitted forest or single tree
+
+    Args:
+        model: Fitted RandomForestClassifier or DecisionTreeClassifier
+        feature_names: Names of the model's input columns
+    """
+
+    def __init__(self, model, feature_names=None):
+        trees = getattr(model, 'estimators_', [model])
+        self.classes = np.asarray(model.classes_)
+        self.n_features = trees[0].tree_.n_features
+        self.feature_names = list(feature_names) if feature_names is not None else [
+            f"f{i}" for i in range(self.n_features)
+        ]
+
+        by_depth = {}
+        for tree in trees:
+            for path, value in _tree_leaves(tree, 1.0 / len(trees)):
+                paths, values = by_depth.setdefault(len(path), ([], []))
+                paths.append(path)
+                values.append(value)
+
+        # Tek yapraklı ağaçların (d=0) katkısı yoktur, yalnızca beklenen değere eklenir
+        _, root_values = by_depth.pop(0, ([], []))
+        self.groups = [_LeafGroup(paths, values, self.n_features) for paths, values in by_depth.values()]
+        self.expected_value = np.zeros(len(self.classes)) + np.sum(root_values, axis=0)
+        for group in self.groups:
+            self.expected_value += group.expected_value()
+
+    def shap_values(self, X, chunk_size=None):
+        """
+        Per-feature contributions for each row and class
+
+        Args:
+            X: Model input rows (n, n_features), same scale as training
+            chunk_size: Rows per vectorized pass (default: EXPLAIN_CONFIG['chunk_size'])
+
+        Returns:
+            np.ndarray: (n, n_features, n_classes); expected_value + sum over features
+            equals predict_proba
+        """
+        # Ağaçlar float32'ye çevrilmiş girdiyle karşılaştırma yapar (sklearn ile aynı)
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        chunk_size = chunk_size or EXPLAIN_CONFIG['chunk_size']
+        phi = np.zeros((len(X), self.n_features, len(self.classes)))
+        for start in range(0, len(X), chunk_size):
+            rows = X[start:start + chunk_size]
+            for group in self.groups:
+                phi[start:start + chunk_size] += group.contributions(rows)
+        return phi
+
+
+# =============================================================================
+# SERVICE
+# =============================================================================
+
+class ExplanationService:
+    """
+    Cached explanations for a LungCancerPredictor (raw patient records)
+
+    Args:
+        predictor: Loaded LungCancerPredictor (model, scaler, feature_names)
+        cache_size: LRU size (default: EXPLAIN_CONFIG['cache_size'])
+        top_k: Features listed in top_features (default: EXPLAIN_CONFIG['top_k'])
+    """
+
+    def __init__(self, predictor, cache_size=None, top_k=None):
+        self.predictor = predictor
+        self.explainer = TreeExplainer(predictor.model, predictor.feature_names)
+        self.top_k = top_k or EXPLAIN_CONFIG['top_k']
+        self.cache_size = cache_size or EXPLAIN_CONFIG['cache_size']
+        self._cache = OrderedDict()
+        self.hits = self.misses = 0
+
+    def _model_input(self, df):
+        names = self.predictor.feature_names
+        X = pd.DataFrame(build_feature_matrix(df, names), columns=names)
+        return self.predictor.scaler.transform(X)
+
+    def _format(self, phi):
+        """One row's SHAP matrix (n_features, n_classes) -> response dict"""
+        explainer = self.explainer
+        probability = explainer.expected_value + phi.sum(axis=0)
+        best = int(probability.argmax())
+        predicted = phi[:, best]
+        order = np.argsort(-np.abs(predicted))[:self.top_k]
+        return {
+            'prediction': str(explainer.classes[best]),
+            'probability': {str(c): float(p) for c, p in zip(explainer.classes, probability)},
+            'expected_value': {str(c): float(v) for c, v in zip(explainer.classes, explainer.expected_value)},
+            'contributions': {
+                str(c): dict(zip(explainer.feature_names, map(float, phi[:, k])))
+                for k, c in enumerate(explainer.classes)
+            },
+            'top_features': [
+                {'feature': explainer.feature_names[i], 'contribution': float(predicted[i])} for i in order
+            ],
+        }
+
+    def explain(self, record):
+        """
+        Explain one raw patient record (cached by its RAW_FEATURES values)
+
+        Returns:
+            dict: prediction, probability, expected_value, contributions
+            ({class: {feature: value}}) and top_features for the predicted class
+        """
+        return self.explain_batch(pd.DataFrame([record], columns=RAW_FEATURES))[0]
+
+    def explain_batch(self, df):
+        """
+        Explain many raw records; cache misses are computed in one vectorized pass
+
+        Args:
+            df: DataFrame with RAW_FEATURES columns
+
+        Returns:
+            list: explain() dicts in row order (shared with the cache; do not modify)
+        """
+        keys = [tuple(map(int, row)) for row in df[RAW_FEATURES].itertuples(index=False)]
+        results = [self._cache_get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        if missing:
+            phi = self.explainer.shap_values(self._model_input(df.iloc[missing]))
+            for i, row_phi in zip(missing, phi):
+                results[i] = self._format(row_phi)
+                self._cache_put(keys[i], results[i])
+        return results
+
+    def _cache_get(self, key):
+        result = self._cache.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key, result):
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def cache_info(self):
+        """Hit/miss counters and current size"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'max_size': self.cache_size}
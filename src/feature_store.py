@@ -0,0 +1,230 @@
+"""
+Feature Store - Out-of-Core Feature Engineering
+===============================================
+RAM'e sığmayan veri setleri için parça parça (chunked) özellik mühendisliği.
+
+Ham CSV parçalar halinde okunur, her parça paylaşılan feature spec ile işlenir ve
+sonuç önceden ayrılmış (preallocated) diskteki kolon düzenine yazılır:
+- 'memmap'  : .npy memory-mapped matris (eğitim bu dosyadan okunur)
+- 'parquet' : her parça bir row group (diğer araçlar için dışa aktarım)
+
+Bellekte aynı anda en fazla bir parçanın ara sonuçları tutulur.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import FINAL_FEATURES
+from data_loader import iter_raw_chunks, DEFAULT_CHUNKSIZE, TARGET_COLUMN, LEVEL_CATEGORIES
+from features import build_feature_matrix
+
+# Disk üzerindeki matris tipi: bellek içi yol ve servis (inference) ile aynı float64.
+# float32 saklamak scaler'ı yuvarlanmış özelliklerle eğitir -> train/serve kayması
+STORE_DTYPE = np.float64
+
+
+def count_rows(path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Count the data rows the CSV reader parses
+
+    Satır sonu saymak yerine tek kolon okunur: boş satırlar ve tırnak içindeki
+    satır sonları okuyucuyla aynı şekilde ele alınır.
+
+    Args:
+        path: Path to CSV, or a file object (rewound afterwards)
+        chunksize: Rows per parsed chunk
+
+    Returns:
+        int: Number of data rows
+    """
+    start = path.tell() if hasattr(path, 'read') else None
+    n_rows = 0
+    try:
+        with pd.read_csv(path, usecols=[0], dtype=str, chunksize=chunksize, engine='c') as reader:
+            for chunk in reader:
+                n_rows += len(chunk)
+    finally:
+        if start is not None:
+            path.seek(start)
+    return n_rows
+
+
+def iter_row_batches(rows, batch_size):
+    """Yield consecutive slices of an index array"""
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+class FeatureStore:
+    """
+    Preallocated memory-mapped feature matrix on disk
+
+    Files:
+        X.npy          : (n_rows, n_features) STORE_DTYPE
+        y.npy          : (n_rows,) uint8 Level codes (LEVEL_CATEGORIES order)
+        metadata.json  : feature names, row count, source file
+    """
+
+    def __init__(self, directory):
+        """
+        Open an existing feature store
+
+        Args:
+            directory: Feature store directory
+        """
+        self.directory = Path(directory)
+        with open(self.directory / 'metadata.json') as f:
+            self.metadata = json.load(f)
+        self.feature_names = self.metadata['feature_names']
+        self.X = np.load(self.directory / 'X.npy', mmap_mode='r')
+        self.y = np.load(self.directory / 'y.npy', mmap_mode='r')
+
+    @property
+    def n_rows(self):
+        return self.X.shape[0]
+
+    @classmethod
+    def build(cls, data_path, directory, feature_names=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Stream raw CSV into a new feature store
+
+        Args:
+            data_path: Path to raw CSV
+            directory: Output directory
+            feature_names: Model feature order (default: FINAL_FEATURES)
+            chunksize: Rows per chunk
+
+        Returns:
+            FeatureStore
+        """
+        feature_names = list(FINAL_FEATURES if feature_names is None else feature_names)
+        directory = Path(directory)
+        directory.mkdir(exist_ok=True, parents=True)
+
+        n_rows = count_rows(data_path)
+        X = np.lib.format.open_memmap(
+            directory / 'X.npy', mode='w+', dtype=STORE_DTYPE, shape=(n_rows, len(feature_names))
+        )
+        y = np.lib.format.open_memmap(directory / 'y.npy', mode='w+', dtype=np.uint8, shape=(n_rows,))
+
+        offset = 0
+        for chunk in iter_raw_chunks(data_path, chunksize=chunksize):
+            end = offset + len(chunk)
+            X[offset:end] = build_feature_matrix(chunk, feature_names)
+            y[offset:end] = chunk[TARGET_COLUMN].cat.codes.to_numpy()
+            offset = end
+
+        if offset != n_rows:
+            raise ValueError(f"Row count mismatch: counted {n_rows}, parsed {offset}")
+
+        X.flush()
+        y.flush()
+        del X, y
+
+        metadata = {
+            'feature_names': feature_names,
+            'n_rows': n_rows,
+            'dtype': np.dtype(STORE_DTYPE).name,
+            'target_classes': LEVEL_CATEGORIES,
+            'source': str(data_path),
+        }
+        with open(directory / 'metadata.json', 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+        return cls(directory)
+
+    def labels(self, rows=None):
+        """
+        Decode Level codes to string labels
+
+        Args:
+            rows: Optional row indices
+
+        Returns:
+            np.ndarray of labels (object dtype, shared string objects)
+        """
+        codes = self.y if rows is None else self.y[rows]
+        return np.asarray(LEVEL_CATEGORIES, dtype=object)[codes]
+
+    def frame(self, rows):
+        """Rows as a DataFrame with feature names (for fitted-name transformers)"""
+        return pd.DataFrame(self.X[rows], columns=self.feature_names)
+
+    def fit_scaler(self, scaler, rows, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Fit a scaler incrementally with partial_fit
+
+        Args:
+            scaler: Transformer with partial_fit (e.g. StandardScaler)
+            rows: Sorted row indices to fit on
+            chunksize: Rows per batch
+
+        Returns:
+            Fitted scaler
+        """
+        for batch in iter_row_batches(rows, chunksize):
+            scaler.partial_fit(self.frame(batch))
+        return scaler
+
+    def transform_rows(self, scaler, rows, filename, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Write scaler-transformed rows into a new memory-mapped matrix
+
+        Args:
+            scaler: Fitted transformer
+            rows: Sorted row indices
+            filename: Output .npy name inside the store directory
+            chunksize: Rows per batch
+
+        Returns:
+            np.memmap (read-only) of shape (len(rows), n_features)
+        """
+        path = self.directory / filename
+        out = np.lib.format.open_memmap(
+            path, mode='w+', dtype=STORE_DTYPE, shape=(len(rows), len(self.feature_names))
+        )
+        offset = 0
+        for batch in iter_row_batches(rows, chunksize):
+            out[offset:offset + len(batch)] = scaler.transform(self.frame(batch))
+            offset += len(batch)
+        out.flush()
+        del out
+        return np.load(path, mmap_mode='r')
+
+
+def write_feature_parquet(data_path, output_path, feature_names=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Stream raw CSV into a Parquet file (one row group per chunk)
+
+    Args:
+        data_path: Path to raw CSV
+        output_path: Parquet file path
+        feature_names: Feature columns (default: FINAL_FEATURES)
+        chunksize: Rows per chunk
+
+    Returns:
+        int: Number of rows written
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    feature_names = list(FINAL_FEATURES if feature_names is None else feature_names)
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in iter_raw_chunks(data_path, chunksize=chunksize):
+            X = build_feature_matrix(chunk, feature_names).astype(STORE_DTYPE)
+            columns = {name: X[:, j] for j, name in enumerate(feature_names)}
+            columns[TARGET_COLUMN] = chunk[TARGET_COLUMN].to_numpy(dtype=object)
+            table = pa.table(columns)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table)
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
@@ -0,0 +1,468 @@
+"""
+Feature Engineering Module - Cancer Risk Prediction
+===================================================
+Eğitim (pipeline.py) ve çıkarım (inference.py) tarafından paylaşılan tek özellik
+mühendisliği kaynağı.
+
+Feature'lar tek bir bildirimsel (declarative) spec olarak tanımlanır ve iki çekirdeğe
+derlenir:
+- Batch kernel: tüm DataFrame üzerinde vektörize NumPy işlemleri
+- Row kernel: tek hasta (dict) için saf Python hesaplama (pandas overhead'i yok)
+
+Bileşik skorlar (Environmental_Risk ... Overall_Risk_Score, Critical_Symptom_Count,
+bin kodları) FEATURE_RANGES tanım kümesi üzerinde önceden tablolara dökülür
+(ScoreTables); batch kernel tanım kümesi içindeki tamsayı girişte bunları
+tablo okuması (gather) ile hesaplar.
+
+Spec, config.py'deki AGE_BINS, SMOKING_BINS, POLLUTION_BINS, RISK_WEIGHTS ve
+CRITICAL_SYMPTOM_THRESHOLD değerlerinden türetilir.
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    FINAL_FEATURES,
+    FEATURE_RANGES,
+    AGE_BINS,
+    SMOKING_BINS,
+    POLLUTION_BINS,
+    RISK_WEIGHTS,
+    CRITICAL_SYMPTOM_THRESHOLD,
+)
+
+# =============================================================================
+# FEATURE SPEC (ÖZELLİK TANIMLARI)
+# =============================================================================
+# Ham giriş kolonları (FEATURE_RANGES sırası = ham veri şeması)
+RAW_FEATURES = list(FEATURE_RANGES.keys())
+
+# Balanced Diet koruyucu bir faktör, risk için tersine çevrilir (10 - değer)
+BALANCED_DIET_CEILING = 10
+
+SYMPTOM_COLUMNS = [
+    'Chest Pain', 'Coughing of Blood', 'Fatigue', 'Weight Loss',
+    'Shortness of Breath', 'Wheezing', 'Swallowing Difficulty'
+]
+
+CRITICAL_SYMPTOM_COLUMNS = [
+    'Chest Pain', 'Coughing of Blood', 'Weight Loss', 'Shortness of Breath'
+]
+
+# Her giriş bir özellik tanımlar. Desteklenen tipler:
+#   bin      : pd.cut(source, bins) ile aynı, etiketler 0..n-1 ordinal
+#   linear   : (sum(coef * source) + offset) / divisor  (tamsayı katsayılar)
+#   weighted : sum(weight * derived_feature)
+#   count_ge : sources içinde threshold'a eşit/büyük olanların sayısı
+#   product  : source_a * source_b
+#   power    : source ** exponent
+FEATURE_SPEC = [
+    {'name': 'Age_Group', 'kind': 'bin', 'source': 'Age', 'bins': AGE_BINS},
+    {'name': 'Environmental_Risk', 'kind': 'linear',
+    'terms': {'Air Pollution': 1, 'Dust Allergy': 1, 'OccuPational Hazards': 1},
+    'offset': 0, 'divisor': 3},
+    {'name': 'Lifestyle_Risk', 'kind': 'linear',
+    'terms': {'Smoking': 1, 'Alcohol use': 1, 'Obesity': 1, 'Balanced Diet': -1},
+    'offset': BALANCED_DIET_CEILING, 'divisor': 4},
+    {'name': 'Genetic_Health_Risk', 'kind': 'linear',
+    'terms': {'Genetic Risk': 1, 'chronic Lung Disease': 1},
+    'offset': 0, 'divisor': 2},
+    {'name': 'Symptom_Severity', 'kind': 'linear',
+    'terms': {col: 1 for col in SYMPTOM_COLUMNS},
+    'offset': 0, 'divisor': len(SYMPTOM_COLUMNS)},
+    {'name': 'Respiratory_Score', 'kind': 'linear',
+    'terms': {'Shortness of Breath': 1, 'Wheezing': 1, 'Dry Cough': 1, 'chronic Lung Disease': 1},
+    'offset': 0, 'divisor': 4},
+    {'name': 'Critical_Symptom_Count', 'kind': 'count_ge',
+    'sources': CRITICAL_SYMPTOM_COLUMNS, 'threshold': CRITICAL_SYMPTOM_THRESHOLD},
+    {'name': 'Overall_Risk_Score', 'kind': 'weighted',
+    'terms': {
+        'Environmental_Risk': RISK_WEIGHTS['environmental'],
+        'Lifestyle_Risk': RISK_WEIGHTS['lifestyle'],
+        'Genetic_Health_Risk': RISK_WEIGHTS['genetic_health'],
+        'Symptom_Severity': RISK_WEIGHTS['symptom'],
+    }},
+    {'name': 'Smoking_Age_Interaction', 'kind': 'product', 'sources': ('Smoking', 'Age')},
+    {'name': 'Genetic_Age_Interaction', 'kind': 'product', 'sources': ('Genetic Risk', 'Age')},
+    {'name': 'Smoking_Pollution', 'kind': 'product', 'sources': ('Smoking', 'Air Pollution')},
+    {'name': 'Obesity_ChronicLung', 'kind': 'product', 'sources': ('Obesity', 'chronic Lung Disease')},
+    {'name': 'PassiveSmoker_Pollution', 'kind': 'product', 'sources': ('Passive Smoker', 'Air Pollution')},
+    {'name': 'Smoking_squared', 'kind': 'power', 'source': 'Smoking', 'exponent': 2},
+    {'name': 'Air Pollution_squared', 'kind': 'power', 'source': 'Air Pollution', 'exponent': 2},
+    {'name': 'Genetic Risk_squared', 'kind': 'power', 'source': 'Genetic Risk', 'exponent': 2},
+    {'name': 'Smoking_Level', 'kind': 'bin', 'source': 'Smoking', 'bins': SMOKING_BINS},
+    {'name': 'Pollution_Level', 'kind': 'bin', 'source': 'Air Pollution', 'bins': POLLUTION_BINS},
+]
+
+ENGINEERED_FEATURES = [entry['name'] for entry in FEATURE_SPEC]
+
+
+# =============================================================================
+# COMPILED SPEC (DERLENMİŞ SPEC)
+# =============================================================================
+class CompiledFeatureSpec:
+    """
+    Feature spec compiled into index arrays and coefficient matrices
+
+    Batch kernel tüm satırları tek seferde hesaplar; row kernel aynı
+    sırayla, aynı aritmetikle tek bir kaydı hesaplar (parity garantisi).
+    """
+
+    def __init__(self, spec, ranges=None):
+        """
+        Compile spec
+
+        Args:
+            spec: List of feature definitions (see FEATURE_SPEC)
+            ranges: {column: (min, max)} integer domain; when given, composite
+                scores are precomputed into ScoreTables for the batch kernel
+        """
+        self.spec = spec
+        self.output_names = [entry['name'] for entry in spec]
+
+        # Spec'in ihtiyaç duyduğu ham kolonlar (RAW_FEATURES sırasında)
+        needed = set()
+        for entry in spec:
+            if entry['kind'] in ('bin', 'power'):
+                needed.add(entry['source'])
+            elif entry['kind'] == 'linear':
+                needed.update(entry['terms'])
+            elif entry['kind'] in ('count_ge', 'product'):
+                needed.update(entry['sources'])
+        self.input_columns = [col for col in RAW_FEATURES if col in needed]
+        self.input_columns += sorted(needed - set(self.input_columns))
+        col_index = {col: i for i, col in enumerate(self.input_columns)}
+
+        # Linear features -> tek bir tamsayı katsayı matrisi (tamsayı girişte kesin)
+        linear = [entry for entry in spec if entry['kind'] == 'linear']
+        self.linear_names = [entry['name'] for entry in linear]
+        self.linear_matrix = np.zeros((len(self.input_columns), len(linear)), dtype=np.int64)
+        for j, entry in enumerate(linear):
+            for col, coef in entry['terms'].items():
+                self.linear_matrix[col_index[col], j] = coef
+        self.linear_offsets = np.array([entry['offset'] for entry in linear], dtype=np.int64)
+        self.linear_divisors = np.array([entry['divisor'] for entry in linear], dtype=np.float64)
+
+        # Diğer tipler -> (name, kind, compiled args) op listesi, spec sırasında
+        self.ops = []
+        for entry in spec:
+            kind = entry['kind']
+            if kind == 'linear':
+                j = self.linear_names.index(entry['name'])
+                terms = tuple((col_index[col], coef) for col, coef in entry['terms'].items())
+                args = (j, terms, entry['offset'], entry['divisor'])
+            elif kind == 'bin':
+                edges = tuple(float(edge) for edge in entry['bins'])
+                args = (col_index[entry['source']], np.asarray(edges), edges)
+            elif kind == 'weighted':
+                args = tuple(entry['terms'].items())
+            elif kind == 'count_ge':
+                args = (np.array([col_index[col] for col in entry['sources']]), entry['threshold'])
+            elif kind == 'product':
+                args = tuple(col_index[col] for col in entry['sources'])
+            elif kind == 'power':
+                args = (col_index[entry['source']], entry['exponent'])
+            else:
+                raise ValueError(f"Unknown feature kind: {kind}")
+            self.ops.append((entry['name'], kind, args))
+
+        # Tanım kümesi tüm giriş kolonlarını kapsıyorsa skorlar tabloya dökülür
+        self.tables = None
+        if ranges is not None and all(col in ranges for col in self.input_columns):
+            self.tables = ScoreTables(self, ranges)
+
+    # -------------------------------------------------------------------------
+    # BATCH KERNEL
+    # -------------------------------------------------------------------------
+    def transform(self, X):
+        """
+        Vectorized batch kernel
+
+        Args:
+            X: 2D array with columns in self.input_columns order
+
+        Returns:
+            dict: feature name -> 1D array
+        """
+        X = np.asarray(X)
+        is_integer = np.issubdtype(X.dtype, np.integer)
+        X_int = X.astype(np.int64, copy=False) if is_integer else X.astype(np.float64, copy=False)
+
+        # Tanım kümesi içindeki tamsayı girişte skorlar tablodan okunur
+        index = self.tables.index(X_int) if self.tables is not None and is_integer else None
+        if index is None:
+            linear_sums = X_int @ self.linear_matrix + self.linear_offsets
+        out = {}
+        for name, kind, args in self.ops:
+            if index is not None and name in self.tables.entries:
+                out[name] = self.tables.lookup(name, index)
+            elif kind == 'linear':
+                out[name] = linear_sums[:, args[0]] / self.linear_divisors[args[0]]
+            elif kind == 'bin':
+                idx, edges, _ = args
+                codes = np.searchsorted(edges, X_int[:, idx], side='left') - 1
+                out[name] = np.clip(codes, 0, len(edges) - 2).astype(np.int64)
+            elif kind == 'weighted':
+                acc = None
+                for feature, weight in args:
+                    term = out[feature] * weight
+                    acc = term if acc is None else acc + term
+                out[name] = acc
+            elif kind == 'count_ge':
+                idx, threshold = args
+                out[name] = (X_int[:, idx] >= threshold).sum(axis=1).astype(np.int64)
+            elif kind == 'product':
+                out[name] = X_int[:, args[0]] * X_int[:, args[1]]
+            elif kind == 'power':
+                out[name] = X_int[:, args[0]] ** args[1]
+        return out
+
+    # -------------------------------------------------------------------------
+    # ROW KERNEL
+    # -------------------------------------------------------------------------
+    def transform_row(self, values):
+        """
+        Single-row kernel (pure Python, no pandas)
+
+        Args:
+            values: Sequence with values in self.input_columns order
+
+        Returns:
+            dict: feature name -> scalar
+        """
+        out = {}
+        for name, kind, args in self.ops:
+            if kind == 'linear':
+                _, terms, offset, divisor = args
+                total = offset
+                for idx, coef in terms:
+                    total += coef * values[idx]
+                out[name] = total / divisor
+            elif kind == 'bin':
+                idx, _, edges = args
+                code = bisect_left(edges, values[idx]) - 1
+                out[name] = min(max(code, 0), len(edges) - 2)
+            elif kind == 'weighted':
+                acc = None
+                for feature, weight in args:
+                    term = out[feature] * weight
+                    acc = term if acc is None else acc + term
+                out[name] = acc
+            elif kind == 'count_ge':
+                idx, threshold = args
+                out[name] = sum(1 for i in idx if values[i] >= threshold)
+            elif kind == 'product':
+                out[name] = values[args[0]] * values[args[1]]
+            elif kind == 'power':
+                out[name] = values[args[0]] ** args[1]
+        return out
+
+
+# =============================================================================
+# LOOKUP TABLES (ÖNCEDEN HESAPLANMIŞ SKOR TABLOLARI)
+# =============================================================================
+# count_ge için paketlenmiş kod tablosunun üst sınırı (giriş sayısı)
+MAX_LOOKUP_TABLE_SIZE = 1 << 16
+
+
+class ScoreTables:
+    """
+    Composite scores precomputed over the whole integer input domain
+
+    - linear: yalnızca bileşenlerin tamsayı toplamına bağlıdır -> toplam ile
+      indekslenen tablo (ör. Symptom_Severity: 7..63 -> 57 giriş)
+    - weighted: terim başına (tablo * ağırlık) tablolarının spec sırasıyla toplamı
+    - bin: kaynak değer ile indekslenen kod tablosu
+    - count_ge: kaynak değerlerin karma tabanlı (mixed-radix) paket kodu ile
+      indekslenen sayım tablosu (MAX_LOOKUP_TABLE_SIZE'a kadar)
+
+    Tablolar çekirdeklerle aynı aritmetik ve aynı sırayla doldurulur, bu yüzden
+    tablo okuması bit düzeyinde aynı sonucu verir.
+    """
+
+    def __init__(self, compiled, ranges):
+        """
+        Build tables
+
+        Args:
+            compiled: CompiledFeatureSpec
+            ranges: {column: (min, max)} covering compiled.input_columns
+        """
+        columns = compiled.input_columns
+        self.lower = np.array([ranges[col][0] for col in columns], dtype=np.int64)
+        self.upper = np.array([ranges[col][1] for col in columns], dtype=np.int64)
+
+        # Linear toplamların aralığı: pozitif katsayı alt sınırda, negatif üst sınırda en küçük
+        matrix = compiled.linear_matrix
+        low_terms = np.where(matrix > 0, matrix * self.lower[:, None], matrix * self.upper[:, None])
+        high_terms = np.where(matrix > 0, matrix * self.upper[:, None], matrix * self.lower[:, None])
+        sum_low = low_terms.sum(axis=0) + compiled.linear_offsets
+        sum_high = high_terms.sum(axis=0) + compiled.linear_offsets
+        # Küçük tamsayılar float64'te kesin -> toplamlar tek BLAS çarpımıyla hesaplanır
+        self.linear_matrix = matrix.T.astype(np.float64)
+        self.linear_shift = (sum_low - compiled.linear_offsets).astype(np.float64)
+        linear_tables = [
+            np.arange(low, high + 1, dtype=np.int64) / divisor
+            for low, high, divisor in zip(sum_low, sum_high, compiled.linear_divisors)
+        ]
+
+        # name -> [(index key, table)]; sonuç = Σ table[index[key]] (spec sırasıyla)
+        self.entries = {}
+        self.codes = []
+        self.value_columns = []
+        for name, kind, args in compiled.ops:
+            if kind == 'linear':
+                self.entries[name] = [(('sum', args[0]), linear_tables[args[0]])]
+            elif kind == 'weighted' and all(feature in compiled.linear_names for feature, _ in args):
+                self.entries[name] = [
+                    (('sum', compiled.linear_names.index(feature)),
+                    linear_tables[compiled.linear_names.index(feature)] * weight)
+                    for feature, weight in args
+                ]
+            elif kind == 'bin':
+                idx, edges, _ = args
+                values = np.arange(self.lower[idx], self.upper[idx] + 1)
+                codes = np.searchsorted(edges, values, side='left') - 1
+                self.entries[name] = [(('value', idx), np.clip(codes, 0, len(edges) - 2).astype(np.int64))]
+                self.value_columns.append(idx)
+            elif kind == 'count_ge':
+                idx, threshold = args
+                spans = self.upper[idx] - self.lower[idx] + 1
+                if np.prod(spans) > MAX_LOOKUP_TABLE_SIZE:
+                    continue
+                grid = np.indices(spans).reshape(len(idx), -1) + self.lower[idx][:, None]
+                strides = np.cumprod(np.r_[spans[1:], 1][::-1])[::-1]
+                self.codes.append((idx, strides.astype(np.float64), float(strides @ self.lower[idx])))
+                table = (grid >= threshold).sum(axis=0).astype(np.int64)
+                self.entries[name] = [(('code', len(self.codes) - 1), table)]
+
+    def index(self, X):
+        """
+        Table indices for integer rows (None if any value is outside the domain)
+
+        Args:
+            X: Integer 2D array in compiled.input_columns order
+
+        Returns:
+            dict: index key -> 1D intp array, or None
+        """
+        if len(X) == 0:
+            return None
+        # DataFrame.to_numpy() kolon-öncelikli (F-order) döner -> X.T kopyasız ardışık
+        X_t = np.ascontiguousarray(X.T)
+        if (X_t.min(axis=1) < self.lower).any() or (X_t.max(axis=1) > self.upper).any():
+            return None
+
+        X_float = X_t.astype(np.float64)
+        sums = (self.linear_matrix @ X_float - self.linear_shift[:, None]).astype(np.intp)
+        index = {('sum', j): sums[j] for j in range(len(sums))}
+        for k, (idx, strides, shift) in enumerate(self.codes):
+            index[('code', k)] = (strides @ X_float[idx] - shift).astype(np.intp)
+        for j in self.value_columns:
+            index[('value', j)] = X_t[j] - self.lower[j]
+        return index
+
+    def lookup(self, name, index):
+        """Gather one feature from its table(s)"""
+        acc = None
+        for key, table in self.entries[name]:
+            term = table[index[key]]
+            acc = term if acc is None else acc + term
+        return acc
+
+
+def compile_spec(spec=None, ranges=FEATURE_RANGES):
+    """
+    Compile a feature spec into batch and row kernels
+
+    Args:
+        spec: Feature spec list (default: FEATURE_SPEC)
+        ranges: Integer input domain for the lookup tables (None: arithmetic only)
+
+    Returns:
+        CompiledFeatureSpec
+    """
+    return CompiledFeatureSpec(FEATURE_SPEC if spec is None else spec, ranges)
+
+
+COMPILED_SPEC = compile_spec()
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+def engineer_features(df, compiled=None):
+    """
+    Apply feature engineering to a DataFrame (batch kernel)
+
+    Args:
+        df: DataFrame with raw features
+        compiled: CompiledFeatureSpec (default: COMPILED_SPEC)
+
+    Returns:
+        DataFrame with raw + engineered features
+    """
+    compiled = compiled or COMPILED_SPEC
+    engineered = compiled.transform(df[compiled.input_columns].to_numpy())
+    engineered_df = pd.DataFrame(engineered, index=df.index)
+
+    # Tek concat -> kolon kolon ekleme yüzünden block manager yeniden tahsis edilmez
+    base = df.drop(columns=[c for c in compiled.output_names if c in df.columns])
+    return pd.concat([base, engineered_df], axis=1)
+
+
+def engineer_row(record, compiled=None):
+    """
+    Apply feature engineering to a single patient record (row kernel)
+
+    Args:
+        record: Dict with raw features
+        compiled: CompiledFeatureSpec (default: COMPILED_SPEC)
+
+    Returns:
+        dict: Raw + engineered features
+    """
+    compiled = compiled or COMPILED_SPEC
+    values = [float(record[col]) for col in compiled.input_columns]
+    result = dict(record)
+    result.update(compiled.transform_row(values))
+    return result
+
+
+def build_feature_matrix(df, feature_names=None, compiled=None):
+    """
+    Build the model input matrix from raw data (batch)
+
+    Args:
+        df: DataFrame with raw features
+        feature_names: Output column order (default: FINAL_FEATURES)
+        compiled: CompiledFeatureSpec (default: COMPILED_SPEC)
+
+    Returns:
+        np.ndarray of shape (n_rows, len(feature_names))
+    """
+    compiled = compiled or COMPILED_SPEC
+    feature_names = FINAL_FEATURES if feature_names is None else feature_names
+    engineered = compiled.transform(df[compiled.input_columns].to_numpy())
+    columns = [engineered[name] if name in engineered else df[name].to_numpy()
+            for name in feature_names]
+    return np.column_stack(columns).astype(np.float64)
+
+
+def build_feature_vector(record, feature_names=None, compiled=None):
+    """
+    Build the model input vector for a single patient record
+
+    Args:
+        record: Dict with raw features
+        feature_names: Output order (default: FINAL_FEATURES)
+        compiled: CompiledFeatureSpec (default: COMPILED_SPEC)
+
+    Returns:
+        list of floats
+    """
+    feature_names = FINAL_FEATURES if feature_names is None else feature_names
+    row = engineer_row(record, compiled)
+    return [float(row[name]) for name in feature_names]
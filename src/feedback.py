@@ -0,0 +1,178 @@
+"""
+Prediction Feedback - Late Diagnosis Labels
+===========================================
+Doğrulanmış tanılar tahminden günler sonra gelir. Tahmin kaydı (PREDICTION_LOG_PATH)
+yeniden yazılmaz; etiketler ayrı, yalnızca sona eklenen LABEL_LOG_PATH'e (JSONL) yazılır.
+
+- Tahmin kimliği: kaydın 'id' alanı (API /predict ve monitoring.log_prediction uuid
+  yazar); 'id' olmayan eski kayıtlar için zaman damgası + girdi + tahminden türetilen sabit hash
+- append_predictions(): API'nin sunduğu tahminler yanıt gönderildikten sonra (arka plan
+  görevi) tek okuma + atomik yeniden yazım ile kayda eklenir
+- attach_label(): kimliği tahmin kaydında arar ve {id, label, prediction, timestamp}
+  satırı ekler; aynı kimliğe sonradan gelen etiket öncekini düzeltir
+- Tüketiciler kayıtları kimlikle izler (retraining: tüketilen kimlikler, scheduler:
+  etiket günlüğündeki byte konumu + kimlik başına tek sayım); önceden okunmuş bir
+  tahmine geç gelen etiket de görülür
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from config import PREDICTION_LOG_PATH, LABEL_LOG_PATH
+from data_loader import LEVEL_CATEGORIES
+
+# Aynı süreçteki eşzamanlı yazımlar (API arka plan görevleri) sırayla yapılır
+_log_lock = threading.Lock()
+
+
+def load_prediction_log(path=PREDICTION_LOG_PATH):
+    """
+    Read the prediction log written by monitoring.log_prediction
+
+    Returns:
+        list: Log entries (empty if the file does not exist)
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def new_prediction_entry(input_data, prediction, probability, now=None):
+    """
+    Prediction log entry with a fresh id (monitoring.log_prediction format)
+
+    Args:
+        input_data: Raw-schema patient record
+        prediction: Predicted level
+        probability: {class: probability}
+        now: Prediction time (default: datetime.now())
+
+    Returns:
+        dict: Log entry; its 'id' is the prediction_id returned to the client
+    """
+    return {
+        'id': uuid.uuid4().hex,
+        'timestamp': (now or datetime.now()).isoformat(),
+        'input': input_data,
+        'prediction': prediction,
+        'probability': probability,
+        'high_risk_prob': probability.get('High', probability.get('high', 0))
+    }
+
+
+def append_predictions(entries, log_path=None):
+    """
+    Append served predictions to the prediction log (atomic rewrite)
+
+    Args:
+        entries: new_prediction_entry() outputs
+        log_path: Prediction log (default: PREDICTION_LOG_PATH, resolved at call time)
+    """
+    path = Path(PREDICTION_LOG_PATH if log_path is None else log_path)
+    with _log_lock:
+        logs = load_prediction_log(path) + list(entries)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(logs, indent=2))
+        os.replace(tmp, path)
+
+
+def entry_id(entry):
+    """Stable id of a prediction log entry ('id' field, or a content hash for old entries)"""
+    if entry.get('id'):
+        return str(entry['id'])
+    content = json.dumps([entry.get('timestamp'), entry.get('input'), entry.get('prediction')],
+                        sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()[:32]
+
+
+def attach_label(prediction_id, label, log_path=None, label_path=None, now=None):
+    """
+    Record the confirmed diagnosis of a logged prediction
+
+    Args:
+        prediction_id: entry_id() of the prediction log entry
+        label: Confirmed level (LEVEL_CATEGORIES)
+        log_path: Prediction log (default: PREDICTION_LOG_PATH)
+        label_path: Append-only label log, JSONL (default: LABEL_LOG_PATH)
+        now: Label time (default: datetime.now())
+
+    Returns:
+        dict: The appended label event
+
+    Raises:
+        ValueError: If the label is not a known level
+        KeyError: If no logged prediction has this id
+    """
+    log_path = PREDICTION_LOG_PATH if log_path is None else log_path
+    label_path = LABEL_LOG_PATH if label_path is None else label_path
+    if label not in LEVEL_CATEGORIES:
+        raise ValueError(f"Unknown label: {label} (expected one of {LEVEL_CATEGORIES})")
+    entry = next((e for e in load_prediction_log(log_path) if entry_id(e) == str(prediction_id)), None)
+    if entry is None:
+        raise KeyError(prediction_id)
+
+    event = {
+        'id': str(prediction_id),
+        'label': label,
+        'prediction': entry.get('prediction'),
+        'timestamp': (now or datetime.now()).isoformat(),
+    }
+    label_path = Path(label_path)
+    label_path.parent.mkdir(exist_ok=True, parents=True)
+    with open(label_path, 'a') as f:
+        f.write(json.dumps(event) + '\n')
+    return event
+
+
+def read_label_events(path=LABEL_LOG_PATH, offset=0):
+    """
+    Label events appended after a byte offset
+
+    Yalnızca tamamlanmış (newline ile biten) satırlar okunur; yazımı süren satır
+    bir sonraki okumada alınır.
+
+    Args:
+        path: Label log (JSONL)
+        offset: Byte offset after the last complete line read
+
+    Returns:
+        tuple: (events, new offset, reset flag - the file shrank, read from the start)
+    """
+    path = Path(path)
+    if not path.exists():
+        return [], 0, offset > 0
+    reset = offset > path.stat().st_size
+    if reset:
+        offset = 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+
+    events = []
+    for line in data[:end].splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.get('id') and event.get('label') in LEVEL_CATEGORIES:
+            events.append(event)
+    return events, offset + end, reset
+
+
+def load_labels(path=LABEL_LOG_PATH):
+    """
+    Latest label per prediction id
+
+    Returns:
+        dict: {prediction id: label}
+    """
+    return {event['id']: event['label'] for event in read_label_events(path)[0]}
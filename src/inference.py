@@ -4,17 +4,55 @@ Inference module for Lung Cancer Risk Prediction - FIXED VERSION
 import joblib
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from config import FINAL_MODEL_PATH as MODEL_PATH, FINAL_SCALER_PATH as SCALER_PATH, FEATURE_LIST_PATH as FEATURE_NAMES_PATH
-
+from features import build_feature_vector, build_feature_matrix, engineer_row
+from tree_kernel import ForestKernel, supports
+from artifacts import load_bundle
+
+# API'deki risk faktörü adı -> bileşik özellik (features.FEATURE_SPEC)
+RISK_FACTOR_FEATURES = {
+    'Lifestyle Risk': 'Lifestyle_Risk',
+    'Environmental Risk': 'Environmental_Risk',
+    'Genetic/Health Risk': 'Genetic_Health_Risk',
+    'Symptom Severity': 'Symptom_Severity',
+    'Critical Symptoms': 'Critical_Symptom_Count',
+}
+
+
+def risk_factor_scores(input_data):
+    """
+    Composite risk scores of a raw record (model independent)
+
+    Args:
+        input_data (dict): Raw input features
+
+    Returns:
+        dict: risk_factors (RISK_FACTOR_FEATURES names) and overall_risk_score
+    """
+    row = engineer_row(input_data)
+    return {
+        'risk_factors': {name: float(row[feature]) for name, feature in RISK_FACTOR_FEATURES.items()},
+        'overall_risk_score': float(row['Overall_Risk_Score'])
+    }
 
 
 class LungCancerPredictor:
 
-    def __init__(self):
-        """Initialize predictor with saved model and scaler"""
+    def __init__(self, model_path=None):
+        """
+        Initialize predictor with saved model and scaler
+
+        Args:
+            model_path: Model file (default: FINAL_MODEL_PATH; e.g. COMPACT_MODEL_PATH
+                for the pruned/distilled serving model)
+        """
+        self.model_path = model_path or MODEL_PATH
         self.model = None
         self.scaler = None
         self.feature_names = None
+        self.kernel = None
+        self.version = None
         self.load_model()
     
     def load_model(self):
@@ -23,15 +61,27 @@ class LungCancerPredictor:
         """Eğitilmiş modeli, ölçekleyiciyi ve özellik adlarını yükle"""
 
         try:
-        # load model
-            self.model = joblib.load(MODEL_PATH)
-            
-            # load scaler
-            self.scaler = joblib.load(SCALER_PATH)
-        
-            # Feature list
-            with open(FEATURE_NAMES_PATH, "r") as f:
-                self.feature_names = [line.strip() for line in f.readlines()]
+            # Manifest'li paket: checksum + model/scaler/feature uyumu doğrulanır (artifacts.py)
+            model_path = Path(self.model_path)
+            bundle = load_bundle(model_path.parent, model_path.name)
+            if bundle is not None:
+                self.model, self.scaler, self.feature_names = bundle.model, bundle.scaler, bundle.feature_names
+                self.version = bundle.version
+            else:
+                print(f"⚠️ No bundle manifest in {model_path.parent}, loading unverified files "
+                    f"(python artifacts.py --write)")
+                # load model
+                self.model = joblib.load(self.model_path)
+
+                # load scaler
+                self.scaler = joblib.load(SCALER_PATH)
+
+                # Feature list
+                with open(FEATURE_NAMES_PATH, "r") as f:
+                    self.feature_names = [line.strip() for line in f.readlines()]
+
+            # Ağaç modelleri joblib dağıtımı olmadan değerlendirilir (tree_kernel.py)
+            self.kernel = ForestKernel(self.model) if supports(self.model) else None
 
             # ⭐⭐ EKLEYECEĞİN SATIR TAM BURAYA ⭐⭐
             print("🔥 SCALER FEATURE LIST:", self.scaler.feature_names_in_)
@@ -60,127 +110,21 @@ class LungCancerPredictor:
         #     raise
     
     def prepare_features(self, input_data):
+        """
+        Build the scaled-model input row from raw patient data
 
-        # -----------------------------------
-        # 1) SAFE NUMERIC CONVERSION
-        # -----------------------------------
-        cleaned = {}
-        for key, value in input_data.items():
-            try:
-                cleaned[key] = float(value)
-            except:
-                cleaned[key] = value
-        input_data = cleaned
-
-        df = pd.DataFrame([input_data])
-
-        # -----------------------------------
-        # 2) BASIC FEATURE ENGINEERING
-        # -----------------------------------
-        df['Smoking_squared'] = df['Smoking'] ** 2
-        df['Air Pollution_squared'] = df['Air Pollution'] ** 2
-
-        df['Age_Group'] = pd.cut(
-            df['Age'], [0, 25, 40, 55, 100],
-            labels=['Young', 'Adult', 'Middle_Aged', 'Senior']
-        )
-
-        df['Smoking_Level'] = pd.cut(
-            df['Smoking'], [0, 2, 5, 10],
-            labels=['Low', 'Medium', 'High']
-        )
-
-        # -----------------------------------
-        # 3) ENVIRONMENTAL RISK
-        # -----------------------------------
-        df['Environmental_Risk'] = (
-            df['Air Pollution'] +
-            df['Dust Allergy'] +
-            df['OccuPational Hazards']
-        )
-
-        # -----------------------------------
-        # 4) LIFESTYLE RISK
-        # -----------------------------------
-        df['Lifestyle_Risk'] = (
-            df['Smoking'] +
-            df['Alcohol use'] +
-            df['Obesity'] +
-            (10 - df['Balanced Diet'])
-        ) / 4
-
-        # -----------------------------------
-        # 5) GENETIC / HEALTH RISK
-        # -----------------------------------
-        df['Genetic_Health_Risk'] = (
-            df['Genetic Risk'] +
-            df['chronic Lung Disease']
-        ) / 2
-
-        # -----------------------------------
-        # 6) SYMPTOM SEVERITY
-        # -----------------------------------
-        symptom_cols = [
-            'Chest Pain', 'Coughing of Blood', 'Fatigue', 'Weight Loss',
-            'Shortness of Breath', 'Wheezing', 'Swallowing Difficulty'
-        ]
-        df['Symptom_Severity'] = df[symptom_cols].mean(axis=1)
-
-        # -----------------------------------
-        # 7) RESPIRATORY SCORE
-        # -----------------------------------
-        df['Respiratory_Score'] = (
-            df['Shortness of Breath'] +
-            df['Wheezing'] +
-            df['Dry Cough'] +
-            df['chronic Lung Disease']
-        ) / 4
-
-        # -----------------------------------
-        # 8) CRITICAL SYMPTOM COUNT
-        # -----------------------------------
-        critical_threshold = 6
-        df['Critical_Symptom_Count'] = (
-            (df['Chest Pain'] >= critical_threshold).astype(int) +
-            (df['Coughing of Blood'] >= critical_threshold).astype(int) +
-            (df['Weight Loss'] >= critical_threshold).astype(int) +
-            (df['Shortness of Breath'] >= critical_threshold).astype(int)
-        )
-
-        # -----------------------------------
-        # 9) OVERALL RISK SCORE
-        # -----------------------------------
-        df['Overall_Risk_Score'] = (
-            df['Environmental_Risk'] * 0.25 +
-            df['Lifestyle_Risk'] * 0.30 +
-            df['Genetic_Health_Risk'] * 0.20 +
-            df['Symptom_Severity'] * 0.25
-        )
-
-        # -----------------------------------
-        # 10) INTERACTION FEATURES
-        # -----------------------------------
-        df['Smoking_Age_Interaction'] = df['Smoking'] * df['Age']
-        df['Genetic_Age_Interaction'] = df['Genetic Risk'] * df['Age']
-
-        # -----------------------------------
-        # 11) ONE-HOT ENCODING
-        # -----------------------------------
-        df_encoded = pd.get_dummies(df, drop_first=True)
-
-        # -----------------------------------
-        # 12) ALIGN COLUMNS (VERY IMPORTANT)
-        # -----------------------------------
-        for col in self.feature_names:
-                if col not in df_encoded.columns:
-                    df_encoded[col] = 0
-
-        df_encoded = df_encoded[self.feature_names]
-
-        return df_encoded
+        Feature engineering, eğitimle aynı paylaşılan spec'in (features.py)
+        tek satır çekirdeği ile yapılır.
 
+        Args:
+            input_data (dict): Raw input features
+
+        Returns:
+            pd.DataFrame: Single row with columns in self.feature_names order
+        """
+        vector = build_feature_vector(input_data, self.feature_names)
+        return pd.DataFrame([vector], columns=self.feature_names)
 
-        
     def predict(self, input_data):
         """
         Make prediction
@@ -197,12 +141,45 @@ class LungCancerPredictor:
         # Scale
         X_scaled = self.scaler.transform(X)
         
-        # Predict
-        prediction = self.model.predict(X_scaled)[0]
-        probability = self.model.predict_proba(X_scaled)[0]
+        # Predict (argmax of probabilities, same as model.predict)
+        probability = self.predict_proba_scaled(X_scaled)[0]
+        prediction = self.model.classes_[probability.argmax()]
         
         return prediction, probability
+
+    def predict_proba_scaled(self, X_scaled):
+        """
+        Class probabilities for already scaled model input
+
+        Args:
+            X_scaled: Scaled rows (n, len(self.feature_names))
+
+        Returns:
+            np.ndarray: (n, n_classes) in model.classes_ order
+        """
+        if self.kernel is not None:
+            return self.kernel.predict_proba(X_scaled)
+        return self.model.predict_proba(X_scaled)
     
+    def predict_batch(self, df):
+        """
+        Score many raw records in one pass (vectorized feature engineering + model)
+
+        Args:
+            df (pd.DataFrame): Raw features (RAW_FEATURES columns)
+
+        Returns:
+            pd.DataFrame: prediction, confidence and prob_<class> columns (same index as df)
+        """
+        X = pd.DataFrame(build_feature_matrix(df, self.feature_names), columns=self.feature_names)
+        probability = self.predict_proba_scaled(self.scaler.transform(X))
+        classes = self.model.classes_
+
+        result = pd.DataFrame(probability, columns=[f"prob_{c}" for c in classes], index=df.index)
+        result.insert(0, 'prediction', classes[probability.argmax(axis=1)])
+        result.insert(1, 'confidence', probability.max(axis=1))
+        return result
+
     def predict_with_details(self, input_data):
         """
         Make prediction with detailed output
@@ -243,6 +220,26 @@ class LungCancerPredictor:
         
         return result
 
+    def predict_with_risk_factors(self, input_data):
+        """
+        Make prediction with the /predict output (all class probabilities + composite risk scores)
+
+        Args:
+            input_data (dict): Raw input features
+
+        Returns:
+            dict: prediction, probabilities ({class: probability}), confidence,
+                risk_factors (RISK_FACTOR_FEATURES names) and overall_risk_score
+        """
+        prediction, probability = self.predict(input_data)
+
+        return {
+            'prediction': str(prediction),
+            'probabilities': {str(c): float(p) for c, p in zip(self.model.classes_, probability)},
+            'confidence': float(probability.max()),
+            **risk_factor_scores(input_data)
+        }
+
 
 # Test function
 if __name__ == "__main__":
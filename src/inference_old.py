@@ -22,6 +22,8 @@ except:
     FINAL_SCALER_PATH = 'models/final_scaler.pkl'
     CRITICAL_SYMPTOM_THRESHOLD = 6
 
+from features import engineer_features
+
 class LungCancerPredictor:
     """
     Cancer Risk Level Predictor
@@ -75,80 +77,8 @@ class LungCancerPredictor:
         Returns:
             DataFrame with engineered features
         """
-        df_fe = df.copy()
-        
-        # Age Groups
-        df_fe['Age_Group'] = pd.cut(
-            df_fe['Age'], 
-            bins=[0, 25, 40, 55, 100], 
-            labels=[0, 1, 2, 3]).astype(int)
-
-        # Risk Scores
-        df_fe['Environmental_Risk'] = (
-            df_fe['Air Pollution'] + 
-            df_fe['Dust Allergy'] + 
-            df_fe['OccuPational Hazards']
-        ) / 3
-        
-        df_fe['Lifestyle_Risk'] = (
-            df_fe['Smoking'] + 
-            df_fe['Alcohol use'] + 
-            df_fe['Obesity'] +
-            (10 - df_fe['Balanced Diet'])
-        ) / 4
-        
-        df_fe['Genetic_Health_Risk'] = (
-            df_fe['Genetic Risk'] + 
-            df_fe['chronic Lung Disease']
-        ) / 2
-        
-        # Symptom scores
-        symptom_cols = ['Chest Pain', 'Coughing of Blood', 'Fatigue', 'Weight Loss',
-                        'Shortness of Breath', 'Wheezing', 'Swallowing Difficulty']
-        df_fe['Symptom_Severity'] = df_fe[symptom_cols].mean(axis=1)
-        
-        df_fe['Respiratory_Score'] = (
-            df_fe['Shortness of Breath'] + 
-            df_fe['Wheezing'] + 
-            df_fe['Dry Cough'] +
-            df_fe['chronic Lung Disease']
-        ) / 4
-        
-        # Critical symptoms
-        df_fe['Critical_Symptom_Count'] = (
-            (df_fe['Chest Pain'] >= CRITICAL_SYMPTOM_THRESHOLD).astype(int) +
-            (df_fe['Coughing of Blood'] >= CRITICAL_SYMPTOM_THRESHOLD).astype(int) +
-            (df_fe['Weight Loss'] >= CRITICAL_SYMPTOM_THRESHOLD).astype(int) +
-            (df_fe['Shortness of Breath'] >= CRITICAL_SYMPTOM_THRESHOLD).astype(int)
-        )
-        
-        # Overall risk
-        df_fe['Overall_Risk_Score'] = (
-            df_fe['Environmental_Risk'] * 0.25 +
-            df_fe['Lifestyle_Risk'] * 0.30 +
-            df_fe['Genetic_Health_Risk'] * 0.20 +
-            df_fe['Symptom_Severity'] * 0.25
-        )
-        
-        # Interactions
-        df_fe['Smoking_Age_Interaction'] = df_fe['Smoking'] * df_fe['Age']
-        df_fe['Genetic_Age_Interaction'] = df_fe['Genetic Risk'] * df_fe['Age']
-        df_fe['Smoking_Pollution'] = df_fe['Smoking'] * df_fe['Air Pollution']
-        df_fe['Obesity_ChronicLung'] = df_fe['Obesity'] * df_fe['chronic Lung Disease']
-        df_fe['PassiveSmoker_Pollution'] = df_fe['Passive Smoker'] * df_fe['Air Pollution']
-        
-        # Polynomial features
-        for feat in ['Smoking', 'Air Pollution', 'Genetic Risk']:
-            df_fe[f'{feat}_squared'] = df_fe[feat] ** 2
-        
-        # Binning
-        df_fe['Smoking_Level'] = pd.cut(df_fe['Smoking'], 
-        bins=[0, 2, 5, 10], 
-        labels=[0, 1, 2]).astype(int)
-        
-        df_fe['Pollution_Level'] = pd.cut(df_fe['Air Pollution'], 
-        bins=[0, 3, 6, 10], 
-        labels=[0, 1, 2]).astype(int)
+        # Paylaşılan feature spec (features.py) - eğitimle aynı batch çekirdeği
+        df_fe = engineer_features(df)
 
         return df_fe
     
@@ -172,17 +102,7 @@ class LungCancerPredictor:
         df_fe = self.engineer_features(df)
         
         # Select final features
-        final_features = [
-            'Smoking', 'Genetic Risk', 'Air Pollution', 'Alcohol use',
-            'chronic Lung Disease', 'Age', 'Obesity', 'Chest Pain',
-            'Coughing of Blood', 'Fatigue', 'Weight Loss', 'Shortness of Breath',
-            'Wheezing', 'Passive Smoker', 'OccuPational Hazards',
-            'Overall_Risk_Score', 'Lifestyle_Risk', 'Environmental_Risk',
-            'Symptom_Severity', 'Respiratory_Score', 'Genetic_Health_Risk',
-            'Smoking_Age_Interaction', 'Genetic_Age_Interaction',
-            'Smoking_squared', 'Air Pollution_squared', 'Critical_Symptom_Count',
-            'Age_Group', 'Smoking_Level'
-        ]
+        final_features = list(FINAL_FEATURES)
         
         X = df_fe[final_features]
         
@@ -0,0 +1,315 @@
+"""
+Global Interpretation - Permutation Importance & Partial Dependence Tables
+==========================================================================
+Model eğitildikten sonra bir kez hesaplanan, uygulamaların O(1) okuduğu tablolar.
+
+- Permutation importance: her ham özellik (RAW_FEATURES) test kümesinde karıştırılır,
+  doğruluk düşüşü ölçülür; özellikler thread havuzunda paralel işlenir
+- Partial dependence: FEATURE_RANGES sınırlı tamsayı alanları üzerinde bir ve iki
+  yönlü grid; her grid noktası için arka plan hastalarının ortalama olasılığı
+- Arama (lookup): her özellik için değer -> grid indeksi dizisi tutulur, böylece
+  bir hastanın değerinin etkisi tek indeksleme ile okunur
+"""
+
+import os
+from itertools import combinations
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import train_test_split
+
+from config import (
+    FEATURE_RANGES, INTERPRETATION_CONFIG, INTERPRETATION_PATH, RANDOM_STATE, TEST_SIZE,
+    FINAL_MODEL_PATH, FINAL_SCALER_PATH, FEATURE_LIST_PATH, RAW_DATA_PATH
+)
+from data_loader import load_raw_data, TARGET_COLUMN
+from features import RAW_FEATURES, build_feature_matrix
+
+
+def model_predict_fn(model, scaler, feature_names):
+    """
+    Raw-schema probability function of a fitted model
+
+    Returns:
+        callable: DataFrame (RAW_FEATURES) -> predict_proba array
+    """
+    def predict_proba(raw):
+        X = pd.DataFrame(build_feature_matrix(raw, feature_names), columns=feature_names)
+        return model.predict_proba(scaler.transform(X))
+    return predict_proba
+
+
+def feature_grid(name, resolution=None):
+    """
+    Integer grid over a feature's FEATURE_RANGES domain
+
+    Aralık `resolution` noktadan küçükse tüm tamsayılar kullanılır.
+    """
+    resolution = resolution or INTERPRETATION_CONFIG['grid_resolution']
+    low, high = FEATURE_RANGES[name]
+    if high - low + 1 <= resolution:
+        return np.arange(low, high + 1)
+    return np.unique(np.round(np.linspace(low, high, resolution)).astype(int))
+
+
+def _grid_index(name, grid):
+    """Lookup array: value - low -> index of the nearest grid point"""
+    low, high = FEATURE_RANGES[name]
+    values = np.arange(low, high + 1)
+    return np.abs(values[:, None] - grid[None, :]).argmin(axis=1)
+
+
+# =============================================================================
+# PERMUTATION IMPORTANCE
+# =============================================================================
+
+def _permuted_scores(predict_fn, classes, X_raw, y, feature, n_repeats, random_state):
+    """Accuracies with one feature shuffled n_repeats times"""
+    rng = np.random.default_rng(random_state)
+    scores = []
+    for _ in range(n_repeats):
+        shuffled = X_raw.copy()
+        shuffled[feature] = rng.permutation(shuffled[feature].to_numpy())
+        scores.append(np.mean(classes[predict_fn(shuffled).argmax(axis=1)] == y))
+    return scores
+
+
+def permutation_importance(predict_fn, classes, X_raw, y, n_repeats=None, n_jobs=None,
+                        random_state=RANDOM_STATE):
+    """
+    Accuracy drop when each raw feature is shuffled
+
+    Args:
+        predict_fn: DataFrame -> predict_proba (model_predict_fn)
+        classes: Class labels in predict_proba column order
+        X_raw: Held-out rows (RAW_FEATURES)
+        y: True labels
+        n_repeats: Shuffles per feature (default: from config)
+        n_jobs: Parallel features (default: all cores)
+        random_state: Seed (each feature gets its own stream)
+
+    Returns:
+        pd.DataFrame: feature, importance_mean, importance_std (sorted, largest first)
+    """
+    n_repeats = n_repeats or INTERPRETATION_CONFIG['n_repeats']
+    n_jobs = n_jobs or os.cpu_count() or 1
+    classes = np.asarray(classes)
+    y = np.asarray(y)
+    X_raw = X_raw[RAW_FEATURES].reset_index(drop=True)
+    baseline = np.mean(classes[predict_fn(X_raw).argmax(axis=1)] == y)
+
+    # predict_proba GIL'i bırakır: thread havuzu veri kopyalamadan paralel çalışır
+    scores = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(_permuted_scores)(predict_fn, classes, X_raw, y, feature, n_repeats, random_state + i)
+        for i, feature in enumerate(RAW_FEATURES)
+    )
+    drops = baseline - np.asarray(scores)
+    return pd.DataFrame({
+        'feature': RAW_FEATURES,
+        'importance_mean': drops.mean(axis=1),
+        'importance_std': drops.std(axis=1),
+    }).sort_values('importance_mean', ascending=False).reset_index(drop=True)
+
+
+# =============================================================================
+# PARTIAL DEPENDENCE
+# =============================================================================
+
+def partial_dependence(predict_fn, background, features, resolution=None):
+    """
+    One- or two-way partial dependence over integer grids
+
+    Tüm grid noktaları x arka plan satırları tek predict çağrısında skorlanır.
+
+    Args:
+        predict_fn: DataFrame -> predict_proba
+        background: Rows averaged over (RAW_FEATURES)
+        features: One or two feature names
+        resolution: Max grid points per feature
+
+    Returns:
+        tuple: (grids, values) with values of shape (*grid sizes, n_classes)
+    """
+    grids = [feature_grid(name, resolution) for name in features]
+    mesh = np.meshgrid(*grids, indexing='ij')
+    n_points, n_background = mesh[0].size, len(background)
+
+    rows = pd.DataFrame(np.tile(background[RAW_FEATURES].to_numpy(), (n_points, 1)), columns=RAW_FEATURES)
+    for name, values in zip(features, mesh):
+        rows[name] = np.repeat(values.ravel(), n_background)
+
+    proba = predict_fn(rows).reshape(n_points, n_background, -1).mean(axis=1)
+    return grids, proba.reshape(*[len(g) for g in grids], -1)
+
+
+# =============================================================================
+# LOOKUP TABLES
+# =============================================================================
+
+class InterpretationTables:
+    """
+    Precomputed global explanations with O(1) lookups
+
+    Args:
+        classes: Class labels (probability column order)
+        importance: permutation_importance DataFrame
+        pdp1: {feature: (grid, values (n_grid, n_classes))}
+        pdp2: {(feature_a, feature_b): (grid_a, grid_b, values (n_a, n_b, n_classes))}
+    """
+
+    def __init__(self, classes, importance, pdp1, pdp2):
+        self.classes = [str(c) for c in classes]
+        self.importance = importance
+        self.pdp1 = pdp1
+        self.pdp2 = pdp2
+        self._index = {name: _grid_index(name, grid) for name, (grid, _) in pdp1.items()}
+        # Özelliğin kendi alanı üzerindeki ortalama etkisi (uniform tamsayı değerler)
+        self._mean = {name: values[self._index[name]].mean(axis=0) for name, (_, values) in pdp1.items()}
+
+    def _class(self, label):
+        return self.classes.index(str(label))
+
+    def pdp(self, feature, value):
+        """Partial-dependence probabilities (all classes) at one feature value"""
+        _, values = self.pdp1[feature]
+        return values[self._index[feature][int(value) - FEATURE_RANGES[feature][0]]]
+
+    def pdp_pair(self, feature_a, feature_b, value_a, value_b):
+        """Two-way partial-dependence probabilities (pairs of top features only)"""
+        if (feature_a, feature_b) not in self.pdp2:
+            feature_a, feature_b, value_a, value_b = feature_b, feature_a, value_b, value_a
+        _, _, values = self.pdp2[(feature_a, feature_b)]
+        i = self._index[feature_a][int(value_a) - FEATURE_RANGES[feature_a][0]]
+        j = self._index[feature_b][int(value_b) - FEATURE_RANGES[feature_b][0]]
+        return values[i, j]
+
+    def effects(self, patient, label='High'):
+        """
+        How much each feature value moves P(label) relative to the feature's average
+
+        Args:
+            patient: Raw record (RAW_FEATURES)
+            label: Class whose probability is read
+
+        Returns:
+            dict: feature -> probability shift (positive = raises risk)
+        """
+        k = self._class(label)
+        return {
+            name: float(self.pdp(name, patient[name])[k] - self._mean[name][k])
+            for name in self.pdp1
+        }
+
+    def to_frames(self):
+        """Long-format one- and two-way tables (CSV export)"""
+        one_way = pd.concat([
+            pd.DataFrame(values, columns=[f"prob_{c}" for c in self.classes]).assign(feature=name, value=grid)
+            for name, (grid, values) in self.pdp1.items()
+        ], ignore_index=True)
+        two_way = [
+            pd.DataFrame(values.reshape(-1, len(self.classes)), columns=[f"prob_{c}" for c in self.classes]).assign(
+                feature_a=a, feature_b=b,
+                value_a=np.repeat(grid_a, len(grid_b)), value_b=np.tile(grid_b, len(grid_a)))
+            for (a, b), (grid_a, grid_b, values) in self.pdp2.items()
+        ]
+        return one_way, pd.concat(two_way, ignore_index=True) if two_way else pd.DataFrame()
+
+    def save(self, path=INTERPRETATION_PATH):
+        """Pickle tables and write CSV exports next to them"""
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        joblib.dump(self, path)
+        self.importance.to_csv(path.parent / 'permutation_importance.csv', index=False)
+        one_way, two_way = self.to_frames()
+        one_way.to_csv(path.parent / 'partial_dependence.csv', index=False)
+        two_way.to_csv(path.parent / 'partial_dependence_2d.csv', index=False)
+
+    @staticmethod
+    def load(path=INTERPRETATION_PATH):
+        """Load tables (None if they have not been built)"""
+        path = Path(path)
+        return joblib.load(path) if path.exists() else None
+
+
+def build_tables(predict_fn, classes, X_eval, y_eval, background, config=None, n_jobs=None,
+                random_state=RANDOM_STATE):
+    """
+    Compute importance and partial-dependence tables
+
+    Args:
+        predict_fn: DataFrame -> predict_proba
+        classes: Class labels
+        X_eval, y_eval: Held-out rows for permutation importance
+        background: Rows for PDP averaging (sampled to config['n_background'])
+        config: Overrides for INTERPRETATION_CONFIG
+        n_jobs: Parallel workers
+        random_state: Seed
+
+    Returns:
+        InterpretationTables
+    """
+    config = dict(INTERPRETATION_CONFIG, **(config or {}))
+    importance = permutation_importance(predict_fn, classes, X_eval, y_eval, config['n_repeats'],
+                                        n_jobs, random_state)
+
+    background = background[RAW_FEATURES]
+    if len(background) > config['n_background']:
+        background = background.sample(n=config['n_background'], random_state=random_state)
+
+    resolution = config['grid_resolution']
+    pdp1 = {}
+    for name in RAW_FEATURES:
+        (grid,), values = partial_dependence(predict_fn, background, [name], resolution)
+        pdp1[name] = (grid, values)
+
+    pdp2 = {}
+    top = importance['feature'].head(config['n_pair_features']).tolist()
+    for a, b in combinations(top, 2):
+        (grid_a, grid_b), values = partial_dependence(predict_fn, background, [a, b], resolution)
+        pdp2[(a, b)] = (grid_a, grid_b, values)
+
+    return InterpretationTables(classes, importance, pdp1, pdp2)
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    """Build tables for the deployed model (importance on the pipeline's test split)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Permutation importance & partial dependence tables")
+    parser.add_argument('--data-path', default=str(RAW_DATA_PATH), help="Raw data CSV")
+    parser.add_argument('--output', default=str(INTERPRETATION_PATH), help="Tables pickle")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("GLOBAL INTERPRETATION TABLES")
+    print("="*80)
+
+    model = joblib.load(FINAL_MODEL_PATH)
+    scaler = joblib.load(FINAL_SCALER_PATH)
+    with open(FEATURE_LIST_PATH) as f:
+        feature_names = [line.strip() for line in f if line.strip()]
+    df = load_raw_data(args.data_path)
+    y = df[TARGET_COLUMN].astype(str)
+    # pipeline.prepare_data ile aynı bölme: importance yalnızca test satırlarında ölçülür
+    train_idx, test_idx = train_test_split(df.index, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y)
+
+    tables = build_tables(model_predict_fn(model, scaler, feature_names), model.classes_,
+                        df.loc[test_idx, RAW_FEATURES], y[test_idx], df.loc[train_idx])
+    tables.save(args.output)
+
+    print("\n📊 Permutation importance (accuracy drop):")
+    print(tables.importance.head(10).round(4).to_string(index=False))
+    print(f"\n✅ Tables saved: {args.output}")
+
+
+if __name__ == '__main__':
+    # Modül adıyla çalıştır: tablolar __main__.InterpretationTables olarak pickle'lanmasın
+    import interpretation
+    interpretation.main()
@@ -8,6 +8,7 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import json
 import os
+import uuid
 
 # Page config
 st.set_page_config(
@@ -27,10 +28,11 @@ def init_logs():
             json.dump([], f)
 
 def log_prediction(input_data, prediction, probability, timestamp):
-    """Log prediction to file"""
+    """Log prediction to file, return its id (labels are attached later with feedback.attach_label)"""
     init_logs()
     
     log_entry = {
+        'id': uuid.uuid4().hex,
         'timestamp': timestamp.isoformat(),
         'input': input_data,
         'prediction': prediction,
@@ -48,6 +50,8 @@ def log_prediction(input_data, prediction, probability, timestamp):
     # Write back
     with open(LOG_FILE, 'w') as f:
         json.dump(logs, f, indent=2)
+    
+    return log_entry['id']
 
 def load_logs():
     """Load prediction logs"""
@@ -17,7 +17,7 @@ import pickle
 import json
 from pathlib import Path
 from datetime import datetime
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
@@ -33,6 +33,33 @@ except:
     TEST_SIZE = 0.2
     CV_FOLDS = 5
 
+from features import engineer_features, ENGINEERED_FEATURES
+from data_loader import load_raw_data, print_memory_report, RAW_SCHEMA, DEFAULT_CHUNKSIZE, LEVEL_CATEGORIES
+from feature_store import FeatureStore
+from features import FEATURE_SPEC, RAW_FEATURES
+from stage_cache import StageCache, stage_key, file_digest, code_version
+from cv_engine import cross_validate_parallel, format_classification_report
+from tuning import tune as run_tuning
+from compaction import compact_model, synthetic_patients
+from interpretation import build_tables, model_predict_fn
+from quantization import QuantizedForest, parity_report, forest_nbytes
+from sharded_scoring import random_patients
+from artifacts import write_manifest, training_metadata
+
+# Her aşamanın cache'e yazılan / cache'ten geri yüklenen çıktıları
+STAGE_OUTPUTS = {
+    'load_data': ['df'],
+    'engineer_features': ['df_fe'],
+    'prepare_data': ['X_train', 'X_test', 'y_train', 'y_test',
+                    'scaler', 'X_train_scaled', 'X_test_scaled'],
+    'train_model': ['model'],
+}
+STAGE_UPSTREAM = {
+    'engineer_features': 'load_data',
+    'prepare_data': 'engineer_features',
+    'train_model': 'prepare_data',
+}
+
 class MLPipeline:
     """
     Complete Machine Learning Pipeline
@@ -40,28 +67,57 @@ class MLPipeline:
     Handles data loading, preprocessing, training, and evaluation
     """
     
-    def __init__(self, data_path, random_state=42):
+    def __init__(self, data_path, random_state=42, streaming=False,
+                chunksize=DEFAULT_CHUNKSIZE, store_dir='feature_store',
+                cache_dir=None, force=False, cache_max_bytes=PIPELINE_CACHE_MAX_BYTES,
+                use_tuned_params=True):
         """
         Initialize pipeline
         
         Args:
             data_path: Path to raw data CSV
             random_state: Random seed for reproducibility
+            streaming: Out-of-core mode (chunked feature engineering into memmaps)
+            chunksize: Rows per chunk in streaming mode
+            store_dir: Feature store directory in streaming mode
+            cache_dir: Stage cache directory (None = no caching)
+            force: Recompute every stage even if cached
+            cache_max_bytes: Stage cache size limit
+            use_tuned_params: Override MODEL_PARAMS with TUNED_PARAMS_PATH if present
         """
         self.data_path = data_path
         self.random_state = random_state
+        self.streaming = streaming
+        self.chunksize = chunksize
+        self.store_dir = store_dir
         
         # Data
         self.df = None
         self.df_fe = None
+        self.feature_store = None
+        self.feature_names = list(FINAL_FEATURES)
         self.X_train = None
         self.X_test = None
         self.y_train = None
         self.y_test = None
         
+        # compact() için eğitimden önce train'den ayrılan doğrulama kümesi (run(compact=True))
+        self.compaction_holdout = False
+        
         # Models & preprocessing
         self.scaler = None
         self.model = None
+        self.model_params = dict(MODEL_PARAMS, random_state=random_state)
+        if use_tuned_params and Path(TUNED_PARAMS_PATH).exists():
+            with open(TUNED_PARAMS_PATH) as f:
+                self.model_params.update(json.load(f)['best_params'])
+        self.tuning_results = None
+        
+        # Stage cache (streaming modunda memmap çıktıları cache'lenmez)
+        self.cache = None
+        if cache_dir is not None and not streaming:
+            self.cache = StageCache(cache_dir, max_bytes=cache_max_bytes, force=force)
+        self._load_options = {'include_patient_id': False}
         
         # Results
         self.results = {}
@@ -71,22 +127,94 @@ class MLPipeline:
         print("="*80)
         print(f"Data Path: {data_path}")
         print(f"Random State: {random_state}")
+        if streaming:
+            print(f"Mode: streaming (chunksize={chunksize:,}, store={store_dir})")
+        if self.cache is not None:
+            print(f"Stage Cache: {cache_dir}" + (" (force)" if force else ""))
+    
+    def _stage_key(self, stage):
+        """Content address of a stage, chained through upstream stage keys"""
+        if stage == 'load_data':
+            return stage_key(
+                stage,
+                data=file_digest(self.data_path),
+                code=code_version(),
+                options=self._load_options,
+                # config.py kod sürümünde değil: aşamalar yalnızca okudukları config değerlerine bağlı
+                params={'ranges': FEATURE_RANGES}
+            )
+        
+        if stage == 'engineer_features':
+            params = {'spec': FEATURE_SPEC, 'ranges': FEATURE_RANGES}
+        elif stage == 'prepare_data':
+            params = {'test_size': TEST_SIZE, 'random_state': self.random_state,
+                    'features': self.feature_names}
+        else:
+            # n_jobs sonucu değiştirmez, anahtara dahil edilmez
+            params = {k: v for k, v in self.model_params.items() if k != 'n_jobs'}
+            if self.compaction_holdout:
+                params['holdout'] = COMPACTION_CONFIG['validation_size']
+        return stage_key(stage, upstream=self._stage_key(STAGE_UPSTREAM[stage]), params=params)
     
-    def load_data(self):
-        """Load raw data"""
+    def _restore_stage(self, stage):
+        """Load stage outputs from cache; returns True on hit"""
+        if self.cache is None:
+            return False
+        key = self._stage_key(stage)
+        outputs = self.cache.get(stage, key)
+        if outputs is None:
+            return False
+        for name, value in outputs.items():
+            setattr(self, name, value)
+        print(f"\n♻️ Loaded from stage cache ({key[:12]})")
+        return True
+    
+    def _store_stage(self, stage):
+        """Persist stage outputs to cache"""
+        if self.cache is None:
+            return
+        key = self._stage_key(stage)
+        self.cache.put(stage, key, {name: getattr(self, name) for name in STAGE_OUTPUTS[stage]})
+    
+    def load_data(self, engine='c', chunksize=DEFAULT_CHUNKSIZE, include_patient_id=False):
+        """
+        Load raw data with schema dtypes (uint8 features, categorical Level)
+        
+        Args:
+            engine: 'c' (chunked) or 'pyarrow'
+            chunksize: Rows per chunk for the C engine
+            include_patient_id: Also load 'Patient Id' column
+        """
         print("\n" + "="*80)
         print("STAGE 1: DATA LOADING")
         print("="*80)
         
-        self.df = pd.read_csv(self.data_path)
-        print(f"\n✅ Data loaded: {self.df.shape}")
+        if self.streaming:
+            print(f"\n⏭️ Streaming mode: raw data is read chunk-by-chunk in STAGE 2")
+            return self
+        
+        self._load_options = {'include_patient_id': include_patient_id}
+        if self._restore_stage('load_data'):
+            return self
+        
+        self.df = load_raw_data(
+            self.data_path,
+            engine=engine,
+            chunksize=chunksize,
+            include_patient_id=include_patient_id
+        )
+        print(f"\n✅ Data loaded: {self.df.shape} (engine: {engine})")
         print(f"   Rows: {self.df.shape[0]:,}")
         print(f"   Columns: {self.df.shape[1]}")
         
+        print_memory_report(self.df)
+        
         # Check target distribution
         print(f"\n📊 Target Distribution:")
         print(self.df['Level'].value_counts())
         
+        self._store_stage('load_data')
+        
         return self
     
     def engineer_features(self):
@@ -95,105 +223,48 @@ class MLPipeline:
         print("STAGE 2: FEATURE ENGINEERING")
         print("="*80)
         
-        self.df_fe = self.df.copy()
-        
-        # Age Groups
-        self.df_fe['Age_Group'] = pd.cut(
-            self.df_fe['Age'], 
-            bins=[0, 25, 40, 55, 100], 
-            labels=[0, 1, 2, 3]
-        ).astype(int)
-        print("✅ Age_Group created")
-        
-        # Risk Scores
-        self.df_fe['Environmental_Risk'] = (
-            self.df_fe['Air Pollution'] + 
-            self.df_fe['Dust Allergy'] + 
-            self.df_fe['OccuPational Hazards']
-        ) / 3
-        print("✅ Environmental_Risk created")
-        
-        self.df_fe['Lifestyle_Risk'] = (
-            self.df_fe['Smoking'] + 
-            self.df_fe['Alcohol use'] + 
-            self.df_fe['Obesity'] +
-            (10 - self.df_fe['Balanced Diet'])
-        ) / 4
-        print("✅ Lifestyle_Risk created")
-        
-        self.df_fe['Genetic_Health_Risk'] = (
-            self.df_fe['Genetic Risk'] + 
-            self.df_fe['chronic Lung Disease']
-        ) / 2
-        print("✅ Genetic_Health_Risk created")
-        
-        # Symptom scores
-        symptom_cols = ['Chest Pain', 'Coughing of Blood', 'Fatigue', 'Weight Loss',
-                        'Shortness of Breath', 'Wheezing', 'Swallowing Difficulty']
-        self.df_fe['Symptom_Severity'] = self.df_fe[symptom_cols].mean(axis=1)
-        print("✅ Symptom_Severity created")
-        
-        self.df_fe['Respiratory_Score'] = (
-            self.df_fe['Shortness of Breath'] + 
-            self.df_fe['Wheezing'] + 
-            self.df_fe['Dry Cough'] +
-            self.df_fe['chronic Lung Disease']
-        ) / 4
-        print("✅ Respiratory_Score created")
-        
-        # Critical symptoms
-        critical_threshold = 6
-        self.df_fe['Critical_Symptom_Count'] = (
-            (self.df_fe['Chest Pain'] >= critical_threshold).astype(int) +
-            (self.df_fe['Coughing of Blood'] >= critical_threshold).astype(int) +
-            (self.df_fe['Weight Loss'] >= critical_threshold).astype(int) +
-            (self.df_fe['Shortness of Breath'] >= critical_threshold).astype(int)
-        )
-        print("✅ Critical_Symptom_Count created")
-        
-        # Overall risk
-        self.df_fe['Overall_Risk_Score'] = (
-            self.df_fe['Environmental_Risk'] * 0.25 +
-            self.df_fe['Lifestyle_Risk'] * 0.30 +
-            self.df_fe['Genetic_Health_Risk'] * 0.20 +
-            self.df_fe['Symptom_Severity'] * 0.25
-        )
-        print("✅ Overall_Risk_Score created")
-        
-        # Interactions
-        self.df_fe['Smoking_Age_Interaction'] = self.df_fe['Smoking'] * self.df_fe['Age']
-        self.df_fe['Genetic_Age_Interaction'] = self.df_fe['Genetic Risk'] * self.df_fe['Age']
-        self.df_fe['Smoking_Pollution'] = self.df_fe['Smoking'] * self.df_fe['Air Pollution']
-        self.df_fe['Obesity_ChronicLung'] = self.df_fe['Obesity'] * self.df_fe['chronic Lung Disease']
-        self.df_fe['PassiveSmoker_Pollution'] = self.df_fe['Passive Smoker'] * self.df_fe['Air Pollution']
-        print("✅ Interaction features created (5)")
-        
-        # Polynomial features
-        for feat in ['Smoking', 'Air Pollution', 'Genetic Risk']:
-            self.df_fe[f'{feat}_squared'] = self.df_fe[feat] ** 2
-        print("✅ Polynomial features created (3)")
-        
-        # Binning
-        self.df_fe['Smoking_Level'] = pd.cut(
-            self.df_fe['Smoking'], 
-            bins=[0, 2, 5, 10], 
-            labels=[0, 1, 2]
-        ).astype(int)
-        
-        self.df_fe['Pollution_Level'] = pd.cut(
-            self.df_fe['Air Pollution'], 
-            bins=[0, 3, 6, 10], 
-            labels=[0, 1, 2]
-        ).astype(int)
-        print("✅ Binning features created (2)")
+        if self.streaming:
+            return self._engineer_features_streaming()
+        
+        if self._restore_stage('engineer_features'):
+            return self
+        
+        # Paylaşılan feature spec (features.py) - inference ile aynı çekirdek
+        self.df_fe = engineer_features(self.df)
+        print(f"✅ {len(ENGINEERED_FEATURES)} features created from shared spec (features.py)")
         
         # Count new features
         original_cols = set(self.df.columns)
         new_cols = set(self.df_fe.columns) - original_cols
         print(f"\n📊 Feature Engineering Summary:")
-        print(f"   Original features: {len(original_cols) - 3}")  # -3 for index, Patient Id, Level
+        n_original = len([col for col in original_cols if col in RAW_SCHEMA])
+        print(f"   Original features: {n_original}")
         print(f"   New features: {len(new_cols)}")
-        print(f"   Total features: {len(self.df_fe.columns) - 3}")
+        print(f"   Total features: {n_original + len(new_cols)}")
+        
+        self._store_stage('engineer_features')
+        
+        return self
+    
+    def _engineer_features_streaming(self):
+        """Chunked feature engineering into an on-disk feature store"""
+        start_time = datetime.now()
+        self.feature_store = FeatureStore.build(
+            self.data_path,
+            self.store_dir,
+            feature_names=self.feature_names,
+            chunksize=self.chunksize
+        )
+        elapsed = (datetime.now() - start_time).total_seconds()
+        
+        print(f"✅ Feature store built: {self.feature_store.n_rows:,} rows x {len(self.feature_names)} features")
+        print(f"   Location: {self.store_dir}")
+        print(f"   Time: {elapsed:.2f} seconds")
+        
+        print(f"\n📊 Target Distribution:")
+        counts = np.bincount(self.feature_store.y, minlength=len(LEVEL_CATEGORIES))
+        for label, count in zip(LEVEL_CATEGORIES, counts):
+            print(f"   {label:10s}: {count:,}")
         
         return self
     
@@ -204,20 +275,16 @@ class MLPipeline:
         print("="*80)
         
         # Define final features
-        final_features = [
-            'Smoking', 'Genetic Risk', 'Air Pollution', 'Alcohol use',
-            'chronic Lung Disease', 'Age', 'Obesity', 'Chest Pain',
-            'Coughing of Blood', 'Fatigue', 'Weight Loss', 'Shortness of Breath',
-            'Wheezing', 'Passive Smoker', 'OccuPational Hazards',
-            'Overall_Risk_Score', 'Lifestyle_Risk', 'Environmental_Risk',
-            'Symptom_Severity', 'Respiratory_Score', 'Genetic_Health_Risk',
-            'Smoking_Age_Interaction', 'Genetic_Age_Interaction',
-            'Smoking_squared', 'Air Pollution_squared', 'Critical_Symptom_Count',
-            'Age_Group', 'Smoking_Level'
-        ]
+        final_features = self.feature_names
         
         print(f"\n📝 Final feature count: {len(final_features)}")
         
+        if self.streaming:
+            return self._prepare_data_streaming()
+        
+        if self._restore_stage('prepare_data'):
+            return self
+        
         # Prepare X and y
         X = self.df_fe[final_features]
         y = self.df_fe['Level']
@@ -240,23 +307,128 @@ class MLPipeline:
         self.X_test_scaled = self.scaler.transform(self.X_test)
         print(f"✅ StandardScaler fitted")
         
+        self._store_stage('prepare_data')
+        
         return self
     
-    def train_model(self):
-        """Train the model"""
+    def _prepare_data_streaming(self):
+        """Split row indices, fit scaler with partial_fit and write scaled memmaps"""
+        store = self.feature_store
+        train_idx, test_idx = train_test_split(
+            np.arange(store.n_rows),
+            test_size=TEST_SIZE,
+            random_state=self.random_state,
+            stratify=np.asarray(store.y)
+        )
+        # Sıralı indeksler -> memmap üzerinde ardışık okuma
+        train_idx.sort()
+        test_idx.sort()
+        
+        self.y_train = store.labels(train_idx)
+        self.y_test = store.labels(test_idx)
+        
+        print(f"\n✅ Train-test split:")
+        print(f"   Train: {len(train_idx):,} samples")
+        print(f"   Test:  {len(test_idx):,} samples")
+        
+        self.scaler = store.fit_scaler(StandardScaler(), train_idx, self.chunksize)
+        self.X_train_scaled = store.transform_rows(self.scaler, train_idx, 'X_train.npy', self.chunksize)
+        self.X_test_scaled = store.transform_rows(self.scaler, test_idx, 'X_test.npy', self.chunksize)
+        print(f"✅ StandardScaler fitted (partial_fit, chunked)")
+        
+        return self
+    
+    def tune(self, checkpoint_path=None):
+        """
+        Successive halving / Hyperband search over forest parameters
+        
+        Kazanan parametreler self.model_params'a yazılır ve TUNED_PARAMS_PATH'e
+        kaydedilir (sonraki çalıştırmalar da kullanır).
+        
+        Args:
+            checkpoint_path: JSONL trial log, search resumes from it (default: TUNING_CHECKPOINT_PATH)
+        """
+        checkpoint_path = checkpoint_path or TUNING_CHECKPOINT_PATH
         print("\n" + "="*80)
-        print("STAGE 4: MODEL TRAINING")
+        print("STAGE 3b: HYPERPARAMETER TUNING")
         print("="*80)
         
-        # Initialize model
-        self.model = RandomForestClassifier(
-            n_estimators=300,
-            max_depth=15,
-            min_samples_split=2,
-            min_samples_leaf=1,
+        signature = stage_key(
+            'tune',
+            upstream=self._stage_key('prepare_data'),
+            space=TUNING_SEARCH_SPACE,
+            config=TUNING_CONFIG
+        )
+        print(f"\n🔍 Method: {TUNING_CONFIG['method']} "
+            f"({TUNING_CONFIG['n_candidates']} candidates, eta={TUNING_CONFIG['eta']})")
+        
+        start_time = datetime.now()
+        self.tuning_results = run_tuning(
+            self.X_train_scaled,
+            self.y_train,
+            checkpoint_path=checkpoint_path,
+            signature=signature,
+            random_state=self.random_state
+        )
+        elapsed = (datetime.now() - start_time).total_seconds()
+        
+        best_params = self.tuning_results['best_params']
+        self.model_params.update(best_params)
+        
+        Path(TUNED_PARAMS_PATH).parent.mkdir(exist_ok=True, parents=True)
+        with open(TUNED_PARAMS_PATH, 'w') as f:
+            json.dump({
+                'best_params': best_params,
+                'best_score': self.tuning_results['best_score'],
+                'n_trials': len(self.tuning_results['trials']),
+                'method': TUNING_CONFIG['method'],
+                'timestamp': datetime.now().isoformat()
+            }, f, indent=2)
+        
+        print(f"\n✅ Tuning completed in {elapsed:.2f} seconds")
+        print(f"   Best validation accuracy: {self.tuning_results['best_score']:.4f}")
+        for name, value in best_params.items():
+            print(f"   - {name}: {value}")
+        print(f"✅ Tuned parameters saved: {TUNED_PARAMS_PATH}")
+        
+        return self
+    
+    def _compaction_split(self):
+        """
+        Split the training rows into fit / compaction-validation rows
+        
+        Returns:
+            tuple: X_fit, X_val, y_fit, y_val (deterministic for a given random_state)
+        """
+        return train_test_split(
+            np.asarray(self.X_train_scaled),
+            np.asarray(self.y_train),
+            test_size=COMPACTION_CONFIG['validation_size'],
             random_state=self.random_state,
-            n_jobs=-1
+            stratify=np.asarray(self.y_train)
         )
+    
+    def train_model(self):
+        """
+        Train the model
+        
+        compaction_holdout açıksa model train kümesinin doğrulama payı ayrıldıktan
+        sonra kalan satırlarla eğitilir; compact() aynı modeli bu satırlarda küçültür.
+        """
+        print("\n" + "="*80)
+        print("STAGE 4: MODEL TRAINING")
+        print("="*80)
+        
+        if self._restore_stage('train_model'):
+            return self
+        
+        X_fit, y_fit = self.X_train_scaled, self.y_train
+        if self.compaction_holdout:
+            X_fit, X_val, y_fit, _ = self._compaction_split()
+            print(f"\n🔒 Held out {len(X_val):,} training rows for compaction validation")
+        
+        # Initialize model (config.MODEL_PARAMS)
+        self.model = RandomForestClassifier(**self.model_params)
         
         print(f"\n🔧 Model: {self.model.__class__.__name__}")
         print(f"⚙️ Parameters:")
@@ -267,11 +439,13 @@ class MLPipeline:
         print(f"\n🚀 Training model...")
         start_time = datetime.now()
         
-        self.model.fit(self.X_train_scaled, self.y_train)
+        self.model.fit(X_fit, y_fit)
         
         training_time = (datetime.now() - start_time).total_seconds()
         print(f"✅ Training completed in {training_time:.2f} seconds")
         
+        self._store_stage('train_model')
+        
         return self
     
     def evaluate_model(self):
@@ -288,15 +462,20 @@ class MLPipeline:
         train_acc = accuracy_score(self.y_train, y_train_pred)
         test_acc = accuracy_score(self.y_test, y_test_pred)
         
-        # Cross-validation
+        # Cross-validation (katlar + ağaçlar tek bir sınırlı işçi havuzunda)
         print(f"\n📊 Performing {CV_FOLDS}-fold cross-validation...")
-        cv_scores = cross_val_score(
-            self.model, 
-            self.X_train_scaled, 
-            self.y_train, 
-            cv=CV_FOLDS, 
-            scoring='accuracy'
+        cv = cross_validate_parallel(
+            self.model,
+            self.X_train_scaled,
+            self.y_train,
+            n_folds=CV_FOLDS
         )
+        cv_scores = cv['scores']
+        print(f"   Workers: {cv['fold_workers']} fold(s) x {cv['tree_jobs']} tree job(s), "
+            f"wall time {cv['wall_time']:.2f}s")
+        for fold in cv['folds']:
+            print(f"   Fold {fold['fold'] + 1}: acc={fold['accuracy']:.4f}  "
+                f"fit={fold['fit_time']:.2f}s  predict={fold['predict_time']:.3f}s")
         
         print(f"\n📊 PERFORMANCE METRICS:")
         print(f"   Train Accuracy:      {train_acc:.4f} ({train_acc*100:.2f}%)")
@@ -304,10 +483,11 @@ class MLPipeline:
         print(f"   CV Score (mean):     {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
         print(f"   Overfitting:         {(train_acc - test_acc):.4f}")
         
-        # Classification report
+        # Classification report (tek hesaplama, metin dict'ten üretilir)
+        report = classification_report(self.y_test, y_test_pred, output_dict=True)
         print(f"\n📊 CLASSIFICATION REPORT:")
         print("="*80)
-        print(classification_report(self.y_test, y_test_pred))
+        print(format_classification_report(report))
         
         # Confusion matrix
         print(f"\n📊 CONFUSION MATRIX:")
@@ -333,13 +513,155 @@ class MLPipeline:
             'cv_score_mean': float(cv_scores.mean()),
             'cv_score_std': float(cv_scores.std()),
             'overfitting': float(train_acc - test_acc),
-            'classification_report': classification_report(self.y_test, y_test_pred, output_dict=True),
+            'cv_oof_accuracy': cv['oof_accuracy'],
+            'cv_oof_macro_f1': cv['oof_macro_f1'],
+            'cv_folds': cv['folds'],
+            'cv_wall_time': cv['wall_time'],
+            'classification_report': report,
             'confusion_matrix': cm.tolist(),
             'timestamp': datetime.now().isoformat()
         }
         
         return self
     
+    def compact(self):
+        """
+        Search for the smallest serving model within tolerance of the trained forest
+        
+        Referans self.model'dir (yeniden eğitilmez): ağaç alt kümeleri bu ormandan alınır,
+        sığ ormanlar ve damıtılmış tek ağaçlar onunla karşılaştırılır. Kabul, eğitimden
+        önce ayrılan doğrulama kümesinde ölçülür (compaction_holdout, run(compact=True)).
+        Seçilen model ayrıca test kümesinde ölçülür ve save_artifacts ile
+        compact_model.pkl olarak kaydedilir.
+        
+        Raises:
+            ValueError: The model was trained without the compaction hold-out
+        """
+        print("\n" + "="*80)
+        print("STAGE 5b: MODEL COMPACTION")
+        print("="*80)
+        
+        if self.model is None or not self.compaction_holdout:
+            raise ValueError("compact() needs a model trained with compaction_holdout=True "
+                            "(use run(compact=True))")
+        
+        X_fit, X_val, y_fit, y_val = self._compaction_split()
+        synthetic = synthetic_patients(COMPACTION_CONFIG['n_synthetic'], self.feature_names,
+                                    self.random_state)
+        X_synthetic = self.scaler.transform(synthetic)
+        
+        print(f"\n🔍 Reference: trained model ({len(self.model.estimators_)} trees, not refit)")
+        print(f"   Fit: {len(X_fit):,}  Validation: {len(X_val):,}  "
+            f"Synthetic (distillation): {len(X_synthetic):,}")
+        
+        start_time = datetime.now()
+        result = compact_model(
+            self.model,
+            X_fit, y_fit, X_val, y_val,
+            X_transfer=X_synthetic,
+            random_state=self.random_state
+        )
+        elapsed = (datetime.now() - start_time).total_seconds()
+        
+        report = result['report']
+        columns = ['candidate', 'n_trees', 'max_depth', 'n_nodes', 'size_kb',
+                'latency_ms', 'rows_per_sec', 'val_accuracy', 'within_tolerance', 'eligible']
+        print(f"\n📊 TRADE-OFF (tolerance={COMPACTION_CONFIG['tolerance']}, "
+            f"min_trees={COMPACTION_CONFIG['min_trees']}, ranking={result['ranking']}):")
+        print(report[columns].round(4).to_string(index=False))
+        
+        self.compact_model = result['model']
+        reference = report.set_index('candidate').loc['reference']
+        chosen = report.iloc[0]
+        test_acc = accuracy_score(self.y_test, self.compact_model.predict(np.asarray(self.X_test_scaled)))
+        
+        self.compaction_results = {
+            'chosen': result['best'],
+            'reference_val_accuracy': result['reference_accuracy'],
+            'val_accuracy': float(chosen['val_accuracy']),
+            'test_accuracy': float(test_acc),
+            'size_bytes': int(chosen['size_bytes']),
+            'reference_size_bytes': int(reference['size_bytes']),
+            'latency_ms': float(chosen['latency_ms']),
+            'reference_latency_ms': float(reference['latency_ms']),
+            'report': report.to_dict(orient='records')
+        }
+        if getattr(self, 'results', None) is not None:
+            self.results['compaction'] = {k: v for k, v in self.compaction_results.items() if k != 'report'}
+        
+        print(f"\n✅ Compaction completed in {elapsed:.2f} seconds")
+        print(f"   Chosen: {result['best']}")
+        print(f"   Size:    {reference['size_kb']:.1f} KB -> {chosen['size_kb']:.1f} KB "
+            f"({reference['size_bytes'] / chosen['size_bytes']:.1f}x smaller)")
+        print(f"   Latency: {reference['latency_ms']:.3f} ms -> {chosen['latency_ms']:.3f} ms (1 row)")
+        print(f"   Test Accuracy: {test_acc:.4f}")
+        
+        return self
+    
+    def interpret(self):
+        """
+        Precompute permutation importance and partial-dependence tables
+        
+        Importance test kümesinin ham özelliklerinde, PDP ortalamaları train
+        satırları üzerinde hesaplanır; save_artifacts interpretation.pkl yazar.
+        """
+        print("\n" + "="*80)
+        print("STAGE 5c: GLOBAL INTERPRETATION")
+        print("="*80)
+        
+        if self.streaming:
+            print("\n⚠️ Skipped: raw rows are not kept in streaming mode "
+                "(run `python interpretation.py` after training)")
+            return self
+        
+        # prepare_data cache'ten geldiyse ham veri yüklenmemiştir
+        raw = self.df_fe if self.df_fe is not None else load_raw_data(self.data_path)
+        
+        start_time = datetime.now()
+        self.interpretation = build_tables(
+            model_predict_fn(self.model, self.scaler, self.feature_names),
+            self.model.classes_,
+            raw.loc[self.X_test.index, RAW_FEATURES],
+            np.asarray(self.y_test).astype(str),
+            raw.loc[self.X_train.index, RAW_FEATURES],
+            random_state=self.random_state
+        )
+        elapsed = (datetime.now() - start_time).total_seconds()
+        
+        print(f"\n📊 Permutation importance (top 10, accuracy drop):")
+        print(self.interpretation.importance.head(10).round(4).to_string(index=False))
+        print(f"\n✅ Tables built in {elapsed:.2f} seconds "
+            f"({len(self.interpretation.pdp1)} one-way, {len(self.interpretation.pdp2)} two-way PDPs)")
+        
+        return self
+    
+    def quantize(self):
+        """
+        Export the integer-grid quantized serving model
+        
+        Eşikler, düğüm indeksleri ve yaprak olasılıkları küçük tamsayı tiplerinde
+        saklanır; parity FEATURE_RANGES'ten rastgele hastalarda ölçülür ve
+        save_artifacts quantized_model.npz olarak kaydeder.
+        """
+        print("\n" + "="*80)
+        print("STAGE 5d: QUANTIZED EXPORT")
+        print("="*80)
+        
+        start_time = datetime.now()
+        self.quantized_model = QuantizedForest.from_model(self.model, self.scaler, self.feature_names)
+        parity = parity_report(self.quantized_model, self.model, self.scaler, self.feature_names,
+                            random_patients(10_000, seed=self.random_state))
+        elapsed = (datetime.now() - start_time).total_seconds()
+        
+        print(f"\n✅ Quantized in {elapsed:.2f} seconds")
+        print(f"   Memory: {forest_nbytes(self.model) / 1024:.1f} KB -> "
+            f"{self.quantized_model.nbytes / 1024:.1f} KB")
+        print(f"   Leaf agreement: {parity['leaf_agreement']:.4f}  "
+            f"Label agreement: {parity['label_agreement']:.4f}  "
+            f"Max prob error: {parity['max_abs_probability_error']:.2e}")
+        
+        return self
+    
     def save_artifacts(self, output_dir='models'):
         """Save model and artifacts"""
         print("\n" + "="*80)
@@ -364,7 +686,7 @@ class MLPipeline:
         # Save feature names
         features_path = output_path / 'final_features.txt'
         with open(features_path, 'w') as f:
-            for feat in self.X_train.columns:
+            for feat in self.feature_names:
                 f.write(f"{feat}\n")
         print(f"✅ Features saved: {features_path}")
         
@@ -376,7 +698,7 @@ class MLPipeline:
         
         # Save feature importance
         importance_df = pd.DataFrame({
-            'feature': self.X_train.columns,
+            'feature': self.feature_names,
             'importance': self.model.feature_importances_
         }).sort_values('importance', ascending=False)
         
@@ -384,10 +706,59 @@ class MLPipeline:
         importance_df.to_csv(importance_path, index=False)
         print(f"✅ Feature importance saved: {importance_path}")
         
+        # Save compact serving model (if compaction ran)
+        if getattr(self, 'compact_model', None) is not None:
+            compact_path = output_path / Path(COMPACT_MODEL_PATH).name
+            with open(compact_path, 'wb') as f:
+                pickle.dump(self.compact_model, f)
+            print(f"✅ Compact model saved: {compact_path}")
+            
+            report_path = output_path / 'compaction_report.csv'
+            pd.DataFrame(self.compaction_results['report']).to_csv(report_path, index=False)
+            print(f"✅ Compaction report saved: {report_path}")
+        
+        # Save interpretation tables (if interpret ran)
+        if getattr(self, 'interpretation', None) is not None:
+            tables_path = output_path / Path(INTERPRETATION_PATH).name
+            self.interpretation.save(tables_path)
+            print(f"✅ Interpretation tables saved: {tables_path} (+ permutation_importance.csv, partial_dependence*.csv)")
+        
+        # Save quantized model (if quantize ran)
+        if getattr(self, 'quantized_model', None) is not None:
+            quantized_path = output_path / Path(QUANTIZED_MODEL_PATH).name
+            self.quantized_model.save(quantized_path)
+            print(f"✅ Quantized model saved: {quantized_path}")
+        
+        # Bundle manifest: checksum'lar + feature/sınıf sırası + eğitim metadata'sı (artifacts.py)
+        data_path = Path(self.data_path)
+        training = training_metadata(
+            self.model,
+            data_path=str(data_path),
+            data_sha256=file_digest(data_path) if data_path.exists() else None,
+            n_train=len(self.y_train),
+            n_test=len(self.y_test),
+            random_state=self.random_state,
+            metrics={key: value for key, value in self.results.items() if isinstance(value, float)},
+            code_version=code_version()
+        )
+        manifest = write_manifest(output_path, self.model, self.scaler, self.feature_names, training=training)
+        print(f"✅ Manifest saved: {output_path / 'manifest.json'} "
+            f"(version {manifest['version']}, {len(manifest['files'])} files)")
+        
         return self
     
-    def run(self):
-        """Run complete pipeline"""
+    def run(self, tune=False, compact=False, interpret=False, quantize=False, output_dir='models'):
+        """
+        Run complete pipeline
+        
+        Args:
+            tune: Run hyperparameter search before training
+            compact: Search for a smaller serving model after evaluation (the forest is
+                then trained without the compaction validation rows)
+            interpret: Precompute permutation importance and partial-dependence tables
+            quantize: Export the integer-grid quantized model
+            output_dir: Artifact directory (e.g. MODEL_DIR to replace the served bundle)
+        """
         print("\n" + "🚀"*40)
         print("STARTING COMPLETE ML PIPELINE")
         print("🚀"*40)
@@ -395,15 +766,32 @@ class MLPipeline:
         start_time = datetime.now()
         
         # Execute all stages
-        self.load_data()
-        self.engineer_features()
+        # prepare_data cache'te ise ham veri ve feature'lar hiç hesaplanmaz
+        if self.cache is not None and self.cache.contains('prepare_data', self._stage_key('prepare_data')):
+            print("\n♻️ prepare_data is cached - skipping STAGE 1 & 2")
+        else:
+            self.load_data()
+            self.engineer_features()
         self.prepare_data()
+        if tune:
+            self.tune()
+        self.compaction_holdout = compact
         self.train_model()
         self.evaluate_model()
-        self.save_artifacts()
+        if compact:
+            self.compact()
+        if interpret:
+            self.interpret()
+        if quantize:
+            self.quantize()
+        self.save_artifacts(output_dir)
         
         total_time = (datetime.now() - start_time).total_seconds()
         
+        if self.cache is not None:
+            print(f"\n♻️ Stage cache: {self.cache.hits} hit(s), {self.cache.misses} miss(es), "
+                f"{self.cache.size() / 1024**2:.1f} MB")
+        
         # Final summary
         print("\n" + "="*80)
         print("PIPELINE COMPLETED SUCCESSFULLY! ✅")
@@ -421,6 +809,7 @@ Total Time:          {total_time:.2f} seconds
 ✅ final_features.txt
 ✅ model_results.json
 ✅ feature_importance.csv
+✅ manifest.json (SHA-256 checksums, feature/class order, training metadata)
 
 🚀 NEXT STEPS:
 1. Review model results in models/model_results.json
@@ -438,9 +827,21 @@ Total Time:          {total_time:.2f} seconds
 # =============================================================================
 def main():
     """Main execution function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Cancer Risk Prediction - ML Pipeline")
+    parser.add_argument('--data-path', default='cancer patient data sets.csv', help="Raw data CSV")
+    parser.add_argument('--force', action='store_true', help="Recompute all stages (ignore stage cache)")
+    parser.add_argument('--no-cache', action='store_true', help="Disable stage cache")
+    parser.add_argument('--streaming', action='store_true', help="Out-of-core chunked mode")
+    parser.add_argument('--tune', action='store_true', help="Successive halving search before training")
+    parser.add_argument('--compact', action='store_true', help="Export a pruned/distilled serving model")
+    parser.add_argument('--interpret', action='store_true', help="Precompute importance & partial-dependence tables")
+    parser.add_argument('--quantize', action='store_true', help="Export the integer-grid quantized model")
+    args = parser.parse_args()
     
     # Configuration
-    DATA_PATH = 'cancer patient data sets.csv'
+    DATA_PATH = args.data_path
     RANDOM_STATE = 42
     
     # Check if data exists
@@ -452,10 +853,13 @@ def main():
     # Initialize and run pipeline
     pipeline = MLPipeline(
         data_path=DATA_PATH,
-        random_state=RANDOM_STATE
+        random_state=RANDOM_STATE,
+        streaming=args.streaming,
+        cache_dir=None if args.no_cache else PIPELINE_CACHE_DIR,
+        force=args.force
     )
     
-    pipeline.run()
+    pipeline.run(tune=args.tune, compact=args.compact, interpret=args.interpret, quantize=args.quantize)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
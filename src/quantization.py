@@ -0,0 +1,472 @@
+"""
+Model Quantization - Integer-Grid Forest Export
+===============================================
+Servis ormanını (RandomForest + StandardScaler) ham tamsayı girdiler üzerinde
+çalışan kompakt bir düz diziye (flat array) dönüştürür.
+
+- Her model özelliği FEATURE_RANGES üzerinde bir tamsayı anahtara (key) sahiptir:
+  ham kolon -> değer; linear skor -> bileşen toplamı; weighted skor -> toplamların
+  tamsayı katsayılı kombinasyonu (Overall_Risk_Score * 840); bin/count/product/power
+  -> kendi tamsayı değeri
+- Scaler katlanır (fold): her düğüm eşiği t için, tanım kümesindeki tüm anahtarların
+  float32(scaled) değerleri t ile karşılaştırılır ve `x <= t` <=> `key <= k` olan
+  tamsayı k bulunur -> tanım kümesinde ağaç kararları birebir aynıdır (bulunamazsa hata)
+- Düğüm indeksleri int16/int32, eşikler int16/int32, özellik indeksi uint8,
+  yaprak olasılıkları uint8/uint16 (sabit nokta) olarak saklanır
+- Değerlendirme: tüm ağaçlar seviye seviye (level-synchronous) vektörel gezilir;
+  yapraklar kendine döner, max_depth adımda biter. Tek satır / küçük batch
+  (~100 satıra kadar) gecikme yolu içindir; büyük batch'lerde C'de gezinen
+  ForestKernel (tree_kernel.py) daha hızlıdır
+
+Kullanım:
+    python quantization.py            # deployed modeli dışa aktarır, bellek/gecikme/parity raporu
+"""
+
+import argparse
+import time
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import QUANTIZATION_CONFIG, QUANTIZED_MODEL_PATH
+from features import RAW_FEATURES, FEATURE_RANGES, FEATURE_SPEC, COMPILED_SPEC, build_feature_matrix
+
+PROBABILITY_DTYPES = {'uint8': np.uint8, 'uint16': np.uint16}
+
+
+def _sumset(sets):
+    """All achievable sums of one value from each set"""
+    total = np.zeros(1, dtype=np.int64)
+    for values in sets:
+        total = np.unique(total[:, None] + np.asarray(values, dtype=np.int64)[None, :])
+    return total
+
+
+def _small_int_dtype(low, high, unsigned=False):
+    for dtype in ((np.uint8, np.uint16, np.uint32) if unsigned else (np.int16, np.int32)):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+# =============================================================================
+# INTEGER FEATURE KEYS
+# =============================================================================
+class FeatureKeys:
+    """
+    Integer key per model feature, computed from raw integer rows
+
+    Ham, linear ve weighted özellikler ham değerlerin afin fonksiyonudur (tek
+    tamsayı matris çarpımı); diğerleri paylaşılan spec'in tamsayı çıktılarıdır.
+
+    Args:
+        feature_names: Model input columns (order of the scaler / model)
+    """
+
+    def __init__(self, feature_names):
+        self.feature_names = list(feature_names)
+        spec = {entry['name']: entry for entry in FEATURE_SPEC}
+        raw_index = {name: i for i, name in enumerate(RAW_FEATURES)}
+
+        # Linear özellik -> (ham katsayı vektörü, offset, divisor)
+        linear = {}
+        for name, entry in spec.items():
+            if entry['kind'] == 'linear':
+                coef = np.zeros(len(RAW_FEATURES), dtype=np.int64)
+                for col, c in entry['terms'].items():
+                    coef[raw_index[col]] = c
+                linear[name] = (coef, entry['offset'], entry['divisor'])
+
+        self.affine = np.zeros((len(RAW_FEATURES), len(self.feature_names)), dtype=np.int64)
+        self.offset = np.zeros(len(self.feature_names), dtype=np.int64)
+        self.engineered = []     # (model column, spec name): spec'in tamsayı çıktısı kullanılır
+        self._domains = []
+        for j, name in enumerate(self.feature_names):
+            entry = spec.get(name)
+            if entry is None:
+                low, high = FEATURE_RANGES[name]
+                self.affine[raw_index[name], j] = 1
+                keys = np.arange(low, high + 1, dtype=np.int64)
+                self._domains.append((keys, keys.astype(np.float64)))
+            elif entry['kind'] == 'linear':
+                coef, offset, divisor = linear[name]
+                self.affine[:, j], self.offset[j] = coef, offset
+                keys = self._linear_sums(entry)
+                self._domains.append((keys, keys / np.float64(divisor)))
+            elif entry['kind'] == 'weighted':
+                self._domains.append(self._weighted(j, entry, spec, linear))
+            else:
+                self.engineered.append((j, name))
+                self._domains.append(self._engineered_domain(entry))
+
+    @staticmethod
+    def _linear_sums(entry):
+        sets = [c * np.arange(FEATURE_RANGES[col][0], FEATURE_RANGES[col][1] + 1)
+                for col, c in entry['terms'].items()]
+        return _sumset(sets) + entry['offset']
+
+    def _weighted(self, j, entry, spec, linear):
+        """Key = Σ c_k * sum_k with integer c_k (weights are exact decimals)"""
+        terms = list(entry['terms'].items())
+        ratios = [Fraction(str(weight)) / linear[feature][2] for feature, weight in terms]
+        scale = np.lcm.reduce([ratio.denominator for ratio in ratios])
+        multipliers = [int(ratio * scale) for ratio in ratios]
+        for (feature, _), multiplier in zip(terms, multipliers):
+            coef, offset, _ = linear[feature]
+            self.affine[:, j] += multiplier * coef
+            self.offset[j] += multiplier * offset
+
+        # Bileşen toplamlarının tüm kombinasyonları; float değer çekirdekle aynı sırayla
+        sums = [self._linear_sums(spec[feature]) for feature, _ in terms]
+        grid = np.meshgrid(*sums, indexing='ij')
+        keys = sum(m * g.ravel() for m, g in zip(multipliers, grid))
+        values = None
+        for (feature, weight), g in zip(terms, grid):
+            term = (g.ravel() / np.float64(linear[feature][2])) * weight
+            values = term if values is None else values + term
+        return keys, values
+
+    @staticmethod
+    def _engineered_domain(entry):
+        kind = entry['kind']
+        span = lambda col: np.arange(FEATURE_RANGES[col][0], FEATURE_RANGES[col][1] + 1, dtype=np.int64)
+        if kind == 'bin':
+            values = span(entry['source'])
+            edges = np.asarray(entry['bins'], dtype=np.float64)
+            keys = np.unique(np.clip(np.searchsorted(edges, values, side='left') - 1, 0, len(edges) - 2))
+        elif kind == 'count_ge':
+            indicators = [np.unique(span(col) >= entry['threshold']).astype(np.int64) for col in entry['sources']]
+            keys = _sumset(indicators)
+        elif kind == 'product':
+            a, b = (span(col) for col in entry['sources'])
+            keys = np.unique(a[:, None] * b[None, :])
+        elif kind == 'power':
+            keys = span(entry['source']) ** entry['exponent']
+        else:
+            raise ValueError(f"Cannot quantize feature kind: {kind}")
+        return keys, keys.astype(np.float64)
+
+    def domain(self, j):
+        """(keys, float feature values) over the whole FEATURE_RANGES domain"""
+        return self._domains[j]
+
+    def transform(self, X_raw):
+        """
+        Integer keys for raw rows
+
+        Args:
+            X_raw: Integer array (n, len(RAW_FEATURES)) in RAW_FEATURES order
+
+        Returns:
+            np.ndarray: (n, n_features) int64
+        """
+        X_raw = np.asarray(X_raw, dtype=np.int64)
+        keys = X_raw @ self.affine + self.offset
+        if self.engineered:
+            index = [RAW_FEATURES.index(col) for col in COMPILED_SPEC.input_columns]
+            engineered = COMPILED_SPEC.transform(X_raw[:, index])
+            for j, name in self.engineered:
+                keys[:, j] = engineered[name]
+        return keys
+
+
+def fold_thresholds(feature_keys, scaler, features, thresholds):
+    """
+    Integer key cut k for every float split `float32(scaled x) <= t`
+
+    Args:
+        feature_keys: FeatureKeys
+        scaler: Fitted StandardScaler (or None)
+        features: Split feature index per node
+        thresholds: Split threshold per node (scaled space)
+
+    Returns:
+        np.ndarray: int64 k per node (x goes left iff key <= k)
+
+    Raises:
+        ValueError: If a threshold falls between two values sharing one key
+    """
+    cuts = np.zeros(len(features), dtype=np.int64)
+    mean = getattr(scaler, 'mean_', None)
+    scale = getattr(scaler, 'scale_', None)
+    for j in np.unique(features):
+        keys, values = feature_keys.domain(j)
+        if mean is not None:
+            values = values - mean[j]
+        if scale is not None:
+            values = values / scale[j]
+        # Ağaçlar girdiyi float32'ye çevirip float64 eşikle karşılaştırır
+        values = values.astype(np.float32).astype(np.float64)
+
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        low = np.full(len(unique_keys), np.inf)
+        high = np.full(len(unique_keys), -np.inf)
+        np.minimum.at(low, inverse, values)
+        np.maximum.at(high, inverse, values)
+        if (high[:-1] > low[1:]).any():
+            raise ValueError(f"Feature {feature_keys.feature_names[j]} is not monotone in its key")
+
+        nodes = np.flatnonzero(features == j)
+        t = thresholds[nodes]
+        position = np.searchsorted(high, t, side='right')      # sola giden anahtar sayısı
+        split = (position < len(unique_keys)) & (low[np.minimum(position, len(unique_keys) - 1)] <= t)
+        if split.any():
+            raise ValueError(f"Threshold on {feature_keys.feature_names[j]} splits one integer key")
+        cuts[nodes] = np.where(position > 0, unique_keys[np.maximum(position - 1, 0)], unique_keys[0] - 1)
+    return cuts
+
+
+# =============================================================================
+# QUANTIZED FOREST
+# =============================================================================
+class QuantizedForest:
+    """
+    Flat integer forest over raw patient values
+
+    Attributes:
+        feature, threshold, left, right: Per-node arrays (leaves point to themselves)
+        value: Per-node class probabilities in fixed point (value / value_scale)
+        roots: First node of every tree
+    """
+
+    ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+
+    def __init__(self, feature_names, classes, max_depth, value_scale, **arrays):
+        self.feature_names = list(feature_names)
+        self.classes = np.asarray(classes)
+        self.max_depth = int(max_depth)
+        self.value_scale = int(value_scale)
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.keys = FeatureKeys(self.feature_names)
+        self.lower = np.array([FEATURE_RANGES[name][0] for name in RAW_FEATURES])
+        self.upper = np.array([FEATURE_RANGES[name][1] for name in RAW_FEATURES])
+
+    @classmethod
+    def from_model(cls, model, scaler, feature_names, probability_dtype=None):
+        """
+        Quantize a fitted forest (or tree) and its scaler
+
+        Args:
+            model: Fitted RandomForestClassifier / DecisionTreeClassifier
+            scaler: Scaler applied before the model (StandardScaler or None)
+            feature_names: Model input columns
+            probability_dtype: 'uint8' or 'uint16' (default: from config)
+
+        Returns:
+            QuantizedForest
+        """
+        dtype = PROBABILITY_DTYPES[probability_dtype or QUANTIZATION_CONFIG['probability_dtype']]
+        keys = FeatureKeys(feature_names)
+        trees = [estimator.tree_ for estimator in getattr(model, 'estimators_', [model])]
+
+        sizes = np.array([tree.node_count for tree in trees])
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        n_nodes = int(sizes.sum())
+        node = np.arange(n_nodes)
+        left = np.concatenate([tree.children_left for tree in trees]).astype(np.int64)
+        right = np.concatenate([tree.children_right for tree in trees]).astype(np.int64)
+        is_leaf = left == -1
+        offset = np.repeat(roots, sizes)
+        left = np.where(is_leaf, node, left + offset)
+        right = np.where(is_leaf, node, right + offset)
+
+        feature = np.concatenate([tree.feature for tree in trees])
+        feature = np.where(is_leaf, 0, feature)
+        threshold = np.concatenate([tree.threshold for tree in trees])
+        cuts = np.zeros(n_nodes, dtype=np.int64)
+        cuts[~is_leaf] = fold_thresholds(keys, scaler, feature[~is_leaf], threshold[~is_leaf])
+
+        n_classes = len(model.classes_)
+        probability = np.concatenate([tree.value[:, 0, :n_classes] for tree in trees])
+        probability = probability / probability.sum(axis=1, keepdims=True)
+        value_scale = np.iinfo(dtype).max
+        value = np.where(is_leaf[:, None], np.rint(probability * value_scale), 0).astype(dtype)
+
+        index_dtype = _small_int_dtype(0, n_nodes - 1)
+        key_low = min(int(keys.domain(j)[0].min()) for j in range(len(keys.feature_names)))
+        key_high = max(int(keys.domain(j)[0].max()) for j in range(len(keys.feature_names)))
+        threshold_dtype = _small_int_dtype(min(key_low - 1, cuts.min()), max(key_high, cuts.max()))
+        return cls(
+            feature_names, model.classes_,
+            max_depth=max(tree.max_depth for tree in trees),
+            value_scale=value_scale,
+            feature=feature.astype(_small_int_dtype(0, len(feature_names) - 1, unsigned=True)),
+            threshold=cuts.astype(threshold_dtype),
+            left=left.astype(index_dtype),
+            right=right.astype(index_dtype),
+            value=value,
+            roots=roots.astype(index_dtype),
+        )
+
+    @property
+    def nbytes(self):
+        """Bytes of the node and value arrays"""
+        return int(sum(getattr(self, name).nbytes for name in self.ARRAYS))
+
+    def apply(self, X_raw):
+        """
+        Leaf node of every tree for raw rows
+
+        Returns:
+            np.ndarray: (n, n_trees) global node indices
+        """
+        X_raw = np.asarray(X_raw)
+        if len(X_raw) and ((X_raw < self.lower).any() or (X_raw > self.upper).any()):
+            raise ValueError("Quantized model is only defined on FEATURE_RANGES")
+        keys = self.keys.transform(X_raw).astype(self.threshold.dtype)
+        n_rows, n_features = keys.shape
+        flat_keys = keys.ravel()
+        row_base = (np.arange(n_rows) * n_features)[:, None]
+
+        # Küçük dtype'lı diziler çağrı başına intp'ye açılır (6k düğüm, µs mertebesi):
+        # NumPy indeks olarak intp dışı tiplerde her gather'da dönüşüm yapar
+        feature, left, right = (a.astype(np.intp) for a in (self.feature, self.left, self.right))
+        node = np.broadcast_to(self.roots.astype(np.intp), (n_rows, len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = flat_keys[row_base + feature[node]] <= self.threshold[node]
+            node = np.where(go_left, left[node], right[node])
+        return node
+
+    def predict_proba(self, X_raw, chunk_size=None):
+        """
+        Class probabilities for raw integer rows (RAW_FEATURES order)
+
+        Returns:
+            np.ndarray: (n, n_classes) float64
+        """
+        chunk_size = chunk_size or QUANTIZATION_CONFIG['chunk_size']
+        X_raw = np.asarray(X_raw)
+        out = np.empty((len(X_raw), len(self.classes)))
+        for start in range(0, len(X_raw), chunk_size):
+            leaves = self.apply(X_raw[start:start + chunk_size])
+            totals = self.value[leaves].sum(axis=1, dtype=np.int64)
+            out[start:start + chunk_size] = totals / (self.value_scale * len(self.roots))
+        return out
+
+    def predict_batch(self, df):
+        """
+        Score a raw DataFrame (same columns as LungCancerPredictor.predict_batch)
+        """
+        probability = self.predict_proba(df[RAW_FEATURES].to_numpy())
+        result = pd.DataFrame(probability, columns=[f"prob_{c}" for c in self.classes], index=df.index)
+        result.insert(0, 'prediction', self.classes[probability.argmax(axis=1)])
+        result.insert(1, 'confidence', probability.max(axis=1))
+        return result
+
+    def save(self, path):
+        """Write arrays and metadata to an .npz file (no pickle)"""
+        np.savez(
+            path, feature_names=np.array(self.feature_names), classes=self.classes.astype(str),
+            meta=np.array([self.max_depth, self.value_scale]),
+            **{name: getattr(self, name) for name in self.ARRAYS}
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved model (None if the file does not exist)"""
+        if not Path(path).exists():
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            max_depth, value_scale = data['meta']
+            return cls(data['feature_names'], data['classes'], max_depth, value_scale,
+                    **{name: data[name] for name in cls.ARRAYS})
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+def forest_nbytes(model):
+    """Bytes of sklearn's node structs and value arrays"""
+    trees = [estimator.tree_ for estimator in getattr(model, 'estimators_', [model])]
+    return int(sum(tree.__getstate__()['nodes'].nbytes + tree.value.nbytes for tree in trees))
+
+
+def parity_report(quantized, model, scaler, feature_names, X_raw):
+    """
+    Agreement between the quantized model and the float model
+
+    Args:
+        quantized: QuantizedForest
+        model, scaler, feature_names: The float model it was exported from
+        X_raw: Raw integer rows (RAW_FEATURES order)
+
+    Returns:
+        dict: leaf_agreement (same leaf in every tree), label_agreement,
+            max_abs_probability_error
+    """
+    df = pd.DataFrame(X_raw, columns=RAW_FEATURES)
+    X = scaler.transform(pd.DataFrame(build_feature_matrix(df, feature_names), columns=feature_names))
+    expected = model.predict_proba(X)
+    actual = quantized.predict_proba(X_raw)
+
+    leaves = model.apply(X)
+    if leaves.ndim == 1:  # Tek karar ağacı
+        leaves = leaves[:, None]
+    return {
+        'leaf_agreement': float((quantized.apply(X_raw) == leaves + quantized.roots.astype(np.int64)).mean()),
+        'label_agreement': float((actual.argmax(axis=1) == expected.argmax(axis=1)).mean()),
+        'max_abs_probability_error': float(np.abs(actual - expected).max()),
+    }
+
+
+def _best_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - began)
+    return min(timings) * 1000
+
+
+def main():
+    """Quantize the deployed model and report memory, latency and parity"""
+    from inference import LungCancerPredictor
+    from sharded_scoring import random_patients
+
+    parser = argparse.ArgumentParser(description="Quantized model export")
+    parser.add_argument('--probability-dtype', choices=sorted(PROBABILITY_DTYPES), default=None)
+    parser.add_argument('--rows', type=int, default=100_000, help="Random rows for the parity check")
+    parser.add_argument('--output', type=Path, default=QUANTIZED_MODEL_PATH)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("MODEL QUANTIZATION")
+    print("=" * 80)
+    predictor = LungCancerPredictor()
+    start = time.perf_counter()
+    quantized = QuantizedForest.from_model(predictor.model, predictor.scaler, predictor.feature_names,
+                                           args.probability_dtype)
+    print(f"\n✅ Quantized {len(quantized.roots)} trees / {len(quantized.left):,} nodes "
+        f"in {time.perf_counter() - start:.2f} s")
+    print(f"   dtypes: index={quantized.left.dtype}, threshold={quantized.threshold.dtype}, "
+        f"feature={quantized.feature.dtype}, value={quantized.value.dtype}")
+
+    before, after = forest_nbytes(predictor.model), quantized.nbytes
+    print(f"\n💾 Memory: {before / 1024:,.1f} KB -> {after / 1024:,.1f} KB ({before / after:.1f}x smaller)")
+
+    X_raw = random_patients(args.rows)
+    parity = parity_report(quantized, predictor.model, predictor.scaler, predictor.feature_names, X_raw)
+    print(f"\n🎯 Parity on {args.rows:,} random patients: " +
+        ", ".join(f"{k}={v:.6g}" for k, v in parity.items()))
+
+    row_dict = dict(zip(RAW_FEATURES, map(int, X_raw[0])))
+    df = pd.DataFrame(X_raw[:10_000], columns=RAW_FEATURES)
+    rows = [('1 row', _best_ms(lambda: predictor.predict(row_dict), 50),
+             _best_ms(lambda: quantized.predict_proba(X_raw[:1]), 50))]
+    for n in (100, 1_000, 10_000):
+        rows.append((f"{n:,} rows", _best_ms(lambda: predictor.predict_batch(df.iloc[:n]), 3),
+                     _best_ms(lambda: quantized.predict_batch(df.iloc[:n]), 3)))
+    print("\n⏱️ Latency (raw input -> probabilities, best of N):")
+    for label, float_ms, quantized_ms in rows:
+        print(f"   {label:9s} float {float_ms:8.2f} ms | quantized {quantized_ms:8.2f} ms")
+
+    quantized.save(args.output)
+    print(f"\n✅ Saved: {args.output} ({Path(args.output).stat().st_size / 1024:,.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
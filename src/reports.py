@@ -0,0 +1,185 @@
+"""
+PDF Reports - Template-Based Risk Report Rendering
+==================================================
+Risk raporu tek bir yerde, bildirimsel (declarative) bir şablondan üretilir.
+
+- REPORT_TEMPLATE: blok listesi (başlık, metin, liste); renderer blokları sayfa
+  düzenine göre çizer, sayfa dolunca yeni sayfa açar
+- Cache: PDF'ler içerik hash'i (şablon + sonuç + girdiler) ile REPORT_CACHE_DIR'da
+  saklanır (StageCache, LRU)
+- Toplu üretim: reportlab saf Python olduğu için raporlar process havuzunda
+  paralel çizilir (render_reports)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from config import REPORT_CACHE_DIR, REPORT_CACHE_MAX_BYTES, REPORT_MAX_WORKERS
+from stage_cache import StageCache, stage_key
+
+# =============================================================================
+# TEMPLATE
+# =============================================================================
+# Blok stilleri: (font, boyut, x, bloktan önceki boşluk, satır yüksekliği)
+BLOCK_STYLES = {
+    'title':   ('Helvetica-Bold', 20, 50, 0, 30),
+    'heading': ('Helvetica-Bold', 14, 50, 0, 20),
+    'label':   ('Helvetica-Bold', 12, 50, 10, 20),
+    'text':    ('Helvetica', 12, 50, 0, 20),
+    'item':    ('Helvetica', 12, 60, 0, 20),
+    'detail':  ('Helvetica', 10, 60, 0, 15),
+}
+
+REPORT_TEMPLATE = [
+    {'block': 'title', 'text': "Lung Cancer Risk Report"},
+    {'block': 'heading', 'text': "Risk Level: {risk_level}"},
+    {'block': 'text', 'text': "Confidence: {confidence:.2%}"},
+    {'block': 'label', 'text': "Probability Distribution:"},
+    {'block': 'item', 'each': 'probability', 'text': "{key}: {value:.2%}"},
+    {'block': 'heading', 'text': "Patient Inputs:", 'space_before': 20},
+    {'block': 'detail', 'each': 'input_data', 'text': "{key}: {value}"},
+]
+
+PAGE_TOP = 750
+PAGE_BOTTOM = 50
+
+
+def _report_context(result, input_data):
+    """Fields the template reads (cache key is built from these only)"""
+    return {
+        'risk_level': result['risk_level'],
+        'confidence': float(result['confidence']),
+        'probability': {k: float(v) for k, v in result['probability'].items()},
+        'input_data': dict(input_data),
+    }
+
+
+def _template_lines(template, context):
+    """Expand template blocks into (style, text, space_before) lines"""
+    for block in template:
+        style = block['block']
+        space = block.get('space_before', BLOCK_STYLES[style][3])
+        if 'each' in block:
+            for i, (key, value) in enumerate(context[block['each']].items()):
+                yield style, block['text'].format(key=key, value=value), space if i == 0 else 0
+        else:
+            yield style, block['text'].format(**context), space
+
+
+def render_pdf(result, input_data, template=None):
+    """
+    Draw a risk report
+
+    Args:
+        result: predict_with_details output (risk_level, confidence, probability)
+        input_data: Raw patient inputs
+        template: Block list (default: REPORT_TEMPLATE)
+
+    Returns:
+        bytes: PDF document
+    """
+    context = _report_context(result, input_data)
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, invariant=True)  # Aynı içerik -> aynı PDF
+
+    y = PAGE_TOP
+    for style, text, space in _template_lines(template or REPORT_TEMPLATE, context):
+        font, size, x, _, line_height = BLOCK_STYLES[style]
+        y -= space
+        if y < PAGE_BOTTOM:  # Sayfa dolarsa yenisini aç
+            c.showPage()
+            y = PAGE_TOP
+        c.setFont(font, size)
+        c.drawString(x, y, text)
+        y -= line_height
+
+    c.save()
+    return buffer.getvalue()
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def report_key(result, input_data, template=None):
+    """Content hash of a report (template + rendered fields)"""
+    return stage_key('report', template=template or REPORT_TEMPLATE, styles=BLOCK_STYLES,
+                    context=_report_context(result, input_data))
+
+
+_default_cache = None
+
+
+def get_report_cache():
+    """Process-wide report cache (REPORT_CACHE_DIR)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = StageCache(REPORT_CACHE_DIR, max_bytes=REPORT_CACHE_MAX_BYTES)
+    return _default_cache
+
+
+def generate_report(result, input_data, template=None, cache=None):
+    """
+    Cached PDF report
+
+    Args:
+        result: predict_with_details output
+        input_data: Raw patient inputs
+        template: Block list (default: REPORT_TEMPLATE)
+        cache: StageCache (default: get_report_cache(); False = no cache)
+
+    Returns:
+        bytes: PDF document
+    """
+    if cache is False:
+        return render_pdf(result, input_data, template)
+    cache = cache or get_report_cache()
+    key = report_key(result, input_data, template)
+    pdf = cache.get('report', key)
+    if pdf is None:
+        pdf = render_pdf(result, input_data, template)
+        cache.put('report', key, pdf)
+    return pdf
+
+
+def _render_item(item):
+    result, input_data, template = item
+    return render_pdf(result, input_data, template)
+
+
+def render_reports(items, template=None, cache=None, max_workers=REPORT_MAX_WORKERS):
+    """
+    Render many reports; cache misses are drawn in a process pool
+
+    Args:
+        items: List of (result, input_data)
+        template: Block list (default: REPORT_TEMPLATE)
+        cache: StageCache (default: get_report_cache(); False = no cache)
+        max_workers: Pool size (default: all cores)
+
+    Returns:
+        list: PDF bytes in input order
+    """
+    cache = None if cache is False else (cache or get_report_cache())
+    keys = [report_key(result, input_data, template) for result, input_data in items]
+    pdfs = [cache.get('report', key) if cache else None for key in keys]
+    missing = [i for i, pdf in enumerate(pdfs) if pdf is None]
+
+    if missing:
+        work = [(items[i][0], items[i][1], template) for i in missing]
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1 or len(work) == 1:
+            rendered = [_render_item(item) for item in work]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                chunksize = max(1, len(work) // (max_workers * 4))
+                rendered = list(pool.map(_render_item, work, chunksize=chunksize))
+        for i, pdf in zip(missing, rendered):
+            pdfs[i] = pdf
+            if cache:
+                cache.put('report', keys[i], pdf)
+    return pdfs
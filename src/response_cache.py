@@ -0,0 +1,186 @@
+"""
+Response Cache - Request-Level TTL Cache for the API
+====================================================
+Aynı hasta girdisi (tekrar denemeler, çift gönderimler, arayüz yenilemeleri) için
+predict_with_details + generate_recommendations tekrar çalıştırılmaz.
+
+- Anahtar: sha256(uç nokta + model sürümü + kanonik JSON girdi); alan sırası ve
+  2 / 2.0 farkı anahtarı değiştirmez
+- Bellek katmanı: OrderedDict LRU, her girdi oluşturulma zamanıyla tutulur; TTL
+  dolmuşsa miss sayılır ve silinir
+- İsteğe bağlı disk katmanı (StageCache, RESPONSE_CACHE_DIR): aynı makinedeki tüm
+  worker süreçleri paylaşır; LRU tahliye her DISK_EVICT_EVERY yazımda bir yapılır
+  (dizin taraması her istekte ödenmez, sınır en fazla bu kadar girdi aşılabilir)
+- Model değişimi (hot-swap): anahtar model sürümünü içerir; ensure_version() yeni bir
+  sürüm gördüğünde bellek katmanını boşaltır (disk girdileri eski sürümle eşleşmez)
+- Metrikler: bellek / disk isabeti, miss, hit oranı, tahliye, süresi dolan, geçersizleştirme
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from config import RESPONSE_CACHE_CONFIG, RESPONSE_CACHE_DIR
+from stage_cache import StageCache
+
+# Disk katmanında kaç yazımda bir LRU tahliyesi yapılacağı
+DISK_EVICT_EVERY = 100
+
+
+def _canonical(value):
+    """Integral floats -> int so that 2 and 2.0 hash alike"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, 'item'):
+        return _canonical(value.item())
+    return value
+
+
+def payload_key(payload, model_version, namespace='predict'):
+    """
+    Cache key of a request payload for one model version
+
+    Args:
+        payload: JSON-like request input (e.g. raw-schema patient record)
+        model_version: Version of the model that answers (bundle id)
+        namespace: Endpoint / response kind
+
+    Returns:
+        str: Hex digest
+    """
+    canonical = json.dumps(_canonical(payload), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(f"{namespace}\0{model_version}\0{canonical}".encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    In-process LRU + TTL cache with an optional shared on-disk tier
+
+    Args:
+        max_entries: Memory tier size (default: RESPONSE_CACHE_CONFIG)
+        ttl_seconds: Entry lifetime (default: RESPONSE_CACHE_CONFIG)
+        disk_dir: Directory of the shared disk tier (None = memory only)
+        disk_max_bytes: Disk tier size limit
+        clock: Wall-clock function (tests); wall time so that workers agree on ages
+    """
+
+    def __init__(self, max_entries=None, ttl_seconds=None, disk_dir=None, disk_max_bytes=None, clock=time.time):
+        self.max_entries = max_entries or RESPONSE_CACHE_CONFIG['max_entries']
+        # 0 geçerli bir TTL'dir (her girdi hemen bayatlar), yalnızca None varsayılanı alır
+        self.ttl_seconds = RESPONSE_CACHE_CONFIG['ttl_seconds'] if ttl_seconds is None else ttl_seconds
+        self.disk = None
+        if disk_dir is not None:
+            self.disk = StageCache(disk_dir, max_bytes=disk_max_bytes or RESPONSE_CACHE_CONFIG['disk_max_bytes'])
+        self.clock = clock
+        self.version = None
+        self._memory = OrderedDict()
+        self._disk_writes = 0
+        self.memory_hits = self.disk_hits = self.misses = 0
+        self.evictions = self.expirations = self.invalidations = 0
+
+    def ensure_version(self, version):
+        """
+        Invalidate the memory tier when the served model version changes
+
+        Returns:
+            bool: True if the cache was invalidated
+        """
+        if version == self.version:
+            return False
+        if self.version is not None:
+            self.invalidations += 1
+        self._memory.clear()
+        self.version = version
+        return True
+
+    def _fresh(self, created):
+        return self.clock() - created < self.ttl_seconds
+
+    def get(self, key):
+        """
+        Cached value, or None on miss / expiry
+
+        Args:
+            key: payload_key()
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            if self._fresh(entry[0]):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            del self._memory[key]
+            self.expirations += 1
+
+        if self.disk is not None:
+            entry = self.disk.get('response', key)
+            if entry is not None:
+                if self._fresh(entry[0]):
+                    self._remember(key, entry)
+                    self.disk_hits += 1
+                    return entry[1]
+                # Süresi dolmuş dosya, yeniden hesaplanan yanıtla (aynı anahtar) üzerine yazılır
+                self.expirations += 1
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Store a response in memory (and on disk if enabled)"""
+        entry = (self.clock(), value)
+        self._remember(key, entry)
+        if self.disk is not None:
+            self._disk_writes += 1
+            self.disk.put('response', key, entry, evict=self._disk_writes % DISK_EVICT_EVERY == 0)
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (both tiers)"""
+        self._memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def metrics(self):
+        """
+        Hit-ratio metrics
+
+        Returns:
+            dict: requests, memory/disk hits, misses, hit_ratio, entries, evictions,
+                expirations, invalidations, model_version
+        """
+        hits = self.memory_hits + self.disk_hits
+        requests = hits + self.misses
+        return {
+            'requests': requests,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_ratio': hits / requests if requests else None,
+            'entries': len(self._memory),
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+            'ttl_seconds': self.ttl_seconds,
+            'disk': self.disk is not None,
+            'model_version': self.version,
+        }
+
+
+def build_response_cache(config=None):
+    """ResponseCache from RESPONSE_CACHE_CONFIG (None if disabled)"""
+    config = dict(RESPONSE_CACHE_CONFIG, **(config or {}))
+    if not config['enabled']:
+        return None
+    return ResponseCache(config['max_entries'], config['ttl_seconds'],
+                        RESPONSE_CACHE_DIR if config['disk'] else None, config['disk_max_bytes'])
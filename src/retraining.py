@@ -0,0 +1,306 @@
+"""
+Incremental Retraining - Warm-Start Forest Updates
+==================================================
+Tahmin kayıtlarına (PREDICTION_LOG_PATH) sonradan gelen doğrulanmış etiketlerle
+(feedback.attach_label -> LABEL_LOG_PATH) modeli artımlı olarak günceller.
+
+- 300 ağacın hepsi yeniden eğitilmez: warm_start ile yeni verilerden
+  `trees_per_update` ağaç eklenir, `max_trees` aşılırsa en eski ağaçlar atılır
+- Yeni ağaçlar, yeni kayıtlar + eski eğitim verisinden bir tekrar (replay) örneği
+  ile eğitilir (tüm sınıfların temsil edilmesi için)
+- Scaler sabit tutulur: mevcut ağaçların eşikleri aynı ölçekte kalır
+- RETRAINING_TRIGGERS ('sample_count', 'time_based') aşıldığında otomatik çalışır;
+  kullanılan kayıtların kimlikleri (consumed_ids) RETRAIN_STATE_PATH'te tutulur:
+  eski bir tahmine geç gelen etiket de bir sonraki güncellemede kullanılır
+"""
+
+import json
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+from config import (
+    RETRAINING_TRIGGERS, INCREMENTAL_RETRAIN_CONFIG, PREDICTION_LOG_PATH, LABEL_LOG_PATH,
+    RETRAIN_STATE_PATH, FINAL_MODEL_PATH, FINAL_SCALER_PATH, FEATURE_LIST_PATH, RAW_DATA_PATH,
+    RANDOM_STATE
+)
+from data_loader import load_raw_data, LEVEL_CATEGORIES, TARGET_COLUMN
+from features import RAW_FEATURES, build_feature_matrix
+from artifacts import refresh_manifest
+from feedback import load_prediction_log, load_labels, entry_id, attach_label
+
+
+# =============================================================================
+# PREDICTION LOG & STATE
+# =============================================================================
+
+def labelled_records(entries, labels=None, consumed=()):
+    """
+    Raw features + label of labelled entries not used yet
+
+    Args:
+        entries: Prediction log entries
+        labels: {entry id: label} from the label log (overrides an inline 'label')
+        consumed: Ids of entries already used for an update
+
+    Returns:
+        pd.DataFrame: RAW_FEATURES + TARGET_COLUMN indexed by entry id
+            (entries without a valid label are skipped)
+    """
+    labels = labels or {}
+    consumed = set(consumed)
+    rows, ids = [], []
+    for entry in entries:
+        key = entry_id(entry)
+        label = labels.get(key, entry.get('label'))
+        if label not in LEVEL_CATEGORIES or key in consumed:
+            continue
+        record = entry.get('input', {})
+        if any(name not in record for name in RAW_FEATURES):
+            continue
+        rows.append(dict({name: record[name] for name in RAW_FEATURES}, **{TARGET_COLUMN: label}))
+        ids.append(key)
+    return pd.DataFrame(rows, columns=RAW_FEATURES + [TARGET_COLUMN], index=pd.Index(ids, name='id'))
+
+
+def load_state(path=RETRAIN_STATE_PATH, model_path=FINAL_MODEL_PATH):
+    """
+    Retraining state (consumed entry ids, last retrain time, update count)
+
+    Durum dosyası yoksa son eğitim zamanı olarak model dosyasının tarihi kullanılır.
+    """
+    path = Path(path)
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)
+    model_path = Path(model_path)
+    last = datetime.fromtimestamp(model_path.stat().st_mtime) if model_path.exists() else datetime.now()
+    return {'consumed_ids': [], 'last_retrain': last.isoformat(), 'n_updates': 0, 'n_samples_added': 0}
+
+
+def save_state(state, path=RETRAIN_STATE_PATH):
+    """Write retraining state as JSON"""
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    with open(path, 'w') as f:
+        json.dump(state, f, indent=2)
+
+
+def check_triggers(state, n_new, now=None, triggers=RETRAINING_TRIGGERS):
+    """
+    Evaluate count- and time-based retraining triggers
+
+    Args:
+        state: Retraining state
+        n_new: New labelled records since the last update
+        now: Current time (default: datetime.now())
+        triggers: Thresholds (default: RETRAINING_TRIGGERS)
+
+    Returns:
+        list: Names of fired triggers
+    """
+    now = now or datetime.now()
+    fired = []
+    if n_new >= triggers['sample_count']:
+        fired.append('sample_count')
+    age_days = (now - datetime.fromisoformat(state['last_retrain'])).total_seconds() / 86400
+    if age_days >= triggers['time_based']:
+        fired.append('time_based')
+    return fired
+
+
+# =============================================================================
+# WARM-START UPDATE
+# =============================================================================
+
+def warm_start_update(model, X, y, n_new_trees, max_trees=None):
+    """
+    Grow a fitted forest with trees trained on (X, y)
+
+    Args:
+        model: Fitted RandomForestClassifier (modified in place)
+        X, y: Training rows for the new trees
+        n_new_trees: Trees to add
+        max_trees: Drop the oldest trees beyond this count (None = unbounded)
+
+    Returns:
+        The updated model
+    """
+    missing = set(model.classes_) - set(np.unique(y))
+    if missing:
+        # Yeni ağaçlar farklı sınıf kümesiyle eğitilirse olasılık kolonları kayar
+        raise ValueError(f"Update data lacks classes {sorted(missing)}; add replay rows")
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+
+    if max_trees is not None and len(model.estimators_) > max_trees:
+        model.estimators_ = model.estimators_[-max_trees:]
+        model.n_estimators = max_trees
+    return model
+
+
+def _save_model_atomic(model, path):
+    """Pickle the model next to path, then replace it"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(model, f)
+        os.replace(tmp_name, path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+
+
+def incremental_retrain(log_path=PREDICTION_LOG_PATH, label_path=LABEL_LOG_PATH, data_path=RAW_DATA_PATH,
+                        model_path=FINAL_MODEL_PATH, scaler_path=FINAL_SCALER_PATH,
+                        feature_path=FEATURE_LIST_PATH, state_path=RETRAIN_STATE_PATH,
+                        force=False, now=None, config=None, triggers=None,
+                        random_state=RANDOM_STATE):
+    """
+    Add warm-start trees for newly labelled records if a trigger fired
+
+    Args:
+        log_path: Prediction log (monitoring.py format)
+        label_path: Label log written by feedback.attach_label
+        data_path: Original training CSV for replay rows (skipped with a warning if missing)
+        model_path, scaler_path, feature_path: Deployed artifacts
+        state_path: Retraining state file
+        force: Update even if no trigger fired
+        now: Current time (for time-based trigger)
+        config: Overrides for INCREMENTAL_RETRAIN_CONFIG
+        triggers: Overrides for RETRAINING_TRIGGERS
+        random_state: Seed for replay sampling
+
+    Returns:
+        dict: retrained flag, fired triggers and update summary
+    """
+    config = dict(INCREMENTAL_RETRAIN_CONFIG, **(config or {}))
+    now = now or datetime.now()
+    state = load_state(state_path, model_path)
+    entries = load_prediction_log(log_path)
+    consumed = set(state.get('consumed_ids', []))
+    if 'log_offset' in state:
+        # Eski durum dosyası: ilk log_offset kaydın satır içi etiketleri kullanılmıştı
+        consumed |= {entry_id(e) for e in entries[:state.pop('log_offset')] if e.get('label') in LEVEL_CATEGORIES}
+    new = labelled_records(entries, load_labels(label_path), consumed)
+
+    fired = check_triggers(state, len(new), now, dict(RETRAINING_TRIGGERS, **(triggers or {})))
+    summary = {'retrained': False, 'triggers': fired, 'n_new': len(new)}
+    if force:
+        fired = fired or ['manual']
+        summary['triggers'] = fired
+    if not fired:
+        return summary
+    if len(new) < config['min_new_samples']:
+        summary['reason'] = f"only {len(new)} new labelled records (< {config['min_new_samples']})"
+        return summary
+
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    with open(feature_path) as f:
+        feature_names = [line.strip() for line in f if line.strip()]
+
+    def scaled(df):
+        return scaler.transform(pd.DataFrame(build_feature_matrix(df, feature_names), columns=feature_names))
+
+    X_new = scaled(new)
+    y_new = new[TARGET_COLUMN].to_numpy()
+    # Güncelleme öncesi, yeni kayıtlar üzerindeki doğruluk (prequential)
+    accuracy_before = float(accuracy_score(y_new, model.predict(X_new)))
+
+    X_parts, y_parts = [X_new], [y_new]
+    if config['replay_size'] > 0 and not (data_path and Path(data_path).exists()):
+        print(f"⚠️ Replay data not found: {data_path} (new trees see only the {len(new)} new records)")
+        summary['replay_missing'] = str(data_path)
+    elif config['replay_size'] > 0:
+        replay = load_raw_data(data_path)
+        replay = replay.sample(n=min(config['replay_size'], len(replay)), random_state=random_state)
+        X_parts.append(scaled(replay))
+        y_parts.append(replay[TARGET_COLUMN].astype(str).to_numpy())
+
+    missing = set(map(str, model.classes_)) - set(np.concatenate(y_parts).astype(str))
+    if missing:
+        # Replay olmadan küçük bir etiket grubu genelde tüm sınıfları içermez; kayıtlar
+        # tüketilmez, sonraki güncellemede tekrar denenir
+        summary['reason'] = f"update data lacks classes {sorted(missing)} (no replay rows)"
+        return summary
+
+    n_before = len(model.estimators_)
+    warm_start_update(model, np.vstack(X_parts), np.concatenate(y_parts),
+                    config['trees_per_update'], config['max_trees'])
+    _save_model_atomic(model, model_path)
+    # Model paketin parçasıysa checksum'ı güncellenir (yoksa loader değişen dosyayı reddeder)
+    refresh_manifest(Path(model_path).parent, [Path(model_path).name],
+                    last_incremental_update=now.isoformat(), n_estimators=len(model.estimators_))
+
+    state.update({
+        'consumed_ids': sorted(consumed | set(new.index)),
+        'last_retrain': now.isoformat(),
+        'n_updates': state['n_updates'] + 1,
+        'n_samples_added': state['n_samples_added'] + len(new),
+    })
+    save_state(state, state_path)
+
+    summary.update({
+        'retrained': True,
+        'n_replay': int(sum(len(y) for y in y_parts[1:])),
+        'trees_before': n_before,
+        'trees_after': len(model.estimators_),
+        'accuracy_before': accuracy_before,
+        'accuracy_after': float(accuracy_score(y_new, model.predict(X_new))),
+    })
+    return summary
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    """Check triggers and run an incremental update if one fired"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incremental warm-start retraining")
+    parser.add_argument('--log-path', default=str(PREDICTION_LOG_PATH), help="Prediction log JSON")
+    parser.add_argument('--label-path', default=str(LABEL_LOG_PATH), help="Label log JSONL")
+    parser.add_argument('--data-path', default=str(RAW_DATA_PATH), help="Original training CSV (replay rows)")
+    parser.add_argument('--force', action='store_true', help="Update even if no trigger fired")
+    parser.add_argument('--label', nargs=2, metavar=('PREDICTION_ID', 'LEVEL'),
+                        help="Attach a confirmed diagnosis to a logged prediction and exit")
+    args = parser.parse_args()
+
+    if args.label:
+        event = attach_label(*args.label, log_path=args.log_path, label_path=args.label_path)
+        print(f"🏷️ {event['id']}: predicted {event['prediction']}, confirmed {event['label']}")
+        return
+
+    print("\n" + "="*80)
+    print("INCREMENTAL RETRAINING")
+    print("="*80)
+
+    summary = incremental_retrain(log_path=args.log_path, label_path=args.label_path,
+                                data_path=args.data_path, force=args.force)
+
+    print(f"\n📥 New labelled records: {summary['n_new']}")
+    print(f"🔔 Triggers: {', '.join(summary['triggers']) or 'none'}")
+    if not summary['retrained']:
+        print(f"⏭️ No update ({summary.get('reason', 'no trigger fired')})")
+        return
+    print(f"🌲 Trees: {summary['trees_before']} -> {summary['trees_after']} "
+        f"(new data + {summary['n_replay']} replay rows)")
+    print(f"📊 Accuracy on new records: {summary['accuracy_before']:.4f} -> {summary['accuracy_after']:.4f}")
+    print(f"✅ Model updated: {FINAL_MODEL_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+"""
+Model Routing - Multi-Model Serving & A/B Traffic Splitting
+===========================================================
+Birden fazla model sürümü (varyant) aynı anda yüklenir, trafik ağırlıklara göre bölünür.
+
+- Atama: 'hash' stratejisinde sha256(salt:patient_id) [0, 1) aralığına çevrilir ve
+  kümülatif ağırlıklarla varyant seçilir (aynı hasta hep aynı varyantı görür);
+  patient_id yoksa veya 'weight' stratejisinde rastgele seçilir
+- Özellikler bir kez hesaplanır: tüm varyantların feature listelerinin birleşimi
+  üzerinde build_feature_matrix, her varyant kendi kolonlarını indeksle alır
+  (scaler'lar varyanta özgü)
+- Varyant bazında metrikler artımlı toplamlarla tutulur: istek/satır sayısı, hata,
+  gecikme, tahmin dağılımı, ortalama güven; record_outcome() ile gelen doğrulanmış
+  etiketlerden doğruluk. ROUTING_METRICS_PATH'e yazılır
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import ROUTING_CONFIG, ROUTING_METRICS_PATH
+from features import build_feature_matrix
+
+
+def hash_bucket(patient_id, salt=''):
+    """Stable position of a patient id in [0, 1)"""
+    digest = hashlib.sha256(f"{salt}:{patient_id}".encode()).digest()
+    return (int.from_bytes(digest[:8], 'big') >> 11) / 2 ** 53
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+class VariantMetrics:
+    """Running totals for one variant"""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.n_requests = data.get('n_requests', 0)
+        self.n_rows = data.get('n_rows', 0)
+        self.n_errors = data.get('n_errors', 0)
+        self.latency_sum = data.get('latency_sum', 0.0)
+        self.latency_max = data.get('latency_max', 0.0)
+        self.confidence_sum = data.get('confidence_sum', 0.0)
+        self.prediction_counts = data.get('prediction_counts', {})
+        self.n_labelled = data.get('n_labelled', 0)
+        self.n_correct = data.get('n_correct', 0)
+
+    def update(self, predictions, confidence, latency):
+        """Add one scored request (one or more rows)"""
+        self.n_requests += 1
+        self.n_rows += len(predictions)
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.confidence_sum += float(np.sum(confidence))
+        for label, count in zip(*np.unique(np.asarray(predictions, dtype=str), return_counts=True)):
+            self.prediction_counts[str(label)] = self.prediction_counts.get(str(label), 0) + int(count)
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    def metrics(self):
+        """Per-variant summary (None where there is no data)"""
+        return {
+            'requests': self.n_requests,
+            'rows': self.n_rows,
+            'error_rate': self.n_errors / (self.n_requests + self.n_errors) if self.n_requests + self.n_errors else None,
+            'mean_latency_ms': 1000 * self.latency_sum / self.n_requests if self.n_requests else None,
+            'max_latency_ms': 1000 * self.latency_max if self.n_requests else None,
+            'latency_per_row_ms': 1000 * self.latency_sum / self.n_rows if self.n_rows else None,
+            'mean_confidence': self.confidence_sum / self.n_rows if self.n_rows else None,
+            'prediction_distribution': {label: count / self.n_rows for label, count in
+                                        self.prediction_counts.items()} if self.n_rows else None,
+            'labelled': self.n_labelled,
+            'accuracy': self.n_correct / self.n_labelled if self.n_labelled else None,
+        }
+
+
+# =============================================================================
+# ROUTER
+# =============================================================================
+
+class ModelRouter:
+    """
+    Serve several model versions side by side and split traffic between them
+
+    Args:
+        variants: {name: predictor} (LungCancerPredictor-like: model, scaler,
+            feature_names, predict_proba_scaled, optional version)
+        weights: {name: traffic weight} (default: equal)
+        strategy: 'hash' (by patient id) or 'weight' (random)
+        salt: Experiment salt for hash_bucket
+        metrics_path: JSON file for per-variant metrics (None = memory only)
+        outcome_memory: Recent assignments kept for record_outcome
+        flush_every: Write metrics after this many requests
+        seed: Random seed (tests)
+    """
+
+    def __init__(self, variants, weights=None, strategy=None, salt=None, metrics_path=ROUTING_METRICS_PATH,
+                outcome_memory=None, flush_every=None, seed=None):
+        if not variants:
+            raise ValueError("At least one variant is required")
+        self.variants = dict(variants)
+        self.names = list(self.variants)
+        weights = weights or {name: 1.0 for name in self.names}
+        unknown = set(weights) - set(self.names)
+        if unknown:
+            raise ValueError(f"Weights for unknown variants: {sorted(unknown)}")
+        weight = np.array([float(weights.get(name, 0.0)) for name in self.names])
+        if (weight < 0).any() or weight.sum() <= 0:
+            raise ValueError(f"Weights must be >= 0 with a positive sum, got {weights}")
+        self.weights = dict(zip(self.names, weight / weight.sum()))
+        self._cumulative = np.cumsum(weight / weight.sum())
+        self._cumulative[-1] = 1.0
+
+        self.strategy = strategy or ROUTING_CONFIG['strategy']
+        if self.strategy not in ('hash', 'weight'):
+            raise ValueError(f"Unknown strategy: {self.strategy} (expected 'hash' or 'weight')")
+        self.salt = ROUTING_CONFIG['salt'] if salt is None else salt
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.flush_every = flush_every or ROUTING_CONFIG['flush_every']
+        self.outcome_memory = outcome_memory or ROUTING_CONFIG['outcome_memory']
+
+        # Birleşik feature listesi (ilk görülme sırası) ve varyant başına kolon indeksleri
+        self.feature_names = []
+        for predictor in self.variants.values():
+            self.feature_names += [name for name in predictor.feature_names if name not in self.feature_names]
+        position = {name: i for i, name in enumerate(self.feature_names)}
+        self._columns = {name: [position[feature] for feature in predictor.feature_names]
+                        for name, predictor in self.variants.items()}
+        self.classes = []
+        for predictor in self.variants.values():
+            self.classes += [str(c) for c in predictor.model.classes_ if str(c) not in self.classes]
+
+        self._random = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._metrics = {name: VariantMetrics() for name in self.names}
+        self._assignments = OrderedDict()
+        self._unflushed = 0
+
+    def version(self, name):
+        """Model version of a variant (bundle id, None for unbundled models)"""
+        return getattr(self.variants[name], 'version', None)
+
+    def assign_many(self, n_rows, patient_ids=None):
+        """
+        Variant index per row (vectorized over the cumulative weights)
+
+        Args:
+            n_rows: Number of requests
+            patient_ids: One stable id per row (hash strategy; default: random)
+
+        Returns:
+            np.ndarray: Indices into self.names
+        """
+        if self.strategy == 'hash' and patient_ids is not None:
+            u = np.array([hash_bucket(patient_id, self.salt) for patient_id in patient_ids])
+        else:
+            with self._lock:
+                u = self._random.random(n_rows)
+        return np.searchsorted(self._cumulative, u, side='right')
+
+    def assign(self, patient_id=None):
+        """
+        Variant for a request
+
+        Args:
+            patient_id: Stable patient identifier (hash strategy)
+
+        Returns:
+            str: Variant name
+        """
+        return self.names[int(self.assign_many(1, None if patient_id is None else [patient_id])[0])]
+
+    def _score(self, name, X):
+        """Probabilities of one variant on the shared feature matrix, in self.classes order"""
+        predictor = self.variants[name]
+        names = predictor.feature_names
+        X_variant = pd.DataFrame(X[:, self._columns[name]], columns=names)
+        probability = predictor.predict_proba_scaled(predictor.scaler.transform(X_variant))
+        out = np.zeros((len(X), len(self.classes)))
+        out[:, [self.classes.index(str(c)) for c in predictor.model.classes_]] = probability
+        return out
+
+    def predict_batch(self, df, patient_ids=None, variant=None):
+        """
+        Route and score raw records (features computed once for all variants)
+
+        Args:
+            df (pd.DataFrame): Raw features (RAW_FEATURES columns)
+            patient_ids: One id per row (hash strategy; default: random assignment)
+            variant: Force every row to this variant
+
+        Returns:
+            pd.DataFrame: variant, model_version, prediction, confidence and prob_<class>
+                columns (same index as df)
+        """
+        if patient_ids is not None and len(patient_ids) != len(df):
+            raise ValueError(f"Got {len(patient_ids)} patient ids for {len(df)} rows")
+        if variant is not None and variant not in self.variants:
+            raise ValueError(f"Unknown variant: {variant}")
+        if variant is not None:
+            index = np.full(len(df), self.names.index(variant))
+        else:
+            index = self.assign_many(len(df), patient_ids)
+        assigned = np.array(self.names, dtype=object)[index]
+
+        X = build_feature_matrix(df, self.feature_names)
+        probability = np.zeros((len(df), len(self.classes)))
+        for i, name in enumerate(self.names):
+            rows = np.flatnonzero(index == i)
+            if not len(rows):
+                continue
+            began = time.perf_counter()
+            try:
+                probability[rows] = self._score(name, X[rows])
+            except Exception:
+                with self._lock:
+                    self._metrics[name].n_errors += 1
+                raise
+            latency = time.perf_counter() - began
+            labels = np.array(self.classes, dtype=object)[probability[rows].argmax(axis=1)]
+            with self._lock:
+                self._metrics[name].update(labels, probability[rows].max(axis=1), latency)
+                if patient_ids is not None:
+                    for row, label in zip(rows, labels):
+                        self._remember(patient_ids[row], name, label)
+                self._unflushed += 1
+        self._maybe_flush()
+
+        classes = np.array(self.classes, dtype=object)
+        result = pd.DataFrame(probability, columns=[f"prob_{c}" for c in self.classes], index=df.index)
+        result.insert(0, 'variant', assigned)
+        result.insert(1, 'model_version', np.array([self.version(name) for name in self.names], dtype=object)[index])
+        result.insert(2, 'prediction', classes[probability.argmax(axis=1)])
+        result.insert(3, 'confidence', probability.max(axis=1))
+        return result
+
+    def predict(self, record, patient_id=None, variant=None):
+        """
+        Route and score one raw record
+
+        Returns:
+            dict: variant, model_version, prediction, confidence, probabilities
+        """
+        row = self.predict_batch(pd.DataFrame([record]), None if patient_id is None else [patient_id],
+                                variant).iloc[0]
+        return {
+            'variant': row['variant'],
+            'model_version': row['model_version'],
+            'prediction': row['prediction'],
+            'confidence': float(row['confidence']),
+            'probabilities': {c: float(row[f"prob_{c}"]) for c in self.classes},
+        }
+
+    def _remember(self, patient_id, name, label):
+        """Keep the latest assignment of a patient (bounded, oldest evicted)"""
+        self._assignments[str(patient_id)] = (name, str(label))
+        self._assignments.move_to_end(str(patient_id))
+        while len(self._assignments) > self.outcome_memory:
+            self._assignments.popitem(last=False)
+
+    def record_outcome(self, patient_id, label):
+        """
+        Attach a confirmed diagnosis to the patient's last routed prediction
+
+        Returns:
+            str: Variant that served the patient (None if the assignment is no longer known)
+        """
+        with self._lock:
+            assignment = self._assignments.pop(str(patient_id), None)
+            if assignment is None:
+                return None
+            name, predicted = assignment
+            self._metrics[name].n_labelled += 1
+            self._metrics[name].n_correct += int(predicted == str(label))
+            self._unflushed += 1
+        self._maybe_flush()
+        return name
+
+    def metrics(self):
+        """Per-variant metrics with weights and model versions"""
+        with self._lock:
+            return {
+                'strategy': self.strategy,
+                'variants': {
+                    name: dict(self._metrics[name].metrics(), weight=float(self.weights[name]),
+                            model_version=self.version(name))
+                    for name in self.names
+                },
+            }
+
+    def _maybe_flush(self):
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write per-variant totals and metrics to metrics_path (atomic)"""
+        if self.metrics_path is None:
+            return
+        metrics = self.metrics()
+        with self._lock:
+            self._unflushed = 0
+            state = {
+                'updated_at': datetime.now().isoformat(),
+                'salt': self.salt,
+                'totals': {name: self._metrics[name].to_dict() for name in self.names},
+                'metrics': metrics,
+            }
+        self.metrics_path.parent.mkdir(exist_ok=True, parents=True)
+        tmp = self.metrics_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, self.metrics_path)
+
+
+def load_router(config=None, metrics_path=None):
+    """
+    Build a router from ROUTING_CONFIG (every variant loaded as a validated bundle)
+
+    Args:
+        config: Overrides for ROUTING_CONFIG
+        metrics_path: Metrics file (default: ROUTING_METRICS_PATH, resolved at call time)
+
+    Returns:
+        ModelRouter
+    """
+    from inference import LungCancerPredictor
+
+    metrics_path = ROUTING_METRICS_PATH if metrics_path is None else metrics_path
+    config = dict(ROUTING_CONFIG, **(config or {}))
+    variants = {name: LungCancerPredictor(spec['model_path']) for name, spec in config['variants'].items()}
+    weights = {name: spec.get('weight', 1.0) for name, spec in config['variants'].items()}
+    return ModelRouter(variants, weights, config['strategy'], config['salt'], metrics_path,
+                    config['outcome_memory'], config['flush_every'])
@@ -0,0 +1,546 @@
+"""
+Retraining Scheduler - Trigger Evaluation Job
+=============================================
+RETRAINING_TRIGGERS ve ALERT_THRESHOLDS'u periyodik olarak değerlendiren hafif
+arka plan işi.
+
+- Tahmin kayıtları (PREDICTION_LOG_PATH) her seferinde baştan okunmaz: son okunan
+  byte konumundan devam edilir, metrikler artımlı toplamlardan (count, sum, sumsq)
+  hesaplanır
+- Etiketler tahminlerden ayrı izlenir: yalnızca sona eklenen LABEL_LOG_PATH kendi
+  byte konumundan okunur, her tahmin kimliği bir kez sayılır (düzeltmeler sayımı
+  günceller); önceden okunmuş bir tahmine geç gelen etiket de görülür
+- Tetikleyici çalışırsa kuyruğa (RETRAIN_QUEUE_DIR) bir yeniden eğitim işi eklenir:
+  sample_count / time_based -> artımlı (warm-start), performance_drop / data_drift -> tam pipeline
+- İşler sunulan paketi (MODEL_DIR) günceller; izleme penceresi yalnızca paketin sürümü
+  (manifest version) gerçekten değiştiyse sıfırlanır
+- Her değerlendirme süresi, metrikleri ve kararıyla SCHEDULER_AUDIT_PATH'e yazılır
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from config import (
+    RETRAINING_TRIGGERS, ALERT_THRESHOLDS, SCHEDULER_CONFIG, SCHEDULER_STATE_PATH,
+    SCHEDULER_AUDIT_PATH, RETRAIN_QUEUE_DIR, PREDICTION_LOG_PATH, LABEL_LOG_PATH, RETRAIN_STATE_PATH,
+    MODEL_RESULTS_PATH, FINAL_MODEL_PATH, FINAL_SCALER_PATH, FEATURE_LIST_PATH, RAW_DATA_PATH, MODEL_DIR
+)
+from data_loader import load_raw_data, LEVEL_CATEGORIES, TARGET_COLUMN
+from features import RAW_FEATURES
+from feedback import read_label_events
+from artifacts import read_manifest
+from stage_cache import file_digest
+
+# Kuyruk işinin türü: veri dağılımı değiştiyse tam yeniden eğitim gerekir
+TRIGGER_ACTIONS = {
+    'performance_drop': 'full',
+    'data_drift': 'full',
+    'sample_count': 'incremental',
+    'time_based': 'incremental',
+}
+
+# Son okunan konumdan önceki bu kadar byte'ın hash'i, dosyanın yeniden yazılıp
+# yazılmadığını (rotation / truncation) anlamak için saklanır
+TAIL_CHECK_BYTES = 64
+
+
+# =============================================================================
+# INCREMENTAL LOG READER
+# =============================================================================
+
+def _tail_hash(path, offset):
+    """Hash of the bytes just before offset"""
+    start = max(0, offset - TAIL_CHECK_BYTES)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def read_new_entries(path, offset=0, tail_hash=None):
+    """
+    Decode log entries appended after a byte offset
+
+    monitoring.log_prediction dosyayı JSON dizisi olarak yeniden yazar; önceki
+    kayıtların byte'ları değişmez, yeni kayıt son '}' karakterinden sonra eklenir.
+    Bu yüzden son okunan kaydın bittiği konumdan devam edilebilir.
+
+    Args:
+        path: Prediction log (JSON array)
+        offset: Byte offset after the last decoded entry
+        tail_hash: _tail_hash at offset from the previous read (None = skip check)
+
+    Returns:
+        tuple: (new entries, new offset, new tail hash, reset flag)
+    """
+    path = Path(path)
+    if not path.exists():
+        return [], 0, None, offset > 0
+
+    reset = False
+    if offset > path.stat().st_size or (offset and tail_hash and _tail_hash(path, offset) != tail_hash):
+        # Dosya kısaldı veya yeniden yazıldı -> baştan oku
+        offset, reset = 0, True
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read().decode('utf-8')
+
+    decoder = json.JSONDecoder()
+    entries = []
+    pos = end = 0
+    while True:
+        while pos < len(data) and data[pos] in ' \t\r\n,[':
+            pos += 1
+        if pos >= len(data) or data[pos] == ']':
+            break
+        try:
+            entry, pos = decoder.raw_decode(data, pos)
+        except json.JSONDecodeError:
+            break  # Yazımı sürmekte olan kayıt, bir sonraki turda okunur
+        entries.append(entry)
+        end = pos
+
+    new_offset = offset + len(data[:end].encode('utf-8'))
+    return entries, new_offset, _tail_hash(path, new_offset) if new_offset else None, reset
+
+
+# =============================================================================
+# AGGREGATES
+# =============================================================================
+
+class MonitoringAggregates:
+    """
+    Running totals over prediction log entries since the last retrain
+
+    Yalnızca sayaçlar ve toplamlar tutulur; metrikler bunlardan O(özellik sayısı)
+    sürede hesaplanır.
+    """
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.n_entries = data.get('n_entries', 0)
+        self.n_labelled = data.get('n_labelled', 0)
+        self.n_correct = data.get('n_correct', 0)
+        self.n_errors = data.get('n_errors', 0)
+        self.n_timed = data.get('n_timed', 0)
+        self.response_time_sum = data.get('response_time_sum', 0.0)
+        self.feature_count = data.get('feature_count', 0)
+        self.feature_sum = np.array(data.get('feature_sum', [0.0] * len(RAW_FEATURES)))
+        self.feature_sumsq = np.array(data.get('feature_sumsq', [0.0] * len(RAW_FEATURES)))
+        self.prediction_counts = data.get('prediction_counts', {level: 0 for level in LEVEL_CATEGORIES})
+        self.labels = data.get('labels', {})
+
+    def add_label(self, prediction, label, key=None):
+        """
+        Count one confirmed diagnosis
+
+        Args:
+            prediction: Logged prediction
+            label: Confirmed level
+            key: Prediction id; a repeated id corrects the earlier label instead of
+                counting twice (None = always count)
+        """
+        correct = int(prediction == label)
+        if key is not None and key in self.labels:
+            self.n_correct += correct - self.labels[key]
+            self.labels[key] = correct
+            return
+        self.n_labelled += 1
+        self.n_correct += correct
+        if key is not None:
+            self.labels[key] = correct
+
+    def update(self, entry):
+        """Add one log entry"""
+        self.n_entries += 1
+        if entry.get('error'):
+            self.n_errors += 1
+        if entry.get('response_time') is not None:
+            self.n_timed += 1
+            self.response_time_sum += float(entry['response_time'])
+
+        prediction = entry.get('prediction')
+        if prediction in self.prediction_counts:
+            self.prediction_counts[prediction] += 1
+        if entry.get('label') in LEVEL_CATEGORIES:
+            self.add_label(prediction, entry['label'], entry.get('id'))
+
+        record = entry.get('input') or {}
+        if all(name in record for name in RAW_FEATURES):
+            values = np.array([float(record[name]) for name in RAW_FEATURES])
+            self.feature_count += 1
+            self.feature_sum += values
+            self.feature_sumsq += values ** 2
+
+    def to_dict(self):
+        return {
+            'n_entries': self.n_entries,
+            'n_labelled': self.n_labelled,
+            'n_correct': self.n_correct,
+            'n_errors': self.n_errors,
+            'n_timed': self.n_timed,
+            'response_time_sum': self.response_time_sum,
+            'feature_count': self.feature_count,
+            'feature_sum': self.feature_sum.tolist(),
+            'feature_sumsq': self.feature_sumsq.tolist(),
+            'prediction_counts': self.prediction_counts,
+            'labels': self.labels,
+        }
+
+    def metrics(self, reference=None, baseline_accuracy=None, config=None):
+        """
+        Current monitoring metrics (None where there is not enough data)
+
+        Args:
+            reference: reference_stats() of the training data
+            baseline_accuracy: Test accuracy of the deployed model
+            config: Overrides for SCHEDULER_CONFIG
+
+        Returns:
+            dict: accuracy, performance_drop, data_drift, drift_feature,
+                prediction_drift, error_rate, average_response_time, sample_count
+        """
+        config = dict(SCHEDULER_CONFIG, **(config or {}))
+        result = {
+            'sample_count': self.n_labelled,
+            'accuracy': None,
+            'performance_drop': None,
+            'data_drift': None,
+            'drift_feature': None,
+            'prediction_drift': None,
+            'error_rate': self.n_errors / self.n_entries if self.n_entries else None,
+            'average_response_time': self.response_time_sum / self.n_timed if self.n_timed else None,
+        }
+
+        if self.n_labelled >= config['min_labelled_for_performance']:
+            result['accuracy'] = self.n_correct / self.n_labelled
+            if baseline_accuracy is not None:
+                result['performance_drop'] = baseline_accuracy - result['accuracy']
+
+        if reference and self.feature_count >= config['min_samples_for_drift']:
+            # Standartlaştırılmış ortalama farkı (en çok kayan özellik)
+            live_mean = self.feature_sum / self.feature_count
+            ref_mean = np.array(reference['feature_mean'])
+            ref_std = np.maximum(np.array(reference['feature_std']), 1e-9)
+            shift = np.abs(live_mean - ref_mean) / ref_std
+            worst = int(np.argmax(shift))
+            result['data_drift'] = float(shift[worst])
+            result['drift_feature'] = RAW_FEATURES[worst]
+
+        n_predicted = sum(self.prediction_counts.values())
+        if reference and n_predicted >= config['min_samples_for_drift']:
+            # Toplam varyasyon mesafesi (tahmin dağılımı vs eğitim sınıf dağılımı)
+            result['prediction_drift'] = 0.5 * sum(
+                abs(self.prediction_counts[level] / n_predicted - reference['class_distribution'][level])
+                for level in LEVEL_CATEGORIES
+            )
+        return result
+
+
+def reference_stats(df):
+    """
+    Training-data reference for drift (per-feature mean/std, class distribution)
+
+    Args:
+        df: Raw training data (RAW_FEATURES + TARGET_COLUMN)
+
+    Returns:
+        dict: JSON-serializable statistics
+    """
+    values = df[RAW_FEATURES].to_numpy(dtype=np.float64)
+    distribution = df[TARGET_COLUMN].astype(str).value_counts(normalize=True)
+    return {
+        'feature_mean': values.mean(axis=0).tolist(),
+        'feature_std': values.std(axis=0).tolist(),
+        'class_distribution': {level: float(distribution.get(level, 0.0)) for level in LEVEL_CATEGORIES},
+    }
+
+
+# =============================================================================
+# RETRAIN QUEUE
+# =============================================================================
+
+def pending_jobs(queue_dir=RETRAIN_QUEUE_DIR):
+    """Pending retrain jobs, oldest first"""
+    queue_dir = Path(queue_dir)
+    if not queue_dir.exists():
+        return []
+    jobs = [json.loads(p.read_text()) for p in sorted(queue_dir.glob('*.pending.json'))]
+    return sorted(jobs, key=lambda job: job['created'])
+
+
+def enqueue_job(triggers, queue_dir=RETRAIN_QUEUE_DIR, now=None):
+    """
+    Add a retrain job unless one is already pending
+
+    Returns:
+        dict: The new job, or None if a job was already pending
+    """
+    if pending_jobs(queue_dir):
+        return None
+    now = now or datetime.now()
+    action = 'full' if any(TRIGGER_ACTIONS[t] == 'full' for t in triggers) else 'incremental'
+    job = {
+        'job_id': f"{now:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}",
+        'created': now.isoformat(),
+        'triggers': list(triggers),
+        'action': action,
+    }
+    queue_dir = Path(queue_dir)
+    queue_dir.mkdir(exist_ok=True, parents=True)
+    (queue_dir / f"{job['job_id']}.pending.json").write_text(json.dumps(job, indent=2))
+    return job
+
+
+def served_version(model_dir=MODEL_DIR):
+    """Version of the served bundle (manifest version; model file digest without a manifest)"""
+    manifest = read_manifest(model_dir)
+    if manifest is not None:
+        return manifest['version']
+    model_path = Path(model_dir) / Path(FINAL_MODEL_PATH).name
+    return file_digest(model_path) if model_path.exists() else None
+
+
+def _run_job(job, data_path, model_dir=MODEL_DIR):
+    """Default job runner: warm-start update or full pipeline run, both into the served bundle"""
+    model_dir = Path(model_dir)
+    if job['action'] == 'incremental':
+        from retraining import incremental_retrain
+        return incremental_retrain(
+            data_path=data_path, model_path=model_dir / Path(FINAL_MODEL_PATH).name,
+            scaler_path=model_dir / Path(FINAL_SCALER_PATH).name,
+            feature_path=model_dir / Path(FEATURE_LIST_PATH).name, force=True
+        )
+    from pipeline import MLPipeline
+    MLPipeline(data_path=str(data_path)).run(output_dir=model_dir)
+    return {'retrained': True}
+
+
+def process_queue(queue_dir=RETRAIN_QUEUE_DIR, state_path=SCHEDULER_STATE_PATH,
+                data_path=RAW_DATA_PATH, runner=None, model_dir=MODEL_DIR):
+    """
+    Run pending jobs; jobs that change the served bundle reset the monitoring window
+
+    Args:
+        queue_dir: Job queue directory
+        state_path: Scheduler state (aggregates are reset after a retrain)
+        data_path: Training CSV passed to the runner
+        runner: Callable(job, data_path) (default: _run_job into model_dir)
+        model_dir: Served bundle directory (its version is compared before/after each job)
+
+    Returns:
+        list: Finished jobs with status and model_version before/after
+    """
+    runner = runner or partial(_run_job, model_dir=model_dir)
+    queue_dir = Path(queue_dir)
+    finished = []
+    for job in pending_jobs(queue_dir):
+        pending_path = queue_dir / f"{job['job_id']}.pending.json"
+        start = time.perf_counter()
+        before = served_version(model_dir)
+        try:
+            job['result'] = runner(job, data_path)
+            job['status'] = 'done'
+        except Exception as e:
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        job['duration_seconds'] = time.perf_counter() - start
+        job['finished'] = datetime.now().isoformat()
+        job['model_version'] = {'before': before, 'after': served_version(model_dir)}
+        # Yalnızca sunulan paket gerçekten değiştiyse pencere sıfırlanır (ör. yeni etiket yoksa değişmez)
+        job['window_reset'] = job['status'] == 'done' and before != job['model_version']['after']
+
+        (queue_dir / f"{job['job_id']}.{job['status']}.json").write_text(json.dumps(job, indent=2, default=str))
+        pending_path.unlink(missing_ok=True)
+        if job['status'] == 'done' and not job['window_reset']:
+            print(f"⚠️ Job {job['job_id']} finished but the served bundle did not change "
+                f"({before}); monitoring window kept")
+        if job['window_reset']:
+            state = load_scheduler_state(state_path)
+            state['aggregates'] = MonitoringAggregates().to_dict()
+            state['window_start'] = job['finished']
+            save_scheduler_state(state, state_path)
+        finished.append(job)
+    return finished
+
+
+# =============================================================================
+# EVALUATION
+# =============================================================================
+
+def load_scheduler_state(path=SCHEDULER_STATE_PATH):
+    """Scheduler state: log position, aggregates, cached reference"""
+    path = Path(path)
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)
+    return {'log_offset': 0, 'tail_hash': None, 'label_offset': 0, 'aggregates': {}, 'reference': None,
+            'window_start': datetime.now().isoformat()}
+
+
+def save_scheduler_state(state, path=SCHEDULER_STATE_PATH):
+    """Write scheduler state atomically"""
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, path)
+
+
+def model_age_days(now, retrain_state_path=RETRAIN_STATE_PATH, model_path=FINAL_MODEL_PATH):
+    """Days since the last (full or incremental) retrain"""
+    from retraining import load_state
+    state = load_state(retrain_state_path, model_path)
+    last = datetime.fromisoformat(state['last_retrain'])
+    model_path = Path(model_path)
+    if model_path.exists():
+        last = max(last, datetime.fromtimestamp(model_path.stat().st_mtime))
+    return (now - last).total_seconds() / 86400
+
+
+def _baseline_accuracy(path=MODEL_RESULTS_PATH):
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f).get('test_accuracy')
+
+
+def evaluate_triggers(log_path=PREDICTION_LOG_PATH, label_path=LABEL_LOG_PATH, data_path=RAW_DATA_PATH,
+                    state_path=SCHEDULER_STATE_PATH, audit_path=SCHEDULER_AUDIT_PATH,
+                    queue_dir=RETRAIN_QUEUE_DIR, results_path=MODEL_RESULTS_PATH,
+                    retrain_state_path=RETRAIN_STATE_PATH, model_path=FINAL_MODEL_PATH,
+                    now=None, triggers=None, alerts=None, config=None):
+    """
+    One scheduler tick: read new log entries and labels, update aggregates, check thresholds
+
+    Args:
+        log_path: Prediction log
+        label_path: Label log (feedback.attach_label)
+        data_path: Training CSV (reference statistics, computed once and cached)
+        state_path, audit_path, queue_dir: Scheduler files
+        results_path: model_results.json (baseline accuracy)
+        retrain_state_path, model_path: Used for model age
+        now: Evaluation time
+        triggers, alerts, config: Overrides for RETRAINING_TRIGGERS, ALERT_THRESHOLDS, SCHEDULER_CONFIG
+
+    Returns:
+        dict: Audit record of this evaluation
+    """
+    start = time.perf_counter()
+    now = now or datetime.now()
+    triggers = dict(RETRAINING_TRIGGERS, **(triggers or {}))
+    alerts = dict(ALERT_THRESHOLDS, **(alerts or {}))
+    state = load_scheduler_state(state_path)
+
+    if state.get('reference') is None and data_path and Path(data_path).exists():
+        state['reference'] = reference_stats(load_raw_data(data_path))
+
+    entries, offset, tail_hash, reset = read_new_entries(log_path, state['log_offset'], state.get('tail_hash'))
+    aggregates = MonitoringAggregates(None if reset else state['aggregates'])
+    for entry in entries:
+        aggregates.update(entry)
+    # Tahmin kaydı yeniden yazıldıysa pencere sıfırlandı: etiketler de baştan sayılır
+    labels, label_offset, _ = read_label_events(label_path, 0 if reset else state.get('label_offset', 0))
+    for event in labels:
+        if event.get('prediction') is not None:
+            aggregates.add_label(event['prediction'], event['label'], event['id'])
+    state.update(log_offset=offset, tail_hash=tail_hash, label_offset=label_offset,
+                aggregates=aggregates.to_dict())
+
+    metrics = aggregates.metrics(state['reference'], _baseline_accuracy(results_path), config)
+    metrics['model_age_days'] = model_age_days(now, retrain_state_path, model_path)
+
+    fired = []
+    if metrics['performance_drop'] is not None and metrics['performance_drop'] > triggers['performance_drop']:
+        fired.append('performance_drop')
+    if metrics['data_drift'] is not None and metrics['data_drift'] > triggers['data_drift']:
+        fired.append('data_drift')
+    if metrics['sample_count'] >= triggers['sample_count']:
+        fired.append('sample_count')
+    if metrics['model_age_days'] >= triggers['time_based']:
+        fired.append('time_based')
+
+    raised = [name for name, metric in (('error_rate', 'error_rate'),
+                                        ('response_time', 'average_response_time'),
+                                        ('prediction_drift', 'prediction_drift'))
+            if metrics[metric] is not None and metrics[metric] > alerts[name]]
+
+    job = enqueue_job(fired, queue_dir, now) if fired else None
+    save_scheduler_state(state, state_path)
+
+    record = {
+        'timestamp': now.isoformat(),
+        'entries_read': len(entries),
+        'labels_read': len(labels),
+        'log_reset': reset,
+        'metrics': metrics,
+        'triggers': fired,
+        'alerts': raised,
+        'job_id': job['job_id'] if job else None,
+        'job_skipped': bool(fired) and job is None,  # Zaten bekleyen iş var
+        'duration_ms': (time.perf_counter() - start) * 1000,
+    }
+    audit_path = Path(audit_path)
+    audit_path.parent.mkdir(exist_ok=True, parents=True)
+    with open(audit_path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+    return record
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def main():
+    """Run the scheduler loop (or a single tick with --once)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Retraining trigger scheduler")
+    parser.add_argument('--log-path', default=str(PREDICTION_LOG_PATH), help="Prediction log JSON")
+    parser.add_argument('--label-path', default=str(LABEL_LOG_PATH), help="Label log JSONL")
+    parser.add_argument('--data-path', default=str(RAW_DATA_PATH), help="Training CSV")
+    parser.add_argument('--interval', type=int, default=SCHEDULER_CONFIG['interval_seconds'],
+                        help="Seconds between evaluations")
+    parser.add_argument('--once', action='store_true', help="Evaluate once and exit")
+    parser.add_argument('--run-jobs', action='store_true', help="Also run queued retrain jobs")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("RETRAINING SCHEDULER")
+    print("="*80)
+
+    while True:
+        record = evaluate_triggers(log_path=args.log_path, label_path=args.label_path,
+                                    data_path=args.data_path)
+        metrics = record['metrics']
+        print(f"\n🕒 {record['timestamp']}  read {record['entries_read']} entries "
+            f"in {record['duration_ms']:.1f} ms")
+        print(f"   samples={metrics['sample_count']}  accuracy={metrics['accuracy']}  "
+            f"drift={metrics['data_drift']}  age={metrics['model_age_days']:.1f}d")
+        if record['alerts']:
+            print(f"⚠️ Alerts: {', '.join(record['alerts'])}")
+        if record['triggers']:
+            print(f"🔔 Triggers: {', '.join(record['triggers'])} -> "
+                f"{'job ' + record['job_id'] if record['job_id'] else 'job already pending'}")
+
+        if args.run_jobs:
+            for job in process_queue(data_path=args.data_path):
+                print(f"🚀 Job {job['job_id']} ({job['action']}): {job['status']} "
+                    f"in {job['duration_seconds']:.1f}s")
+
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+API Serialization - Fast JSON & Columnar Payloads
+=================================================
+API yanıtlarının kodlanması (encoding) için yardımcılar.
+
+- dumps: orjson kuruluysa onu kullanır (numpy tiplerini doğrudan yazar),
+  değilse standart json (boşluksuz ayırıcılar)
+- FastJSONResponse: FastAPI'nin varsayılan JSONResponse'u yerine geçer
+- to_columnar: kayıt listesini kolon listelerine çevirir; alan adları her
+  hasta için tekrar edilmez
+"""
+
+import json
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from fastapi.responses import Response
+
+
+def _default(obj):
+    """Fallback encoder for numpy values (standard json only)"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, fast=True):
+    """
+    Serialize to compact JSON bytes
+
+    Args:
+        obj: JSON-compatible object (numpy scalars/arrays allowed)
+        fast: Use orjson when installed (False = standard json, e.g. for benchmarks)
+
+    Returns:
+        bytes: UTF-8 JSON
+    """
+    if fast and orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=_default).encode('utf-8')
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with dumps (no jsonable_encoder pass for plain dicts)"""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def to_columnar(records, nested=()):
+    """
+    Turn a list of records into a dict of column lists
+
+    Args:
+        records: List of dicts with the same keys
+        nested: Keys whose values are dicts; each becomes {sub_key: [values]}
+
+    Returns:
+        dict: {key: [value per record]} (nested keys -> {sub_key: [...]})
+    """
+    if not records:
+        return {}
+    columns = {}
+    for key in records[0]:
+        if key in nested:
+            columns[key] = {sub: [record[key][sub] for record in records] for sub in records[0][key]}
+        else:
+            columns[key] = [record[key] for record in records]
+    return columns
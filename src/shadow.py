@@ -0,0 +1,275 @@
+"""
+Shadow Model - Candidate Evaluation on Live Traffic
+===================================================
+Yeniden eğitilmiş bir aday model, terfi (promotion) öncesi canlı isteklerin bir
+örneği üzerinde yanıt yolunun dışında (asenkron) skorlanır.
+
+- submit(): örnekleme + sınırlı kuyruğa non-blocking ekleme; kuyruk doluysa örnek
+  atılır, primary yanıtı hiçbir zaman shadow'u beklemez
+- Tek bir arka plan thread'i skorlar (aday model n_jobs=1, tek thread'li çekirdek)
+- CPU sınırı: her skorlamanın harcadığı thread CPU süresi c ölçülür, ardından
+  c * (1 - f) / f kadar beklenir -> shadow thread'i en fazla max_cpu_fraction (f)
+  kadar CPU kullanır; bekleme sırasında gelen örnekler kuyruk dolunca atılır
+- Uyum oranı, sınıf bazında olasılık farkları, gecikmeler ve etiket geçişleri
+  (primary -> shadow) artımlı toplamlarla tutulur ve SHADOW_METRICS_PATH'e yazılır
+  (aday sürümü aynıysa yeniden başlatmada kaldığı yerden devam eder)
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config import SHADOW_CONFIG, SHADOW_METRICS_PATH
+from tree_kernel import ForestKernel
+
+
+# =============================================================================
+# AGGREGATES
+# =============================================================================
+
+class ShadowAggregates:
+    """
+    Running totals comparing shadow predictions with the primary model
+
+    Yalnızca sayaçlar ve toplamlar tutulur (scheduler.MonitoringAggregates gibi).
+    """
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.n_sampled = data.get('n_sampled', 0)
+        self.n_dropped = data.get('n_dropped', 0)
+        self.n_scored = data.get('n_scored', 0)
+        self.n_errors = data.get('n_errors', 0)
+        self.n_agree = data.get('n_agree', 0)
+        self.primary_latency_sum = data.get('primary_latency_sum', 0.0)
+        self.shadow_latency_sum = data.get('shadow_latency_sum', 0.0)
+        self.shadow_cpu_seconds = data.get('shadow_cpu_seconds', 0.0)
+        self.delta_sum = data.get('delta_sum', {})
+        self.delta_max = data.get('delta_max', {})
+        self.transitions = data.get('transitions', {})
+
+    def update(self, primary_label, primary_probability, shadow_label, shadow_probability,
+            primary_latency, shadow_latency, cpu_seconds):
+        """
+        Add one scored request
+
+        Args:
+            primary_label, shadow_label: Predicted classes
+            primary_probability, shadow_probability: {class: probability}
+            primary_latency, shadow_latency: Seconds spent scoring
+            cpu_seconds: Shadow thread CPU time
+        """
+        self.n_scored += 1
+        self.n_agree += int(str(primary_label) == str(shadow_label))
+        key = f"{primary_label}->{shadow_label}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        for label in primary_probability.keys() & shadow_probability.keys():
+            delta = abs(float(shadow_probability[label]) - float(primary_probability[label]))
+            self.delta_sum[label] = self.delta_sum.get(label, 0.0) + delta
+            self.delta_max[label] = max(self.delta_max.get(label, 0.0), delta)
+        if primary_latency is not None:
+            self.primary_latency_sum += primary_latency
+        self.shadow_latency_sum += shadow_latency
+        self.shadow_cpu_seconds += cpu_seconds
+
+    def to_dict(self):
+        return {
+            'n_sampled': self.n_sampled,
+            'n_dropped': self.n_dropped,
+            'n_scored': self.n_scored,
+            'n_errors': self.n_errors,
+            'n_agree': self.n_agree,
+            'primary_latency_sum': self.primary_latency_sum,
+            'shadow_latency_sum': self.shadow_latency_sum,
+            'shadow_cpu_seconds': self.shadow_cpu_seconds,
+            'delta_sum': self.delta_sum,
+            'delta_max': self.delta_max,
+            'transitions': self.transitions,
+        }
+
+    def metrics(self):
+        """
+        Comparison metrics (None until something was scored)
+
+        Returns:
+            dict: agreement, mean/max probability delta per class, mean latencies (ms),
+                drop and error rates, label transitions
+        """
+        n = self.n_scored
+        return {
+            'n_sampled': self.n_sampled,
+            'n_scored': n,
+            'agreement': self.n_agree / n if n else None,
+            'mean_probability_delta': {label: total / n for label, total in self.delta_sum.items()} if n else None,
+            'max_probability_delta': dict(self.delta_max) if n else None,
+            'primary_latency_ms': 1000 * self.primary_latency_sum / n if n else None,
+            'shadow_latency_ms': 1000 * self.shadow_latency_sum / n if n else None,
+            'shadow_cpu_seconds': self.shadow_cpu_seconds,
+            'drop_rate': self.n_dropped / self.n_sampled if self.n_sampled else None,
+            'error_rate': self.n_errors / (n + self.n_errors) if n + self.n_errors else None,
+            'transitions': dict(self.transitions),
+        }
+
+
+# =============================================================================
+# EVALUATOR
+# =============================================================================
+
+class ShadowEvaluator:
+    """
+    Score a sample of live requests with a candidate model in a background thread
+
+    Args:
+        candidate: LungCancerPredictor for the candidate model
+        sample_rate: Fraction of submitted requests that are scored
+        max_cpu_fraction: CPU share the shadow thread may use (0 < f <= 1)
+        queue_size: Pending samples; further samples are dropped
+        metrics_path: JSON file for the aggregates (None = memory only)
+        flush_every: Write metrics after this many scored requests
+        primary_version: Version of the serving model (stored with the metrics)
+        seed: Sampling seed (tests)
+    """
+
+    def __init__(self, candidate, sample_rate=None, max_cpu_fraction=None, queue_size=None,
+                metrics_path=SHADOW_METRICS_PATH, flush_every=None, primary_version=None, seed=None):
+        self.candidate = candidate
+        self.sample_rate = SHADOW_CONFIG['sample_rate'] if sample_rate is None else sample_rate
+        self.max_cpu_fraction = max_cpu_fraction or SHADOW_CONFIG['max_cpu_fraction']
+        if not 0 < self.max_cpu_fraction <= 1:
+            raise ValueError(f"max_cpu_fraction must be in (0, 1], got {self.max_cpu_fraction}")
+        self.flush_every = flush_every or SHADOW_CONFIG['flush_every']
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.primary_version = primary_version
+        self.candidate_version = getattr(candidate, 'version', None)
+
+        # Shadow tek thread'de kalır (joblib / thread havuzu açmaz)
+        if hasattr(candidate.model, 'n_jobs'):
+            candidate.model.n_jobs = 1
+        if getattr(candidate, 'kernel', None) is not None:
+            candidate.kernel = ForestKernel(candidate.model, n_threads=1)
+
+        self.aggregates = ShadowAggregates(self._load_previous())
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size or SHADOW_CONFIG['queue_size'])
+        self._unflushed = 0
+        self._thread = threading.Thread(target=self._run, name='shadow-model', daemon=True)
+        self._thread.start()
+
+    def _load_previous(self):
+        """Aggregates of an earlier run with the same candidate version"""
+        if self.metrics_path is None or not self.metrics_path.exists():
+            return None
+        try:
+            with open(self.metrics_path) as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if previous.get('candidate_version') != self.candidate_version or self.candidate_version is None:
+            return None
+        return previous.get('aggregates')
+
+    def submit(self, record, primary_label, primary_probability, primary_latency=None):
+        """
+        Offer a served request to the shadow model (never blocks)
+
+        Args:
+            record: Raw-schema input
+            primary_label: Primary prediction
+            primary_probability: Primary {class: probability}
+            primary_latency: Primary scoring time in seconds
+
+        Returns:
+            bool: True if the request was queued
+        """
+        if self._random.random() >= self.sample_rate:
+            return False
+        with self._lock:
+            self.aggregates.n_sampled += 1
+        try:
+            self._queue.put_nowait((record, primary_label, primary_probability, primary_latency))
+            return True
+        except queue.Full:
+            with self._lock:
+                self.aggregates.n_dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            self._score(*item)
+            self._queue.task_done()
+
+    def _score(self, record, primary_label, primary_probability, primary_latency):
+        cpu_start = time.thread_time()
+        began = time.perf_counter()
+        try:
+            label, probability = self.candidate.predict(record)
+        except Exception:
+            with self._lock:
+                self.aggregates.n_errors += 1
+            return
+        shadow_latency = time.perf_counter() - began
+        cpu_seconds = time.thread_time() - cpu_start
+        shadow_probability = {str(c): float(p) for c, p in zip(self.candidate.model.classes_, probability)}
+
+        with self._lock:
+            self.aggregates.update(primary_label, {str(c): p for c, p in primary_probability.items()},
+                                label, shadow_probability, primary_latency, shadow_latency, cpu_seconds)
+            self._unflushed += 1
+            flush = self._unflushed >= self.flush_every
+        if flush:
+            self.flush()
+        # CPU sınırı: c saniye çalıştıysa c * (1 - f) / f bekle -> görev oranı <= f
+        time.sleep(cpu_seconds * (1 - self.max_cpu_fraction) / self.max_cpu_fraction)
+
+    def metrics(self):
+        """Current comparison metrics plus model versions"""
+        with self._lock:
+            metrics = self.aggregates.metrics()
+        metrics.update(primary_version=self.primary_version, candidate_version=self.candidate_version,
+                    sample_rate=self.sample_rate, max_cpu_fraction=self.max_cpu_fraction,
+                    queue_depth=self._queue.qsize())
+        return metrics
+
+    def flush(self):
+        """Write aggregates and metrics to metrics_path (atomic)"""
+        if self.metrics_path is None:
+            return
+        with self._lock:
+            self._unflushed = 0
+            state = {
+                'primary_version': self.primary_version,
+                'candidate_version': self.candidate_version,
+                'updated_at': datetime.now().isoformat(),
+                'aggregates': self.aggregates.to_dict(),
+                'metrics': self.aggregates.metrics(),
+            }
+        self.metrics_path.parent.mkdir(exist_ok=True, parents=True)
+        tmp = self.metrics_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, self.metrics_path)
+
+    def drain(self, timeout=None):
+        """Wait until every queued sample has been scored (tests, shutdown)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self):
+        """Score what is queued, stop the thread and write the metrics"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self.flush()
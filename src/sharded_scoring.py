@@ -0,0 +1,274 @@
+"""
+Sharded Scoring - Multi-Core Batch Inference
+============================================
+Milyonlarca satırlık toplu skorlama için kalıcı süreç havuzu (process pool).
+
+- Her worker modeli, scaler'ı ve feature listesini başlangıçta bir kez yükler
+  (LungCancerPredictor); model thread'leri 1'e indirilir (çekirdek başına bir süreç)
+- Girdi matrisi ve sonuç matrisi paylaşılan bellekte (/dev/shm üzerinde
+  np.memmap) tutulur; worker'lara yalnızca dosya adı ve satır aralığı gönderilir,
+  veri pickle'lanmaz
+- Her shard sonucunu çıktı matrisindeki kendi satırlarına yazar -> sıra korunur
+- scaling_report(): worker sayısına göre hız, speedup ve verimlilik (efficiency)
+
+Kullanım:
+    with ShardedScorer(n_workers=8) as scorer:
+        result = scorer.predict_batch(df)          # LungCancerPredictor ile aynı çıktı
+        bulk_scoring.score_csv(path, scorer)       # predict_batch arayüzü yeterli
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from math import ceil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import FINAL_MODEL_PATH, SHARDED_SCORING_CONFIG, FEATURE_RANGES
+from features import RAW_FEATURES, build_feature_matrix
+from tree_kernel import ForestKernel
+
+# Linux'ta tmpfs (RAM); yoksa sistem geçici dizini
+SHARED_MEMORY_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+_worker_predictor = None
+
+
+def _init_worker(model_path):
+    """Load the predictor once per worker process"""
+    global _worker_predictor
+    from inference import LungCancerPredictor
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        _worker_predictor = LungCancerPredictor(model_path)
+    # Paralellik süreçler arasında; her süreç tek thread ile skorlar
+    if hasattr(_worker_predictor.model, 'n_jobs'):
+        _worker_predictor.model.n_jobs = 1
+    if _worker_predictor.kernel is not None:
+        _worker_predictor.kernel = ForestKernel(_worker_predictor.model, n_threads=1)
+
+
+def _worker_classes():
+    return list(_worker_predictor.model.classes_)
+
+
+def _score_shard(input_spec, output_spec, start, stop):
+    """
+    Score rows [start, stop) of the shared input into the shared output
+
+    Returns:
+        tuple: (start, stop, seconds spent in this worker)
+    """
+    began = time.perf_counter()
+    predictor = _worker_predictor
+    X_raw = np.memmap(input_spec[0], dtype=input_spec[1], mode='r', shape=input_spec[2])
+    out = np.memmap(output_spec[0], dtype=np.float64, mode='r+', shape=output_spec[1])
+
+    names = predictor.feature_names
+    raw = pd.DataFrame(np.asarray(X_raw[start:stop]), columns=RAW_FEATURES)
+    X = pd.DataFrame(build_feature_matrix(raw, names), columns=names)
+    out[start:stop] = predictor.predict_proba_scaled(predictor.scaler.transform(X))
+
+    del X_raw, out
+    return start, stop, time.perf_counter() - began
+
+
+# =============================================================================
+# SCORER
+# =============================================================================
+class ShardedScorer:
+    """
+    Persistent process pool scoring raw feature matrices in shards
+
+    Args:
+        model_path: Model file loaded by every worker (default: FINAL_MODEL_PATH)
+        n_workers: Worker processes (default: config, else os.cpu_count())
+        shard_size: Max rows per task (default: SHARDED_SCORING_CONFIG['shard_size'])
+        start_method: multiprocessing start method (default: from config)
+    """
+
+    def __init__(self, model_path=None, n_workers=None, shard_size=None, start_method=None):
+        self.model_path = str(model_path or FINAL_MODEL_PATH)
+        self.n_workers = n_workers or SHARDED_SCORING_CONFIG['n_workers'] or os.cpu_count()
+        self.shard_size = shard_size or SHARDED_SCORING_CONFIG['shard_size']
+        context = multiprocessing.get_context(start_method or SHARDED_SCORING_CONFIG['start_method'])
+
+        self._directory = tempfile.mkdtemp(prefix='sharded_scoring_', dir=SHARED_MEMORY_DIR)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.n_workers, mp_context=context,
+            initializer=_init_worker, initargs=(self.model_path,)
+        )
+        # Tüm worker'ları şimdi başlat (model yükleme ilk istekte ödenmez)
+        try:
+            warmup = [self._pool.submit(_worker_classes) for _ in range(self.n_workers)]
+            self.classes = np.array(warmup[0].result())
+            for future in warmup[1:]:
+                future.result()
+        except Exception:
+            self.close()
+            raise
+        self.last_shard_seconds = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shut down the pool and remove shared buffers"""
+        self._pool.shutdown(wait=True)
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def _shards(self, n_rows):
+        # Her worker'a en az bir shard düşsün
+        size = max(1, min(self.shard_size, ceil(n_rows / self.n_workers)))
+        return [(start, min(start + size, n_rows)) for start in range(0, n_rows, size)]
+
+    def predict_proba(self, X_raw):
+        """
+        Class probabilities for raw rows, computed across the pool
+
+        Args:
+            X_raw: Integer array (n, len(RAW_FEATURES)) in RAW_FEATURES order
+
+        Returns:
+            np.ndarray: (n, n_classes), rows in input order, columns in self.classes order
+        """
+        X_raw = np.asarray(X_raw)
+        if X_raw.ndim != 2 or X_raw.shape[1] != len(RAW_FEATURES):
+            raise ValueError(f"Expected shape (n, {len(RAW_FEATURES)}), got {X_raw.shape}")
+        n_rows = len(X_raw)
+        if n_rows == 0:
+            return np.empty((0, len(self.classes)))
+
+        # Ham değerler (FEATURE_RANGES: 1..100) uint8'e sığar: paylaşılan girdi 8 kat küçülür
+        dtype = np.uint8 if X_raw.min() >= 0 and X_raw.max() <= 255 else np.int64
+        key = uuid.uuid4().hex
+        input_path = os.path.join(self._directory, f"{key}_input.bin")
+        output_path = os.path.join(self._directory, f"{key}_output.bin")
+        shape = (n_rows, len(self.classes))
+        try:
+            shared_input = np.memmap(input_path, dtype=dtype, mode='w+', shape=X_raw.shape)
+            shared_input[:] = X_raw
+            shared_input.flush()
+            shared_output = np.memmap(output_path, dtype=np.float64, mode='w+', shape=shape)
+
+            futures = [
+                self._pool.submit(_score_shard, (input_path, np.dtype(dtype).str, X_raw.shape),
+                                (output_path, shape), start, stop)
+                for start, stop in self._shards(n_rows)
+            ]
+            self.last_shard_seconds = [future.result()[2] for future in futures]
+            result = np.array(shared_output)
+            del shared_input, shared_output
+        finally:
+            for path in (input_path, output_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        return result
+
+    def predict_batch(self, df):
+        """
+        Score a raw DataFrame (drop-in for LungCancerPredictor.predict_batch)
+
+        Args:
+            df (pd.DataFrame): Raw features (RAW_FEATURES columns)
+
+        Returns:
+            pd.DataFrame: prediction, confidence and prob_<class> columns (same index as df)
+        """
+        probability = self.predict_proba(df[RAW_FEATURES].to_numpy())
+        result = pd.DataFrame(probability, columns=[f"prob_{c}" for c in self.classes], index=df.index)
+        result.insert(0, 'prediction', self.classes[probability.argmax(axis=1)])
+        result.insert(1, 'confidence', probability.max(axis=1))
+        return result
+
+
+# =============================================================================
+# SCALING REPORT
+# =============================================================================
+def random_patients(n_rows, seed=0):
+    """Raw integer matrix drawn uniformly from FEATURE_RANGES"""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(*FEATURE_RANGES[name], size=n_rows, endpoint=True) for name in RAW_FEATURES
+    ])
+
+
+def scaling_report(X_raw, worker_counts, model_path=None, shard_size=None, repeats=3):
+    """
+    Throughput and scaling efficiency per worker count
+
+    Args:
+        X_raw: Raw integer matrix (RAW_FEATURES order)
+        worker_counts: Worker counts to measure (e.g. [1, 2, 4, 8])
+        model_path: Model file (default: FINAL_MODEL_PATH)
+        shard_size: Rows per task (default: from config)
+        repeats: Timed runs per count (best is kept; pool start-up excluded)
+
+    Returns:
+        pd.DataFrame: n_workers, seconds, rows_per_sec, speedup, efficiency
+            (speedup vs. the smallest worker count, efficiency = speedup / worker ratio)
+    """
+    rows = []
+    reference = None
+    for n_workers in sorted(worker_counts):
+        with ShardedScorer(model_path, n_workers=n_workers, shard_size=shard_size) as scorer:
+            timings = []
+            for _ in range(repeats):
+                began = time.perf_counter()
+                probability = scorer.predict_proba(X_raw)
+                timings.append(time.perf_counter() - began)
+        if reference is None:
+            reference = probability
+        elif not np.array_equal(probability, reference):
+            raise RuntimeError(f"Results with {n_workers} workers differ from the baseline")
+        rows.append({'n_workers': n_workers, 'seconds': min(timings)})
+
+    report = pd.DataFrame(rows)
+    report['rows_per_sec'] = len(X_raw) / report['seconds']
+    base = report.iloc[0]
+    report['speedup'] = base['seconds'] / report['seconds']
+    report['efficiency'] = report['speedup'] / (report['n_workers'] / base['n_workers'])
+    return report
+
+
+def main():
+    """Measure multi-core scaling on random patients"""
+    parser = argparse.ArgumentParser(description="Sharded scoring scaling benchmark")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Rows to score")
+    parser.add_argument('--workers', default=None,
+                        help="Comma-separated worker counts (default: 1,2,4,... up to cpu_count)")
+    parser.add_argument('--shard-size', type=int, default=None, help="Rows per task")
+    parser.add_argument('--model-path', type=Path, default=None, help="Model file")
+    args = parser.parse_args()
+
+    if args.workers:
+        counts = [int(n) for n in args.workers.split(',')]
+    else:
+        counts = [2 ** k for k in range(int(np.log2(os.cpu_count())) + 1)]
+
+    print("=" * 80)
+    print("SHARDED SCORING - SCALING REPORT")
+    print("=" * 80)
+    print(f"\n📊 Rows: {args.rows:,} | Worker counts: {counts} | CPUs: {os.cpu_count()}")
+    report = scaling_report(random_patients(args.rows), counts, args.model_path, args.shard_size)
+    print("\n" + report.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+    print("\n✅ Done")
+
+
+if __name__ == '__main__':
+    main()
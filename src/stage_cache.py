@@ -0,0 +1,203 @@
+"""
+Stage Cache - Content-Addressed Pipeline Cache
+==============================================
+MLPipeline aşamalarının (load_data, engineer_features, prepare_data, train_model)
+çıktılarını girdilerinin hash'i ile diskte saklar.
+
+Her aşamanın anahtarı = sha256(aşama adı + önceki aşamanın anahtarı + parametreler
++ kod sürümü). Girdiler değişmediyse aşama yeniden hesaplanmaz, diskten yüklenir.
+Cache boyutu max_bytes'ı aşarsa en uzun süredir kullanılmayan girdiler silinir (LRU).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import joblib
+
+# Kod sürümüne dahil edilen kaynak dosyalar (aşama çıktılarını etkileyen modüller);
+# config.py dahil değil: her aşama okuduğu config değerlerini kendi parametrelerinde hash'ler
+# (MLPipeline._stage_key), böylece MODEL_PARAMS değişikliği yalnızca train_model'i geçersiz kılar
+CODE_FILES = ['pipeline.py', 'features.py', 'data_loader.py']
+
+_file_digest_memo = {}
+
+
+def file_digest(path, block_size=1 << 20):
+    """
+    SHA-256 digest of a file's content
+
+    (path, size, mtime) aynı kaldıkça sonuç bellekte tutulur, dosya tekrar okunmaz.
+
+    Args:
+        path: File path
+        block_size: Bytes read per block
+
+    Returns:
+        str: Hex digest
+    """
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _file_digest_memo:
+        return _file_digest_memo[memo_key]
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            h.update(block)
+    digest = h.hexdigest()
+    _file_digest_memo[memo_key] = digest
+    return digest
+
+
+def code_version(files=None):
+    """
+    Digest of the source files that produce stage outputs
+
+    Args:
+        files: File names relative to src/ (default: CODE_FILES)
+
+    Returns:
+        str: Hex digest
+    """
+    src_dir = Path(__file__).parent
+    h = hashlib.sha256()
+    for name in files or CODE_FILES:
+        h.update(name.encode())
+        h.update(file_digest(src_dir / name).encode())
+    return h.hexdigest()
+
+
+def stage_key(stage, **inputs):
+    """
+    Content address for a stage
+
+    Args:
+        stage: Stage name
+        **inputs: JSON-serializable inputs (upstream keys, digests, parameters)
+
+    Returns:
+        str: Hex digest
+    """
+    payload = json.dumps({'stage': stage, 'inputs': inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class StageCache:
+    """
+    Local on-disk cache for pipeline stage outputs
+
+    Her girdi '<stage>-<key>.joblib' dosyasıdır. Erişim zamanı (mtime) LRU
+    tahliyesi (eviction) için güncellenir.
+    """
+
+    def __init__(self, cache_dir, max_bytes=2 * 1024**3, force=False):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Cache directory
+            max_bytes: Size limit; least recently used entries are evicted
+            force: Ignore existing entries (always recompute, then overwrite)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.max_bytes = max_bytes
+        self.force = force
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, stage, key):
+        return self.cache_dir / f"{stage}-{key}.joblib"
+
+    def contains(self, stage, key):
+        """Check whether a stage output is cached (always False with force)"""
+        return not self.force and self._path(stage, key).exists()
+
+    def get(self, stage, key):
+        """
+        Load a cached stage output
+
+        Returns:
+            Cached object, or None on miss
+        """
+        path = self._path(stage, key)
+        if self.force or not path.exists():
+            self.misses += 1
+            return None
+        try:
+            value = joblib.load(path)
+        except Exception:
+            # Bozuk girdi -> miss olarak say ve sil
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        os.utime(path)  # LRU için erişim zamanı
+        self.hits += 1
+        return value
+
+    def put(self, stage, key, value, evict=True):
+        """
+        Store a stage output atomically, then evict if over the size limit
+
+        Args:
+            evict: Run evict() now (False: caller evicts in batches, e.g. many small entries)
+
+        Returns:
+            Path of the cache entry
+        """
+        path = self._path(stage, key)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            joblib.dump(value, tmp_name)
+            os.replace(tmp_name, path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+        if evict:
+            self.evict(keep=path)
+        return path
+
+    def entries(self):
+        """Cache entries sorted from least to most recently used"""
+        files = [p for p in self.cache_dir.glob('*.joblib') if p.is_file()]
+        return sorted(files, key=lambda p: p.stat().st_mtime)
+
+    def size(self):
+        """Total cache size in bytes"""
+        return sum(p.stat().st_size for p in self.entries())
+
+    def evict(self, keep=None):
+        """
+        Remove least recently used entries until size <= max_bytes
+
+        Args:
+            keep: Entry that must not be evicted (the one just written)
+
+        Returns:
+            list: Removed paths
+        """
+        removed = []
+        entries = self.entries()
+        total = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == keep:
+                continue
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+            removed.append(path)
+        return removed
+
+    def clear(self):
+        """Remove all entries"""
+        for path in self.entries():
+            path.unlink(missing_ok=True)
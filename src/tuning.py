@@ -0,0 +1,267 @@
+"""
+Hyperparameter Tuning - Successive Halving / Hyperband
+======================================================
+RandomForest hiperparametreleri için bütçe tabanlı arama.
+
+Her turda (rung) adaylar düşük bütçeyle (az ağaç + veri alt örneği) eğitilir,
+doğrulama skoruna göre en iyi 1/eta kısmı bir sonraki tura geçer ve bütçe eta
+katına çıkar. Son turda tam veri ve adayın kendi n_estimators değeri kullanılır.
+
+- Paralel: bir turdaki adaylar thread havuzunda eğitilir (ağaç eğitimi GIL'i bırakır)
+- Checkpoint: her deneme (trial) JSONL dosyasına yazılır, arama kaldığı yerden devam eder
+- Eşit skorlarda daha ucuz model (az ağaç, sığ derinlik) tercih edilir
+"""
+
+import json
+import math
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterSampler, train_test_split
+
+from config import TUNING_SEARCH_SPACE, TUNING_CONFIG, RANDOM_STATE
+
+
+def _cost_key(params):
+    """Cheaper models sort first (used to break score ties)"""
+    depth = params.get('max_depth')
+    return (params.get('n_estimators', 100), math.inf if depth is None else depth)
+
+
+def sample_candidates(search_space, n_candidates, random_state):
+    """
+    Deterministic random sample of parameter candidates
+
+    Aynı random_state ile aynı adaylar üretilir (checkpoint'ten devam için gerekli).
+
+    Returns:
+        list of (candidate_id, params)
+    """
+    sampler = ParameterSampler(search_space, n_iter=n_candidates, random_state=random_state)
+    candidates = []
+    seen = set()
+    for params in sampler:
+        key = json.dumps(params, sort_keys=True)
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append((f"c{len(candidates):03d}", params))
+    return candidates
+
+
+class TrialCheckpoint:
+    """
+    Append-only JSONL log of completed trials
+
+    Her satır bir denemedir; 'signature' aynı olmayan satırlar (farklı veri veya
+    arama ayarı) yok sayılır.
+    """
+
+    def __init__(self, path, signature):
+        self.path = Path(path) if path else None
+        self.signature = signature
+        self.trials = {}
+        if self.path and self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        trial = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Yarım kalmış son satır
+                    if trial.get('signature') == signature:
+                        self.trials[(trial['candidate_id'], trial['rung'])] = trial
+
+    def get(self, candidate_id, rung):
+        return self.trials.get((candidate_id, rung))
+
+    def record(self, trial):
+        """Store a trial in memory and append it to disk"""
+        trial = dict(trial, signature=self.signature)
+        self.trials[(trial['candidate_id'], trial['rung'])] = trial
+        if self.path:
+            self.path.parent.mkdir(exist_ok=True, parents=True)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(trial, default=str) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def _subsample(y, fraction, random_state):
+    """Stratified row subsample of size fraction * len(y)"""
+    idx = np.arange(len(y))
+    if fraction >= 1:
+        return idx
+    try:
+        sub, _ = train_test_split(idx, train_size=fraction, random_state=random_state, stratify=y)
+    except ValueError:
+        sub, _ = train_test_split(idx, train_size=fraction, random_state=random_state)
+    return np.sort(sub)
+
+
+def _run_trial(candidate_id, params, rung, fraction, X_fit, y_fit, X_val, y_val,
+            min_trees, random_state):
+    """Fit one candidate at one budget and score it on the validation split"""
+    rows = _subsample(y_fit, fraction, random_state + rung)
+    n_trees = params.get('n_estimators', 100)
+    if fraction < 1:
+        n_trees = max(min_trees, int(round(n_trees * fraction)))
+
+    model = RandomForestClassifier(**dict(params, n_estimators=n_trees, n_jobs=1,
+                                        random_state=random_state))
+    start = time.perf_counter()
+    model.fit(X_fit[rows], y_fit[rows])
+    fit_time = time.perf_counter() - start
+    score = accuracy_score(y_val, model.predict(X_val))
+
+    return {
+        'candidate_id': candidate_id,
+        'params': params,
+        'rung': rung,
+        'fraction': fraction,
+        'n_samples': int(len(rows)),
+        'n_trees': int(n_trees),
+        'score': float(score),
+        'fit_time': float(fit_time),
+    }
+
+
+def successive_halving(candidates, X, y, eta=3, min_fraction=1 / 9, min_trees=10,
+                    validation_size=0.2, n_jobs=None, random_state=RANDOM_STATE,
+                    checkpoint=None, verbose=True):
+    """
+    Successive halving over a fixed candidate list
+
+    Args:
+        candidates: List of (candidate_id, params)
+        X, y: Training data (validation split is carved out of it)
+        eta: Keep top 1/eta candidates per rung, multiply budget by eta
+        min_fraction: Budget fraction of the first rung
+        min_trees: Minimum trees in low-budget fits
+        validation_size: Held-out fraction for scoring
+        n_jobs: Parallel trials (default: all cores)
+        random_state: Seed for splits and forests
+        checkpoint: TrialCheckpoint (None = no persistence)
+        verbose: Print rung summaries
+
+    Returns:
+        dict: best candidate, best params, all trials
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X, y, test_size=validation_size, random_state=random_state, stratify=y
+    )
+    n_jobs = n_jobs or os.cpu_count() or 1
+    checkpoint = checkpoint or TrialCheckpoint(None, None)
+
+    n_rungs = max(1, int(round(math.log(1 / min_fraction, eta))) + 1)
+    survivors = list(candidates)
+    all_trials = []
+
+    for rung in range(n_rungs):
+        fraction = min(1.0, min_fraction * eta ** rung)
+        if rung == n_rungs - 1:
+            fraction = 1.0
+
+        done = [checkpoint.get(cid, rung) for cid, _ in survivors]
+        pending = [(cid, params) for (cid, params), trial in zip(survivors, done) if trial is None]
+        rung_trials = [trial for trial in done if trial is not None]
+
+        start = time.perf_counter()
+        results = Parallel(n_jobs=n_jobs, prefer='threads', return_as='generator')(
+            delayed(_run_trial)(cid, params, rung, fraction, X_fit, y_fit, X_val, y_val,
+                                min_trees, random_state)
+            for cid, params in pending
+        )
+        for trial in results:
+            checkpoint.record(trial)
+            rung_trials.append(trial)
+        elapsed = time.perf_counter() - start
+
+        rung_trials.sort(key=lambda t: (-t['score'], _cost_key(t['params'])))
+        all_trials.extend(rung_trials)
+
+        if verbose:
+            print(f"   Rung {rung}: {len(rung_trials)} candidates, budget {fraction:.0%}, "
+                f"{len(pending)} trained / {len(rung_trials) - len(pending)} resumed, "
+                f"best={rung_trials[0]['score']:.4f} ({elapsed:.1f}s)")
+
+        n_keep = max(1, len(rung_trials) // eta)
+        params_by_id = dict(survivors)
+        survivors = [(t['candidate_id'], params_by_id[t['candidate_id']]) for t in rung_trials[:n_keep]]
+        if len(rung_trials) == 1:
+            break
+
+    best = rung_trials[0]
+    return {
+        'best_candidate': best['candidate_id'],
+        'best_params': best['params'],
+        'best_score': best['score'],
+        'trials': all_trials,
+    }
+
+
+def hyperband(X, y, search_space=None, max_candidates=27, eta=3, min_fraction=1 / 9,
+            random_state=RANDOM_STATE, checkpoint=None, **kwargs):
+    """
+    Hyperband: successive halving brackets with different starting budgets
+
+    Bracket s, max_candidates / eta^(s_max - s) adayla min_fraction * eta^(s_max - s)
+    bütçesinden başlar; en iyi bracket sonucu döner.
+
+    Returns:
+        dict: Same as successive_halving, plus per-bracket results
+    """
+    search_space = search_space or TUNING_SEARCH_SPACE
+    s_max = max(0, int(round(math.log(1 / min_fraction, eta))))
+    brackets = []
+    for i, s in enumerate(range(s_max, -1, -1)):
+        n = max(1, int(math.ceil(max_candidates / eta ** (s_max - s))))
+        start_fraction = min(1.0, min_fraction * eta ** (s_max - s))
+        candidates = [(f"b{i}-{cid}", params)
+                    for cid, params in sample_candidates(search_space, n, random_state + i)]
+        print(f"\n   Bracket {i}: {len(candidates)} candidates from {start_fraction:.0%} budget")
+        result = successive_halving(candidates, X, y, eta=eta, min_fraction=start_fraction,
+                                    random_state=random_state, checkpoint=checkpoint, **kwargs)
+        brackets.append(result)
+
+    best = min(brackets, key=lambda r: (-r['best_score'], _cost_key(r['best_params'])))
+    return dict(best, brackets=brackets)
+
+
+def tune(X, y, search_space=None, config=None, checkpoint_path=None, signature=None,
+        random_state=RANDOM_STATE, n_jobs=None):
+    """
+    Run the configured search (TUNING_CONFIG)
+
+    Args:
+        X, y: Training data
+        search_space: Parameter lists (default: TUNING_SEARCH_SPACE)
+        config: Search settings (default: TUNING_CONFIG)
+        checkpoint_path: JSONL trial log (None = no resume)
+        signature: Data/config fingerprint for checkpoint matching
+        random_state: Seed
+        n_jobs: Parallel trials
+
+    Returns:
+        dict: best_params, best_score, trials
+    """
+    search_space = search_space or TUNING_SEARCH_SPACE
+    config = dict(TUNING_CONFIG, **(config or {}))
+    checkpoint = TrialCheckpoint(checkpoint_path, signature)
+    common = dict(eta=config['eta'], min_fraction=config['min_fraction'],
+                min_trees=config['min_trees'], validation_size=config['validation_size'],
+                n_jobs=n_jobs, random_state=random_state, checkpoint=checkpoint)
+
+    if config['method'] == 'hyperband':
+        return hyperband(X, y, search_space, max_candidates=config['n_candidates'], **common)
+    if config['method'] != 'halving':
+        raise ValueError(f"Unknown tuning method: {config['method']}")
+
+    candidates = sample_candidates(search_space, config['n_candidates'], random_state)
+    return successive_halving(candidates, X, y, **common)
@@ -0,0 +1,126 @@
+"""
+Input Validation - Vectorized Range Checks
+==========================================
+FEATURE_RANGES tek kaynaktır: aralıklar NumPy alt/üst sınır vektörlerine derlenir
+ve bir batch'in tamamı tek geçişte doğrulanır.
+
+- Girdi: DataFrame, kayıt (dict) listesi veya tek kayıt
+- Çıktı: satır bazında geçerlilik maskesi + (satır, kolon, değer, sebep, izin verilen)
+  yapısında hata tablosu
+- API (app_old.py) ve toplu skorlama (bulk_scoring.py) aynı motoru kullanır
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import FEATURE_RANGES
+
+ERROR_COLUMNS = ['row', 'column', 'value', 'reason', 'allowed']
+
+REASON_MISSING = 'missing or non-numeric'
+REASON_NOT_INTEGER = 'not an integer'
+REASON_OUT_OF_RANGE = 'out of range'
+
+
+class ValidationResult:
+    """Outcome of one batch validation"""
+
+    def __init__(self, valid, errors):
+        self.valid = valid
+        self.errors = errors
+
+    @property
+    def ok(self):
+        """True if every row passed"""
+        return bool(self.valid.all())
+
+    @property
+    def n_invalid(self):
+        return int((~self.valid).sum())
+
+    def to_records(self):
+        """
+        Errors as JSON-serializable dicts (e.g. for an HTTP 422 body)
+
+        Returns:
+            list: {'row', 'column', 'value', 'reason', 'allowed'} per invalid cell
+        """
+        records = self.errors.astype(object).to_dict('records')
+        for record in records:
+            record['row'] = int(record['row'])
+            value = record['value']
+            if isinstance(value, np.generic):
+                value = value.item()
+            if isinstance(value, float) and np.isnan(value):
+                value = None
+            record['value'] = value
+        return records
+
+
+class RangeValidator:
+    """
+    FEATURE_RANGES compiled into lower/upper bound vectors
+
+    Args:
+        ranges: {column: (min, max)} (default: FEATURE_RANGES)
+        integer: Also reject fractional values (all raw features are integer scores)
+    """
+
+    def __init__(self, ranges=None, integer=True):
+        ranges = FEATURE_RANGES if ranges is None else ranges
+        self.columns = list(ranges)
+        self.lower = np.array([ranges[name][0] for name in self.columns], dtype=np.float64)
+        self.upper = np.array([ranges[name][1] for name in self.columns], dtype=np.float64)
+        self.integer = integer
+        self.allowed = np.array([f"{ranges[name][0]}-{ranges[name][1]}" for name in self.columns])
+
+    def _frame(self, data):
+        """Coerce input to a DataFrame with every compiled column (absent ones -> NaN)"""
+        if isinstance(data, dict):
+            data = [data]
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame(list(data))
+        return data.reindex(columns=self.columns)
+
+    def validate(self, data, row_offset=0):
+        """
+        Check a whole batch in one pass
+
+        Args:
+            data: DataFrame, list of records or a single record
+            row_offset: Row number reported for the first row (e.g. chunk start in a file)
+
+        Returns:
+            ValidationResult: valid (bool mask per row), errors (DataFrame, ERROR_COLUMNS)
+        """
+        raw = self._frame(data)
+        if all(pd.api.types.is_numeric_dtype(dtype) for dtype in raw.dtypes):
+            values = raw.to_numpy(dtype=np.float64)
+        else:
+            values = raw.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+        missing = np.isnan(values)
+        with np.errstate(invalid='ignore'):
+            out_of_range = ~missing & ((values < self.lower) | (values > self.upper))
+            not_integer = ~missing & (values != np.round(values)) if self.integer else np.zeros_like(missing)
+        bad = missing | not_integer | out_of_range
+
+        rows, cols = np.nonzero(bad)
+        reasons = np.where(missing[rows, cols], REASON_MISSING,
+                        np.where(not_integer[rows, cols], REASON_NOT_INTEGER, REASON_OUT_OF_RANGE))
+        errors = pd.DataFrame({
+            'row': rows + row_offset,
+            'column': np.array(self.columns, dtype=object)[cols],
+            'value': raw.to_numpy(dtype=object)[rows, cols],
+            'reason': reasons,
+            'allowed': self.allowed[cols],
+        }, columns=ERROR_COLUMNS)
+        return ValidationResult(~bad.any(axis=1), errors)
+
+
+FEATURE_VALIDATOR = RangeValidator()
+
+
+def validate_records(records, row_offset=0):
+    """Validate raw-schema records with the FEATURE_RANGES validator"""
+    return FEATURE_VALIDATOR.validate(records, row_offset)
@@ -0,0 +1,105 @@
+"""
+Response Encoding Benchmark for the API
+=======================================
+/predict/batch yanıt düzenlerinin (records/columnar, metin/kod öneriler) ve
+kodlayıcıların (standart json / orjson) boyut ve süresini, gzip'li ve gzip'siz ölçer.
+
+Usage:
+    python tests/benchmark_api_responses.py [--patients 10000] [--repeats 5]
+
+Sonuçlar rastgele risk faktörlerinden üretilir (model gerekmez); ölçülen kısım
+yalnızca yanıt gövdesinin hazırlanması, kodlanması ve sıkıştırılmasıdır.
+"""
+
+import argparse
+import gzip
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SRC_DIR = Path(__file__).parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from app_old import batch_response, format_batch_item
+from config import API_RESPONSE_CONFIG
+from serialization import dumps, orjson
+
+CLASSES = ['Low', 'Medium', 'High']
+
+VARIANTS = [
+    # (ad, format, recommendations, fast encoder)
+    ('records/text  json', 'records', 'text', False),
+    ('records/text  fast', 'records', 'text', True),
+    ('records/codes fast', 'records', 'codes', True),
+    ('columnar/codes fast', 'columnar', 'codes', True),
+]
+
+
+def synthetic_results(n_patients, seed=0):
+    """predict_with_details-shaped results with random scores"""
+    rng = np.random.default_rng(seed)
+    probs = rng.dirichlet(np.ones(len(CLASSES)), size=n_patients)
+    results = []
+    for p in probs:
+        results.append({
+            'prediction': CLASSES[int(p.argmax())],
+            'confidence': float(p.max()),
+            'probabilities': dict(zip(CLASSES, map(float, p))),
+            'risk_factors': {
+                'Lifestyle Risk': float(rng.uniform(0, 10)),
+                'Environmental Risk': float(rng.uniform(0, 8)),
+                'Genetic/Health Risk': float(rng.uniform(0, 7)),
+                'Symptom Severity': float(rng.uniform(0, 9)),
+                'Critical Symptoms': int(rng.integers(0, 5)),
+            },
+            'overall_risk_score': float(rng.uniform(0, 10)),
+        })
+    return results
+
+
+def best_of(fn, repeats):
+    """Fastest of `repeats` runs in ms, plus the last return value"""
+    best, value = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, value
+
+
+def run_benchmark(n_patients, repeats):
+    """
+    Build, encode and gzip each response variant
+
+    Returns:
+        list: (variant, build ms, encode ms, bytes, gzip ms, gzip bytes)
+    """
+    results = synthetic_results(n_patients)
+    rows = []
+    for name, layout, recommendations, fast in VARIANTS:
+        build_ms, body = best_of(lambda: batch_response(
+            [format_batch_item(r, codes=recommendations == 'codes') for r in results],
+            layout, recommendations), repeats)
+        encode_ms, payload = best_of(lambda: dumps(body, fast=fast), repeats)
+        gzip_ms, compressed = best_of(
+            lambda: gzip.compress(payload, compresslevel=API_RESPONSE_CONFIG['gzip_level']), repeats)
+        rows.append((name, build_ms, encode_ms, len(payload), gzip_ms, len(compressed)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /predict/batch response encodings")
+    parser.add_argument('--patients', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Patients: {args.patients}  (orjson: {'yes' if orjson else 'not installed'})")
+    print(f"{'variant':<22}{'build ms':>10}{'encode ms':>11}{'bytes':>12}{'gzip ms':>10}{'gzip bytes':>12}")
+    for name, build_ms, encode_ms, size, gzip_ms, gzip_size in run_benchmark(args.patients, args.repeats):
+        print(f"{name:<22}{build_ms:>10.1f}{encode_ms:>11.1f}{size:>12,}{gzip_ms:>10.1f}{gzip_size:>12,}")
+
+
+if __name__ == '__main__':
+    main()
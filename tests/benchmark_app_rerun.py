@@ -0,0 +1,90 @@
+"""
+Rerun Benchmark for Streamlit App
+=================================
+Her etkileşimin (slider, Predict, PDF) tetiklediği script rerun'ının CPU süresini ölçer.
+
+Usage:
+    python tests/benchmark_app_rerun.py [--app src/app.py] [--rounds 5]
+
+streamlit.testing.v1.AppTest ile çalışır (tarayıcı gerekmez).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from streamlit.testing.v1 import AppTest
+
+
+def timed_run(at, label, timings):
+    """Run one script rerun and record wall/CPU time"""
+    wall, cpu = time.perf_counter(), time.process_time()
+    at.run(timeout=60)
+    timings.append((label, (time.perf_counter() - wall) * 1000, (time.process_time() - cpu) * 1000))
+    if at.exception:
+        raise RuntimeError(f"{label}: {at.exception[0].message}")
+
+
+def find_button(at, text):
+    """Button whose label contains text"""
+    for button in at.button:
+        if text in button.label:
+            return button
+    raise LookupError(f"No button with label containing {text!r}")
+
+
+def run_benchmark(app_path, rounds):
+    """
+    Replay a typical session: move sliders, predict, re-predict same input, prepare PDF
+
+    Returns:
+        list: (interaction, wall ms, cpu ms)
+    """
+    timings = []
+    at = AppTest.from_file(str(app_path), default_timeout=60)
+    timed_run(at, 'initial load', timings)
+
+    smoking = [s for s in at.slider if s.label == "Smoking Level"][0]
+    for i in range(rounds):
+        smoking.set_value(2 + i % 8)
+        timed_run(at, 'slider move', timings)
+
+        find_button(at, 'Predict Risk').click()
+        timed_run(at, 'predict (new input)', timings)
+
+        smoking.set_value(smoking.value)
+        timed_run(at, 'rerun (same input)', timings)
+
+        find_button(at, 'Predict Risk').click()
+        timed_run(at, 'predict (cached input)', timings)
+
+        find_button(at, 'Prepare PDF').click()
+        timed_run(at, 'prepare PDF', timings)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit rerun CPU benchmark")
+    parser.add_argument('--app', default=str(SRC_DIR / 'app.py'), help="Streamlit script")
+    parser.add_argument('--rounds', type=int, default=5, help="Interaction rounds")
+    args = parser.parse_args()
+
+    timings = run_benchmark(args.app, args.rounds)
+
+    print("\n" + "="*70)
+    print("STREAMLIT RERUN BENCHMARK")
+    print("="*70)
+    print(f"{'interaction':<26s} {'runs':>5s} {'wall ms':>10s} {'cpu ms':>10s}")
+    for label in dict.fromkeys(label for label, _, _ in timings):
+        rows = [(w, c) for l, w, c in timings if l == label]
+        wall = sum(w for w, _ in rows) / len(rows)
+        cpu = sum(c for _, c in rows) / len(rows)
+        print(f"{label:<26s} {len(rows):>5d} {wall:>10.1f} {cpu:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
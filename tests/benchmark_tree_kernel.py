@@ -0,0 +1,101 @@
+"""
+Forest Evaluation Benchmark
+===========================
+Serving modelinin predict_proba süresini batch boyutuna göre ölçer:
+sklearn (model n_jobs ayarı ve n_jobs=1), ForestKernel seri ve thread-paralel yol.
+
+Usage:
+    python tests/benchmark_tree_kernel.py [--sizes 1,10,100,500,1000,5000,20000] [--repeats 5]
+
+Önerilen crossover_rows: paralel yolun seri yoldan hızlı olduğu ve bundan büyük
+tüm boyutlarda da hızlı kaldığı en küçük batch boyutu (config.TREE_KERNEL_CONFIG).
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = Path(__file__).parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from inference import LungCancerPredictor
+from sharded_scoring import random_patients
+from features import RAW_FEATURES, build_feature_matrix
+from tree_kernel import ForestKernel
+
+warnings.filterwarnings('ignore')
+
+
+def best_time(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - began)
+    return min(timings) * 1000
+
+
+def suggest_crossover(report):
+    """Smallest size from which the threaded path stays faster than the serial one"""
+    faster = (report['kernel_parallel_ms'] < report['kernel_serial_ms']).to_numpy()
+    for i in range(len(faster)):
+        if faster[i:].all():
+            return int(report['rows'].iloc[i])
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forest evaluation benchmark")
+    parser.add_argument('--sizes', default='1,10,100,250,500,1000,2500,5000,20000')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--threads', type=int, default=None, help="Kernel threads (default: cpu_count)")
+    args = parser.parse_args()
+
+    predictor = LungCancerPredictor()
+    model = predictor.model
+    kernel = ForestKernel(model, n_threads=args.threads)
+    names = predictor.feature_names
+    sizes = [int(n) for n in args.sizes.split(',')]
+    raw = pd.DataFrame(random_patients(max(sizes)), columns=RAW_FEATURES)
+    X_all = predictor.scaler.transform(pd.DataFrame(build_feature_matrix(raw, names), columns=names))
+
+    n_jobs = model.n_jobs
+    rows = []
+    for n in sizes:
+        X = X_all[:n]
+        model.n_jobs = n_jobs
+        sklearn_ms = best_time(lambda: model.predict_proba(X), args.repeats)
+        model.n_jobs = 1
+        sklearn_serial_ms = best_time(lambda: model.predict_proba(X), args.repeats)
+        serial_ms = best_time(lambda: kernel.predict_proba(X, parallel=False), args.repeats)
+        parallel_ms = best_time(lambda: kernel.predict_proba(X, parallel=True), args.repeats)
+        assert np.array_equal(kernel.predict_proba(X, parallel=False), model.predict_proba(X))
+        assert np.allclose(kernel.predict_proba(X, parallel=True), model.predict_proba(X), rtol=0, atol=1e-12)
+        rows.append({
+            'rows': n, f'sklearn_n_jobs={n_jobs}_ms': sklearn_ms, 'sklearn_n_jobs=1_ms': sklearn_serial_ms,
+            'kernel_serial_ms': serial_ms, 'kernel_parallel_ms': parallel_ms,
+        })
+    model.n_jobs = n_jobs
+    kernel.close()
+
+    report = pd.DataFrame(rows)
+    print("=" * 80)
+    print(f"FOREST EVALUATION ({len(kernel._trees)} trees, {kernel.n_threads} threads, "
+        f"{os.cpu_count()} CPUs)")
+    print("=" * 80)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    crossover = suggest_crossover(report) if kernel.n_threads > 1 else None
+    if crossover is None:
+        print("\n💡 Threaded path never faster here: keep serial (n_threads=1)")
+    else:
+        print(f"\n💡 Suggested crossover_rows: {crossover}")
+
+
+if __name__ == '__main__':
+    main()
@@ -275,6 +275,25 @@ def project_root():
     return Path(__file__).parent.parent
 
 
+@pytest.fixture(scope="module")
+def api_log_dir(tmp_path_factory):
+    """
+    Temporary logs/ directory for API tests (tahmin kaydı, etiketler ve yönlendirici
+    metrikleri repo'daki logs/ dizinine yazılmaz)
+    
+    Returns:
+        Path: Directory holding predictions.json, labels.jsonl and routing_metrics.json
+    """
+    import routing
+    import feedback
+    directory = tmp_path_factory.mktemp("logs")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(routing, "ROUTING_METRICS_PATH", directory / "routing_metrics.json")
+        mp.setattr(feedback, "PREDICTION_LOG_PATH", directory / "predictions.json")
+        mp.setattr(feedback, "LABEL_LOG_PATH", directory / "labels.jsonl")
+        yield directory
+
+
 # =============================================================================
 # SHARED FIXTURES - VALIDATION
 # =============================================================================
@@ -0,0 +1,122 @@
+"""
+Unit Tests for Artifacts Module
+===============================
+Tests for the checksummed model bundle (manifest, doğrulama ve cache testleri)
+"""
+
+import pytest
+import pickle
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    from artifacts import (
+        write_manifest, load_bundle, refresh_manifest, verify_bundle, read_manifest, clear_cache
+    )
+    from inference import LungCancerPredictor
+    from features import RAW_FEATURES, build_feature_matrix
+    from sharded_scoring import random_patients
+    ARTIFACTS_AVAILABLE = True
+except ImportError:
+    ARTIFACTS_AVAILABLE = False
+    pytest.skip("Artifacts module not available", allow_module_level=True)
+
+FEATURES = ['Smoking', 'Age', 'Overall_Risk_Score', 'Critical_Symptom_Count']
+
+
+def fit_artifacts(features=FEATURES, seed=0):
+    """Small model and scaler fitted on random patients"""
+    raw = pd.DataFrame(random_patients(300, seed=seed), columns=RAW_FEATURES)
+    X = pd.DataFrame(build_feature_matrix(raw, features), columns=features)
+    y = np.where(X['Overall_Risk_Score'] > X['Overall_Risk_Score'].median(), 'High', 'Low')
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=5, random_state=seed).fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def save_bundle(directory, model, scaler, features=FEATURES):
+    """Write loose files the way MLPipeline.save_artifacts does, then the manifest"""
+    with open(directory / 'final_model.pkl', 'wb') as f:
+        pickle.dump(model, f)
+    with open(directory / 'final_scaler.pkl', 'wb') as f:
+        pickle.dump(scaler, f)
+    (directory / 'final_features.txt').write_text(''.join(f"{name}\n" for name in features))
+    return write_manifest(directory, model, scaler, features)
+
+
+@pytest.fixture
+def bundle_dir(temp_model_dir):
+    clear_cache()
+    save_bundle(temp_model_dir, *fit_artifacts())
+    yield temp_model_dir
+    clear_cache()
+
+
+class TestManifest:
+    """Tests for writing and verifying the manifest"""
+
+    def test_manifest_contents(self, bundle_dir):
+        """Test checksums, feature order, class order and metadata"""
+        manifest = read_manifest(bundle_dir)
+        assert manifest['feature_names'] == FEATURES
+        assert manifest['classes'] == ['High', 'Low']
+        assert set(manifest['files']) == {'final_model.pkl', 'final_scaler.pkl', 'final_features.txt'}
+        assert manifest['training']['model_class'] == 'RandomForestClassifier'
+        assert all(state == 'ok' for state in verify_bundle(bundle_dir).values())
+
+    def test_mismatched_scaler_is_rejected(self, temp_model_dir):
+        """Test that a scaler fitted on another feature order cannot be bundled"""
+        model, _ = fit_artifacts()
+        _, scaler = fit_artifacts(features=FEATURES[::-1])
+        with pytest.raises(ValueError, match="different feature"):
+            save_bundle(temp_model_dir, model, scaler)
+
+
+class TestLoadBundle:
+    """Tests for validated, cached loading"""
+
+    def test_load_is_cached(self, bundle_dir):
+        """Test that an unchanged bundle is returned from the cache"""
+        bundle = load_bundle(bundle_dir)
+        assert bundle.feature_names == FEATURES
+        assert load_bundle(bundle_dir) is bundle
+        assert load_bundle(bundle_dir.parent / 'missing') is None
+
+    def test_swapped_scaler_fails_checksum(self, bundle_dir):
+        """Test that replacing a bundled file is detected"""
+        load_bundle(bundle_dir)
+        _, other = fit_artifacts(seed=1)
+        with open(bundle_dir / 'final_scaler.pkl', 'wb') as f:
+            pickle.dump(other, f)
+        assert verify_bundle(bundle_dir)['final_scaler.pkl'] == 'modified'
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            load_bundle(bundle_dir)
+
+    def test_refresh_after_in_place_update(self, bundle_dir):
+        """Test that re-checksumming a retrained model makes the bundle loadable again"""
+        version = read_manifest(bundle_dir)['version']
+        model, _ = fit_artifacts(seed=2)
+        with open(bundle_dir / 'final_model.pkl', 'wb') as f:
+            pickle.dump(model, f)
+        manifest = refresh_manifest(bundle_dir, ['final_model.pkl'], n_estimators=5)
+        assert manifest['version'] != version and manifest['training']['n_estimators'] == 5
+        assert load_bundle(bundle_dir).version == manifest['version']
+
+    def test_predictor_uses_bundle(self, bundle_dir):
+        """Test that LungCancerPredictor loads the bundle next to its model path"""
+        predictor = LungCancerPredictor(bundle_dir / 'final_model.pkl')
+        assert predictor.feature_names == FEATURES
+        assert predictor.version == read_manifest(bundle_dir)['version']
+        result = predictor.predict_batch(pd.DataFrame(random_patients(5), columns=RAW_FEATURES))
+        assert set(result['prediction']) <= {'High', 'Low'}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
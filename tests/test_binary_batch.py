@@ -0,0 +1,124 @@
+"""
+Unit Tests for Binary Batch Codec
+=================================
+Tests for Arrow IPC / packed uint8 batch bodies (binary toplu istek testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
+
+try:
+    import pyarrow as pa
+    from fastapi.testclient import TestClient
+    from binary_batch import (
+        MATRIX_COLUMNS, ARROW_MEDIA_TYPE, MATRIX_MEDIA_TYPE, decode_matrix, decode_arrow, encode_arrow
+    )
+    BINARY_AVAILABLE = True
+except ImportError:
+    BINARY_AVAILABLE = False
+    pytest.skip("Binary batch dependencies not available", allow_module_level=True)
+
+
+@pytest.fixture(scope='module')
+def raw():
+    """First 200 dataset rows as uint8 features"""
+    return pd.read_csv(DATA_PATH, nrows=200)[MATRIX_COLUMNS].astype(np.uint8)
+
+
+@pytest.fixture(scope='module')
+def client(api_log_dir):
+    """Test client with startup (model loading) run"""
+    from app_old import app
+    with TestClient(app) as client:
+        yield client
+
+
+def arrow_bytes(df):
+    """DataFrame as an Arrow IPC stream"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# =============================================================================
+# CODEC TESTS
+# =============================================================================
+
+class TestCodec:
+    """Tests for decoding request bodies"""
+
+    def test_matrix_is_zero_copy(self, raw):
+        """Test that the uint8 body is viewed, not copied"""
+        body = raw.to_numpy().tobytes()
+        df = decode_matrix(body)
+        assert df.shape == raw.shape and list(df.columns) == MATRIX_COLUMNS
+        assert np.shares_memory(df.to_numpy(), np.frombuffer(body, dtype=np.uint8))
+        assert (df.to_numpy() == raw.to_numpy()).all()
+
+    def test_matrix_bad_length(self):
+        """Test that partial rows are rejected"""
+        with pytest.raises(ValueError):
+            decode_matrix(b'\x01' * (len(MATRIX_COLUMNS) + 1))
+
+    def test_arrow_missing_column(self, raw):
+        """Test that Arrow bodies must carry every feature"""
+        with pytest.raises(ValueError, match='Age'):
+            decode_arrow(arrow_bytes(raw.drop(columns=['Age'])))
+
+
+# =============================================================================
+# ENDPOINT TESTS
+# =============================================================================
+
+class TestBinaryEndpoint:
+    """Tests for binary /predict/batch bodies"""
+
+    def test_matrix_round_trip(self, client, raw):
+        """Test that a uint8 matrix returns a float32 probability matrix"""
+        from app_old import raw_predictor
+        response = client.post("/predict/batch", content=raw.to_numpy().tobytes(),
+                            headers={"Content-Type": MATRIX_MEDIA_TYPE})
+        assert response.status_code == 200
+        classes = response.headers["X-Classes"].split(",")
+        probs = np.frombuffer(response.content, dtype='<f4').reshape(len(raw), len(classes))
+
+        expected = raw_predictor.predict_batch(raw.astype(np.int64))
+        assert np.allclose(probs, expected[[f"prob_{c}" for c in classes]].to_numpy(), atol=1e-6)
+
+    def test_arrow_round_trip(self, client, raw):
+        """Test that an Arrow stream returns predictions as Arrow"""
+        response = client.post("/predict/batch", content=arrow_bytes(raw),
+                            headers={"Content-Type": ARROW_MEDIA_TYPE})
+        assert response.status_code == 200
+        result = pa.ipc.open_stream(response.content).read_all().to_pandas()
+        assert len(result) == len(raw)
+        assert {'prediction', 'confidence'} <= set(result.columns)
+        assert encode_arrow(result)  # Yanıt yeniden kodlanabilir
+
+    def test_out_of_range_rejected(self, client, raw):
+        """Test that binary rows go through the range validator"""
+        bad = raw.copy()
+        bad.loc[7, 'Smoking'] = 0
+        response = client.post("/predict/batch", content=bad.to_numpy().tobytes(),
+                            headers={"Content-Type": MATRIX_MEDIA_TYPE})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["row"] == 7
+
+    def test_json_still_accepted(self, client):
+        """Test that JSON bodies keep their validation errors"""
+        response = client.post("/predict/batch", json={"patients": [{"Age": 55}]})
+        assert response.status_code == 422
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
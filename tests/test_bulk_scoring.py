@@ -0,0 +1,150 @@
+"""
+Unit Tests for Bulk Scoring Module
+==================================
+Tests for chunked CSV validation and scoring (toplu skorlama testleri)
+"""
+
+import pytest
+import io
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
+
+try:
+    from bulk_scoring import validate_chunk, score_csv
+    from features import RAW_FEATURES
+    BULK_AVAILABLE = True
+except ImportError:
+    BULK_AVAILABLE = False
+    pytest.skip("Bulk scoring module not available", allow_module_level=True)
+
+
+class CountingPredictor:
+    """Predictor stub that records batch sizes (real model is tested in test_inference)"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, df):
+        self.batch_sizes.append(len(df))
+        labels = np.where(df['Smoking'].to_numpy() >= 5, 'High', 'Low')
+        return pd.DataFrame({'prediction': labels, 'confidence': 1.0}, index=df.index)
+
+
+@pytest.fixture
+def raw_df():
+    """Raw-schema data with two invalid cells"""
+    df = pd.read_csv(DATA_PATH).astype(object)
+    df.loc[3, 'Age'] = 300
+    df.loc[5, 'Smoking'] = 'x'
+    return df
+
+
+def as_upload(df):
+    """CSV bytes wrapped like a Streamlit upload"""
+    return io.BytesIO(df.to_csv(index=False).encode())
+
+
+# =============================================================================
+# VALIDATION TESTS
+# =============================================================================
+
+class TestValidateChunk:
+    """Tests for vectorized range checks"""
+
+    def test_errors_reported_per_cell(self, raw_df):
+        """Test that each invalid cell is reported with row and reason"""
+        valid, errors = validate_chunk(raw_df, row_offset=100)
+        assert (~valid).sum() == 2
+        assert errors[['row', 'column', 'reason']].values.tolist() == [
+            [103, 'Age', 'out of range'],
+            [105, 'Smoking', 'missing or non-numeric'],
+        ]
+
+    def test_non_integer(self):
+        """Test that fractional scores are rejected"""
+        df = pd.DataFrame([{name: 2 for name in RAW_FEATURES}])
+        df['Age'] = 40.5
+        valid, errors = validate_chunk(df)
+        assert not valid[0] and errors['reason'].tolist() == ['not an integer']
+
+
+# =============================================================================
+# SCORING TESTS
+# =============================================================================
+
+class TestScoreCsv:
+    """Tests for chunked scoring"""
+
+    def test_chunks_and_progress(self, raw_df, tmp_path):
+        """Test that scoring runs in bounded chunks and reports progress"""
+        predictor = CountingPredictor()
+        progress = []
+        summary = score_csv(as_upload(raw_df), predictor, tmp_path / 'out.csv', chunksize=300,
+                            on_progress=lambda done, total: progress.append((done, total)))
+        assert max(predictor.batch_sizes) <= 300
+        assert progress[-1] == (1000, 1000) and len(progress) == 4
+        assert (summary['n_scored'], summary['n_invalid']) == (998, 2)
+
+        out = pd.read_csv(tmp_path / 'out.csv')
+        assert len(out) == 998
+        assert 3 not in out['row'].values and 'Patient Id' in out.columns
+
+    def test_parquet_output(self, raw_df, tmp_path):
+        """Test that Parquet output matches CSV output"""
+        pytest.importorskip('pyarrow')
+        score_csv(as_upload(raw_df), CountingPredictor(), tmp_path / 'out.csv', chunksize=256)
+        score_csv(as_upload(raw_df), CountingPredictor(), tmp_path / 'out.parquet',
+                output_format='parquet', chunksize=256)
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'out.csv'),
+                                    pd.read_parquet(tmp_path / 'out.parquet'), check_dtype=False)
+
+    def test_float_formatted_integers(self, tmp_path):
+        """Test that integral floats such as '33.0' are scored, not rejected as an invalid file"""
+        df = pd.read_csv(DATA_PATH).head(20)
+        df[RAW_FEATURES] = df[RAW_FEATURES].astype(float)
+        upload = as_upload(df)
+        assert b'33.0' in upload.getvalue()
+        predictor = CountingPredictor()
+        summary = score_csv(upload, predictor, tmp_path / 'out.csv')
+        assert (summary['n_scored'], summary['n_invalid']) == (20, 0)
+        expected = np.where(df['Smoking'] >= 5, 'High', 'Low')
+        assert pd.read_csv(tmp_path / 'out.csv')['prediction'].tolist() == expected.tolist()
+
+    def test_missing_columns(self):
+        """Test that files without the raw schema are rejected"""
+        with pytest.raises(ValueError, match="Missing columns"):
+            score_csv(as_upload(pd.DataFrame({'Age': [40]})), CountingPredictor())
+
+
+# =============================================================================
+# BATCH PREDICTOR TESTS
+# =============================================================================
+
+class TestPredictBatch:
+    """Tests for LungCancerPredictor.predict_batch"""
+
+    def test_matches_single_row_path(self):
+        """Test that batch scoring equals row-by-row predict"""
+        from inference import LungCancerPredictor
+        predictor = LungCancerPredictor()
+        df = pd.read_csv(DATA_PATH, nrows=25)[RAW_FEATURES]
+        batch = predictor.predict_batch(df)
+        for i, record in enumerate(df.to_dict(orient='records')):
+            prediction, probability = predictor.predict(record)
+            assert batch['prediction'].iloc[i] == prediction
+            np.testing.assert_allclose(batch.filter(like='prob_').iloc[i].to_numpy(), probability)
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
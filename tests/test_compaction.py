@@ -0,0 +1,178 @@
+"""
+Unit Tests for Compaction Module
+================================
+Tests for forest pruning, distillation and candidate selection (model küçültme testleri)
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sklearn.datasets import make_classification
+    from sklearn.ensemble import RandomForestClassifier
+    from compaction import (subset_forest, rank_trees, oob_indices, compact_model, model_footprint,
+                            synthetic_patients)
+    from features import ENGINEERED_FEATURES, RAW_FEATURES
+    COMPACTION_AVAILABLE = True
+except ImportError:
+    COMPACTION_AVAILABLE = False
+    pytest.skip("Compaction module not available", allow_module_level=True)
+
+
+FAST_CONFIG = {
+    'tree_counts': [1, 5],
+    'min_trees': 3,
+    'depths': [3],
+    'depth_n_estimators': 5,
+    'distill_depths': [4],
+    'latency_repeats': 3,
+}
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Small 3-class dataset split into fit/validation"""
+    X, y = make_classification(n_samples=400, n_features=8, n_informative=5,
+                            n_classes=3, random_state=1)
+    y = np.array(['Low', 'Medium', 'High'])[y]
+    return X[:300], y[:300], X[300:], y[300:]
+
+
+# =============================================================================
+# PRUNING TESTS
+# =============================================================================
+
+class TestSubsetForest:
+    """Tests for tree subset copies"""
+
+    def test_subset_matches_manual_vote(self, dataset):
+        """Test that a subset forest averages only the kept trees"""
+        X_fit, y_fit, X_val, _ = dataset
+        forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X_fit, y_fit)
+        keep = [3, 7, 11]
+        compact = subset_forest(forest, keep)
+        expected = np.mean([forest.estimators_[i].predict_proba(X_val) for i in keep], axis=0)
+        np.testing.assert_allclose(compact.predict_proba(X_val), expected)
+        assert len(forest.estimators_) == 20
+        assert model_footprint(compact)['size_bytes'] < model_footprint(forest)['size_bytes']
+
+    def test_rank_trees_best_first(self, dataset):
+        """Test that ranking puts the most accurate tree first"""
+        X_fit, y_fit, X_val, y_val = dataset
+        forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X_fit, y_fit)
+        order = rank_trees(forest, X_val, y_val)
+        scores = [np.mean(forest.classes_[forest.estimators_[i].predict(X_val).astype(int)] == y_val)
+                for i in order]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_rank_trees_oob(self, dataset):
+        """Test that OOB ranking scores each tree only on rows it was not trained on"""
+        X_fit, y_fit, _, _ = dataset
+        forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X_fit, y_fit)
+        rows = oob_indices(forest)
+        assert len(rows) == 10 and all(0 < len(r) < len(X_fit) for r in rows)
+        scores = [np.mean(forest.classes_[forest.estimators_[i].predict(X_fit[rows[i]]).astype(int)]
+                        == y_fit[rows[i]]) for i in rank_trees(forest, X_fit, y_fit, oob=True)]
+        assert scores == sorted(scores, reverse=True)
+        # Eğitim satırlarında ağaçlar neredeyse kusursuz: OOB skoru daha düşük
+        assert np.mean(scores) < 1.0
+
+    def test_rank_trees_oob_requires_bootstrap(self, dataset):
+        """Test that OOB ranking is refused for forests without bootstrap"""
+        X_fit, y_fit, _, _ = dataset
+        forest = RandomForestClassifier(n_estimators=3, bootstrap=False, random_state=0).fit(X_fit, y_fit)
+        assert oob_indices(forest) is None
+        with pytest.raises(ValueError):
+            rank_trees(forest, X_fit, y_fit, oob=True)
+
+    @pytest.mark.parametrize('attribute', ['_n_samples', '_get_estimators_indices'])
+    def test_missing_private_api_falls_back_to_validation(self, dataset, attribute):
+        """Test that a forest without sklearn's private sampling API is ranked on validation rows"""
+        X_fit, y_fit, X_val, y_val = dataset
+        forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X_fit, y_fit)
+        if attribute in vars(forest):
+            delattr(forest, attribute)
+        else:
+            setattr(forest, attribute, None)
+        assert oob_indices(forest) is None
+        result = compact_model(forest, X_fit, y_fit, X_val, y_val, config=FAST_CONFIG)
+        assert result['ranking'] == 'validation'
+        kept = result['report'].set_index('candidate').loc['subset-5']
+        assert kept['n_trees'] == 5
+
+
+# =============================================================================
+# SELECTION TESTS
+# =============================================================================
+
+class TestCompactModel:
+    """Tests for the compaction search"""
+
+    def test_chosen_model_within_tolerance(self, dataset):
+        """Test that the chosen model respects the tolerance and is the smallest such candidate"""
+        X_fit, y_fit, X_val, y_val = dataset
+        result = compact_model(RandomForestClassifier(n_estimators=30, random_state=0),
+                            X_fit, y_fit, X_val, y_val, config=dict(FAST_CONFIG, tolerance=0.02))
+        report = result['report']
+        ok = report[report['eligible']]
+        assert result['best'] == ok.sort_values('size_bytes').iloc[0]['candidate']
+        chosen = report.iloc[0]
+        assert result['reference_accuracy'] - chosen['val_accuracy'] <= 0.02
+        assert {'latency_ms', 'size_bytes', 'val_accuracy'} <= set(report.columns)
+        assert result['ranking'] == 'oob'
+
+    def test_min_trees(self, dataset):
+        """Test that no model with fewer than min_trees trees is offered or chosen"""
+        X_fit, y_fit, X_val, y_val = dataset
+        result = compact_model(RandomForestClassifier(n_estimators=30, random_state=0),
+                            X_fit, y_fit, X_val, y_val, config=dict(FAST_CONFIG, tolerance=1.0))
+        report = result['report'].set_index('candidate')
+        assert 'subset-1' not in report.index and 'subset-5' in report.index
+        assert not report.loc['distilled-4', 'eligible']
+        assert report.loc[result['best'], 'n_trees'] >= FAST_CONFIG['min_trees']
+        probabilities = result['model'].predict_proba(X_val)
+        assert ((probabilities > 0) & (probabilities < 1)).any()
+
+    def test_zero_tolerance_keeps_reference_available(self, dataset):
+        """Test that the reference always qualifies, so a model is always returned"""
+        X_fit, y_fit, X_val, y_val = dataset
+        result = compact_model(RandomForestClassifier(n_estimators=10, random_state=0),
+                            X_fit, y_fit, X_val, y_val, config=dict(FAST_CONFIG, tolerance=0.0))
+        assert bool(result['report'].set_index('candidate').loc['reference', 'within_tolerance'])
+        assert result['report'].iloc[0]['val_accuracy'] >= result['reference_accuracy']
+
+
+# =============================================================================
+# DISTILLATION TESTS
+# =============================================================================
+
+class TestSyntheticPatients:
+    """Tests for the distillation transfer set"""
+
+    def test_shape_and_determinism(self):
+        """Test that synthetic patients are engineered and reproducible"""
+        first = synthetic_patients(50, ENGINEERED_FEATURES, random_state=3)
+        second = synthetic_patients(50, ENGINEERED_FEATURES, random_state=3)
+        assert list(first.columns) == ENGINEERED_FEATURES
+        assert first.shape == (50, len(ENGINEERED_FEATURES))
+        assert first.equals(second)
+
+    def test_raw_values_in_range(self):
+        """Test that raw columns stay inside FEATURE_RANGES"""
+        from config import FEATURE_RANGES
+        df = synthetic_patients(200, RAW_FEATURES, random_state=0)
+        for name, (low, high) in FEATURE_RANGES.items():
+            assert df[name].between(low, high).all()
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
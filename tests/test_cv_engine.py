@@ -0,0 +1,87 @@
+"""
+Unit Tests for Cross-Validation Engine
+======================================
+Tests for parallel fold scheduling and metric reuse (paralel çapraz doğrulama testleri)
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sklearn.datasets import make_classification
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import classification_report
+    from sklearn.model_selection import cross_val_score
+    from cv_engine import plan_workers, cross_validate_parallel, format_classification_report
+    CV_ENGINE_AVAILABLE = True
+except ImportError:
+    CV_ENGINE_AVAILABLE = False
+    pytest.skip("CV engine module not available", allow_module_level=True)
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Small 3-class dataset with string labels"""
+    X, y = make_classification(n_samples=300, n_features=8, n_informative=5,
+                            n_classes=3, random_state=42)
+    return X, np.array(['Low', 'Medium', 'High'])[y]
+
+
+# =============================================================================
+# WORKER PLANNING TESTS
+# =============================================================================
+
+class TestPlanWorkers:
+    """Tests for the worker budget split"""
+
+    @pytest.mark.parametrize("n_folds,max_workers", [(5, 1), (5, 4), (5, 32), (10, 8)])
+    def test_no_oversubscription(self, n_folds, max_workers):
+        """Test that fold workers x tree jobs never exceeds the budget"""
+        fold_workers, tree_jobs = plan_workers(n_folds, max_workers)
+        assert fold_workers * tree_jobs <= max_workers
+        assert 1 <= fold_workers <= n_folds
+
+
+# =============================================================================
+# CROSS-VALIDATION TESTS
+# =============================================================================
+
+class TestCrossValidation:
+    """Tests for fold results"""
+
+    def test_scores_match_cross_val_score(self, dataset):
+        """Test that fold scores equal sklearn cross_val_score"""
+        X, y = dataset
+        model = RandomForestClassifier(n_estimators=20, random_state=42)
+        result = cross_validate_parallel(model, X, y, n_folds=5, max_workers=4)
+        expected = cross_val_score(model, X, y, cv=5, scoring='accuracy')
+        np.testing.assert_allclose(result['scores'], expected)
+
+    def test_fold_timings_reported(self, dataset):
+        """Test that every fold reports timing and out-of-fold predictions cover all rows"""
+        X, y = dataset
+        result = cross_validate_parallel(RandomForestClassifier(n_estimators=5, random_state=0), X, y, n_folds=3)
+        assert len(result['folds']) == 3
+        assert all(fold['fit_time'] > 0 for fold in result['folds'])
+        assert len(result['oof_pred']) == len(y)
+        assert result['oof_accuracy'] == pytest.approx(np.mean(result['oof_pred'] == y))
+
+    def test_report_formatting_matches_sklearn(self, dataset):
+        """Test that text report rendered from dict matches sklearn's values"""
+        _, y = dataset
+        y_pred = np.roll(y, 1)
+        report = classification_report(y, y_pred, output_dict=True)
+        assert format_classification_report(report).split() == classification_report(y, y_pred).split()
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
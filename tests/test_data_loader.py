@@ -0,0 +1,108 @@
+"""
+Unit Tests for Data Loader Module
+=================================
+Tests for schema-driven CSV ingestion (şema tabanlı CSV okuma testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from data_loader import (
+        load_raw_data, iter_raw_chunks, memory_footprint,
+        RAW_SCHEMA, LEVEL_DTYPE, ID_COLUMN
+    )
+    DATA_LOADER_AVAILABLE = True
+except ImportError:
+    DATA_LOADER_AVAILABLE = False
+    pytest.skip("Data loader module not available", allow_module_level=True)
+
+
+RAW_DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
+
+
+# =============================================================================
+# SCHEMA TESTS
+# =============================================================================
+
+class TestSchema:
+    """Tests for dtype schema and loading"""
+
+    def test_feature_columns_are_uint8(self):
+        """Test that all raw score columns use uint8"""
+        df = load_raw_data(RAW_DATA_PATH)
+        for col in RAW_SCHEMA:
+            assert df[col].dtype == np.uint8
+
+    def test_level_is_categorical(self):
+        """Test that Level is loaded as categorical"""
+        df = load_raw_data(RAW_DATA_PATH)
+        assert df['Level'].dtype == LEVEL_DTYPE
+
+    def test_patient_id_optional(self):
+        """Test that Patient Id is only loaded on request"""
+        assert ID_COLUMN not in load_raw_data(RAW_DATA_PATH).columns
+        assert ID_COLUMN in load_raw_data(RAW_DATA_PATH, include_patient_id=True).columns
+
+    def test_engines_and_chunking_agree(self):
+        """Test that C (chunked) and PyArrow engines give identical frames"""
+        df_c = load_raw_data(RAW_DATA_PATH, chunksize=128)
+        df_arrow = load_raw_data(RAW_DATA_PATH, engine='pyarrow')
+        pd.testing.assert_frame_equal(df_c, df_arrow)
+
+    def test_values_match_default_read(self):
+        """Test that values are unchanged compared to default pd.read_csv"""
+        df = load_raw_data(RAW_DATA_PATH)
+        df_default = pd.read_csv(RAW_DATA_PATH)
+        for col in RAW_SCHEMA:
+            np.testing.assert_array_equal(df[col].to_numpy(), df_default[col].to_numpy())
+
+    def test_chunks_cover_all_rows(self):
+        """Test that chunk iteration yields every row"""
+        total = sum(len(chunk) for chunk in iter_raw_chunks(RAW_DATA_PATH, chunksize=300))
+        assert total == len(pd.read_csv(RAW_DATA_PATH))
+
+
+# =============================================================================
+# VALIDATION & MEMORY TESTS
+# =============================================================================
+
+class TestValidation:
+    """Tests for overflow and label checks"""
+
+    def test_overflow_raises(self, tmp_path):
+        """Test that values beyond uint8 do not wrap around silently"""
+        df = pd.read_csv(RAW_DATA_PATH, nrows=5)
+        df.loc[0, 'Age'] = 300
+        path = tmp_path / 'overflow.csv'
+        df.to_csv(path, index=False)
+        with pytest.raises(ValueError):
+            load_raw_data(path)
+
+    def test_unknown_level_raises(self, tmp_path):
+        """Test that unknown target labels are rejected"""
+        df = pd.read_csv(RAW_DATA_PATH, nrows=5)
+        df.loc[0, 'Level'] = 'Unknown'
+        path = tmp_path / 'bad_level.csv'
+        df.to_csv(path, index=False)
+        with pytest.raises(ValueError):
+            load_raw_data(path)
+
+    def test_memory_reduction(self):
+        """Test that schema dtypes use several times less memory"""
+        report = memory_footprint(load_raw_data(RAW_DATA_PATH))
+        assert report['ratio'] > 4
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
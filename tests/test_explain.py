@@ -0,0 +1,150 @@
+"""
+Unit Tests for Explain Module
+=============================
+Tests for exact TreeSHAP and the /explain endpoints (açıklanabilirlik testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from itertools import combinations
+from math import factorial
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
+
+try:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.tree import DecisionTreeClassifier
+    from fastapi.testclient import TestClient
+    from explain import TreeExplainer, ExplanationService
+    from inference import LungCancerPredictor
+    from features import RAW_FEATURES
+    EXPLAIN_AVAILABLE = True
+except ImportError:
+    EXPLAIN_AVAILABLE = False
+    pytest.skip("Explain module not available", allow_module_level=True)
+
+
+@pytest.fixture(scope='module')
+def toy():
+    """Small tree on integer features with an interaction"""
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 5, size=(300, 4)).astype(float)
+    y = (X[:, 0] + X[:, 1] * X[:, 2] > 6).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def service():
+    """Explanation service on the deployed model"""
+    return ExplanationService(LungCancerPredictor(), cache_size=8)
+
+
+@pytest.fixture(scope='module')
+def raw():
+    return pd.read_csv(DATA_PATH, nrows=20)[RAW_FEATURES]
+
+
+def brute_force_shap(tree, x):
+    """Shapley values by enumerating subsets of the path-dependent value function"""
+    t = tree.tree_
+    n_features = t.n_features
+
+    def value(S, node=0):
+        if t.children_left[node] == -1:
+            return t.value[node, 0] / t.value[node, 0].sum()
+        left, right = t.children_left[node], t.children_right[node]
+        if t.feature[node] in S:
+            return value(S, left if x[t.feature[node]] <= t.threshold[node] else right)
+        w = t.weighted_n_node_samples
+        return (w[left] * value(S, left) + w[right] * value(S, right)) / w[node]
+
+    phi = np.zeros((n_features, len(tree.classes_)))
+    for i in range(n_features):
+        others = [j for j in range(n_features) if j != i]
+        for size in range(n_features):
+            weight = factorial(size) * factorial(n_features - size - 1) / factorial(n_features)
+            for S in combinations(others, size):
+                phi[i] += weight * (value(set(S) | {i}) - value(set(S)))
+    return phi
+
+
+# =============================================================================
+# TREESHAP TESTS
+# =============================================================================
+
+class TestTreeExplainer:
+    """Tests for exactness"""
+
+    def test_matches_brute_force(self, toy):
+        """Test SHAP values against subset enumeration"""
+        X, y = toy
+        tree = DecisionTreeClassifier(max_depth=4, random_state=0).fit(X, y)
+        phi = TreeExplainer(tree).shap_values(X[:5])
+        for row, x in zip(phi, X[:5]):
+            assert np.allclose(row, brute_force_shap(tree, x), atol=1e-12)
+
+    def test_local_accuracy_forest(self, toy):
+        """Test that expected_value + contributions reproduce predict_proba"""
+        X, y = toy
+        forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+        explainer = TreeExplainer(forest)
+        phi = explainer.shap_values(X, chunk_size=7)
+        assert np.allclose(explainer.expected_value + phi.sum(axis=1), forest.predict_proba(X), atol=1e-10)
+
+
+# =============================================================================
+# SERVICE TESTS
+# =============================================================================
+
+class TestExplanationService:
+    """Tests for cached explanations of raw records"""
+
+    def test_explanation_matches_model(self, service, raw):
+        """Test that explained probabilities equal the predictor's"""
+        result = service.explain(raw.iloc[0].to_dict())
+        expected = service.predictor.predict_batch(raw.iloc[:1]).iloc[0]
+        assert result['prediction'] == expected['prediction']
+        for label, p in result['probability'].items():
+            assert p == pytest.approx(expected[f"prob_{label}"], abs=1e-9)
+        assert len(result['top_features']) == service.top_k
+
+    def test_cache_and_batch(self, service, raw):
+        """Test that repeated inputs hit the cache and batch equals single-row results"""
+        batch = service.explain_batch(raw.iloc[:6])
+        hits = service.hits
+        single = service.explain(raw.iloc[3].to_dict())
+        assert service.hits == hits + 1
+        assert single is batch[3]
+
+        service.explain_batch(raw)
+        assert service.cache_info()['size'] == 8
+
+
+# =============================================================================
+# ENDPOINT TESTS
+# =============================================================================
+
+class TestExplainEndpoint:
+    """Tests for /explain"""
+
+    def test_explain(self, raw, api_log_dir):
+        """Test single and batch explanation endpoints"""
+        from app_old import app, API_FIELD_NAMES
+        payload = {API_FIELD_NAMES[name]: int(value) for name, value in raw.iloc[0].items()}
+        with TestClient(app) as client:
+            first = client.post("/explain", json=payload).json()
+            second = client.post("/explain", json=payload).json()
+            batch = client.post("/explain/batch", json={"patients": [payload, payload]})
+        assert not first['cached'] and second['cached']
+        assert set(first['contributions']) == set(first['probability'])
+        assert batch.status_code == 200 and batch.json()['count'] == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
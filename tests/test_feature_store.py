@@ -0,0 +1,116 @@
+"""
+Unit Tests for Feature Store Module
+===================================
+Tests for out-of-core chunked feature engineering (parça parça özellik mühendisliği testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sklearn.preprocessing import StandardScaler
+    from feature_store import FeatureStore, count_rows, write_feature_parquet, STORE_DTYPE
+    from features import build_feature_matrix
+    from data_loader import load_raw_data
+    FEATURE_STORE_AVAILABLE = True
+except ImportError:
+    FEATURE_STORE_AVAILABLE = False
+    pytest.skip("Feature store module not available", allow_module_level=True)
+
+
+RAW_DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    """Feature store built with small chunks"""
+    directory = tmp_path_factory.mktemp("feature_store")
+    return FeatureStore.build(RAW_DATA_PATH, directory, chunksize=128)
+
+
+# =============================================================================
+# FEATURE STORE TESTS
+# =============================================================================
+
+class TestFeatureStore:
+    """Tests for chunked feature store"""
+
+    def test_count_rows(self):
+        """Test newline-based row count"""
+        assert count_rows(RAW_DATA_PATH) == len(pd.read_csv(RAW_DATA_PATH))
+
+    def test_count_rows_blank_lines_and_quoted_newlines(self, tmp_path):
+        """Test that rows are counted as parsed (trailing blank line, quoted newline)"""
+        raw = pd.read_csv(RAW_DATA_PATH).head(20)
+        raw.loc[3, 'Patient Id'] = 'P4\nsecond line'
+        path = tmp_path / 'messy.csv'
+        path.write_text(raw.to_csv(index=False) + '\n\n')
+        assert count_rows(path) == 20
+        built = FeatureStore.build(path, tmp_path / 'store', chunksize=7)
+        assert built.n_rows == 20
+
+    def test_matrix_matches_in_memory(self, store):
+        """Test that chunked output equals in-memory feature matrix"""
+        expected = build_feature_matrix(load_raw_data(RAW_DATA_PATH)).astype(STORE_DTYPE)
+        np.testing.assert_array_equal(np.asarray(store.X), expected)
+
+    def test_labels_roundtrip(self, store):
+        """Test that stored Level codes decode to original labels"""
+        expected = pd.read_csv(RAW_DATA_PATH)['Level'].to_numpy()
+        np.testing.assert_array_equal(store.labels(), expected)
+
+    def test_reopen(self, store):
+        """Test that an existing store can be reopened"""
+        reopened = FeatureStore(store.directory)
+        assert reopened.n_rows == store.n_rows
+        assert reopened.feature_names == store.feature_names
+
+    def test_partial_fit_scaler_matches_full_fit(self, store):
+        """Test that chunked scaler fit equals a single fit"""
+        rows = np.arange(store.n_rows)
+        chunked = store.fit_scaler(StandardScaler(), rows, chunksize=97)
+        full = StandardScaler().fit(store.frame(rows))
+        np.testing.assert_allclose(chunked.mean_, full.mean_, rtol=1e-6)
+        np.testing.assert_allclose(chunked.scale_, full.scale_, rtol=1e-5)
+
+    def test_streaming_scaler_matches_in_memory_fit(self, store):
+        """Test that the streaming scaler and scaled rows match the in-memory path (no train/serve skew)"""
+        rows = np.arange(0, store.n_rows, 2)
+        in_memory = pd.DataFrame(build_feature_matrix(load_raw_data(RAW_DATA_PATH)),
+                                columns=store.feature_names).iloc[rows]
+        full = StandardScaler().fit(in_memory)
+        chunked = store.fit_scaler(StandardScaler(), rows, chunksize=97)
+        np.testing.assert_allclose(chunked.mean_, full.mean_, rtol=1e-12)
+        np.testing.assert_allclose(chunked.scale_, full.scale_, rtol=1e-12)
+
+        scaled = store.transform_rows(chunked, rows, 'X_parity.npy', chunksize=97)
+        expected = full.transform(in_memory)
+        np.testing.assert_allclose(np.asarray(scaled), expected, rtol=1e-12, atol=1e-12)
+        # Ağaçların gördüğü float32 girdi birebir aynı
+        np.testing.assert_array_equal(np.asarray(scaled, dtype=np.float32), expected.astype(np.float32))
+
+
+class TestParquetExport:
+    """Tests for Parquet output"""
+
+    def test_parquet_roundtrip(self, tmp_path, store):
+        """Test that Parquet export contains every row and feature"""
+        path = tmp_path / 'features.parquet'
+        n_rows = write_feature_parquet(RAW_DATA_PATH, path, chunksize=300)
+        df = pd.read_parquet(path)
+        assert n_rows == len(df) == store.n_rows
+        np.testing.assert_array_equal(df[store.feature_names].to_numpy(), np.asarray(store.X))
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,255 @@
+"""
+Unit Tests for Feature Engineering Module
+=========================================
+Parity tests for the shared feature spec (batch kernel, row kernel and the
+original pipeline implementation)(paylaşılan özellik spec'i için eşitlik testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from features import (
+        engineer_features, engineer_row, build_feature_matrix,
+        build_feature_vector, compile_spec, ENGINEERED_FEATURES, RAW_FEATURES, COMPILED_SPEC
+    )
+    from config import FINAL_FEATURES, FEATURE_RANGES
+    FEATURES_AVAILABLE = True
+except ImportError:
+    FEATURES_AVAILABLE = False
+    pytest.skip("Features module not available", allow_module_level=True)
+
+
+RAW_DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture(scope="module")
+def raw_df():
+    """Raw training data"""
+    return pd.read_csv(RAW_DATA_PATH)
+
+
+def reference_engineer_features(df):
+    """Original MLPipeline.engineer_features implementation (reference)"""
+    df_fe = df.copy()
+    df_fe['Age_Group'] = pd.cut(df_fe['Age'], bins=[0, 25, 40, 55, 100], labels=[0, 1, 2, 3]).astype(int)
+    df_fe['Environmental_Risk'] = (df_fe['Air Pollution'] + df_fe['Dust Allergy'] + df_fe['OccuPational Hazards']) / 3
+    df_fe['Lifestyle_Risk'] = (df_fe['Smoking'] + df_fe['Alcohol use'] + df_fe['Obesity'] + (10 - df_fe['Balanced Diet'])) / 4
+    df_fe['Genetic_Health_Risk'] = (df_fe['Genetic Risk'] + df_fe['chronic Lung Disease']) / 2
+    symptom_cols = ['Chest Pain', 'Coughing of Blood', 'Fatigue', 'Weight Loss',
+                    'Shortness of Breath', 'Wheezing', 'Swallowing Difficulty']
+    df_fe['Symptom_Severity'] = df_fe[symptom_cols].mean(axis=1)
+    df_fe['Respiratory_Score'] = (df_fe['Shortness of Breath'] + df_fe['Wheezing'] +
+                                df_fe['Dry Cough'] + df_fe['chronic Lung Disease']) / 4
+    df_fe['Critical_Symptom_Count'] = (
+        (df_fe['Chest Pain'] >= 6).astype(int) + (df_fe['Coughing of Blood'] >= 6).astype(int) +
+        (df_fe['Weight Loss'] >= 6).astype(int) + (df_fe['Shortness of Breath'] >= 6).astype(int)
+    )
+    df_fe['Overall_Risk_Score'] = (
+        df_fe['Environmental_Risk'] * 0.25 + df_fe['Lifestyle_Risk'] * 0.30 +
+        df_fe['Genetic_Health_Risk'] * 0.20 + df_fe['Symptom_Severity'] * 0.25
+    )
+    df_fe['Smoking_Age_Interaction'] = df_fe['Smoking'] * df_fe['Age']
+    df_fe['Genetic_Age_Interaction'] = df_fe['Genetic Risk'] * df_fe['Age']
+    df_fe['Smoking_Pollution'] = df_fe['Smoking'] * df_fe['Air Pollution']
+    df_fe['Obesity_ChronicLung'] = df_fe['Obesity'] * df_fe['chronic Lung Disease']
+    df_fe['PassiveSmoker_Pollution'] = df_fe['Passive Smoker'] * df_fe['Air Pollution']
+    for feat in ['Smoking', 'Air Pollution', 'Genetic Risk']:
+        df_fe[f'{feat}_squared'] = df_fe[feat] ** 2
+    df_fe['Smoking_Level'] = pd.cut(df_fe['Smoking'], bins=[0, 2, 5, 10], labels=[0, 1, 2]).astype(int)
+    df_fe['Pollution_Level'] = pd.cut(df_fe['Air Pollution'], bins=[0, 3, 6, 10], labels=[0, 1, 2]).astype(int)
+    return df_fe
+
+
+# =============================================================================
+# BATCH KERNEL TESTS
+# =============================================================================
+
+class TestBatchKernel:
+    """Tests for the vectorized batch kernel"""
+
+    def test_all_engineered_features_created(self, raw_df):
+        """Test that every spec feature is created"""
+        df_fe = engineer_features(raw_df)
+        for feature in ENGINEERED_FEATURES:
+            assert feature in df_fe.columns
+
+    def test_final_features_covered(self):
+        """Test that FINAL_FEATURES are raw or engineered features"""
+        for feature in FINAL_FEATURES:
+            assert feature in ENGINEERED_FEATURES or feature in RAW_FEATURES
+
+    def test_parity_with_reference(self, raw_df):
+        """Test that batch kernel matches the original pipeline implementation"""
+        expected = reference_engineer_features(raw_df)
+        actual = engineer_features(raw_df)
+        for feature in ENGINEERED_FEATURES:
+            np.testing.assert_allclose(
+                actual[feature].to_numpy(dtype=float),
+                expected[feature].to_numpy(dtype=float),
+                rtol=0, atol=1e-12, err_msg=feature
+            )
+
+    def test_input_not_modified(self, raw_df):
+        """Test that the input DataFrame is not modified"""
+        columns = list(raw_df.columns)
+        engineer_features(raw_df)
+        assert list(raw_df.columns) == columns
+
+    def test_feature_matrix_shape(self, raw_df):
+        """Test model matrix shape and column order"""
+        X = build_feature_matrix(raw_df)
+        expected = reference_engineer_features(raw_df)[FINAL_FEATURES].to_numpy(dtype=float)
+        assert X.shape == (len(raw_df), len(FINAL_FEATURES))
+        np.testing.assert_allclose(X, expected, rtol=0, atol=1e-12)
+
+
+# =============================================================================
+# ROW KERNEL TESTS
+# =============================================================================
+
+class TestRowKernel:
+    """Tests for the single-row kernel"""
+
+    def test_row_matches_batch(self, raw_df):
+        """Test that row kernel matches batch kernel for every training row"""
+        X = build_feature_matrix(raw_df)
+        for i, record in enumerate(raw_df.to_dict('records')):
+            assert build_feature_vector(record) == X[i].tolist()
+
+    def test_engineer_row_keeps_raw_values(self, sample_patient_data):
+        """Test that raw values are preserved in the engineered record"""
+        row = engineer_row(sample_patient_data)
+        for key, value in sample_patient_data.items():
+            assert row[key] == value
+        for feature in ENGINEERED_FEATURES:
+            assert feature in row
+
+    def test_age_group_boundaries(self, sample_patient_data):
+        """Test right-closed bin edges (pd.cut semantics)"""
+        for age, group in [(14, 0), (25, 0), (26, 1), (40, 1), (41, 2), (55, 2), (56, 3), (100, 3)]:
+            record = dict(sample_patient_data, Age=age)
+            assert engineer_row(record)['Age_Group'] == group
+
+
+# =============================================================================
+# LOOKUP TABLE TESTS
+# =============================================================================
+
+ARITHMETIC_SPEC = compile_spec(ranges=None) if FEATURES_AVAILABLE else None
+
+
+def lower_rows(n):
+    """n rows with every input column at its FEATURE_RANGES minimum"""
+    lower = [FEATURE_RANGES[col][0] for col in COMPILED_SPEC.input_columns]
+    return np.tile(np.array(lower, dtype=np.int64), (n, 1))
+
+
+def sum_walk(terms):
+    """
+    Rows (for the term columns) reaching every integer sum of a linear feature
+
+    Her adımda bir bileşen bir artırılır/azaltılır (katsayılar ±1), en küçük
+    toplamdan en büyüğüne kadar tüm toplamlar sırayla görülür.
+    """
+    start = [FEATURE_RANGES[col][0] if coef > 0 else FEATURE_RANGES[col][1] for col, coef in terms.items()]
+    rows = [list(start)]
+    for k, (col, coef) in enumerate(terms.items()):
+        low, high = FEATURE_RANGES[col]
+        for _ in range(high - low):
+            rows.append(list(rows[-1]))
+            rows[-1][k] += 1 if coef > 0 else -1
+    return np.array(rows, dtype=np.int64)
+
+
+def assert_same(X):
+    """Tables, arithmetic batch kernel and row kernel agree bit for bit"""
+    assert COMPILED_SPEC.tables.index(X) is not None
+    expected = ARITHMETIC_SPEC.transform(X)
+    actual = COMPILED_SPEC.transform(X)
+    assert list(actual) == list(expected)
+    for name in expected:
+        assert actual[name].dtype == expected[name].dtype, name
+        assert np.array_equal(actual[name], expected[name]), name
+    for i in range(0, len(X), max(1, len(X) // 50)):
+        row = COMPILED_SPEC.transform_row([float(v) for v in X[i]])
+        assert [row[name] for name in expected] == [expected[name][i] for name in expected]
+
+
+class TestScoreTables:
+    """Tests that table lookups equal the arithmetic kernels over the whole domain"""
+
+    def test_linear_scores_every_sum(self):
+        """Test every table entry of each linear score (score depends only on the sum)"""
+        columns = COMPILED_SPEC.input_columns
+        for entry in (e for e in COMPILED_SPEC.spec if e['kind'] == 'linear'):
+            walk = sum_walk(entry['terms'])
+            X = lower_rows(len(walk))
+            X[:, [columns.index(col) for col in entry['terms']]] = walk
+            assert len(walk) == len(COMPILED_SPEC.tables.entries[entry['name']][0][1])
+            assert_same(X)
+
+    def test_overall_score_every_component_combination(self):
+        """Test Overall_Risk_Score for every combination of its component sums"""
+        columns = COMPILED_SPEC.input_columns
+        weighted = next(e for e in COMPILED_SPEC.spec if e['kind'] == 'weighted')
+        linear = {e['name']: e['terms'] for e in COMPILED_SPEC.spec if e['kind'] == 'linear'}
+        walks = [sum_walk(linear[name]) for name in weighted['terms']]
+        grid = np.indices([len(walk) for walk in walks]).reshape(len(walks), -1)
+        X = lower_rows(grid.shape[1])
+        for walk, steps, name in zip(walks, grid, weighted['terms']):
+            X[:, [columns.index(col) for col in linear[name]]] = walk[steps]
+        assert_same(X)
+
+    def test_count_and_bins_every_value(self):
+        """Test Critical_Symptom_Count and bin codes for every source combination"""
+        columns = COMPILED_SPEC.input_columns
+        for entry in COMPILED_SPEC.spec:
+            sources = entry.get('sources', [entry.get('source')])
+            if entry['kind'] not in ('count_ge', 'bin'):
+                continue
+            spans = [FEATURE_RANGES[col][1] - FEATURE_RANGES[col][0] + 1 for col in sources]
+            grid = np.indices(spans).reshape(len(sources), -1)
+            X = lower_rows(grid.shape[1])
+            for col, values in zip(sources, grid):
+                X[:, columns.index(col)] = values + FEATURE_RANGES[col][0]
+            assert_same(X)
+
+    def test_random_domain_rows(self):
+        """Test all features on random rows across the full domain"""
+        rng = np.random.default_rng(0)
+        X = np.column_stack([
+            rng.integers(*FEATURE_RANGES[col], size=20000, endpoint=True) for col in COMPILED_SPEC.input_columns
+        ])
+        assert_same(X)
+
+    def test_out_of_domain_falls_back(self, raw_df):
+        """Test that values outside FEATURE_RANGES and float input use arithmetic"""
+        df = raw_df.head(20).copy()
+        df.loc[0, 'Air Pollution'] = 12
+        X = df[COMPILED_SPEC.input_columns].to_numpy()
+        assert COMPILED_SPEC.tables.index(X) is None
+        actual = engineer_features(df)
+        assert actual['Environmental_Risk'].iloc[0] == (12 + df['Dust Allergy'].iloc[0] +
+                                                        df['OccuPational Hazards'].iloc[0]) / 3
+        fractional = engineer_features(df[RAW_FEATURES].astype(float).assign(Smoking=2.5))
+        assert fractional['Lifestyle_Risk'].iloc[1] == pytest.approx(
+            (2.5 + df['Alcohol use'].iloc[1] + df['Obesity'].iloc[1] + 10 - df['Balanced Diet'].iloc[1]) / 4)
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,129 @@
+"""
+Unit Tests for Feedback Module
+==============================
+Tests for prediction ids and the append-only label log (geç gelen tanı testleri)
+"""
+
+import pytest
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from feedback import entry_id, attach_label, read_label_events, load_labels
+    FEEDBACK_AVAILABLE = True
+except ImportError:
+    FEEDBACK_AVAILABLE = False
+    pytest.skip("Feedback module not available", allow_module_level=True)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    """Prediction log with one new-style and one legacy (id-less) entry"""
+    path = tmp_path / 'predictions.json'
+    path.write_text(json.dumps([
+        {'id': 'abc', 'timestamp': '2026-01-01T10:00:00', 'input': {'Age': 40}, 'prediction': 'Low'},
+        {'timestamp': '2026-01-01T11:00:00', 'input': {'Age': 50}, 'prediction': 'High'},
+    ]))
+    return path
+
+
+# =============================================================================
+# ID TESTS
+# =============================================================================
+
+class TestEntryId:
+    """Tests for prediction ids"""
+
+    def test_explicit_id(self):
+        """Test that the logged id is used as is"""
+        assert entry_id({'id': 'abc', 'input': {}}) == 'abc'
+
+    def test_legacy_id_is_stable(self, log_path):
+        """Test that id-less entries get a content hash that survives re-reading"""
+        first = entry_id(json.loads(log_path.read_text())[1])
+        assert first == entry_id(json.loads(log_path.read_text())[1])
+        assert len(first) == 32
+
+
+# =============================================================================
+# LABEL LOG TESTS
+# =============================================================================
+
+class TestLabelLog:
+    """Tests for attaching and reading labels"""
+
+    def test_attach_and_load(self, tmp_path, log_path):
+        """Test that labels are appended with the logged prediction, latest wins"""
+        labels = tmp_path / 'labels.jsonl'
+        legacy = entry_id(json.loads(log_path.read_text())[1])
+        event = attach_label('abc', 'Medium', log_path, labels, now=datetime(2026, 2, 1))
+        assert event == {'id': 'abc', 'label': 'Medium', 'prediction': 'Low',
+                        'timestamp': '2026-02-01T00:00:00'}
+        attach_label(legacy, 'High', log_path, labels)
+        attach_label('abc', 'Low', log_path, labels)
+        assert load_labels(labels) == {'abc': 'Low', legacy: 'High'}
+
+    def test_unknown_id_and_label_rejected(self, tmp_path, log_path):
+        """Test that unknown prediction ids and levels are refused"""
+        labels = tmp_path / 'labels.jsonl'
+        with pytest.raises(KeyError):
+            attach_label('missing', 'Low', log_path, labels)
+        with pytest.raises(ValueError):
+            attach_label('abc', 'Severe', log_path, labels)
+        assert not labels.exists()
+
+    def test_read_from_offset_skips_partial_line(self, tmp_path, log_path):
+        """Test that only complete lines after the offset are returned"""
+        labels = tmp_path / 'labels.jsonl'
+        attach_label('abc', 'Medium', log_path, labels)
+        events, offset, reset = read_label_events(labels)
+        assert [e['label'] for e in events] == ['Medium'] and not reset
+
+        with open(labels, 'a') as f:
+            f.write('{"id": "abc", "lab')
+        assert read_label_events(labels, offset)[:2] == ([], offset)
+
+        labels.write_text('')
+        assert read_label_events(labels, offset) == ([], 0, True)
+
+
+# =============================================================================
+# API TESTS
+# =============================================================================
+
+class TestFeedbackEndpoint:
+    """Tests for logging served predictions and labelling them through the API"""
+
+    def test_served_prediction_can_be_labelled(self, api_log_dir):
+        """Test that /predict logs its prediction_id and /feedback attaches a label to it"""
+        TestClient = pytest.importorskip('fastapi.testclient').TestClient
+        import app_old
+        from features import FEATURE_RANGES
+        payload = {field: FEATURE_RANGES[name][1] for name, field in app_old.API_FIELD_NAMES.items()}
+        with TestClient(app_old.app) as client:
+            first = client.post("/predict", json=payload).json()
+            second = client.post("/predict", json=payload).json()
+            batch = client.post("/predict/batch", json={"patients": [payload]}).json()
+            labelled = client.post("/feedback", json={"prediction_id": first['prediction_id'], "label": "High"})
+            unknown = client.post("/feedback", json={"prediction_id": "missing", "label": "High"})
+
+        ids = [first['prediction_id'], second['prediction_id'], batch['predictions'][0]['prediction_id']]
+        assert len(set(ids)) == 3
+        logged = json.loads((api_log_dir / 'predictions.json').read_text())
+        assert [entry['id'] for entry in logged[-3:]] == ids
+        assert logged[-3]['prediction'] == first['prediction']
+        assert labelled.status_code == 200 and unknown.status_code == 404
+        assert load_labels(api_log_dir / 'labels.jsonl')[first['prediction_id']] == 'High'
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,104 @@
+"""
+Unit Tests for Interpretation Module
+====================================
+Tests for permutation importance and partial-dependence tables (global yorumlama testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from interpretation import (
+        feature_grid, permutation_importance, partial_dependence, build_tables, InterpretationTables
+    )
+    from features import RAW_FEATURES, FEATURE_RANGES
+    INTERPRETATION_AVAILABLE = True
+except ImportError:
+    INTERPRETATION_AVAILABLE = False
+    pytest.skip("Interpretation module not available", allow_module_level=True)
+
+CLASSES = np.array(['High', 'Low'])
+
+
+def smoking_model(raw):
+    """P(High) rises linearly with Smoking; every other feature is ignored"""
+    p_high = (raw['Smoking'].to_numpy() - 1) / 7
+    return np.column_stack([p_high, 1 - p_high])
+
+
+@pytest.fixture
+def raw():
+    """Random patients within FEATURE_RANGES"""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        name: rng.integers(*FEATURE_RANGES[name], size=300, endpoint=True) for name in RAW_FEATURES
+    })
+
+
+@pytest.fixture
+def tables(raw):
+    labels = CLASSES[smoking_model(raw).argmax(axis=1)]
+    return build_tables(smoking_model, CLASSES, raw, labels, raw,
+                        config={'n_repeats': 2, 'n_pair_features': 2}, n_jobs=2)
+
+
+class TestGrid:
+    """Tests for bounded integer grids"""
+
+    def test_small_range_uses_every_value(self):
+        """Test that short ranges are not subsampled"""
+        assert feature_grid('Smoking').tolist() == list(range(1, 9))
+
+    def test_wide_range_is_capped(self):
+        """Test that Age is reduced to at most grid_resolution points"""
+        grid = feature_grid('Age', resolution=10)
+        assert len(grid) <= 10 and grid[0] == 14 and grid[-1] == 100
+
+
+class TestTables:
+    """Tests for importance, partial dependence and lookups"""
+
+    def test_importance_finds_only_used_feature(self, tables):
+        """Test that only Smoking has a positive accuracy drop"""
+        importance = tables.importance.set_index('feature')['importance_mean']
+        assert importance.idxmax() == 'Smoking' and importance['Smoking'] > 0.1
+        assert (importance.drop('Smoking') == 0).all()
+
+    def test_partial_dependence_recovers_model(self, raw):
+        """Test one- and two-way PDP on a model with a known shape"""
+        (grid,), values = partial_dependence(smoking_model, raw, ['Smoking'])
+        assert np.allclose(values[:, 0], (grid - 1) / 7)
+        (grid_a, grid_b), values = partial_dependence(smoking_model, raw, ['Smoking', 'Age'], resolution=5)
+        assert values.shape == (len(grid_a), len(grid_b), 2)
+        assert np.allclose(values[:, 0, 0], values[:, -1, 0])
+
+    def test_lookups_and_effects(self, tables):
+        """Test O(1) lookups and effect signs"""
+        assert tables.pdp('Smoking', 8)[0] == pytest.approx(1.0)
+        other = tables.importance['feature'][1]
+        assert tables.pdp_pair(other, 'Smoking', FEATURE_RANGES[other][1], 1)[0] == pytest.approx(0.0)
+        patient = {name: FEATURE_RANGES[name][0] for name in RAW_FEATURES}
+        effects = tables.effects(dict(patient, Smoking=8), 'High')
+        assert effects['Smoking'] == pytest.approx(0.5)
+        assert effects['Age'] == pytest.approx(0.0)
+
+    def test_save_load(self, tables, tmp_path):
+        """Test that tables and CSV exports are written"""
+        path = tmp_path / 'interpretation.pkl'
+        tables.save(path)
+        loaded = InterpretationTables.load(path)
+        assert loaded.pdp('Smoking', 4).tolist() == tables.pdp('Smoking', 4).tolist()
+        assert (tmp_path / 'permutation_importance.csv').exists()
+        assert len(pd.read_csv(tmp_path / 'partial_dependence.csv')) == sum(
+            len(grid) for grid, _ in tables.pdp1.values())
+        assert InterpretationTables.load(tmp_path / 'missing.pkl') is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,131 @@
+"""
+Integration Tests for Pipeline Module
+=====================================
+End-to-end MLPipeline run with tune / compact / interpret / quantize stages and the
+stage cache (uçtan uca pipeline testleri)
+"""
+
+import pytest
+import json
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
+
+try:
+    import pipeline
+    import tuning
+    from pipeline import MLPipeline
+    from artifacts import verify_bundle
+    PIPELINE_AVAILABLE = True
+except ImportError:
+    PIPELINE_AVAILABLE = False
+    pytest.skip("Pipeline module not available", allow_module_level=True)
+
+
+@pytest.fixture
+def fast_pipeline(tmp_path, monkeypatch):
+    """Small forests and search space; every output (cache, tuned params, artifacts) in tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pipeline, 'MODEL_PARAMS', dict(pipeline.MODEL_PARAMS, n_estimators=20, max_depth=6, n_jobs=1))
+    monkeypatch.setattr(pipeline, 'TUNED_PARAMS_PATH', tmp_path / 'tuned_params.json')
+    monkeypatch.setattr(pipeline, 'TUNING_CHECKPOINT_PATH', tmp_path / 'trials.jsonl')
+    monkeypatch.setattr(tuning, 'TUNING_SEARCH_SPACE', {'n_estimators': [12, 16], 'max_depth': [4, 8]})
+    monkeypatch.setattr(tuning, 'TUNING_CONFIG', dict(tuning.TUNING_CONFIG, n_candidates=4, eta=2,
+                                                    min_fraction=0.5, min_trees=5))
+
+    def make(**kwargs):
+        return MLPipeline(str(DATA_PATH), cache_dir=tmp_path / 'cache', **kwargs)
+    return make
+
+
+# =============================================================================
+# END-TO-END TESTS
+# =============================================================================
+
+@pytest.mark.integration
+class TestPipelineRun:
+    """Tests for a full run and a cached rerun"""
+
+    def test_all_stages_then_cached_rerun(self, fast_pipeline, tmp_path):
+        """Test that every optional stage saves its artifact and a rerun is served from the cache"""
+        first = fast_pipeline().run(tune=True, compact=True, interpret=True, quantize=True)
+        assert first.cache.hits == 0
+
+        tuned = json.loads((tmp_path / 'tuned_params.json').read_text())['best_params']
+        assert set(tuned) == {'n_estimators', 'max_depth'}
+        assert first.model.n_estimators == tuned['n_estimators']
+        assert first.compaction_results['chosen'] in {row['candidate'] for row in first.compaction_results['report']}
+        # Referans eğitilen modelin kendisi; kabul eğitimde görülmemiş satırlarda ölçülür
+        reference = next(row for row in first.compaction_results['report'] if row['candidate'] == 'reference')
+        assert reference['n_trees'] == len(first.model.estimators_)
+        _, X_val, _, y_val = first._compaction_split()
+        assert first.compaction_results['reference_val_accuracy'] == first.model.score(X_val, y_val)
+
+        models = tmp_path / 'models'
+        for name in ('final_model.pkl', 'compact_model.pkl', 'interpretation.pkl',
+                    'quantized_model.npz', 'manifest.json'):
+            assert (models / name).exists(), name
+        assert set(verify_bundle(models).values()) == {'ok'}
+
+        # Ayarlanmış parametreler yeniden okunur -> aynı train_model anahtarı, STAGE 1 & 2 atlanır
+        second = fast_pipeline().run(compact=True)
+        assert second.model_params == first.model_params
+        assert second.df is None and second.cache.hits == 2
+        assert second.results['test_accuracy'] == first.results['test_accuracy']
+
+        # Ayrılmış doğrulama kümesi olmadan model tüm train satırlarıyla yeniden eğitilir
+        third = fast_pipeline().run()
+        assert (third.cache.hits, third.cache.misses) == (1, 1)
+        with pytest.raises(ValueError):
+            third.compact()
+
+    def test_use_tuned_params_false(self, fast_pipeline, tmp_path):
+        """Test that saved tuned parameters are ignored when use_tuned_params=False"""
+        (tmp_path / 'tuned_params.json').write_text(json.dumps({'best_params': {'n_estimators': 7}}))
+        assert fast_pipeline().model_params['n_estimators'] == 7
+        assert fast_pipeline(use_tuned_params=False).model_params['n_estimators'] == 20
+
+    def test_model_params_change_only_retrains(self, fast_pipeline, monkeypatch):
+        """Test that a MODEL_PARAMS change misses only train_model"""
+        fast_pipeline().run()
+        monkeypatch.setattr(pipeline, 'MODEL_PARAMS', dict(pipeline.MODEL_PARAMS, n_estimators=12))
+        second = fast_pipeline().run()
+        assert second.model.n_estimators == 12
+        assert second.df is None and (second.cache.hits, second.cache.misses) == (1, 1)
+
+
+class TestStageKeys:
+    """Tests for the config values each stage key depends on"""
+
+    STAGES = ['load_data', 'engineer_features', 'prepare_data', 'train_model']
+
+    def keys(self, fast_pipeline):
+        made = fast_pipeline()
+        return {stage: made._stage_key(stage) for stage in self.STAGES}
+
+    @pytest.mark.parametrize('name, value, first_changed', [
+        ('MODEL_PARAMS', {'n_estimators': 12}, 'train_model'),
+        ('TEST_SIZE', 0.3, 'prepare_data'),
+        ('FEATURE_RANGES', {'Age': (18, 100)}, 'load_data'),
+    ])
+    def test_config_change_invalidates_from_reading_stage(self, fast_pipeline, monkeypatch,
+                                                        name, value, first_changed):
+        """Test that a config value only changes the key of the stage reading it and its dependents"""
+        before = self.keys(fast_pipeline)
+        current = getattr(pipeline, name)
+        monkeypatch.setattr(pipeline, name, dict(current, **value) if isinstance(value, dict) else value)
+        after = self.keys(fast_pipeline)
+        changed = [stage for stage in self.STAGES if before[stage] != after[stage]]
+        assert changed == self.STAGES[self.STAGES.index(first_changed):]
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,109 @@
+"""
+Unit Tests for Quantization Module
+==================================
+Tests for the integer-grid quantized forest (kuantize model testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    from quantization import QuantizedForest, FeatureKeys, parity_report, forest_nbytes
+    from inference import LungCancerPredictor
+    from features import RAW_FEATURES, FEATURE_RANGES, build_feature_matrix
+    from sharded_scoring import random_patients
+    QUANTIZATION_AVAILABLE = True
+except ImportError:
+    QUANTIZATION_AVAILABLE = False
+    pytest.skip("Quantization module not available", allow_module_level=True)
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    return LungCancerPredictor()
+
+
+@pytest.fixture(scope='module')
+def quantized(predictor):
+    return QuantizedForest.from_model(predictor.model, predictor.scaler, predictor.feature_names)
+
+
+@pytest.fixture(scope='module')
+def raw():
+    return random_patients(3000, seed=1)
+
+
+class TestFeatureKeys:
+    """Tests for integer keys of engineered features"""
+
+    def test_keys_are_scaled_features(self, predictor, raw):
+        """Test that every key is the float feature times an integer constant"""
+        names = predictor.feature_names
+        keys = FeatureKeys(names).transform(raw)
+        X = build_feature_matrix(pd.DataFrame(raw, columns=RAW_FEATURES), names)
+        multipliers = {'Overall_Risk_Score': 840, 'Environmental_Risk': 3, 'Lifestyle_Risk': 4,
+                    'Genetic_Health_Risk': 2, 'Symptom_Severity': 7, 'Respiratory_Score': 4}
+        for j, name in enumerate(names):
+            np.testing.assert_allclose(keys[:, j], X[:, j] * multipliers.get(name, 1), rtol=0, atol=1e-9)
+
+    def test_domain_covers_rows(self, predictor, raw):
+        """Test that observed keys are inside the enumerated domain"""
+        feature_keys = FeatureKeys(predictor.feature_names)
+        keys = feature_keys.transform(raw)
+        for j in range(keys.shape[1]):
+            assert np.isin(keys[:, j], feature_keys.domain(j)[0]).all()
+
+
+class TestQuantizedForest:
+    """Tests for parity, footprint and persistence"""
+
+    def test_parity_with_float_model(self, predictor, quantized, raw):
+        """Test that every tree reaches the same leaf and labels agree"""
+        parity = parity_report(quantized, predictor.model, predictor.scaler, predictor.feature_names, raw)
+        assert parity['leaf_agreement'] == 1.0
+        assert parity['label_agreement'] == 1.0
+        assert parity['max_abs_probability_error'] <= 1 / 65535
+
+    def test_dtypes_and_footprint(self, predictor, quantized):
+        """Test small integer storage and size reduction"""
+        assert quantized.left.dtype == np.int16 and quantized.threshold.dtype == np.int16
+        assert quantized.feature.dtype == np.uint8 and quantized.value.dtype == np.uint16
+        assert quantized.nbytes * 5 < forest_nbytes(predictor.model)
+
+    def test_uint8_probabilities(self):
+        """Test uint8 leaves on a forest with impure leaves"""
+        raw = random_patients(2000, seed=2)
+        names = ['Smoking', 'Age', 'Overall_Risk_Score', 'Critical_Symptom_Count']
+        X = build_feature_matrix(pd.DataFrame(raw, columns=RAW_FEATURES), names)
+        y = (X[:, 2] + np.random.default_rng(0).normal(0, 0.5, len(X)) > 5).astype(int)
+        scaler = StandardScaler().fit(X)
+        model = RandomForestClassifier(n_estimators=10, min_samples_leaf=20, random_state=0).fit(
+            scaler.transform(X), y)
+        quantized = QuantizedForest.from_model(model, scaler, names, probability_dtype='uint8')
+        parity = parity_report(quantized, model, scaler, names, raw)
+        assert parity['leaf_agreement'] == 1.0
+        assert 0 < parity['max_abs_probability_error'] <= 1 / 255
+
+    def test_save_load_and_domain(self, quantized, raw, tmp_path):
+        """Test .npz round trip and rejection of out-of-range input"""
+        path = tmp_path / 'quantized.npz'
+        quantized.save(path)
+        loaded = QuantizedForest.load(path)
+        assert np.array_equal(loaded.predict_proba(raw[:100]), quantized.predict_proba(raw[:100]))
+        assert QuantizedForest.load(tmp_path / 'missing.npz') is None
+        bad = raw[:1].copy()
+        bad[0, RAW_FEATURES.index('Age')] = FEATURE_RANGES['Age'][1] + 1
+        with pytest.raises(ValueError):
+            quantized.predict_proba(bad)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
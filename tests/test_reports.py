@@ -0,0 +1,142 @@
+"""
+Unit Tests for Reports Module
+=============================
+Tests for template-based PDF rendering, content-hash cache and /report endpoints (rapor testleri)
+"""
+
+import pytest
+import io
+import zipfile
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    import reports
+    from reports import render_pdf, generate_report, render_reports, report_key, REPORT_TEMPLATE
+    from stage_cache import StageCache
+    REPORTS_AVAILABLE = True
+except ImportError:
+    REPORTS_AVAILABLE = False
+    pytest.skip("Reports module not available", allow_module_level=True)
+
+
+RESULT = {'risk_level': 'High', 'confidence': 0.93,
+        'probability': {'High': 0.93, 'Low': 0.07}, 'prediction': 'High'}
+INPUT = {'Age': 55, 'Smoking': 7, 'Air Pollution': 6}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Report cache in a temporary directory (also used as the module default)"""
+    cache = StageCache(tmp_path / 'reports')
+    monkeypatch.setattr(reports, '_default_cache', cache)
+    return cache
+
+
+# =============================================================================
+# RENDERING TESTS
+# =============================================================================
+
+class TestRenderPdf:
+    """Tests for the template renderer"""
+
+    def test_pdf_document(self):
+        """Test that the renderer returns a PDF document"""
+        pdf = render_pdf(RESULT, INPUT)
+        assert pdf.startswith(b'%PDF') and pdf.rstrip().endswith(b'%%EOF')
+
+    def test_long_input_adds_pages(self):
+        """Test that overflowing content continues on a new page"""
+        long_input = {f"Field {i}": i for i in range(80)}
+        assert render_pdf(RESULT, long_input).count(b'/Type /Page\n') > \
+            render_pdf(RESULT, INPUT).count(b'/Type /Page\n')
+
+    def test_key_depends_on_content_and_template(self):
+        """Test that the cache key tracks content and template, not unrelated fields"""
+        key = report_key(RESULT, INPUT)
+        assert key == report_key(dict(RESULT, input_data=INPUT), INPUT)
+        assert key != report_key(dict(RESULT, confidence=0.5), INPUT)
+        assert key != report_key(RESULT, INPUT, REPORT_TEMPLATE[:3])
+
+
+# =============================================================================
+# CACHE TESTS
+# =============================================================================
+
+class TestReportCache:
+    """Tests for cached and parallel generation"""
+
+    def test_cache_hit_skips_rendering(self, cache, monkeypatch):
+        """Test that a repeated report is served from the cache"""
+        first = generate_report(RESULT, INPUT)
+        monkeypatch.setattr(reports, 'render_pdf', lambda *a: pytest.fail("rendered twice"))
+        assert generate_report(RESULT, INPUT) == first
+        assert cache.hits == 1
+
+    def test_parallel_matches_sequential(self, cache):
+        """Test that pooled rendering returns reports in input order"""
+        items = [(dict(RESULT, confidence=0.5 + i / 100), dict(INPUT, Age=20 + i)) for i in range(6)]
+        parallel = render_reports(items, max_workers=2)
+        assert parallel == [render_pdf(r, d) for r, d in items]
+        assert len(cache.entries()) == 6
+
+
+# =============================================================================
+# API TESTS
+# =============================================================================
+
+@pytest.fixture
+def client(cache, api_log_dir):
+    """API test client with startup events (loads the report predictor)"""
+    from fastapi.testclient import TestClient
+    from app_old import app
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def payload():
+    """Valid PatientData payload"""
+    return {
+        "Age": 55, "Gender": 1, "Air_Pollution": 7, "Alcohol_use": 6, "Dust_Allergy": 5,
+        "OccuPational_Hazards": 6, "Genetic_Risk": 5, "chronic_Lung_Disease": 4,
+        "Balanced_Diet": 3, "Obesity": 6, "Smoking": 7, "Passive_Smoker": 5, "Chest_Pain": 7,
+        "Coughing_of_Blood": 6, "Fatigue": 7, "Weight_Loss": 5, "Shortness_of_Breath": 8,
+        "Wheezing": 6, "Swallowing_Difficulty": 4, "Clubbing_of_Finger_Nails": 3,
+        "Frequent_Cold": 4, "Dry_Cough": 5, "Snoring": 3
+    }
+
+
+class TestReportEndpoints:
+    """Tests for /report and /report/batch"""
+
+    def test_report(self, client, payload):
+        """Test that /report returns a PDF"""
+        response = client.post("/report", json=payload)
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/pdf'
+        assert response.content.startswith(b'%PDF')
+
+    def test_batch_report(self, client, payload):
+        """Test that /report/batch returns one PDF per patient"""
+        patients = [dict(payload, Age=30 + i) for i in range(3)]
+        response = client.post("/report/batch", json={"patients": patients})
+        assert response.status_code == 200
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        assert names == ['report_0001.pdf', 'report_0002.pdf', 'report_0003.pdf']
+
+    def test_report_pool_spawns(self, client):
+        """Test that report workers are spawned, not forked from the threaded API process"""
+        from app_old import get_report_pool
+        assert get_report_pool()._mp_context.get_start_method() == 'spawn'
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
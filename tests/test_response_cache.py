@@ -0,0 +1,131 @@
+"""
+Unit Tests for Response Cache Module
+====================================
+Tests for the request-level LRU + TTL cache (yanıt cache testleri)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from response_cache import ResponseCache, payload_key, build_response_cache
+    RESPONSE_CACHE_AVAILABLE = True
+except ImportError:
+    RESPONSE_CACHE_AVAILABLE = False
+    pytest.skip("Response cache module not available", allow_module_level=True)
+
+
+class FakeClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestPayloadKey:
+    """Tests for canonical payload hashing"""
+
+    def test_canonical(self):
+        """Test that field order and 2 vs 2.0 do not change the key"""
+        assert payload_key({'Age': 40, 'Smoking': 2}, 'v1') == payload_key({'Smoking': 2.0, 'Age': 40}, 'v1')
+        assert payload_key({'Age': 40}, 'v1') != payload_key({'Age': 41}, 'v1')
+
+    def test_model_version_and_namespace(self):
+        """Test that the model version and endpoint are part of the key"""
+        assert payload_key({'Age': 40}, 'v1') != payload_key({'Age': 40}, 'v2')
+        assert payload_key({'Age': 40}, 'v1') != payload_key({'Age': 40}, 'v1', namespace='report')
+
+
+class TestResponseCache:
+    """Tests for TTL, LRU, invalidation and the disk tier"""
+
+    def test_ttl(self, clock):
+        """Test that entries expire after ttl_seconds"""
+        cache = ResponseCache(max_entries=10, ttl_seconds=60, clock=clock)
+        cache.put('a', {'prediction': 'High'})
+        clock.now += 59
+        assert cache.get('a') == {'prediction': 'High'}
+        clock.now += 2
+        assert cache.get('a') is None
+        assert cache.metrics()['expirations'] == 1
+
+    def test_zero_ttl_is_not_default(self, clock):
+        """Test that ttl_seconds=0 is kept (nothing is served from cache)"""
+        cache = ResponseCache(max_entries=10, ttl_seconds=0, clock=clock)
+        cache.put('a', 1)
+        assert cache.ttl_seconds == 0 and cache.get('a') is None
+
+    def test_lru_eviction(self, clock):
+        """Test that the least recently used entry is evicted"""
+        cache = ResponseCache(max_entries=2, ttl_seconds=60, clock=clock)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert cache.get('b') is None and cache.get('a') == 1
+        metrics = cache.metrics()
+        assert metrics['evictions'] == 1
+        assert metrics['hit_ratio'] == pytest.approx(2 / 3)
+
+    def test_invalidation_on_model_change(self, clock):
+        """Test that a new model version empties the memory tier"""
+        cache = ResponseCache(max_entries=10, ttl_seconds=60, clock=clock)
+        assert cache.ensure_version('v1')
+        cache.put('a', 1)
+        assert not cache.ensure_version('v1') and cache.get('a') == 1
+        assert cache.ensure_version('v2') and cache.get('a') is None
+        assert cache.metrics()['invalidations'] == 1
+
+    def test_disk_tier_shared(self, clock, tmp_path):
+        """Test that a second worker reads entries written by the first"""
+        first = ResponseCache(max_entries=10, ttl_seconds=60, disk_dir=tmp_path, clock=clock)
+        second = ResponseCache(max_entries=10, ttl_seconds=60, disk_dir=tmp_path, clock=clock)
+        first.put('a', {'prediction': 'Low'})
+        assert second.get('a') == {'prediction': 'Low'}
+        assert second.get('a') == {'prediction': 'Low'}
+        assert second.metrics()['disk_hits'] == 1 and second.metrics()['memory_hits'] == 1
+        clock.now += 61
+        third = ResponseCache(max_entries=10, ttl_seconds=60, disk_dir=tmp_path, clock=clock)
+        assert third.get('a') is None
+
+    def test_disabled(self):
+        """Test that the cache can be switched off in config"""
+        assert build_response_cache({'enabled': False}) is None
+
+
+class TestPredictEndpoint:
+    """Tests for the cache in front of /predict"""
+
+    def test_hit_after_miss_and_miss_after_model_change(self, monkeypatch, api_log_dir):
+        """Test X-Cache MISS -> HIT for a repeated payload and MISS once the model version changes"""
+        TestClient = pytest.importorskip('fastapi.testclient').TestClient
+        import app_old
+        from features import FEATURE_RANGES
+        payload = {field: FEATURE_RANGES[name][0] for name, field in app_old.API_FIELD_NAMES.items()}
+        with TestClient(app_old.app) as client:
+            monkeypatch.setattr(app_old, 'response_cache', ResponseCache(max_entries=10, ttl_seconds=60))
+            first = client.post("/predict", json=payload)
+            second = client.post("/predict", json=payload)
+            monkeypatch.setattr(app_old.raw_predictor, 'version', 'retrained')
+            third = client.post("/predict", json=payload)
+            metrics = client.get("/cache/metrics").json()
+        assert [r.status_code for r in (first, second, third)] == [200, 200, 200]
+        assert [r.headers["X-Cache"] for r in (first, second, third)] == ["MISS", "HIT", "MISS"]
+        assert second.json()['probabilities'] == first.json()['probabilities']
+        assert metrics['invalidations'] == 1 and metrics['model_version'] == 'retrained'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
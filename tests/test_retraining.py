@@ -0,0 +1,209 @@
+"""
+Unit Tests for Retraining Module
+================================
+Tests for warm-start updates and retraining triggers (artımlı yeniden eğitim testleri)
+"""
+
+import pytest
+import json
+import pickle
+import numpy as np
+import pandas as pd
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw' / 'cancer-patient-data-sets.csv'
+
+try:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    from retraining import (check_triggers, warm_start_update, labelled_records,
+                            incremental_retrain, load_state)
+    from feedback import attach_label
+    from config import RAW_DATA_PATH
+    from data_loader import load_raw_data, TARGET_COLUMN
+    from features import RAW_FEATURES, ENGINEERED_FEATURES, build_feature_matrix
+    RETRAINING_AVAILABLE = True
+except ImportError:
+    RETRAINING_AVAILABLE = False
+    pytest.skip("Retraining module not available", allow_module_level=True)
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    """Deployed-style artifacts trained on part of the data, plus a labelled log"""
+    df = load_raw_data(DATA_PATH)
+    train, fresh = df.iloc[:600], df.iloc[600:700]
+    X = pd.DataFrame(build_feature_matrix(train, ENGINEERED_FEATURES), columns=ENGINEERED_FEATURES)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=20, max_depth=5, random_state=0)
+    model.fit(scaler.transform(X), train[TARGET_COLUMN].astype(str))
+
+    paths = {name: tmp_path / name for name in ('model.pkl', 'scaler.pkl', 'features.txt',
+                                               'log.json', 'labels.jsonl', 'state.json')}
+    with open(paths['model.pkl'], 'wb') as f:
+        pickle.dump(model, f)
+    with open(paths['scaler.pkl'], 'wb') as f:
+        pickle.dump(scaler, f)
+    paths['features.txt'].write_text('\n'.join(ENGINEERED_FEATURES) + '\n')
+
+    entries = [{'id': f"p{i}", 'input': {k: int(row[k]) for k in RAW_FEATURES}, 'prediction': 'Low',
+                'label': str(row[TARGET_COLUMN])} for i, (_, row) in enumerate(fresh.iterrows())]
+    entries.append({'id': 'unlabelled', 'input': entries[0]['input'], 'prediction': 'Low'})  # etiketsiz
+    paths['log.json'].write_text(json.dumps(entries))
+    return paths
+
+
+def run(paths, data_path=DATA_PATH, **kwargs):
+    """incremental_retrain against the temporary artifacts"""
+    return incremental_retrain(
+        log_path=paths['log.json'], label_path=paths['labels.jsonl'], data_path=data_path, model_path=paths['model.pkl'],
+        scaler_path=paths['scaler.pkl'], feature_path=paths['features.txt'],
+        state_path=paths['state.json'], **kwargs
+    )
+
+
+# =============================================================================
+# TRIGGER TESTS
+# =============================================================================
+
+class TestTriggers:
+    """Tests for count- and time-based triggers"""
+
+    def test_sample_count(self):
+        """Test that the sample count trigger fires at the threshold"""
+        state = {'last_retrain': datetime.now().isoformat()}
+        assert check_triggers(state, 999) == []
+        assert check_triggers(state, 1000) == ['sample_count']
+
+    def test_time_based(self):
+        """Test that the time trigger fires after the configured days"""
+        state = {'last_retrain': (datetime.now() - timedelta(days=91)).isoformat()}
+        assert check_triggers(state, 0) == ['time_based']
+
+    def test_unlabelled_entries_skipped(self, artifacts):
+        """Test that only labelled entries become training records"""
+        entries = json.loads(artifacts['log.json'].read_text())
+        records = labelled_records(entries)
+        assert len(records) == len(entries) - 1 and 'unlabelled' not in records.index
+        assert len(labelled_records(entries, consumed=[e['id'] for e in entries])) == 0
+
+    def test_label_log_overrides_inline_label(self, artifacts):
+        """Test that a late label is used, and corrects an inline one"""
+        entries = json.loads(artifacts['log.json'].read_text())
+        records = labelled_records(entries, labels={'unlabelled': 'High', 'p0': 'Medium'})
+        assert records.loc['unlabelled', TARGET_COLUMN] == 'High'
+        assert records.loc['p0', TARGET_COLUMN] == 'Medium'
+
+
+# =============================================================================
+# WARM-START TESTS
+# =============================================================================
+
+class TestWarmStart:
+    """Tests for growing the forest"""
+
+    def test_old_trees_kept(self, artifacts):
+        """Test that existing trees are reused and new ones appended"""
+        with open(artifacts['model.pkl'], 'rb') as f:
+            model = pickle.load(f)
+        old_trees = list(model.estimators_)
+        X = np.random.default_rng(0).normal(size=(60, len(ENGINEERED_FEATURES)))
+        y = np.array(['High', 'Low', 'Medium'] * 20)
+        warm_start_update(model, X, y, n_new_trees=5)
+        assert len(model.estimators_) == 25
+        assert all(a is b for a, b in zip(old_trees, model.estimators_[:20]))
+
+    def test_max_trees_drops_oldest(self, artifacts):
+        """Test that the forest is capped by dropping the oldest trees"""
+        with open(artifacts['model.pkl'], 'rb') as f:
+            model = pickle.load(f)
+        X = np.random.default_rng(0).normal(size=(60, len(ENGINEERED_FEATURES)))
+        y = np.array(['High', 'Low', 'Medium'] * 20)
+        warm_start_update(model, X, y, n_new_trees=10, max_trees=15)
+        assert len(model.estimators_) == model.n_estimators == 15
+
+    def test_missing_class_rejected(self, artifacts):
+        """Test that update data without every class is rejected"""
+        with open(artifacts['model.pkl'], 'rb') as f:
+            model = pickle.load(f)
+        with pytest.raises(ValueError):
+            warm_start_update(model, np.zeros((4, len(ENGINEERED_FEATURES))), ['Low'] * 4, 5)
+
+
+# =============================================================================
+# END-TO-END TESTS
+# =============================================================================
+
+class TestIncrementalRetrain:
+    """Tests for trigger-gated updates and state tracking"""
+
+    def test_no_trigger_no_update(self, artifacts):
+        """Test that nothing changes while thresholds are not crossed"""
+        before = artifacts['model.pkl'].read_bytes()
+        summary = run(artifacts)
+        assert not summary['retrained'] and summary['triggers'] == []
+        assert artifacts['model.pkl'].read_bytes() == before
+
+    def test_trigger_updates_and_advances_offset(self, artifacts):
+        """Test that a fired trigger grows the model and consumes the log"""
+        summary = run(artifacts, triggers={'sample_count': 50}, config={'trees_per_update': 7})
+        assert summary['retrained'] and summary['triggers'] == ['sample_count']
+        assert (summary['trees_before'], summary['trees_after']) == (20, 27)
+
+        state = load_state(artifacts['state.json'])
+        assert len(state['consumed_ids']) == 100 and state['n_updates'] == 1
+        assert 'unlabelled' not in state['consumed_ids']
+
+        again = run(artifacts, triggers={'sample_count': 50})
+        assert not again['retrained'] and again['n_new'] == 0
+
+    def test_late_label_for_read_entry_is_used(self, artifacts):
+        """Test that a label attached after an update is picked up by the next one"""
+        run(artifacts, force=True)
+        event = attach_label('unlabelled', 'High', artifacts['log.json'], artifacts['labels.jsonl'])
+        assert event['prediction'] == 'Low'
+
+        summary = run(artifacts, force=True, config={'min_new_samples': 1})
+        assert summary['retrained'] and summary['n_new'] == 1
+        assert 'unlabelled' in load_state(artifacts['state.json'])['consumed_ids']
+
+    def test_legacy_offset_state_migrated(self, artifacts):
+        """Test that entries before an old log_offset are treated as consumed"""
+        artifacts['state.json'].write_text(json.dumps({
+            'log_offset': 50, 'last_retrain': datetime.now().isoformat(),
+            'n_updates': 1, 'n_samples_added': 50}))
+        assert run(artifacts)['n_new'] == 50
+
+    def test_missing_replay_data_warns(self, artifacts, tmp_path, capsys):
+        """Test that a missing replay file is reported instead of silently skipped"""
+        summary = run(artifacts, data_path=tmp_path / 'missing.csv', force=True)
+        assert summary['replay_missing'].endswith('missing.csv') and summary['n_replay'] == 0
+        assert 'Replay data not found' in capsys.readouterr().out
+
+    def test_single_class_batch_without_replay_waits(self, artifacts, tmp_path):
+        """Test that a feedback batch lacking classes is kept, not rejected, when replay is missing"""
+        entries = json.loads(artifacts['log.json'].read_text())
+        artifacts['log.json'].write_text(json.dumps([e for e in entries if e.get('label') == 'High']))
+        before = artifacts['model.pkl'].read_bytes()
+
+        summary = run(artifacts, data_path=tmp_path / 'missing.csv', force=True, config={'min_new_samples': 1})
+        assert not summary['retrained'] and 'lacks classes' in summary['reason']
+        assert artifacts['model.pkl'].read_bytes() == before
+        assert not artifacts['state.json'].exists()
+
+        # Varsayılan replay verisi (config.RAW_DATA_PATH) eksik sınıfları tamamlar
+        replayed = run(artifacts, data_path=RAW_DATA_PATH, force=True, config={'min_new_samples': 1})
+        assert replayed['retrained'] and replayed['n_replay'] > 0
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,188 @@
+"""
+Unit Tests for Routing Module
+=============================
+Tests for multi-model routing and A/B traffic splitting (model yönlendirme testleri)
+"""
+
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    from routing import ModelRouter, hash_bucket
+    from inference import LungCancerPredictor
+    from features import RAW_FEATURES, build_feature_matrix
+    from sharded_scoring import random_patients
+    ROUTING_AVAILABLE = True
+except ImportError:
+    ROUTING_AVAILABLE = False
+    pytest.skip("Routing module not available", allow_module_level=True)
+
+SMALL_FEATURES = ['Smoking', 'Overall_Risk_Score', 'Coughing of Blood']
+
+
+@pytest.fixture(scope='module')
+def control():
+    return LungCancerPredictor()
+
+
+@pytest.fixture(scope='module')
+def small():
+    """Two-class variant on a different feature subset"""
+    raw = pd.DataFrame(random_patients(300, seed=4), columns=RAW_FEATURES)
+    X = pd.DataFrame(build_feature_matrix(raw, SMALL_FEATURES), columns=SMALL_FEATURES)
+    y = np.where(X['Overall_Risk_Score'] > X['Overall_Risk_Score'].median(), 'High', 'Low')
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(scaler.transform(X), y)
+    return SimpleNamespace(model=model, scaler=scaler, feature_names=SMALL_FEATURES,
+                        predict_proba_scaled=model.predict_proba, version='small-1')
+
+
+@pytest.fixture
+def raw():
+    return pd.DataFrame(random_patients(400, seed=5), columns=RAW_FEATURES)
+
+
+class TestAssignment:
+    """Tests for weighted and hash-based assignment"""
+
+    def test_hash_is_sticky_and_weighted(self, control, small):
+        """Test that a patient always gets the same variant and weights are respected"""
+        router = ModelRouter({'control': control, 'small': small}, {'control': 0.8, 'small': 0.2},
+                            strategy='hash', metrics_path=None)
+        ids = [f"patient-{i}" for i in range(5000)]
+        first = [router.assign(i) for i in ids]
+        assert first == [router.assign(i) for i in ids]
+        assert first.count('small') / len(ids) == pytest.approx(0.2, abs=0.02)
+        assert 0 <= hash_bucket('x', 'salt') < 1 and hash_bucket('x', 'a') != hash_bucket('x', 'b')
+
+    def test_invalid_configuration(self, control):
+        """Test that bad weights and strategies are rejected"""
+        with pytest.raises(ValueError):
+            ModelRouter({'control': control}, {'other': 1.0}, metrics_path=None)
+        with pytest.raises(ValueError):
+            ModelRouter({'control': control}, strategy='round-robin', metrics_path=None)
+
+
+class TestRoutedScoring:
+    """Tests for shared features, results and metrics"""
+
+    def test_matches_each_variant(self, control, small, raw):
+        """Test that routed scores equal each variant's own predictions"""
+        router = ModelRouter({'control': control, 'small': small}, strategy='weight',
+                            metrics_path=None, seed=0)
+        assert router.feature_names[:len(control.feature_names)] == control.feature_names
+        result = router.predict_batch(raw)
+        assert set(result['variant']) == {'control', 'small'}
+
+        rows = result['variant'] == 'control'
+        expected = control.predict_batch(raw[rows])
+        np.testing.assert_array_equal(result.loc[rows, 'prediction'], expected['prediction'])
+        for c in control.model.classes_:
+            np.testing.assert_allclose(result.loc[rows, f"prob_{c}"], expected[f"prob_{c}"])
+        assert (result.loc[~rows, 'prob_Medium'] == 0).all()
+        assert (result.loc[~rows, 'model_version'] == 'small-1').all()
+
+    def test_metrics_and_outcomes(self, control, small, raw, tmp_path):
+        """Test per-variant metrics, outcome matching and the metrics file"""
+        path = tmp_path / 'routing.json'
+        router = ModelRouter({'control': control, 'small': small}, metrics_path=path, flush_every=1)
+        ids = [f"p{i}" for i in range(len(raw))]
+        result = router.predict_batch(raw, ids)
+        served = router.record_outcome('p0', result['prediction'].iloc[0])
+        assert served == result['variant'].iloc[0]
+        assert router.record_outcome('p0', 'High') is None
+
+        metrics = router.metrics()['variants']
+        assert sum(m['rows'] for m in metrics.values()) == len(raw)
+        assert metrics[served]['accuracy'] == 1.0
+        stored = json.loads(path.read_text())
+        assert stored['metrics']['variants'][served]['labelled'] == 1
+
+    def test_single_record(self, control):
+        """Test forced variant on one record"""
+        router = ModelRouter({'control': control}, metrics_path=None)
+        record = dict(zip(RAW_FEATURES, random_patients(1)[0].tolist()))
+        result = router.predict(record, patient_id='p1', variant='control')
+        prediction, probability = control.predict(record)
+        assert result['prediction'] == prediction
+        assert result['probabilities']['High'] == pytest.approx(probability[0])
+
+
+
+class TestRoutedServing:
+    """Tests for A/B routing behind /predict and /predict/batch"""
+
+    @pytest.fixture
+    def api(self, small, monkeypatch, api_log_dir):
+        """Client, patient payloads and a two-variant router installed after startup"""
+        TestClient = pytest.importorskip('fastapi.testclient').TestClient
+        import app_old
+        payloads = [{app_old.API_FIELD_NAMES[name]: int(value) for name, value in zip(RAW_FEATURES, row)}
+                    for row in random_patients(6, seed=6)]
+        with TestClient(app_old.app) as client:
+            router = ModelRouter({'control': app_old.raw_predictor, 'small': small}, strategy='hash',
+                                metrics_path=None)
+            yield client, payloads, router, monkeypatch, app_old
+
+    def test_single_variant_keeps_raw_predictor(self, api):
+        """Test that one configured variant leaves /predict on the raw predictor (and its cache)"""
+        client, payloads, _, _, app_old = api
+        assert len(app_old.model_router.names) == 1
+        body = client.post("/predict", json=payloads[0], params={"patient_id": "p0"})
+        assert body.headers["X-Cache"] in ("HIT", "MISS")
+        assert 'variant' not in body.json() and 'model_version' not in body.json()
+        prediction, _ = app_old.raw_predictor.predict(app_old.PatientData(**payloads[0]).to_dict())
+        assert body.json()['prediction'] == prediction
+
+    def test_predict_is_routed_by_patient_id(self, api):
+        """Test that /predict and /predict/batch serve the variant the router assigns"""
+        client, payloads, router, monkeypatch, app_old = api
+        monkeypatch.setattr(app_old, 'model_router', router)
+        ids = [f"patient-{i}" for i in range(len(payloads))]
+
+        single = [client.post("/predict", json=payload, params={"patient_id": i})
+                for payload, i in zip(payloads, ids)]
+        assert all(r.status_code == 200 and 'X-Cache' not in r.headers for r in single)
+        variants = [r.json()['variant'] for r in single]
+        assert variants == [router.assign(i) for i in ids] and set(variants) == {'control', 'small'}
+        assert [r.json()['model_version'] for r in single] == [router.version(v) for v in variants]
+        assert all(r.json()['prediction_id'] and r.json()['risk_factors'] for r in single)
+
+        batch = client.post("/predict/batch", json={"patients": payloads, "patient_ids": ids}).json()
+        assert [item['variant'] for item in batch['predictions']] == variants
+        assert [item['prediction'] for item in batch['predictions']] == [r.json()['prediction'] for r in single]
+        assert sum(m['rows'] for m in router.metrics()['variants'].values()) == 2 * len(payloads)
+
+        columnar = client.post("/predict/batch", params={"format": "columnar"},
+                            json={"patients": payloads, "patient_ids": ids}).json()
+        assert columnar['predictions']['variant'] == variants
+
+    def test_patient_ids_must_match_patients(self, api):
+        """Test that a batch with the wrong number of ids is refused"""
+        client, payloads, router, monkeypatch, app_old = api
+        monkeypatch.setattr(app_old, 'model_router', router)
+        response = client.post("/predict/batch", json={"patients": payloads, "patient_ids": ["a"]})
+        assert response.status_code == 422
+
+    def test_empty_ab_batch_keeps_format(self, api):
+        """Test that an empty /ab/predict/batch has the same shape as a full one"""
+        client, payloads, _, _, _ = api
+        assert client.post("/ab/predict/batch", json={"patients": []}).json() == []
+        empty = client.post("/ab/predict/batch", params={"format": "columnar"}, json={"patients": []})
+        assert empty.json() == {}
+        full = client.post("/ab/predict/batch", params={"format": "columnar"}, json={"patients": payloads})
+        assert isinstance(full.json(), dict) and len(full.json()['variant']) == len(payloads)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
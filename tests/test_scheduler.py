@@ -0,0 +1,241 @@
+"""
+Unit Tests for Scheduler Module
+===============================
+Tests for incremental log reading, aggregates and trigger evaluation (zamanlayıcı testleri)
+"""
+
+import pytest
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from scheduler import (read_new_entries, MonitoringAggregates, evaluate_triggers,
+                        pending_jobs, process_queue, load_scheduler_state, served_version, _run_job)
+    from features import RAW_FEATURES
+    from feedback import attach_label
+    SCHEDULER_AVAILABLE = True
+except ImportError:
+    SCHEDULER_AVAILABLE = False
+    pytest.skip("Scheduler module not available", allow_module_level=True)
+
+
+def make_entry(value=3, prediction='Low', label=None):
+    """Prediction log entry with every raw feature set to value"""
+    entry = {'timestamp': datetime.now().isoformat(),
+            'input': {name: value for name in RAW_FEATURES},
+            'prediction': prediction}
+    if label is not None:
+        entry['label'] = label
+    return entry
+
+
+def append_like_monitoring(path, entry):
+    """Append exactly like monitoring.log_prediction (rewrite the JSON array)"""
+    logs = json.loads(path.read_text()) if path.exists() else []
+    logs.append(entry)
+    path.write_text(json.dumps(logs, indent=2))
+
+
+REFERENCE = {
+    'feature_mean': [3.0] * len(RAW_FEATURES),
+    'feature_std': [1.0] * len(RAW_FEATURES),
+    'class_distribution': {'Low': 0.3, 'Medium': 0.3, 'High': 0.4},
+}
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Scheduler file locations inside a temporary directory"""
+    return {
+        'log_path': tmp_path / 'predictions.json',
+        'label_path': tmp_path / 'labels.jsonl',
+        'data_path': None,
+        'state_path': tmp_path / 'state.json',
+        'audit_path': tmp_path / 'audit.jsonl',
+        'queue_dir': tmp_path / 'queue',
+        'results_path': tmp_path / 'results.json',
+        'retrain_state_path': tmp_path / 'retrain_state.json',
+        'model_path': tmp_path / 'model.pkl',
+    }
+
+
+# =============================================================================
+# LOG READER TESTS
+# =============================================================================
+
+class TestReadNewEntries:
+    """Tests for byte-offset log tailing"""
+
+    def test_reads_only_new_entries(self, tmp_path):
+        """Test that entries appended by a full rewrite are read once"""
+        path = tmp_path / 'log.json'
+        append_like_monitoring(path, make_entry(1))
+        append_like_monitoring(path, make_entry(2))
+        entries, offset, tail, reset = read_new_entries(path)
+        assert len(entries) == 2 and not reset
+
+        append_like_monitoring(path, make_entry(3))
+        entries, offset, tail, reset = read_new_entries(path, offset, tail)
+        assert [e['input']['Age'] for e in entries] == [3]
+        assert read_new_entries(path, offset, tail)[0] == []
+
+    def test_rewritten_log_resets(self, tmp_path):
+        """Test that a replaced log is read from the start"""
+        path = tmp_path / 'log.json'
+        for value in (1, 2, 3):
+            append_like_monitoring(path, make_entry(value))
+        _, offset, tail, _ = read_new_entries(path)
+        path.write_text(json.dumps([make_entry(9)] * 4, indent=2))
+        entries, _, _, reset = read_new_entries(path, offset, tail)
+        assert reset and len(entries) == 4
+
+    def test_partial_entry_left_for_next_read(self, tmp_path):
+        """Test that a half-written trailing entry is not consumed"""
+        path = tmp_path / 'log.json'
+        text = json.dumps([make_entry(1), make_entry(2)], indent=2)
+        path.write_text(text[:-40])
+        entries, offset, _, _ = read_new_entries(path)
+        assert len(entries) == 1
+        path.write_text(text)
+        assert len(read_new_entries(path, offset)[0]) == 1
+
+
+# =============================================================================
+# AGGREGATE TESTS
+# =============================================================================
+
+class TestAggregates:
+    """Tests for running metrics"""
+
+    def test_accuracy_and_drift(self):
+        """Test accuracy from labels and drift from feature sums"""
+        agg = MonitoringAggregates()
+        for i in range(100):
+            agg.update(make_entry(5, 'Low', 'Low' if i < 80 else 'High'))
+        metrics = agg.metrics(REFERENCE, baseline_accuracy=1.0)
+        assert metrics['accuracy'] == pytest.approx(0.8)
+        assert metrics['performance_drop'] == pytest.approx(0.2)
+        assert metrics['data_drift'] == pytest.approx(2.0)
+
+    def test_roundtrip(self):
+        """Test that aggregates survive serialization"""
+        agg = MonitoringAggregates()
+        agg.update(make_entry(4, 'High', 'High'))
+        agg.add_label('Low', 'High', key='p1')
+        restored = MonitoringAggregates(json.loads(json.dumps(agg.to_dict())))
+        assert restored.to_dict() == agg.to_dict()
+
+    def test_corrected_label_counted_once(self):
+        """Test that a repeated prediction id corrects instead of double counting"""
+        agg = MonitoringAggregates()
+        agg.add_label('Low', 'High', key='p1')
+        agg.add_label('Low', 'Low', key='p1')
+        agg.add_label('High', 'High')
+        assert (agg.n_labelled, agg.n_correct) == (2, 2)
+
+    def test_not_enough_data(self):
+        """Test that metrics stay None below the minimum counts"""
+        agg = MonitoringAggregates()
+        agg.update(make_entry(9, 'Low', 'High'))
+        metrics = agg.metrics(REFERENCE, baseline_accuracy=1.0)
+        assert metrics['accuracy'] is None and metrics['data_drift'] is None
+
+
+# =============================================================================
+# EVALUATION TESTS
+# =============================================================================
+
+class TestEvaluateTriggers:
+    """Tests for trigger decisions, queueing and audit"""
+
+    def test_sample_count_enqueues_once(self, files):
+        """Test that a fired trigger enqueues one job and every tick is audited"""
+        for _ in range(5):
+            append_like_monitoring(files['log_path'], make_entry(3, 'Low', 'Low'))
+        first = evaluate_triggers(**files, triggers={'sample_count': 5})
+        assert first['triggers'] == ['sample_count'] and first['job_id']
+        assert pending_jobs(files['queue_dir'])[0]['action'] == 'incremental'
+
+        second = evaluate_triggers(**files, triggers={'sample_count': 5})
+        assert second['entries_read'] == 0 and second['job_skipped']
+        assert len(files['audit_path'].read_text().splitlines()) == 2
+
+    def test_performance_drop_requests_full_run(self, files):
+        """Test that a performance drop enqueues a full pipeline run"""
+        files['results_path'].write_text(json.dumps({'test_accuracy': 1.0}))
+        for i in range(60):
+            append_like_monitoring(files['log_path'], make_entry(3, 'Low', 'High' if i % 5 == 0 else 'Low'))
+        record = evaluate_triggers(**files)
+        assert 'performance_drop' in record['triggers']
+        assert pending_jobs(files['queue_dir'])[0]['action'] == 'full'
+
+    def test_finished_job_resets_window(self, files, tmp_path):
+        """Test that a job that replaces the served bundle resets the aggregates"""
+        for _ in range(3):
+            append_like_monitoring(files['log_path'], make_entry(3, 'Low', 'Low'))
+        evaluate_triggers(**files, triggers={'sample_count': 3})
+        model_dir = tmp_path / 'models'
+        model_dir.mkdir()
+
+        def retrain(job, path):
+            (model_dir / 'final_model.pkl').write_bytes(job['job_id'].encode())
+            return {'ok': True}
+
+        done = process_queue(files['queue_dir'], files['state_path'], runner=retrain, model_dir=model_dir)
+        assert [job['status'] for job in done] == ['done'] and done[0]['window_reset']
+        assert done[0]['model_version']['after'] == served_version(model_dir)
+        assert pending_jobs(files['queue_dir']) == []
+        assert load_scheduler_state(files['state_path'])['aggregates']['n_labelled'] == 0
+
+    def test_unchanged_bundle_keeps_window(self, files, tmp_path):
+        """Test that a job leaving the served bundle as it was does not reset the aggregates"""
+        for _ in range(3):
+            append_like_monitoring(files['log_path'], make_entry(3, 'Low', 'Low'))
+        evaluate_triggers(**files, triggers={'sample_count': 3})
+        done = process_queue(files['queue_dir'], files['state_path'], runner=lambda job, path: {'retrained': False},
+                            model_dir=tmp_path)
+        assert done[0]['status'] == 'done' and not done[0]['window_reset']
+        assert load_scheduler_state(files['state_path'])['aggregates']['n_labelled'] == 3
+
+    def test_full_job_replaces_served_bundle(self, tmp_path, monkeypatch):
+        """Test that the default full-run job reads RAW_DATA_PATH and saves into the model directory"""
+        import pipeline
+        from config import RAW_DATA_PATH
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(pipeline, 'MODEL_PARAMS', dict(pipeline.MODEL_PARAMS, n_estimators=10, n_jobs=1))
+        monkeypatch.setattr(pipeline, 'TUNED_PARAMS_PATH', tmp_path / 'tuned_params.json')
+        model_dir = tmp_path / 'models'
+        assert _run_job({'action': 'full'}, RAW_DATA_PATH, model_dir=model_dir) == {'retrained': True}
+        assert served_version(model_dir) is not None
+        assert (model_dir / 'model_results.json').exists()
+
+    def test_late_label_for_read_entry_counted(self, files):
+        """Test that a label attached after its prediction was read is still counted"""
+        for i in range(3):
+            append_like_monitoring(files['log_path'], dict(make_entry(3, 'Low'), id=f"p{i}"))
+        first = evaluate_triggers(**files)
+        assert first['entries_read'] == 3 and first['metrics']['sample_count'] == 0
+
+        attach_label('p0', 'Low', files['log_path'], files['label_path'])
+        attach_label('p2', 'High', files['log_path'], files['label_path'])
+        second = evaluate_triggers(**files, triggers={'sample_count': 2})
+        assert second['entries_read'] == 0 and second['labels_read'] == 2
+        assert second['metrics']['sample_count'] == 2 and second['triggers'] == ['sample_count']
+
+        attach_label('p2', 'Low', files['log_path'], files['label_path'])
+        evaluate_triggers(**files)
+        aggregates = load_scheduler_state(files['state_path'])['aggregates']
+        assert (aggregates['n_labelled'], aggregates['n_correct']) == (2, 2)
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,102 @@
+"""
+Unit Tests for Serialization Module
+===================================
+Tests for fast JSON encoding, columnar batches and response compression (yanıt kodlama testleri)
+"""
+
+import pytest
+import json
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from fastapi.testclient import TestClient
+    from serialization import dumps, to_columnar
+    from app_old import app, batch_response, format_batch_item, RECOMMENDATIONS
+    SERIALIZATION_AVAILABLE = True
+except ImportError:
+    SERIALIZATION_AVAILABLE = False
+    pytest.skip("Serialization module not available", allow_module_level=True)
+
+
+@pytest.fixture
+def result():
+    """predict_with_details-shaped result"""
+    return {
+        'prediction': 'High',
+        'confidence': 0.9,
+        'probabilities': {'Low': 0.05, 'Medium': 0.05, 'High': 0.9},
+        'risk_factors': {'Lifestyle Risk': 7.5, 'Environmental Risk': 3.0,
+                        'Symptom Severity': 6.5, 'Critical Symptoms': 3},
+        'overall_risk_score': 7.2,
+    }
+
+
+# =============================================================================
+# ENCODER TESTS
+# =============================================================================
+
+class TestDumps:
+    """Tests for JSON encoding"""
+
+    def test_fast_and_standard_agree(self):
+        """Test that both encoders produce the same document"""
+        obj = {'a': np.float64(0.25), 'b': np.arange(3), 'c': "🚨 text", 'd': [1, None]}
+        assert json.loads(dumps(obj)) == json.loads(dumps(obj, fast=False))
+        assert json.loads(dumps(obj)) == {'a': 0.25, 'b': [0, 1, 2], 'c': "🚨 text", 'd': [1, None]}
+
+    def test_to_columnar(self):
+        """Test that records become column lists"""
+        records = [{'x': 1, 'p': {'a': 0.1}}, {'x': 2, 'p': {'a': 0.2}}]
+        assert to_columnar(records, nested=('p',)) == {'x': [1, 2], 'p': {'a': [0.1, 0.2]}}
+        assert to_columnar([]) == {}
+
+
+# =============================================================================
+# BATCH RESPONSE TESTS
+# =============================================================================
+
+class TestBatchResponse:
+    """Tests for /predict/batch layouts"""
+
+    def test_codes_resolve_to_text(self, result):
+        """Test that recommendation codes map back to the text response"""
+        text = format_batch_item(result)['recommendations']
+        codes = format_batch_item(result, codes=True)['recommendations']
+        body = batch_response([format_batch_item(result, codes=True)], recommendations='codes')
+        assert [body['recommendation_catalog'][c] for c in codes] == text
+        assert text[0] == RECOMMENDATIONS['high_risk']
+
+    def test_columnar_matches_records(self, result):
+        """Test that columnar and record layouts carry the same values"""
+        items = [format_batch_item(result), format_batch_item(dict(result, prediction='Low'))]
+        records = batch_response(items)['predictions']
+        columns = batch_response(items, format='columnar')['predictions']
+        assert columns['prediction'] == [r['prediction'] for r in records]
+        assert columns['probabilities']['High'] == [r['probabilities']['High'] for r in records]
+        assert columns['recommendations'] == [r['recommendations'] for r in records]
+
+
+# =============================================================================
+# COMPRESSION TESTS
+# =============================================================================
+
+class TestCompression:
+    """Tests for negotiated gzip"""
+
+    def test_gzip_only_when_accepted(self):
+        """Test that gzip is applied only for clients that accept it"""
+        client = TestClient(app)
+        compressed = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+        assert compressed.headers.get("content-encoding") == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert compressed.json() == plain.json()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
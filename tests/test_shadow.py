@@ -0,0 +1,135 @@
+"""
+Unit Tests for Shadow Module
+============================
+Tests for shadow-model evaluation (gölge model karşılaştırma testleri)
+"""
+
+import pytest
+import json
+import time
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from shadow import ShadowEvaluator, ShadowAggregates
+    from inference import LungCancerPredictor
+    from features import RAW_FEATURES
+    from sharded_scoring import random_patients
+    SHADOW_AVAILABLE = True
+except ImportError:
+    SHADOW_AVAILABLE = False
+    pytest.skip("Shadow module not available", allow_module_level=True)
+
+
+@pytest.fixture(scope='module')
+def primary():
+    return LungCancerPredictor()
+
+
+@pytest.fixture
+def records():
+    return [dict(zip(RAW_FEATURES, row.tolist())) for row in random_patients(40, seed=3)]
+
+
+def served(predictor, record):
+    """Primary result in the shape /predict hands to the shadow"""
+    label, probability = predictor.predict(record)
+    return label, {str(c): float(p) for c, p in zip(predictor.model.classes_, probability)}
+
+
+class TestAggregates:
+    """Tests for running comparison totals"""
+
+    def test_metrics(self):
+        """Test agreement, deltas and transitions from two updates"""
+        aggregates = ShadowAggregates()
+        aggregates.update('High', {'High': 0.9, 'Low': 0.1}, 'High', {'High': 0.7, 'Low': 0.3}, 0.002, 0.001, 0.001)
+        aggregates.update('Low', {'High': 0.4, 'Low': 0.6}, 'High', {'High': 0.6, 'Low': 0.4}, 0.002, 0.003, 0.001)
+        metrics = ShadowAggregates(aggregates.to_dict()).metrics()
+        assert metrics['agreement'] == 0.5
+        assert metrics['mean_probability_delta']['High'] == pytest.approx(0.2)
+        assert metrics['shadow_latency_ms'] == pytest.approx(2.0)
+        assert metrics['transitions'] == {'High->High': 1, 'Low->High': 1}
+
+
+class TestShadowEvaluator:
+    """Tests for background scoring, sampling and the CPU cap"""
+
+    def test_identical_candidate_agrees(self, primary, records, tmp_path):
+        """Test that the deployed model shadowing itself agrees exactly"""
+        shadow = ShadowEvaluator(LungCancerPredictor(), sample_rate=1.0, max_cpu_fraction=1.0,
+                                metrics_path=tmp_path / 'shadow.json', flush_every=10)
+        for record in records:
+            shadow.submit(record, *served(primary, record), primary_latency=0.001)
+        shadow.close()
+        stored = json.loads((tmp_path / 'shadow.json').read_text())
+        assert stored['metrics']['n_scored'] == len(records)
+        assert stored['metrics']['agreement'] == 1.0
+        assert max(stored['metrics']['max_probability_delta'].values()) == 0.0
+
+    def test_sampling_and_resume(self, primary, records, tmp_path):
+        """Test sample rate and resuming aggregates for the same candidate version"""
+        path = tmp_path / 'shadow.json'
+        shadow = ShadowEvaluator(LungCancerPredictor(), sample_rate=0.5, metrics_path=path, seed=0)
+        queued = sum(shadow.submit(record, *served(primary, record)) for record in records)
+        shadow.close()
+        assert 0 < queued < len(records)
+        resumed = ShadowEvaluator(LungCancerPredictor(), sample_rate=0.0, metrics_path=path)
+        assert resumed.metrics()['n_scored'] == queued
+        resumed.close()
+
+    def test_cpu_cap_drops_instead_of_blocking(self, primary, records):
+        """Test that a saturated shadow drops samples and stays under its CPU share"""
+        shadow = ShadowEvaluator(LungCancerPredictor(), sample_rate=1.0, max_cpu_fraction=0.2,
+                                queue_size=2, metrics_path=None)
+        began = time.perf_counter()
+        for record in records * 5:
+            shadow.submit(record, *served(primary, record))
+        assert time.perf_counter() - began < 5.0
+        shadow.drain(timeout=30)
+        elapsed = time.perf_counter() - began
+        metrics = shadow.metrics()
+        shadow.close()
+        assert metrics['drop_rate'] > 0
+        assert metrics['shadow_cpu_seconds'] <= 0.2 * elapsed + 0.05
+
+    def test_candidate_errors_are_counted(self, primary, records):
+        """Test that a failing candidate never raises into the caller"""
+        candidate = LungCancerPredictor()
+        candidate.predict = lambda record: (_ for _ in ()).throw(RuntimeError("broken"))
+        shadow = ShadowEvaluator(candidate, sample_rate=1.0, metrics_path=None)
+        for record in records[:5]:
+            shadow.submit(record, *served(primary, record))
+        shadow.drain(timeout=10)
+        assert shadow.metrics()['error_rate'] == 1.0
+        shadow.close()
+
+
+class TestShadowEndpoint:
+    """Tests for shadow traffic from the serving API"""
+
+    def test_served_requests_are_sampled(self, records, monkeypatch, api_log_dir):
+        """Test that /predict and /predict/batch hand every served prediction to the shadow"""
+        TestClient = pytest.importorskip('fastapi.testclient').TestClient
+        import app_old
+        payloads = [{app_old.API_FIELD_NAMES[name]: int(value) for name, value in record.items()}
+                    for record in records[:3]]
+        with TestClient(app_old.app) as client:
+            shadow = ShadowEvaluator(LungCancerPredictor(), sample_rate=1.0, metrics_path=None,
+                                    primary_version=app_old.served_model_version())
+            monkeypatch.setattr(app_old, 'shadow_evaluator', shadow)
+            assert client.post("/predict", json=payloads[0]).status_code == 200
+            assert client.post("/predict/batch", json={"patients": payloads[1:]}).status_code == 200
+            shadow.drain(timeout=30)
+            metrics = client.get("/shadow/metrics").json()
+        assert metrics['n_sampled'] == 3 and metrics['n_scored'] == 3
+        assert metrics['agreement'] == 1.0
+        assert set(metrics['max_probability_delta']) == set(map(str, shadow.candidate.model.classes_))
+        assert metrics['primary_version'] == app_old.raw_predictor.version
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
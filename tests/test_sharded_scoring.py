@@ -0,0 +1,74 @@
+"""
+Unit Tests for Sharded Scoring Module
+=====================================
+Tests for the process-pool scoring engine (çok çekirdekli skorlama testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sharded_scoring import ShardedScorer, random_patients, scaling_report
+    from inference import LungCancerPredictor
+    from features import RAW_FEATURES
+    SHARDED_AVAILABLE = True
+except ImportError:
+    SHARDED_AVAILABLE = False
+    pytest.skip("Sharded scoring module not available", allow_module_level=True)
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    """Two-worker pool with small shards"""
+    with ShardedScorer(n_workers=2, shard_size=97) as scorer:
+        yield scorer
+
+
+@pytest.fixture(scope='module')
+def raw():
+    return pd.DataFrame(random_patients(1000), columns=RAW_FEATURES)
+
+
+class TestShardedScorer:
+    """Tests for ordering, parity and shared buffers"""
+
+    def test_matches_single_process(self, scorer, raw):
+        """Test that sharded results equal LungCancerPredictor.predict_batch row for row"""
+        expected = LungCancerPredictor().predict_batch(raw)
+        actual = scorer.predict_batch(raw)
+        assert len(scorer.last_shard_seconds) == 11
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_order_preserved(self, scorer, raw):
+        """Test that a reversed input gives reversed output"""
+        forward = scorer.predict_proba(raw.to_numpy())
+        backward = scorer.predict_proba(raw.to_numpy()[::-1])
+        assert np.array_equal(forward[::-1], backward)
+
+    def test_edge_cases(self, scorer):
+        """Test empty input, shape errors and buffer cleanup"""
+        assert scorer.predict_proba(np.empty((0, len(RAW_FEATURES)))).shape == (0, len(scorer.classes))
+        with pytest.raises(ValueError):
+            scorer.predict_proba(np.ones((3, 4)))
+        assert list(Path(scorer._directory).iterdir()) == []
+
+
+class TestScalingReport:
+    """Tests for the scaling report"""
+
+    def test_report_columns(self):
+        """Test per-count rows, baseline speedup and efficiency"""
+        report = scaling_report(random_patients(300), [2, 1], shard_size=50, repeats=1)
+        assert report['n_workers'].tolist() == [1, 2]
+        assert report['speedup'].iloc[0] == 1.0
+        assert report['efficiency'].iloc[1] == pytest.approx(report['speedup'].iloc[1] / 2)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
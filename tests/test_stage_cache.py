@@ -0,0 +1,101 @@
+"""
+Unit Tests for Stage Cache Module
+=================================
+Tests for content-addressed pipeline stage cache (aşama cache'i testleri)
+"""
+
+import pytest
+import os
+import time
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from stage_cache import StageCache, stage_key, file_digest, code_version
+    STAGE_CACHE_AVAILABLE = True
+except ImportError:
+    STAGE_CACHE_AVAILABLE = False
+    pytest.skip("Stage cache module not available", allow_module_level=True)
+
+
+# =============================================================================
+# KEY TESTS
+# =============================================================================
+
+class TestKeys:
+    """Tests for content addressing"""
+
+    def test_key_is_deterministic(self):
+        """Test that identical inputs give identical keys"""
+        assert stage_key('train_model', params={'a': 1, 'b': 2}) == \
+            stage_key('train_model', params={'b': 2, 'a': 1})
+
+    def test_key_changes_with_params(self):
+        """Test that parameter changes change the key"""
+        assert stage_key('train_model', params={'n_estimators': 300}) != \
+            stage_key('train_model', params={'n_estimators': 100})
+
+    def test_key_changes_with_stage(self):
+        """Test that stage names are part of the key"""
+        assert stage_key('load_data', x=1) != stage_key('prepare_data', x=1)
+
+    def test_file_digest_tracks_content(self, tmp_path):
+        """Test that file digest changes with file content"""
+        path = tmp_path / 'data.csv'
+        path.write_text('a,b\n1,2\n')
+        first = file_digest(path)
+        path.write_text('a,b\n1,3\n')
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        assert file_digest(path) != first
+
+    def test_code_version(self):
+        """Test that code version is a sha256 hex digest"""
+        assert len(code_version()) == 64
+
+
+# =============================================================================
+# CACHE TESTS
+# =============================================================================
+
+class TestStageCache:
+    """Tests for cache storage, force and eviction"""
+
+    def test_roundtrip(self, tmp_path):
+        """Test put/get roundtrip and hit counters"""
+        cache = StageCache(tmp_path)
+        cache.put('load_data', 'k1', {'df': [1, 2, 3]})
+        assert cache.get('load_data', 'k1') == {'df': [1, 2, 3]}
+        assert cache.get('load_data', 'missing') is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_force_ignores_entries(self, tmp_path):
+        """Test that force mode always misses"""
+        StageCache(tmp_path).put('train_model', 'k1', {'model': 'm'})
+        forced = StageCache(tmp_path, force=True)
+        assert not forced.contains('train_model', 'k1')
+        assert forced.get('train_model', 'k1') is None
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that least recently used entries are evicted over the size limit"""
+        cache = StageCache(tmp_path, max_bytes=10**9)
+        payload = b'x' * 50_000
+        for i, key in enumerate(['old', 'mid', 'new']):
+            path = cache.put('stage', key, payload)
+            os.utime(path, (1_000 + i, 1_000 + i))
+        entry_size = path.stat().st_size
+
+        cache.max_bytes = int(entry_size * 2.5)
+        removed = cache.evict()
+        assert [p.name for p in removed] == ['stage-old.joblib']
+        assert cache.contains('stage', 'mid') and cache.contains('stage', 'new')
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,88 @@
+"""
+Unit Tests for Tree Kernel Module
+=================================
+Tests for serial / thread-parallel forest evaluation (ağaç çekirdeği testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from tree_kernel import ForestKernel, supports
+    TREE_KERNEL_AVAILABLE = True
+except ImportError:
+    TREE_KERNEL_AVAILABLE = False
+    pytest.skip("Tree kernel module not available", allow_module_level=True)
+
+
+@pytest.fixture(scope='module')
+def forest():
+    """Three-class forest on random data"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 6))
+    y = np.array(['High', 'Low', 'Medium'])[(X[:, 0] > 0).astype(int) + (X[:, 1] > 0.5)]
+    model = RandomForestClassifier(n_estimators=37, max_depth=6, random_state=0, n_jobs=1).fit(X, y)
+    return model, rng.normal(size=(700, 6))
+
+
+class TestForestKernel:
+    """Tests for parity with sklearn and the crossover heuristic"""
+
+    def test_serial_matches_sklearn_exactly(self, forest):
+        """Test that the serial path equals predict_proba bit for bit"""
+        model, X = forest
+        kernel = ForestKernel(model, n_threads=1)
+        assert np.array_equal(kernel.predict_proba(X), model.predict_proba(X))
+        assert (kernel.predict(X) == model.predict(X)).all()
+
+    def test_parallel_matches_and_is_deterministic(self, forest):
+        """Test threaded evaluation with uneven tree partitions"""
+        model, X = forest
+        kernel = ForestKernel(model, n_threads=4)
+        first = kernel.predict_proba(X, parallel=True)
+        np.testing.assert_allclose(first, model.predict_proba(X), rtol=0, atol=1e-12)
+        assert np.array_equal(first, kernel.predict_proba(X, parallel=True))
+        kernel.close()
+
+    def test_crossover(self, forest):
+        """Test that small batches stay serial and one thread never goes parallel"""
+        model, _ = forest
+        kernel = ForestKernel(model, n_threads=4, crossover_rows=100)
+        assert not kernel.use_parallel(99) and kernel.use_parallel(100)
+        assert not ForestKernel(model, n_threads=1, crossover_rows=1).use_parallel(10 ** 6)
+
+    def test_supports(self, forest):
+        """Test model type detection"""
+        model, X = forest
+        assert supports(model) and supports(model.estimators_[0])
+        assert not supports(LogisticRegression().fit(X[:50], model.predict(X[:50])))
+
+
+class TestPredictorIntegration:
+    """Tests for LungCancerPredictor using the kernel"""
+
+    def test_predictor_uses_kernel(self):
+        """Test that predict/predict_batch agree with the sklearn model"""
+        from inference import LungCancerPredictor
+        from sharded_scoring import random_patients
+        from features import RAW_FEATURES
+
+        predictor = LungCancerPredictor()
+        assert predictor.kernel is not None
+        raw = pd.DataFrame(random_patients(50), columns=RAW_FEATURES)
+        batch = predictor.predict_batch(raw)
+        prediction, probability = predictor.predict(raw.iloc[0].to_dict())
+        assert prediction == batch['prediction'].iloc[0]
+        assert np.allclose(probability, batch.filter(like='prob_').iloc[0], rtol=0, atol=1e-12)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,115 @@
+"""
+Unit Tests for Tuning Module
+============================
+Tests for successive halving search and trial checkpoints (hiperparametre arama testleri)
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from sklearn.datasets import make_classification
+    from tuning import sample_candidates, successive_halving, tune, TrialCheckpoint
+    TUNING_AVAILABLE = True
+except ImportError:
+    TUNING_AVAILABLE = False
+    pytest.skip("Tuning module not available", allow_module_level=True)
+
+
+SPACE = {
+    'n_estimators': [20, 40],
+    'max_depth': [3, 6, None],
+    'min_samples_leaf': [1, 2],
+}
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Small 3-class dataset"""
+    X, y = make_classification(n_samples=300, n_features=8, n_informative=5,
+                            n_classes=3, random_state=0)
+    return X, y
+
+
+# =============================================================================
+# CANDIDATE TESTS
+# =============================================================================
+
+class TestCandidates:
+    """Tests for candidate sampling"""
+
+    def test_sampling_is_deterministic(self):
+        """Test that the same seed gives the same candidate list"""
+        assert sample_candidates(SPACE, 6, 42) == sample_candidates(SPACE, 6, 42)
+
+    def test_candidates_are_unique(self):
+        """Test that duplicate parameter sets are dropped"""
+        candidates = sample_candidates(SPACE, 12, 0)
+        ids = [cid for cid, _ in candidates]
+        assert len(set(ids)) == len(ids)
+        assert len({str(sorted(p.items())) for _, p in candidates}) == len(candidates)
+
+
+# =============================================================================
+# SEARCH TESTS
+# =============================================================================
+
+class TestSuccessiveHalving:
+    """Tests for rung promotion and checkpoint resume"""
+
+    def test_rungs_shrink(self, dataset):
+        """Test that each rung keeps the top 1/eta candidates and the last rung uses full budget"""
+        X, y = dataset
+        candidates = sample_candidates(SPACE, 9, 0)
+        result = successive_halving(candidates, X, y, eta=3, min_fraction=1 / 9,
+                                    n_jobs=1, verbose=False)
+        per_rung = [sum(t['rung'] == r for t in result['trials']) for r in range(3)]
+        assert per_rung == [9, 3, 1]
+        final = [t for t in result['trials'] if t['rung'] == 2][0]
+        assert final['fraction'] == 1.0
+        assert result['best_candidate'] == final['candidate_id']
+
+    def test_checkpoint_resume(self, dataset, tmp_path):
+        """Test that a rerun with the same signature reuses every trial"""
+        X, y = dataset
+        path = tmp_path / 'trials.jsonl'
+        config = {'n_candidates': 6, 'eta': 3, 'min_fraction': 1 / 3}
+        first = tune(X, y, SPACE, config, checkpoint_path=path, signature='s1', n_jobs=1)
+        n_lines = len(path.read_text().splitlines())
+
+        second = tune(X, y, SPACE, config, checkpoint_path=path, signature='s1', n_jobs=1)
+        assert second['best_params'] == first['best_params']
+        assert len(path.read_text().splitlines()) == n_lines
+
+        tune(X, y, SPACE, config, checkpoint_path=path, signature='s2', n_jobs=1)
+        assert len(path.read_text().splitlines()) > n_lines
+        assert len(TrialCheckpoint(path, 's1').trials) == n_lines
+
+    def test_ties_prefer_cheaper_model(self, dataset):
+        """Test that equal scores promote fewer trees / shallower depth"""
+        X = np.zeros((60, 2))
+        y = np.array([0, 1] * 30)
+        candidates = [('big', {'n_estimators': 40, 'max_depth': None}),
+                    ('small', {'n_estimators': 20, 'max_depth': 3})]
+        result = successive_halving(candidates, X, y, eta=2, min_fraction=1 / 2,
+                                    n_jobs=1, verbose=False)
+        assert result['best_candidate'] == 'small'
+
+    def test_unknown_method(self, dataset):
+        """Test that an unknown search method is rejected"""
+        X, y = dataset
+        with pytest.raises(ValueError):
+            tune(X, y, SPACE, {'method': 'grid'})
+
+
+# =============================================================================
+# RUN TESTS
+# =============================================================================
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
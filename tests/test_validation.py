@@ -0,0 +1,141 @@
+"""
+Unit Tests for Validation Module
+================================
+Tests for vectorized FEATURE_RANGES checks (doğrulama motoru testleri)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+try:
+    from validation import RangeValidator, FEATURE_VALIDATOR, validate_records
+    from config import FEATURE_RANGES, validate_feature_value
+    VALIDATION_AVAILABLE = True
+except ImportError:
+    VALIDATION_AVAILABLE = False
+    pytest.skip("Validation module not available", allow_module_level=True)
+
+
+@pytest.fixture
+def valid_record():
+    """Record with every feature at its lower bound"""
+    return {name: low for name, (low, high) in FEATURE_RANGES.items()}
+
+
+# =============================================================================
+# COMPILATION TESTS
+# =============================================================================
+
+class TestCompiledRanges:
+    """Tests for bound vectors"""
+
+    def test_bounds_follow_feature_ranges(self):
+        """Test that bound vectors match FEATURE_RANGES in column order"""
+        assert FEATURE_VALIDATOR.columns == list(FEATURE_RANGES)
+        assert FEATURE_VALIDATOR.lower[0] == FEATURE_RANGES['Age'][0]
+        assert FEATURE_VALIDATOR.upper[0] == FEATURE_RANGES['Age'][1]
+
+    def test_custom_ranges(self):
+        """Test validator with its own ranges"""
+        validator = RangeValidator({'a': (0, 1)}, integer=False)
+        result = validator.validate(pd.DataFrame({'a': [0.5, 2.0]}))
+        assert result.valid.tolist() == [True, False]
+
+
+# =============================================================================
+# BATCH VALIDATION TESTS
+# =============================================================================
+
+class TestValidate:
+    """Tests for one-pass batch validation"""
+
+    def test_valid_batch(self, valid_record):
+        """Test that in-range records pass"""
+        result = validate_records([valid_record] * 3)
+        assert result.ok and result.n_invalid == 0 and result.errors.empty
+
+    def test_structured_errors(self, valid_record):
+        """Test per-row, per-column error records"""
+        bad = dict(valid_record, Age=150, Smoking='x')
+        del bad['Snoring']
+        result = validate_records([valid_record, bad])
+
+        assert result.valid.tolist() == [True, False]
+        assert result.to_records() == [
+            {'row': 1, 'column': 'Age', 'value': 150, 'reason': 'out of range', 'allowed': '14-100'},
+            {'row': 1, 'column': 'Smoking', 'value': 'x', 'reason': 'missing or non-numeric', 'allowed': '1-8'},
+            {'row': 1, 'column': 'Snoring', 'value': None, 'reason': 'missing or non-numeric', 'allowed': '1-7'},
+        ]
+
+    def test_single_record_and_offset(self, valid_record):
+        """Test dict input and row offset"""
+        result = validate_records(dict(valid_record, Gender=1.5), row_offset=10)
+        assert result.to_records()[0]['row'] == 10
+        assert result.errors['reason'].tolist() == ['not an integer']
+
+    def test_agrees_with_scalar_check(self):
+        """Test that the engine matches config.validate_feature_value cell by cell"""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({name: rng.integers(-2, 110, size=50) for name in FEATURE_RANGES})
+        result = FEATURE_VALIDATOR.validate(df)
+
+        expected = [
+            not all(validate_feature_value(name, value)[0] for name, value in row.items())
+            for row in df.to_dict('records')
+        ]
+        assert (~result.valid).tolist() == expected
+
+
+
+# =============================================================================
+# API TESTS
+# =============================================================================
+
+class TestApiValidation:
+    """Tests for the 422 bodies of /predict and /predict/batch"""
+
+    @pytest.fixture
+    def client(self):
+        """Client without startup: range checks run before the model is needed"""
+        TestClient = pytest.importorskip('fastapi.testclient').TestClient
+        import app_old
+        return TestClient(app_old.app)
+
+    @pytest.fixture
+    def payload(self, valid_record, client):
+        """valid_record with API field names"""
+        from app_old import API_FIELD_NAMES
+        return {API_FIELD_NAMES[name]: value for name, value in valid_record.items()}
+
+    def test_single_predict_range_errors(self, client, payload):
+        """Test that /predict reports every out-of-range field of the patient as row 0"""
+        response = client.post("/predict", json=dict(payload, Age=150, Air_Pollution=0))
+
+        assert response.status_code == 422
+        errors = response.json()["detail"]
+        assert [(e["row"], e["column"], e["field"], e["reason"], e["allowed"]) for e in errors] == [
+            (0, "Age", "Age", "out of range", "14-100"),
+            (0, "Air Pollution", "Air_Pollution", "out of range", "1-8"),
+        ]
+
+    def test_batch_predict_range_errors(self, client, payload):
+        """Test that out-of-range fields are reported per patient and field"""
+        bad = dict(payload, Age=150, Smoking=0)
+        response = client.post("/predict/batch", json={"patients": [payload, bad]})
+
+        assert response.status_code == 422
+        errors = response.json()["detail"]
+        assert [(e["row"], e["field"], e["reason"], e["allowed"], e["value"]) for e in errors] == [
+            (1, "Age", "out of range", "14-100", 150),
+            (1, "Smoking", "out of range", "1-8", 0),
+        ]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])